@@ -8,15 +8,39 @@ Incluye:
 - Adjuntos
 - Guardar registros seguro
 - Editar registros existentes
-- Exportar a Excel
+- Exportar a Excel, CSV o Parquet/Arrow
+- Tablero de indicadores (KPI) por mes, cliente y producto
+- Análisis de Pareto de fallas, productos, clientes y causas Ishikawa
+- Aviso de NC posiblemente duplicadas mientras se escribe la falla
+- Seguimiento de acciones correctivas vencidas por responsable
+- Menú Diagnóstico: perfil de la sesión, vigilante de bloqueos y latencia del event loop
+
+Opciones:
+    --profile-startup   mide cada fase del arranque y deja el informe en log/
+    --cprofile          con --profile-startup, agrega el perfil por función (.prof)
+    --log-profile P     perfil de logging: production, development, debug u off
+                        (también NC_AC_LOG_PROFILE o [logging] perfil en nc_ac_faben.ini)
 """
 
-import sys, os, sqlite3, shutil, logging
+import sys
+from diagnostics.startup import StartupProfiler
+# Perfil del arranque: se crea antes de las demás importaciones para medirlas
+STARTUP = StartupProfiler.from_argv(sys.argv)
+
+import os, sqlite3, logging
 from datetime import datetime
 from pathlib import Path
 from typing import List
-from PyQt6 import QtWidgets, QtCore
-from openpyxl import Workbook
+from PyQt6 import QtWidgets, QtCore, QtGui
+from db import repository
+from db.repository import NCRepository, AccionRepository
+from db.cache import NCRecordCache
+from db.completion import CompletionSource
+from db.catalog import ProductCatalog
+from db.overdue import overdue_actions, overdue_by_responsable, overdue_count
+from db.schema import NC_FORM_FIELDS, ISHIKAWA_CATEGORIAS, parse_form_values, row_to_form_values
+from diagnostics.eventloop import LagMonitor
+STARTUP.mark('imports')
 
 # Importar configuración de logging personalizada
 LOG_DIR = Path.cwd() / 'log'
@@ -24,9 +48,10 @@ LOG_FILE = LOG_DIR / 'nc_ac_faben.log'
 DEBUG_LOG_FILE = LOG_DIR / 'nc_ac_faben_debug.log'
 
 try:
-    from log import setup_development_logging, log_performance, get_module_logger
-    logger = setup_development_logging()
-    logger.info("Sistema de logging avanzado cargado exitosamente")
+    from log import select_logging_profile, setup_logging_profile, log_performance, get_module_logger
+    LOG_PROFILE, LOG_PROFILE_SOURCE = select_logging_profile()
+    logger = setup_logging_profile(LOG_PROFILE)
+    logger.info(f"Sistema de logging avanzado cargado exitosamente (perfil {LOG_PROFILE}, {LOG_PROFILE_SOURCE})")
 except ImportError:
     # Fallback a configuración básica si no está disponible el paquete log
     logging.basicConfig(
@@ -39,21 +64,22 @@ except ImportError:
     )
     logger = logging.getLogger(__name__)
     logger.warning("Usando configuración de logging básica (logging_config no disponible)")
+    LOG_PROFILE = None
     
     # Función dummy para compatibilidad
     def log_performance(func):
         return func
+STARTUP.mark('logging')
+
+# Latencia del event loop: las operaciones de la ventana se registran con @LAG_MONITOR.track()
+# (sin costo mientras la medición está desactivada)
+LAG_MONITOR = LagMonitor(enabled=False)
+# Vigilante de bloqueos y latencia arrancan activos sólo con el perfil de logging debug; si no, desde el menú
+DIAGNOSTICS_AT_STARTUP = LOG_PROFILE == 'debug'
 
 DB_FILE = Path.cwd() / 'nc_ac_faben.db'
 ATTACH_DIR = Path.cwd() / 'attachments'
 
-def _is_float(s):
-    try:
-        float(s)
-        return True
-    except:
-        return False
-
 @log_performance
 def init_db():
     try:
@@ -61,45 +87,20 @@ def init_db():
         ATTACH_DIR.mkdir(exist_ok=True)
         logger.info(f"Directorio de adjuntos creado/verificado: {ATTACH_DIR}")
         
-        conn = sqlite3.connect(DB_FILE)
-        cur = conn.cursor()
+        conn = repository.connect(DB_FILE)
         logger.info(f"Conexión establecida con base de datos: {DB_FILE}")
         
-        cur.execute('''
-        CREATE TABLE IF NOT EXISTS nc (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nro_nc INTEGER UNIQUE,
-        fecha TEXT,
-        resultado_matriz REAL,
-        op INTEGER,
-        cant_invol REAL,
-        cod_producto TEXT,
-        desc_producto TEXT,
-        cliente TEXT,
-        cant_scrap REAL,
-        costo REAL,
-        cant_recuperada REAL,
-        observaciones TEXT,
-        falla TEXT,
-        ishikawa TEXT
-    )''')
-        logger.info("Tabla 'nc' creada/verificada exitosamente")
-        
-        cur.execute('''
-        CREATE TABLE IF NOT EXISTS acciones (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            nc_id INTEGER,
-            tarea TEXT,
-            tiempo_estimado TEXT,
-            responsable TEXT,
-            fecha_realizacion TEXT,
-            estado TEXT,
-            adjuntos TEXT,
-            FOREIGN KEY(nc_id) REFERENCES nc(id)
-        )''')
-        logger.info("Tabla 'acciones' creada/verificada exitosamente")
-        
-        conn.commit()
+        # Con el esquema al día no hay nada que crear ni migrar: sólo se lee user_version
+        if repository.schema_is_current(conn):
+            logger.info(f"Esquema al día (versión {repository.SCHEMA_VERSION}), sin cambios")
+        else:
+            # Tablas generadas desde el esquema declarativo (db/schema.py)
+            added = repository.init_schema(conn)
+            for table, columns in added.items():
+                if columns:
+                    logger.info(f"Columnas agregadas a '{table}': {', '.join(columns)}")
+                logger.info(f"Tabla '{table}' creada/verificada exitosamente")
+
         conn.close()
         logger.info("Base de datos inicializada correctamente")
         
@@ -133,7 +134,7 @@ class FiveWhysDialog(QtWidgets.QDialog):
 
 # --- Ishikawa Dialog ---
 class IshikawaDialog(QtWidgets.QDialog):
-    M_OPTIONS = ['Máquina','Método','Material','Mano de obra','Medio ambiente','Medición']
+    M_OPTIONS = list(ISHIKAWA_CATEGORIAS)
     def __init__(self,parent=None):
         super().__init__(parent)
         self.setWindowTitle("Diagrama de Ishikawa")
@@ -181,9 +182,52 @@ class IshikawaDialog(QtWidgets.QDialog):
             parts.append(f"{m}:|"+"||".join(ans))
         return ";;".join(parts)
 
+# --- Autocompletado ---
+def attach_completer(line_edit, source, field):
+    """QCompleter cuyas opciones salen del índice de prefijos al tipear (no filtra la lista de Qt).
+    Se crea con la primera tecla: el primer acceso a QtCore.Qt arma todos sus enums (~30 ms)
+    y no hace falta pagarlo antes de mostrar la ventana"""
+    models = []
+    def on_edited(text):
+        if not models:
+            model = QtCore.QStringListModel(line_edit)
+            completer = QtWidgets.QCompleter(model, line_edit)
+            completer.setCaseSensitivity(QtCore.Qt.CaseSensitivity.CaseInsensitive)
+            completer.setCompletionMode(QtWidgets.QCompleter.CompletionMode.UnfilteredPopupCompletion)
+            line_edit.setCompleter(completer)
+            models.append(model)
+        # textEdited llega antes de que QLineEdit consulte al completer, así el modelo ya está al día
+        models[0].setStringList(source.complete(field, text))
+    line_edit.textEdited.connect(on_edited)
+
 # --- Acción Dialog ---
+ACTION_STATES = ['Abierta','En curso','Cerrada']
+# Columnas de la tabla de acciones de la carga rápida (clave de actions_temp, encabezado)
+INLINE_ACTION_COLUMNS = [('tarea','Tarea'),('tiempo','Tiempo estimado'),('responsable','Responsable'),
+                         ('fecha_realizacion','Fecha (AAAA-MM-DD o DD/MM/AAAA)'),('estado','Estado (A/E/C)')]
+# Campos que conserva "Guardar y nueva" (Ctrl+Enter) en la carga rápida
+CLONE_FIELDS = ('Cliente','Cod. Producto','Desc. Producto')
+
+def inline_action(values, row):
+    """Acción de una fila de la tabla de carga rápida: fecha vacía = hoy, estado por su inicial.
+    ValueError con la fila si la fecha o el estado no se reconocen"""
+    fecha = values['fecha_realizacion'] or datetime.now().strftime('%Y-%m-%d')
+    for fmt in ('%Y-%m-%d','%d/%m/%Y'):
+        try:
+            fecha = datetime.strptime(fecha, fmt).strftime('%Y-%m-%d')
+            break
+        except ValueError:
+            pass
+    else:
+        raise ValueError(f"Fila {row}: fecha '{fecha}' inválida (AAAA-MM-DD o DD/MM/AAAA)")
+    estado = values['estado']
+    matches = [e for e in ACTION_STATES if e.lower().startswith(estado.lower())] if estado else ACTION_STATES[:1]
+    if len(matches) != 1:
+        raise ValueError(f"Fila {row}: estado '{estado}' inválido ({', '.join(ACTION_STATES)})")
+    return dict(values, fecha_realizacion=fecha, estado=matches[0])
+
 class ActionDialog(QtWidgets.QDialog):
-    def __init__(self,parent=None):
+    def __init__(self,parent=None,completions=None):
         super().__init__(parent)
         self.setWindowTitle("Agregar Acción Correctiva")
         self.resize(500,300)
@@ -195,9 +239,11 @@ class ActionDialog(QtWidgets.QDialog):
         self.fecha_realizacion.setCalendarPopup(True)
         self.fecha_realizacion.setDate(QtCore.QDate.currentDate())
         self.estado = QtWidgets.QComboBox()
-        self.estado.addItems(['Abierta','En curso','Cerrada'])
+        self.estado.addItems(ACTION_STATES)
         layout.addRow("Tarea",self.tarea)
         layout.addRow("Tiempo estimado",self.tiempo)
+        if completions is not None:
+            attach_completer(self.responsable, completions, 'responsable')
         layout.addRow("Responsable",self.responsable)
         layout.addRow("Fecha realización",self.fecha_realizacion)
         layout.addRow("Estado",self.estado)
@@ -216,6 +262,301 @@ class ActionDialog(QtWidgets.QDialog):
             'estado': self.estado.currentText()
         }
 
+# --- KPI Dialog ---
+class KPIDialog(QtWidgets.QDialog):
+    """Tablero de indicadores leído de kpi_mensual (precalculado, no recorre la tabla nc)"""
+    GROUPINGS = [('Mes',('mes',)),('Cliente',('cliente',)),('Producto',('cod_producto',)),
+                 ('Mes y cliente',('mes','cliente')),('Cliente y producto',('cliente','cod_producto'))]
+    def __init__(self,conn,parent=None):
+        super().__init__(parent)
+        self.conn = conn
+        self.setWindowTitle("Indicadores de calidad")
+        self.resize(800,500)
+        layout = QtWidgets.QVBoxLayout(self)
+        filtros = QtWidgets.QHBoxLayout()
+        self.grouping = QtWidgets.QComboBox()
+        for label,dims in self.GROUPINGS:
+            self.grouping.addItem(label,dims)
+        self.desde = QtWidgets.QLineEdit()
+        self.desde.setPlaceholderText("Desde AAAA-MM")
+        self.hasta = QtWidgets.QLineEdit()
+        self.hasta.setPlaceholderText("Hasta AAAA-MM")
+        btn = QtWidgets.QPushButton("Actualizar")
+        btn.clicked.connect(self.refresh)
+        self.grouping.currentIndexChanged.connect(self.refresh)
+        for w in (QtWidgets.QLabel("Agrupar por"),self.grouping,self.desde,self.hasta,btn):
+            filtros.addWidget(w)
+        layout.addLayout(filtros)
+        self.totals = QtWidgets.QLabel()
+        layout.addWidget(self.totals)
+        self.table = QtWidgets.QTableWidget()
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+        self.refresh()
+
+    def refresh(self):
+        from db.kpi import KPI_LABELS, KPI_VALUES, kpi_summary, kpi_totals
+        dims = self.grouping.currentData()
+        desde, hasta = self.desde.text().strip() or None, self.hasta.text().strip() or None
+        rows = kpi_summary(self.conn,dims,desde,hasta)
+        totals = kpi_totals(self.conn,desde,hasta)
+        self.totals.setText("   ".join(f"{KPI_LABELS[k]}: {totals[k]:,.2f}" if k != 'cantidad'
+                                       else f"{KPI_LABELS[k]}: {totals[k]}" for k in KPI_VALUES))
+        columns = list(dims) + list(KPI_VALUES)
+        self.table.setColumnCount(len(columns))
+        self.table.setHorizontalHeaderLabels([KPI_LABELS[c] for c in columns])
+        self.table.setRowCount(len(rows))
+        for i,row in enumerate(rows):
+            for j,c in enumerate(columns):
+                value = row[c]
+                text = f"{value:,.2f}" if isinstance(value,float) else str(value)
+                item = QtWidgets.QTableWidgetItem(text)
+                if c in KPI_VALUES:
+                    item.setTextAlignment(QtCore.Qt.AlignmentFlag.AlignRight | QtCore.Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(i,j,item)
+        self.table.resizeColumnsToContents()
+        logger.debug(f"Indicadores: {len(rows)} grupos por {', '.join(dims)}")
+
+# --- Pareto ---
+class ParetoChart(QtWidgets.QWidget):
+    """Gráfico de Pareto: barras de la métrica y línea del % acumulado (eje derecho)"""
+    MAX_BARS = 15
+    def __init__(self,parent=None):
+        super().__init__(parent)
+        self.result = None
+        self.setMinimumHeight(260)
+
+    def set_result(self,result):
+        self.result = result
+        self.update()
+
+    def paintEvent(self,event):
+        painter = QtGui.QPainter(self)
+        painter.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        painter.fillRect(self.rect(),QtGui.QColor('white'))
+        items = self.result.items[:self.MAX_BARS] if self.result else ()
+        if not items:
+            painter.drawText(self.rect(),QtCore.Qt.AlignmentFlag.AlignCenter,"Sin datos para el rango seleccionado")
+            return
+        metric = self.result.metric
+        left,right,top,bottom = 60,45,15,95
+        w = self.width()-left-right
+        h = self.height()-top-bottom
+        peak = max(getattr(i,metric) for i in items) or 1
+        slot = w/len(items)
+        painter.setPen(QtGui.QColor('gray'))
+        painter.drawLine(left,top+h,left+w,top+h)
+        painter.drawText(5,top+10,f"{peak:,.0f}")
+        painter.drawText(left+w+5,top+10,"100%")
+        points = []
+        for n,item in enumerate(items):
+            bar_h = h*getattr(item,metric)/peak
+            x = left+n*slot
+            painter.fillRect(QtCore.QRectF(x+slot*0.15,top+h-bar_h,slot*0.7,bar_h),QtGui.QColor(70,130,180))
+            points.append(QtCore.QPointF(x+slot/2,top+h-h*item.acumulado/100))
+            painter.save()
+            painter.translate(x+slot/2,top+h+5)
+            painter.rotate(45)
+            painter.setPen(QtGui.QColor('black'))
+            painter.drawText(0,10,str(item.valor)[:16])
+            painter.restore()
+        painter.setPen(QtGui.QPen(QtGui.QColor(200,60,40),2))
+        painter.drawPolyline(QtGui.QPolygonF(points))
+        for p in points:
+            painter.drawEllipse(p,3,3)
+
+class ParetoDialog(QtWidgets.QDialog):
+    """Pareto por dimensión y métrica sobre un rango de meses, con gráfico, tabla y exportación"""
+    def __init__(self,engine,export_format=None,parent=None):
+        from db.pareto import DIMENSIONS, METRICS
+        super().__init__(parent)
+        self.engine = engine
+        self.dimensions = DIMENSIONS
+        self.export_format = export_format
+        self.result = None
+        self.setWindowTitle("Análisis de Pareto")
+        self.resize(900,650)
+        layout = QtWidgets.QVBoxLayout(self)
+        filtros = QtWidgets.QHBoxLayout()
+        self.dimension = QtWidgets.QComboBox()
+        for key,label in DIMENSIONS.items():
+            self.dimension.addItem(label,key)
+        self.metric = QtWidgets.QComboBox()
+        for key,label in METRICS.items():
+            self.metric.addItem(label,key)
+        self.desde = QtWidgets.QLineEdit()
+        self.desde.setPlaceholderText("Desde AAAA-MM")
+        self.hasta = QtWidgets.QLineEdit()
+        self.hasta.setPlaceholderText("Hasta AAAA-MM")
+        btn = QtWidgets.QPushButton("Actualizar")
+        btn.clicked.connect(self.refresh)
+        export_btn = QtWidgets.QPushButton("Exportar")
+        export_btn.clicked.connect(self.export)
+        self.dimension.currentIndexChanged.connect(self.refresh)
+        self.metric.currentIndexChanged.connect(self.refresh)
+        for w in (self.dimension,self.metric,self.desde,self.hasta,btn,export_btn):
+            filtros.addWidget(w)
+        layout.addLayout(filtros)
+        self.chart = ParetoChart()
+        layout.addWidget(self.chart)
+        self.summary = QtWidgets.QLabel()
+        layout.addWidget(self.summary)
+        self.table = QtWidgets.QTableWidget()
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table)
+        self.refresh()
+
+    def refresh(self):
+        import time
+        start = time.perf_counter()
+        self.result = self.engine.get(self.dimension.currentData(),self.metric.currentData(),
+                                      self.desde.text().strip() or None,self.hasta.text().strip() or None)
+        items = self.result.items
+        self.chart.set_result(self.result)
+        pocos = self.result.vital_few()
+        self.summary.setText(f"{len(items)} elementos; {len(pocos)} concentran el "
+                             f"{pocos[-1].acumulado if pocos else 0:.1f}% del total ({self.result.total:,.2f})")
+        headers = [self.dimensions[self.result.dimension],'NC','Costo','%','% acumulado']
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels(headers)
+        self.table.setRowCount(len(items))
+        for i,item in enumerate(items):
+            for j,text in enumerate((str(item.valor),str(item.cantidad),f"{item.costo:,.2f}",
+                                     f"{item.porcentaje:.1f}",f"{item.acumulado:.1f}")):
+                self.table.setItem(i,j,QtWidgets.QTableWidgetItem(text))
+        self.table.resizeColumnsToContents()
+        logger.debug(f"Pareto {self.result.dimension}/{self.result.metric}: {len(items)} elementos "
+                     f"en {(time.perf_counter()-start)*1000:.1f} ms")
+
+    def export(self):
+        from export.formats import export_pareto
+        try:
+            path,_ = export_pareto(self.result,fmt=self.export_format)
+            QtWidgets.QMessageBox.information(self,"Exportar",f"Pareto exportado a {path.name}")
+        except Exception as e:
+            logger.error(f"Error al exportar Pareto: {e}")
+            QtWidgets.QMessageBox.warning(self,"Error",f"No se pudo exportar: {e}")
+
+# --- Acciones vencidas ---
+class OverdueDialog(QtWidgets.QDialog):
+    """Acciones abiertas con fecha de realización pasada, con la cantidad por responsable.
+    Las consultas recorren sólo el índice parcial de acciones abiertas"""
+    def __init__(self,conn,parent=None):
+        super().__init__(parent)
+        self.conn = conn
+        self.setWindowTitle("Acciones vencidas")
+        self.resize(900,550)
+        layout = QtWidgets.QVBoxLayout(self)
+        self.summary = QtWidgets.QLabel()
+        layout.addWidget(self.summary)
+        self.by_responsable = QtWidgets.QTableWidget()
+        self.by_responsable.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.by_responsable.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.by_responsable.itemSelectionChanged.connect(self.refresh_actions)
+        layout.addWidget(self.by_responsable,1)
+        self.table = QtWidgets.QTableWidget()
+        self.table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        layout.addWidget(self.table,2)
+        self.refresh()
+
+    def refresh(self):
+        rows = overdue_by_responsable(self.conn)
+        self.responsables = [row['responsable'] for row in rows]
+        total = sum(row['cantidad'] for row in rows)
+        self.summary.setText(f"{total} acciones vencidas de {len(rows)} responsables "
+                             f"(seleccione un responsable para ver sólo las suyas)")
+        self.by_responsable.setColumnCount(3)
+        self.by_responsable.setHorizontalHeaderLabels(['Responsable','Vencidas','Más atrasada'])
+        self.by_responsable.setRowCount(len(rows))
+        for i,row in enumerate(rows):
+            for j,text in enumerate((row['responsable'] or '(sin responsable)',str(row['cantidad']),row['mas_antigua'])):
+                self.by_responsable.setItem(i,j,QtWidgets.QTableWidgetItem(text))
+        self.by_responsable.resizeColumnsToContents()
+        self.refresh_actions()
+
+    def refresh_actions(self):
+        selected = self.by_responsable.selectionModel().selectedRows()
+        if selected:
+            rows = overdue_actions(self.conn,responsable=self.responsables[selected[0].row()])
+        else:
+            rows = overdue_actions(self.conn)
+        headers = [('nro_nc','NC'),('tarea','Tarea'),('responsable','Responsable'),
+                   ('fecha_realizacion','Fecha realización'),('dias_vencida','Días vencida'),('estado','Estado')]
+        self.table.setColumnCount(len(headers))
+        self.table.setHorizontalHeaderLabels([label for _,label in headers])
+        self.table.setRowCount(len(rows))
+        for i,row in enumerate(rows):
+            for j,(c,_) in enumerate(headers):
+                self.table.setItem(i,j,QtWidgets.QTableWidgetItem('' if row[c] is None else str(row[c])))
+        self.table.resizeColumnsToContents()
+        logger.debug(f"Acciones vencidas: {len(rows)} filas")
+
+# --- Formato de exportación ---
+class ExportFormatCombo(QtWidgets.QComboBox):
+    """Formatos de exportación instalados. La lista (export.formats y la búsqueda de openpyxl / pyarrow)
+    se arma la primera vez que el combo se despliega, toma el foco o se consulta, no al abrir la ventana"""
+    def __init__(self,parent=None):
+        super().__init__(parent)
+        self.loaded = False
+        self.setPlaceholderText("Formato de exportación")
+        self.setSizeAdjustPolicy(QtWidgets.QComboBox.SizeAdjustPolicy.AdjustToContents)
+
+    def ensure_loaded(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        from export.formats import FORMATS, available_formats
+        for fmt in available_formats():
+            desc, ext = FORMATS[fmt][:2]
+            self.addItem(f"{desc} ({ext})", fmt)
+
+    def showPopup(self):
+        self.ensure_loaded()
+        super().showPopup()
+
+    def focusInEvent(self,event):
+        self.ensure_loaded()
+        super().focusInEvent(event)
+
+    def currentData(self,role=QtCore.Qt.ItemDataRole.UserRole):
+        self.ensure_loaded()
+        return super().currentData(role)
+
+    def findData(self,data,*args):
+        self.ensure_loaded()
+        return super().findData(data,*args)
+
+# --- Avisos no modales ---
+class Toast(QtWidgets.QLabel):
+    """Aviso en la esquina inferior derecha de la ventana que se oculta solo.
+    No toma el foco ni los clics, así la carga de datos sigue sin un clic de más"""
+    DURATION_MS = 3000
+    MARGIN = 16
+
+    def __init__(self,parent):
+        super().__init__(parent)
+        self.setWordWrap(True)
+        self.setAttribute(QtCore.Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setStyleSheet("background-color: rgba(33,37,41,230); color: white; padding: 8px 14px; border-radius: 6px;")
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.hide)
+        self.hide()
+
+    def show_message(self,text,duration_ms=None):
+        parent = self.parentWidget()
+        self.setText(text)
+        self.setMaximumWidth(max(240,parent.width()//2))
+        self.adjustSize()
+        bottom = parent.height()-self.MARGIN
+        status = parent.statusBar() if isinstance(parent,QtWidgets.QMainWindow) else None
+        if status is not None and status.isVisible():
+            bottom -= status.height()
+        self.move(parent.width()-self.width()-self.MARGIN, bottom-self.height())
+        self.raise_()
+        self.show()
+        self.timer.start(duration_ms or self.DURATION_MS)
+
 # --- Main Window ---
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -223,7 +564,17 @@ class MainWindow(QtWidgets.QMainWindow):
         logger.info("Iniciando aplicación principal...")
         
         try:
-            self.conn = sqlite3.connect(DB_FILE)
+            self.conn = repository.connect(DB_FILE)
+            self.nc_repo = NCRepository(self.conn)
+            self.accion_repo = AccionRepository(self.conn)
+            self.nc_cache = NCRecordCache(self.nc_repo, self.accion_repo)
+            # Pareto y detección de duplicados: se crean con el primer uso (ver pareto / duplicates)
+            self._pareto = None
+            self._duplicates = None
+            # Autocompletado de Cliente / Cod. Producto / Responsable (índices perezosos)
+            self.completions = CompletionSource(self.conn)
+            # Catálogo de productos en memoria: el código completa la descripción
+            self.catalog = ProductCatalog(self.conn)
             logger.info("Conexión a base de datos establecida")
         except Exception as e:
             logger.error(f"Error al conectar con la base de datos: {e}")
@@ -233,36 +584,62 @@ class MainWindow(QtWidgets.QMainWindow):
         self.actions_temp=[]
         self.ishikawa_result=''
         self.fields={}
-        self.enable_chain_order=['Nro NC','Resultado Matriz','OP','Cant. Invol.','Cod. Producto',
-                                 'Desc. Producto','Cliente','Cant. Scrap','Costo','Cant. Recuperada','Falla']
+        self.enable_chain_order=[f.label for f in NC_FORM_FIELDS]
+        self.toast=None  # se crea con el primer aviso
+        self.rapid_mode=False
+        self.actions_table=None  # tabla de acciones de la carga rápida, se crea al activarla
         self.init_ui()
         logger.info("Interfaz de usuario inicializada")
 
+    @property
+    def pareto(self):
+        """Motor de Pareto (db.pareto y NumPy se cargan al abrir el análisis, no al iniciar)"""
+        if self._pareto is None:
+            from db.pareto import ParetoEngine
+            self._pareto = ParetoEngine(self.conn)
+        return self._pareto
+
+    @property
+    def duplicates(self):
+        """Detección de duplicados: el índice de fallas se construye en segundo plano con la primera consulta"""
+        if self._duplicates is None:
+            from db.similarity import DuplicateFinder
+            self._duplicates = DuplicateFinder(self.conn, lambda: repository.connect(DB_FILE))
+        return self._duplicates
+
     def init_ui(self):
         self.setWindowTitle("NC y Acciones Correctivas")
         central = QtWidgets.QWidget()
         self.setCentralWidget(central)
         main_layout = QtWidgets.QVBoxLayout(central)
         form_frame = QtWidgets.QGroupBox("Ingreso de datos")
-        form_layout = QtWidgets.QFormLayout()
+        form_layout = self.form_layout = QtWidgets.QFormLayout()
         form_frame.setLayout(form_layout)
         main_layout.addWidget(form_frame)
 
-        # Campos
-        campo_defs=[('Nro NC',lambda v:v.isdigit()),
-                    ('Resultado Matriz',_is_float),
-                    ('OP',lambda v:v.isdigit()),
-                    ('Cant. Invol.',_is_float),
-                    ('Cod. Producto',lambda v:len(v.strip())>0),
-                    ('Desc. Producto',lambda v:len(v.strip())>0),
-                    ('Cliente',lambda v:len(v.strip())>0),
-                    ('Cant. Scrap',_is_float),
-                    ('Costo',_is_float),
-                    ('Cant. Recuperada',_is_float),
-                    ('Falla',lambda v:len(v.strip())>0)]
-        for name,val in campo_defs:
+        # Campos (generados desde el esquema declarativo)
+        for f in NC_FORM_FIELDS:
             le = QtWidgets.QLineEdit()
-            self.add_field(name,le,val,form_layout)
+            self.add_field(f.label,le,f.validator,form_layout)
+        for name, field in (('Cliente','cliente'),('Cod. Producto','cod_producto')):
+            attach_completer(self.fields[name][0], self.completions, field)
+        self.autofilled_desc = None
+        self.fields['Cod. Producto'][0].textChanged.connect(self.fill_product_description)
+
+        # Posibles duplicados (se actualiza con una pausa corta al escribir Falla / Cod. Producto)
+        self.duplicates_list = QtWidgets.QListWidget()
+        self.duplicates_list.setMaximumHeight(90)
+        self.duplicates_list.setToolTip("Doble clic para abrir la NC existente")
+        self.duplicates_list.itemDoubleClicked.connect(
+            lambda item: self.edit_record_by_number(item.data(QtCore.Qt.ItemDataRole.UserRole)))
+        self.duplicates_list.hide()
+        form_layout.addRow(self.duplicates_list)
+        self.duplicates_timer = QtCore.QTimer(self)
+        self.duplicates_timer.setSingleShot(True)
+        self.duplicates_timer.setInterval(250)
+        self.duplicates_timer.timeout.connect(self.update_duplicates)
+        for name in ('Falla','Cod. Producto'):
+            self.fields[name][0].textChanged.connect(self.duplicates_timer.start)
 
         # Botones
         self.ishikawa_btn = QtWidgets.QPushButton("Abrir Ishikawa")
@@ -273,22 +650,309 @@ class MainWindow(QtWidgets.QMainWindow):
         self.attach_btn.clicked.connect(self.attach_files)
         self.save_btn = QtWidgets.QPushButton("Guardar registro")
         self.save_btn.clicked.connect(self.save_record)
-        self.export_btn = QtWidgets.QPushButton("Exportar a Excel")
-        self.export_btn.clicked.connect(self.export_to_excel)
+        self.export_format = ExportFormatCombo()
+        self.export_btn = QtWidgets.QPushButton("Exportar")
+        self.export_btn.clicked.connect(self.export_data)
+        self.export_delta_btn = QtWidgets.QPushButton("Exportar cambios (incremental)")
+        self.export_delta_btn.clicked.connect(lambda: self.export_changes(full=False))
+        self.export_full_btn = QtWidgets.QPushButton("Reexportar todo (resincronizar)")
+        self.export_full_btn.clicked.connect(lambda: self.export_changes(full=True))
+        self.export_audit_btn = QtWidgets.QPushButton("Exportar auditoría (NC, acciones, adjuntos, Ishikawa)")
+        self.export_audit_btn.clicked.connect(self.export_audit_data)
         self.edit_btn = QtWidgets.QPushButton("Editar Registro Existente")
         self.edit_btn.clicked.connect(self.edit_record)
+        self.kpi_btn = QtWidgets.QPushButton("Indicadores (KPI)")
+        self.kpi_btn.clicked.connect(self.open_kpis)
+        self.pareto_btn = QtWidgets.QPushButton("Análisis de Pareto")
+        self.pareto_btn.clicked.connect(self.open_pareto)
+        self.overdue_btn = QtWidgets.QPushButton("Acciones vencidas")
+        self.overdue_btn.clicked.connect(self.open_overdue)
+        self.update_overdue_count()
 
         for btn,label in [(self.ishikawa_btn,'Análisis causa'),(self.action_btn,'Acción Correctiva'),
                           (self.attach_btn,'Adjuntos')]:
             form_layout.addRow(label,btn)
         form_layout.addRow(self.save_btn)
-        form_layout.addRow(self.export_btn)
+        form_layout.addRow(self.export_format, self.export_btn)
+        form_layout.addRow(self.export_delta_btn, self.export_full_btn)
+        form_layout.addRow(self.export_audit_btn)
         form_layout.addRow(self.edit_btn)
+        form_layout.addRow(self.kpi_btn, self.pareto_btn)
+        form_layout.addRow(self.overdue_btn)
 
         self.enable_widgets_by_order()
         for name in self.fields:
             w,_ = self.fields[name]
             w.textChanged.connect(lambda _, n=name:self.validate_and_progress(n))
+        for w,_ in self.fields.values():
+            w.returnPressed.connect(self.on_field_return)
+        # El último aviso queda en la barra de estado después de que el toast se oculta
+        self.statusBar()
+        self.init_rapid_entry()
+        self.init_diagnostics()
+
+    def notify(self, titulo, texto):
+        """Aviso de éxito no modal: toast por unos segundos y el texto en la barra de estado.
+        Los errores y las confirmaciones siguen con QMessageBox"""
+        logger.debug("Aviso '%s': %s", titulo, texto)
+        if self.toast is None:
+            self.toast = Toast(self)
+        self.toast.show_message(texto)
+        self.statusBar().showMessage(f"{titulo}: {texto}")
+
+    def init_rapid_entry(self):
+        """Menú Carga: modo de carga rápida. La tabla de acciones y los atajos se crean al activarlo"""
+        menu = self.menuBar().addMenu("Carga")
+        self.rapid_act = menu.addAction("Modo de carga rápida")
+        self.rapid_act.setCheckable(True)
+        self.rapid_act.setShortcut(QtGui.QKeySequence("Ctrl+R"))
+        self.rapid_act.toggled.connect(self.set_rapid_mode)
+        self.rapid_shortcuts = []
+
+    def init_inline_actions(self):
+        """Tabla de acciones editable en el formulario (reemplaza a ActionDialog en la carga rápida)"""
+        table = self.actions_table = QtWidgets.QTableWidget(0, len(INLINE_ACTION_COLUMNS))
+        table.setHorizontalHeaderLabels([header for _, header in INLINE_ACTION_COLUMNS])
+        table.horizontalHeader().setStretchLastSection(True)
+        table.setMaximumHeight(150)
+        table.setToolTip("Una acción por fila; las filas sin tarea se ignoran. Fecha vacía = hoy, estado vacío = Abierta")
+        table.itemChanged.connect(self.ensure_blank_action_row)
+        # Enter sobre una celda que no se está editando guarda, como Enter en el último campo
+        table.activated.connect(lambda _: self.rapid_save(clone=False))
+        row, _ = self.form_layout.getWidgetPosition(self.save_btn)
+        self.form_layout.insertRow(row, 'Acciones', table)
+        self.setTabOrder(self.fields[self.enable_chain_order[-1]][0], table)
+        for keys in ("Ctrl+Return", "Ctrl+Enter"):
+            shortcut = QtGui.QShortcut(QtGui.QKeySequence(keys), self)
+            shortcut.activated.connect(lambda: self.rapid_save(clone=True))
+            self.rapid_shortcuts.append(shortcut)
+
+    def set_rapid_mode(self, enabled):
+        """Carga rápida: campos en orden libre, Enter avanza/guarda, Ctrl+Enter guarda y abre otra NC
+        con el mismo cliente y producto, acciones en la tabla del formulario"""
+        if enabled == self.rapid_mode:
+            return
+        if enabled:
+            if self.actions_table is None:
+                self.init_inline_actions()
+            self.rapid_mode = True
+            self.set_inline_actions(self.actions_temp)
+            self.form_layout.setRowVisible(self.actions_table, True)
+            self.enable_widgets_by_order()
+            if not self.fields['Nro NC'][0].text():
+                self.fields['Nro NC'][0].setText(str(self.nc_repo.next_nro()))
+            self.focus_next_empty()
+        else:
+            try:
+                self.actions_temp = self.inline_actions()
+            except ValueError as e:
+                QtWidgets.QMessageBox.warning(self, 'Acciones', f'⚠️ {e}')
+                self.rapid_act.setChecked(True)
+                return
+            self.rapid_mode = False
+            self.form_layout.setRowVisible(self.actions_table, False)
+            # Volver a la cadena secuencial: habilitada hasta el primer campo que no valida
+            for w,_ in self.fields.values():
+                w.setEnabled(False)
+            self.enable_widgets_by_order()
+            for name in self.enable_chain_order:
+                if not self.fields[name][0].isEnabled():
+                    break
+                self.validate_and_progress(name)
+        for shortcut in self.rapid_shortcuts:
+            shortcut.setEnabled(self.rapid_mode)
+        logger.info(f"Modo de carga rápida {'activado' if self.rapid_mode else 'desactivado'}")
+
+    def focus_next_empty(self, after=None):
+        """Foco en el primer campo vacío (después de `after` si se indica); False si no queda ninguno"""
+        names = self.enable_chain_order
+        if after is not None:
+            names = names[names.index(after)+1:]
+        for name in names:
+            w, _ = self.fields[name]
+            if not w.text():
+                w.setFocus()
+                return True
+        return False
+
+    def on_field_return(self):
+        """Enter en un campo (carga rápida): pasa al siguiente campo vacío y en el último guarda"""
+        if not self.rapid_mode:
+            return
+        name = next(n for n,(w,_) in self.fields.items() if w is self.sender())
+        if not self.focus_next_empty(after=name):
+            self.rapid_save(clone=False)
+
+    def rapid_save(self, clone):
+        """Guardar la NC de la carga rápida y preparar la siguiente (con clone, mismo cliente y producto)"""
+        kept = {name: self.fields[name][0].text() for name in CLONE_FIELDS} if clone else {}
+        if self.save_record():
+            self.start_next_nc(kept)
+
+    def start_next_nc(self, kept):
+        """Formulario vacío con el próximo número de NC y los campos conservados"""
+        self.fields['Nro NC'][0].setText(str(self.nc_repo.next_nro()))
+        for name, text in kept.items():
+            self.fields[name][0].setText(text)  # Cod. Producto antes que Desc.: el catálogo no pisa la descripción
+        self.focus_next_empty()
+
+    def set_inline_actions(self, actions):
+        table = self.actions_table
+        table.blockSignals(True)
+        table.setRowCount(0)
+        for action in actions:
+            self.append_action_row(action)
+        self.append_action_row({})
+        table.setCurrentCell(table.rowCount()-1, 0)
+        table.blockSignals(False)
+
+    def append_action_row(self, action):
+        table = self.actions_table
+        row = table.rowCount()
+        table.insertRow(row)
+        for col, (key, _) in enumerate(INLINE_ACTION_COLUMNS):
+            table.setItem(row, col, QtWidgets.QTableWidgetItem(action.get(key) or ''))
+
+    def ensure_blank_action_row(self, item):
+        """Siempre queda una fila vacía al final para seguir escribiendo acciones"""
+        table = self.actions_table
+        if item.row() == table.rowCount()-1 and item.text():
+            table.blockSignals(True)
+            self.append_action_row({})
+            table.blockSignals(False)
+
+    def focus_inline_actions(self):
+        self.actions_table.setCurrentCell(self.actions_table.rowCount()-1, 0)
+        self.actions_table.setFocus()
+
+    def inline_actions(self):
+        """Acciones de la tabla (filas con tarea). ValueError si una fecha o un estado no se reconocen"""
+        table = self.actions_table
+        editor = table.indexWidget(table.currentIndex())
+        if editor is not None and table.state() == QtWidgets.QAbstractItemView.State.EditingState:
+            table.commitData(editor)  # la celda que se está escribiendo al presionar Ctrl+Enter
+        actions = []
+        for row in range(table.rowCount()):
+            values = {key: table.item(row, col).text().strip() if table.item(row, col) else ''
+                      for col, (key, _) in enumerate(INLINE_ACTION_COLUMNS)}
+            if values['tarea']:
+                actions.append(inline_action(values, row+1))
+        return actions
+
+    def init_diagnostics(self):
+        """Menú Diagnóstico: perfil de la sesión en curso y vigilante de bloqueos de la interfaz.
+        El perfilador y el vigilante se crean (y sus módulos se importan) al usarlos desde el menú;
+        el vigilante y la medición de latencia arrancan activos sólo con el perfil de logging debug"""
+        self.profiler = None
+        self.watchdog = None
+        self.watchdog_timer = QtCore.QTimer(self)
+
+        menu = self.menuBar().addMenu("Diagnóstico")
+        self.profile_cprofile_act = menu.addAction("Iniciar perfil (cProfile)", lambda: self.start_profile('cprofile'))
+        self.profile_sampling_act = menu.addAction("Iniciar perfil por muestreo", lambda: self.start_profile('sampling'))
+        self.profile_stop_act = menu.addAction("Detener y guardar perfil", self.stop_profile)
+        menu.addSeparator()
+        self.watchdog_act = menu.addAction("Vigilar bloqueos de la interfaz")
+        self.watchdog_act.setCheckable(True)
+        self.watchdog_act.toggled.connect(self.set_watchdog)
+        menu.addAction("Umbral de bloqueo...", self.set_watchdog_threshold)
+        menu.addSeparator()
+        # Timer de alta frecuencia: su demora es el tiempo en que la interfaz no atendió eventos
+        self.lag_timer = QtCore.QTimer(self)
+        self.lag_timer.setInterval(LAG_MONITOR.interval_ms)
+        self.lag_timer.timeout.connect(LAG_MONITOR.tick)
+        self.lag_act = menu.addAction("Medir latencia del event loop")
+        self.lag_act.setCheckable(True)
+        self.lag_act.toggled.connect(self.set_lag_monitor)
+        menu.addAction("Resumen de latencia...", self.show_lag_summary)
+        self.update_profile_actions()
+        if DIAGNOSTICS_AT_STARTUP:
+            self.watchdog_act.setChecked(True)
+            self.lag_act.setChecked(True)
+
+    def update_profile_actions(self):
+        running = self.profiler is not None and self.profiler.running
+        self.profile_cprofile_act.setEnabled(not running)
+        self.profile_sampling_act.setEnabled(not running)
+        self.profile_stop_act.setEnabled(running)
+        self.profile_stop_act.setText(f"Detener y guardar perfil ({self.profiler.mode} en curso)" if running
+                                      else "Detener y guardar perfil")
+
+    def start_profile(self, mode):
+        if self.profiler is None:
+            from diagnostics.profiling import RuntimeProfiler
+            self.profiler = RuntimeProfiler(LOG_DIR)
+        try:
+            self.profiler.start(mode)
+        except RuntimeError as e:
+            logger.warning(f"No se pudo iniciar el perfil {mode}: {e}")
+            QtWidgets.QMessageBox.warning(self, "Perfil", f"No se pudo iniciar el perfil:\n{e}")
+            return
+        logger.info(f"Perfil '{mode}' iniciado desde el menú Diagnóstico")
+        self.update_profile_actions()
+
+    def stop_profile(self):
+        try:
+            path = self.profiler.stop()
+        except Exception as e:
+            logger.error(f"Error al guardar el perfil: {e}")
+            QtWidgets.QMessageBox.warning(self, "Perfil", f"No se pudo guardar el perfil: {e}")
+            path = None
+        self.update_profile_actions()
+        if path:
+            logger.info(f"Perfil guardado en {path}")
+            QtWidgets.QMessageBox.information(self, "Perfil", f"Perfil guardado en:\n{path}")
+
+    def gui_watchdog(self):
+        """Vigilante de bloqueos, creado con el primer uso"""
+        if self.watchdog is None:
+            from diagnostics.watchdog import GuiWatchdog
+            self.watchdog = GuiWatchdog()
+            self.watchdog_timer.timeout.connect(self.watchdog.beat)
+        return self.watchdog
+
+    def set_watchdog(self, enabled):
+        if enabled:
+            self.gui_watchdog().start()
+            self.watchdog_timer.start(self.watchdog.beat_interval_ms)
+        elif self.watchdog is not None:
+            self.watchdog_timer.stop()
+            self.watchdog.stop()
+
+    def set_watchdog_threshold(self):
+        value, ok = QtWidgets.QInputDialog.getInt(
+            self, "Vigilante de la interfaz", "Registrar la pila si la interfaz se bloquea más de (ms):",
+            self.gui_watchdog().threshold_ms, 50, 60000, 50)
+        if ok:
+            self.watchdog.threshold_ms = value
+            self.watchdog_timer.setInterval(self.watchdog.beat_interval_ms)
+            logger.info(f"Umbral del vigilante de la interfaz: {value} ms")
+
+    def set_lag_monitor(self, enabled):
+        LAG_MONITOR.enabled = enabled
+        if enabled:
+            LAG_MONITOR.restart()
+            self.lag_timer.start()
+        else:
+            self.lag_timer.stop()
+
+    def show_lag_summary(self):
+        import html
+        summary = LAG_MONITOR.summary()
+        logger.info(summary)
+        QtWidgets.QMessageBox.information(self, "Latencia del event loop", f"<pre>{html.escape(summary)}</pre>")
+
+    def closeEvent(self, event):
+        # Un perfil en curso se guarda al cerrar para no perder la sesión medida
+        if self.profiler is not None and self.profiler.running:
+            logger.info(f"Perfil guardado al cerrar en {self.profiler.stop()}")
+        self.watchdog_timer.stop()
+        if self.watchdog is not None:
+            self.watchdog.stop()
+        if self.lag_timer.isActive():
+            self.lag_timer.stop()
+            LAG_MONITOR.log_summary()
+        super().closeEvent(event)
 
     def add_field(self,name,widget,validator,layout):
         widget.setEnabled(False)
@@ -296,6 +960,13 @@ class MainWindow(QtWidgets.QMainWindow):
         self.fields[name]=(widget,validator)
 
     def enable_widgets_by_order(self):
+        if self.rapid_mode:
+            # Carga rápida: orden libre, todo habilitado (save_record valida al guardar)
+            for w,_ in self.fields.values():
+                w.setEnabled(True)
+            for btn in (self.ishikawa_btn,self.action_btn,self.attach_btn,self.save_btn):
+                btn.setEnabled(True)
+            return
         first=self.enable_chain_order[0]
         self.fields[first][0].setEnabled(True)
         self.ishikawa_btn.setEnabled(False)
@@ -319,28 +990,71 @@ class MainWindow(QtWidgets.QMainWindow):
                 self.attach_btn.setEnabled(True)
                 self.save_btn.setEnabled(True)
 
+    @LAG_MONITOR.track()
+    def fill_product_description(self, code):
+        """Completar Desc. Producto desde el catálogo si está vacía o la había completado el catálogo"""
+        desc_widget = self.fields['Desc. Producto'][0]
+        current = desc_widget.text()
+        if current and current != self.autofilled_desc:
+            return
+        desc = self.catalog.description(code)
+        if desc is None:
+            if current:
+                desc_widget.clear()
+            self.autofilled_desc = None
+            return
+        self.autofilled_desc = desc
+        desc_widget.setText(desc)
+
+    @LAG_MONITOR.track()
+    def update_duplicates(self):
+        """Mostrar NC existentes con falla parecida (mismo producto primero)"""
+        import time
+        start = time.perf_counter()
+        nro_text = self.fields['Nro NC'][0].text().strip()
+        suggestions = self.duplicates.suggest(self.fields['Falla'][0].text(),
+                                              self.fields['Cod. Producto'][0].text().strip() or None,
+                                              exclude_nro=int(nro_text) if nro_text.isdigit() else None)
+        self.duplicates_list.clear()
+        for s in suggestions:
+            producto = "mismo producto" if s.same_product else s.cod_producto
+            item = QtWidgets.QListWidgetItem(f"⚠️ NC {s.nro_nc} ({(s.fecha or '')[:10]}, {producto}): "
+                                             f"{s.falla} — {s.score:.0%} similar")
+            item.setData(QtCore.Qt.ItemDataRole.UserRole, s.nro_nc)
+            self.duplicates_list.addItem(item)
+        self.duplicates_list.setVisible(bool(suggestions))
+        if suggestions:
+            logger.debug("%d posibles duplicados en %.1f ms", len(suggestions), (time.perf_counter()-start)*1000)
+
+    @LAG_MONITOR.track()
     def open_ishikawa(self):
         logger.info("Abriendo diálogo de análisis Ishikawa...")
         dlg = IshikawaDialog(self)
         if dlg.exec() == QtWidgets.QDialog.DialogCode.Accepted:
             self.ishikawa_result = dlg.get_result()
             logger.info(f"Análisis Ishikawa completado: {len(self.ishikawa_result)} caracteres")
-            QtWidgets.QMessageBox.information(self,'Ishikawa','Análisis guardado.')
+            self.notify('Ishikawa','Análisis guardado.')
         else:
             logger.info("Diálogo Ishikawa cancelado por usuario")
 
+    @LAG_MONITOR.track()
     def open_action(self):
+        if self.rapid_mode:
+            # Carga rápida: las acciones se escriben en la tabla del formulario
+            self.focus_inline_actions()
+            return
         logger.info("Abriendo diálogo de acción correctiva...")
-        dlg = ActionDialog(self)
+        dlg = ActionDialog(self, completions=self.completions)
         if dlg.exec() == QtWidgets.QDialog.DialogCode.Accepted:
             action = dlg.get_action()
             self.actions_temp.append(action)
             logger.info(f"Acción agregada: {action.get('tarea', 'Sin descripción')[:50]}...")
             logger.info(f"Total de acciones temporales: {len(self.actions_temp)}")
-            QtWidgets.QMessageBox.information(self,'Acción','Acción agregada temporalmente.')
+            self.notify('Acción',f'Acción agregada ({len(self.actions_temp)} en esta NC, se guardan con el registro).')
         else:
             logger.info("Diálogo de acción cancelado por usuario")
 
+    @LAG_MONITOR.track()
     def attach_files(self):
         logger.info("Iniciando selección de archivos adjuntos...")
         files,_ = QtWidgets.QFileDialog.getOpenFileNames(self,'Seleccionar archivos')
@@ -350,6 +1064,7 @@ class MainWindow(QtWidgets.QMainWindow):
             return
             
         logger.info(f"Seleccionados {len(files)} archivos para adjuntar")
+        import shutil
         
         for f in files:
             dst = ATTACH_DIR / f"{datetime.now().strftime('%Y%m%d%H%M%S')}_{Path(f).name}"
@@ -363,53 +1078,25 @@ class MainWindow(QtWidgets.QMainWindow):
                 
         if files: 
             logger.info(f"Proceso de adjuntos completado: {len(files)} archivos")
-            QtWidgets.QMessageBox.information(self,'Adjuntos',f'{len(files)} archivos adjuntados.')
+            self.notify('Adjuntos',f'{len(files)} archivos adjuntados.')
 
     def check_nc_exists(self, nro_nc):
         """Verificar si un número de NC ya existe en la base de datos"""
         try:
-            cur = self.conn.cursor()
-            cur.execute("SELECT COUNT(*) FROM nc WHERE nro_nc = ?", (nro_nc,))
-            count = cur.fetchone()[0]
-            return count > 0
+            return self.nc_repo.exists(nro_nc)
         except Exception as e:
             logger.error(f"Error verificando NC existente: {e}")
             return False
 
+    @LAG_MONITOR.track()
     def edit_record_by_number(self, nro_nc):
         """Editar un registro específico por número de NC"""
         try:
-            cur = self.conn.cursor()
-            cur.execute("SELECT * FROM nc WHERE nro_nc=?", (nro_nc,))
-            row = cur.fetchone()
-            if row:
-                # Mapeo correcto de campos UI a índices de DB
-                field_mapping = {
-                    'Resultado Matriz': 3,   # resultado_matriz
-                    'OP': 4,                 # op  
-                    'Cant. Invol.': 5,       # cant_invol
-                    'Cod. Producto': 6,      # cod_producto
-                    'Desc. Producto': 7,     # desc_producto
-                    'Cliente': 8,            # cliente
-                    'Cant. Scrap': 9,        # cant_scrap
-                    'Costo': 10,             # costo
-                    'Cant. Recuperada': 11,  # cant_recuperada
-                    'Falla': 13              # falla
-                }
-                
-                # Rellenar campos excepto Nro NC usando mapeo correcto
-                for name in self.enable_chain_order[1:]:
-                    if name in field_mapping:
-                        w, _ = self.fields[name]
-                        db_index = field_mapping[name]
-                        value = row[db_index] if row[db_index] is not None else ''
-                        w.setText(str(value))
-                        logger.debug(f"Campo '{name}' cargado: {value}")
-                    else:
-                        logger.warning(f"Campo '{name}' no tiene mapeo definido")
-                        
+            record = self.nc_cache.get(nro_nc)
+            if record:
+                self.load_record_into_form(record)
                 logger.info(f"Datos de NC {nro_nc} cargados para edición")
-                QtWidgets.QMessageBox.information(self, "Editar", f"Datos de NC {nro_nc} cargados.\nModifique los campos y presione Guardar.")
+                self.notify("Editar", f"Datos de NC {nro_nc} cargados. Modifique los campos y presione Guardar.")
             else:
                 logger.warning(f"No se encontró NC {nro_nc} para edición")
                 QtWidgets.QMessageBox.warning(self, "No encontrado", f"No existe NC {nro_nc}")
@@ -417,6 +1104,7 @@ class MainWindow(QtWidgets.QMainWindow):
             logger.error(f"Error cargando NC {nro_nc} para edición: {e}")
             QtWidgets.QMessageBox.critical(self, "Error", f"Error al cargar registro: {e}")
 
+    @LAG_MONITOR.track()
     def save_record(self):
         import time
         start_time = time.time()
@@ -436,6 +1124,19 @@ class MainWindow(QtWidgets.QMainWindow):
                 QtWidgets.QMessageBox.warning(self, 'Formato Incorrecto', 
                                             f'⚠️ El número de NC debe ser un número entero.\n\nValor ingresado: "{nro_nc_text}"\n\nPor favor corrija el formato.')
                 return
+
+            # Validadores del esquema: en la carga rápida los campos no pasan por la cadena secuencial
+            for name,(w,val) in self.fields.items():
+                text = w.text()
+                if val and not val(text):
+                    if text.strip():
+                        QtWidgets.QMessageBox.warning(self, 'Formato Incorrecto',
+                                                      f'⚠️ El campo "{name}" tiene un valor inválido: "{text}".\n\nPor favor corrija el formato.')
+                    else:
+                        QtWidgets.QMessageBox.warning(self, 'Campo Requerido',
+                                                      f'⚠️ El campo "{name}" es obligatorio.')
+                    w.setFocus()
+                    return
             
             # Verificar si el NC ya existe (solo para nuevos registros)
             if self.check_nc_exists(nro):
@@ -453,82 +1154,71 @@ class MainWindow(QtWidgets.QMainWindow):
                     # Si elige Retry, continuar con el guardado (modo edición)
                     logger.info(f"Usuario eligió continuar con NC existente: {nro} (modo edición)")
             
-            cur=self.conn.cursor()
+            if self.rapid_mode:
+                try:
+                    self.actions_temp = self.inline_actions()
+                except ValueError as e:
+                    QtWidgets.QMessageBox.warning(self, 'Acciones', f'⚠️ {e}')
+                    return
             logger.info(f"Guardando NC número: {nro}")
             
-            resultado=float(self.fields['Resultado Matriz'][0].text())
-            op=int(self.fields['OP'][0].text())
-            cant_invol=float(self.fields['Cant. Invol.'][0].text())
-            cant_scrap=float(self.fields['Cant. Scrap'][0].text())
-            costo=float(self.fields['Costo'][0].text())
-            cant_recup=float(self.fields['Cant. Recuperada'][0].text())
-            data={name:w.text() for name,(w,_) in self.fields.items()}
-            fecha=datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            params=parse_form_values({name:w.text() for name,(w,_) in self.fields.items()})
+            # La fecha es la del alta: editar no la cambia ni mueve la NC de mes en kpi_mensual / pareto_mensual
+            # (la última modificación queda en updated_at)
+            stored = self.nc_repo.get_by_nro(nro)
+            params.update(nro_nc=nro,
+                          fecha=stored['fecha'] if stored and stored['fecha'] else datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                          observaciones='',
+                          ishikawa=self.ishikawa_result)
 
             # Guardar o actualizar NC
-            # Verificar si es una actualización
-            is_update = self.check_nc_exists(nro)
-            
+            nc_id, is_update = self.nc_repo.save(params)
             if is_update:
-                # Actualizar registro existente
-                cur.execute('''
-                    UPDATE nc SET fecha=?,resultado_matriz=?,op=?,cant_invol=?,cod_producto=?,desc_producto=?,cliente=?,
-                                  cant_scrap=?,costo=?,cant_recuperada=?,observaciones=?,falla=?,ishikawa=?
-                    WHERE nro_nc=?''',
-                                (fecha,resultado,op,cant_invol,data['Cod. Producto'],data['Desc. Producto'],
-                                 data['Cliente'],cant_scrap,costo,cant_recup,'',data['Falla'],self.ishikawa_result,nro))
                 logger.info(f"NC {nro} actualizada exitosamente")
                 operacion = "actualizada"
-                # Obtener ID del registro existente
-                cur.execute("SELECT id FROM nc WHERE nro_nc=?", (nro,))
-                nc_id = cur.fetchone()[0]
             else:
-                # Insertar nuevo registro
-                cur.execute('''
-                    INSERT INTO nc (nro_nc,fecha,resultado_matriz,op,cant_invol,cod_producto,desc_producto,cliente,
-                                    cant_scrap,costo,cant_recuperada,observaciones,falla,ishikawa)
-                    VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)''',
-                                (nro,fecha,resultado,op,cant_invol,data['Cod. Producto'],data['Desc. Producto'],
-                                 data['Cliente'],cant_scrap,costo,cant_recup,'',data['Falla'],self.ishikawa_result))
                 logger.info(f"NC {nro} creada exitosamente")
                 operacion = "guardada"
-                nc_id = cur.lastrowid
             
             logger.info(f"NC procesada con ID: {nc_id}")
 
-            # Guardar acciones
-            if is_update:
-                # Para actualizaciones, eliminar acciones existentes primero
-                cur.execute("DELETE FROM acciones WHERE nc_id = ?", (nc_id,))
-                logger.info(f"Acciones existentes eliminadas para NC {nro}")
-            
+            # Guardar acciones (en actualizaciones reemplaza las existentes)
             logger.info(f"Guardando {len(self.actions_temp)} acciones correctivas...")
+            adjuntos='||'.join(self.attached_files)
+            self.accion_repo.replace_for_nc(nc_id, [
+                dict(tarea=a['tarea'],tiempo_estimado=a['tiempo'],responsable=a['responsable'],
+                     fecha_realizacion=a['fecha_realizacion'],estado=a['estado'],adjuntos=adjuntos)
+                for a in self.actions_temp])
             for i, a in enumerate(self.actions_temp, 1):
-                cur.execute('''
-                    INSERT INTO acciones (nc_id,tarea,tiempo_estimado,responsable,fecha_realizacion,estado,adjuntos)
-                    VALUES (?,?,?,?,?,?,?)''',
-                            (nc_id,a['tarea'],a['tiempo'],a['responsable'],a['fecha_realizacion'],a['estado'],
-                             '||'.join(self.attached_files)))
                 logger.info(f"Acción {i} guardada: {a['tarea'][:50]}...")
                 
             self.conn.commit()
+            self.nc_cache.invalidate(nro)
+            self.duplicates.add(params['falla'])
+            self.completions.add('cliente', params['cliente'])
+            self.completions.add('cod_producto', params['cod_producto'])
+            self.catalog.refresh(params['cod_producto'])
+            for a in self.actions_temp:
+                self.completions.add('responsable', a['responsable'])
+            self.update_overdue_count()
             logger.info(f"Registro NC {nro} {operacion} exitosamente")
             
-            # Mensaje de éxito personalizado
+            # Aviso de éxito no modal: no hace falta un clic para seguir con la próxima NC
             if operacion == "actualizada":
-                mensaje_exito = f"✅ NC {nro} actualizada correctamente.\n\nLos cambios han sido guardados en la base de datos."
+                mensaje_exito = f"✅ NC {nro} actualizada correctamente."
                 titulo_exito = "Registro Actualizado"
             else:
-                mensaje_exito = f"✅ NC {nro} guardada correctamente.\n\nEl nuevo registro ha sido creado en la base de datos."
+                mensaje_exito = f"✅ NC {nro} guardada correctamente."
                 titulo_exito = "Registro Guardado"
             
-            QtWidgets.QMessageBox.information(self, titulo_exito, mensaje_exito)
+            self.notify(titulo_exito, mensaje_exito)
             self.reset_form()
             
             # Log de performance
             end_time = time.time()
             execution_time = end_time - start_time
             logger.info(f"save_record ejecutada en {execution_time:.3f}s")
+            return True
             
         except sqlite3.IntegrityError as e:
             end_time = time.time()
@@ -566,37 +1256,102 @@ class MainWindow(QtWidgets.QMainWindow):
             logger.error(f"Error inesperado al guardar después de {execution_time:.3f}s: {e}")
             QtWidgets.QMessageBox.critical(self,'Error del Sistema', mensaje_usuario)
 
-    def export_to_excel(self):
+    @LAG_MONITOR.track()
+    def open_kpis(self):
+        logger.info("Abriendo tablero de indicadores...")
+        try:
+            KPIDialog(self.conn,self).exec()
+        except Exception as e:
+            logger.error(f"Error al mostrar indicadores: {e}")
+            QtWidgets.QMessageBox.warning(self,"Error",f"No se pudieron cargar los indicadores: {e}")
+
+    @LAG_MONITOR.track()
+    def open_pareto(self):
+        logger.info("Abriendo análisis de Pareto...")
+        try:
+            ParetoDialog(self.pareto,self.export_format.currentData(),self).exec()
+        except Exception as e:
+            logger.error(f"Error al mostrar Pareto: {e}")
+            QtWidgets.QMessageBox.warning(self,"Error",f"No se pudo calcular el Pareto: {e}")
+
+    def update_overdue_count(self):
+        """Mostrar en el botón cuántas acciones abiertas están vencidas"""
+        try:
+            count = overdue_count(self.conn)
+        except Exception as e:
+            logger.error(f"Error al contar acciones vencidas: {e}")
+            return
+        self.overdue_btn.setText(f"⚠️ Acciones vencidas ({count})" if count else "Acciones vencidas")
+        if count:
+            logger.info(f"{count} acciones correctivas vencidas")
+
+    @LAG_MONITOR.track()
+    def open_overdue(self):
+        logger.info("Abriendo acciones vencidas...")
+        try:
+            OverdueDialog(self.conn,self).exec()
+            self.update_overdue_count()
+        except Exception as e:
+            logger.error(f"Error al mostrar acciones vencidas: {e}")
+            QtWidgets.QMessageBox.warning(self,"Error",f"No se pudieron cargar las acciones vencidas: {e}")
+
+    @LAG_MONITOR.track()
+    def export_data(self):
         import time
         start_time = time.time()
+        fmt = self.export_format.currentData()
         try:
-            logger.info("Iniciando exportación a Excel...")
-            cur=self.conn.cursor()
-            cur.execute("SELECT * FROM nc")
-            rows=cur.fetchall()
-            logger.info(f"Obtenidos {len(rows)} registros para exportar")
+            logger.info(f"Iniciando exportación a {fmt}...")
+            logger.info(f"Exportando {self.nc_repo.count()} registros")
             
-            headers=[desc[0] for desc in cur.description]
-            wb=Workbook()
-            ws=wb.active
-            ws.append(headers)
-            for row in rows: ws.append(row)
-            wb.save("export_nc.xlsx")
+            from export.formats import export_nc
+            path, counts, _ = export_nc(self.conn, fmt=fmt)
             
-            logger.info("Exportación a Excel completada exitosamente")
-            QtWidgets.QMessageBox.information(self,"Exportar","Datos exportados a export_nc.xlsx")
+            logger.info(f"Exportación a {fmt} completada exitosamente")
+            self.notify("Exportar",f"Datos exportados a {path.name}")
             
             # Log de performance
             end_time = time.time()
             execution_time = end_time - start_time
-            logger.info(f"export_to_excel ejecutada en {execution_time:.3f}s")
+            logger.info(f"export_data ejecutada en {execution_time:.3f}s")
             
         except Exception as e:
             end_time = time.time()
             execution_time = end_time - start_time
-            logger.error(f"Error al exportar a Excel después de {execution_time:.3f}s: {e}")
+            logger.error(f"Error al exportar a {fmt} después de {execution_time:.3f}s: {e}")
             QtWidgets.QMessageBox.warning(self,"Error",f"No se pudo exportar: {e}")
 
+    @LAG_MONITOR.track()
+    def export_changes(self, full=False):
+        """Exportación incremental (o resincronización completa) para el destino BI"""
+        modo = "completa" if full else "incremental"
+        try:
+            logger.info(f"Iniciando exportación {modo}...")
+            from export.delta import export_delta
+            result = export_delta(self.conn, full=full, fmt=self.export_format.currentData())
+            if result.empty:
+                self.notify("Exportar","No hay cambios desde la última exportación.")
+            else:
+                self.notify("Exportar",f"Datos exportados a {result.path.name}")
+        except Exception as e:
+            logger.error(f"Error en exportación {modo}: {e}")
+            QtWidgets.QMessageBox.warning(self,"Error",f"No se pudo exportar: {e}")
+
+    @LAG_MONITOR.track()
+    def export_audit_data(self):
+        """Exportación de auditoría: una hoja por entidad, leídas en una sola transacción"""
+        fmt = self.export_format.currentData()
+        try:
+            logger.info(f"Iniciando exportación de auditoría a {fmt}...")
+            from export.audit import export_audit
+            path, counts, elapsed = export_audit(self.conn, fmt=fmt)
+            logger.info(f"export_audit_data ejecutada en {elapsed:.3f}s")
+            self.notify("Exportar",f"Auditoría exportada a {path.name}")
+        except Exception as e:
+            logger.error(f"Error en exportación de auditoría a {fmt}: {e}")
+            QtWidgets.QMessageBox.warning(self,"Error",f"No se pudo exportar: {e}")
+
+    @LAG_MONITOR.track()
     def edit_record(self):
         nro,ok=QtWidgets.QInputDialog.getInt(self,"Editar","Ingrese Nro NC a editar:")
         if not ok: 
@@ -604,44 +1359,41 @@ class MainWindow(QtWidgets.QMainWindow):
             return
             
         logger.info(f"Iniciando edición de NC número: {nro}")
-        cur=self.conn.cursor()
-        cur.execute("SELECT * FROM nc WHERE nro_nc=?",(nro,))
-        row=cur.fetchone()
+        record=self.nc_cache.get(nro)
         
-        if not row:
+        if not record:
             logger.warning(f"No se encontró NC {nro} para edición")
             QtWidgets.QMessageBox.warning(self,"No encontrado",f"No existe NC {nro}")
             return
             
         logger.info(f"NC {nro} encontrada, cargando datos para edición...")
-        
-        # Mapeo correcto de campos UI a índices de DB
-        field_mapping = {
-            'Resultado Matriz': 3,   # resultado_matriz
-            'OP': 4,                 # op  
-            'Cant. Invol.': 5,       # cant_invol
-            'Cod. Producto': 6,      # cod_producto
-            'Desc. Producto': 7,     # desc_producto
-            'Cliente': 8,            # cliente
-            'Cant. Scrap': 9,        # cant_scrap
-            'Costo': 10,             # costo
-            'Cant. Recuperada': 11,  # cant_recuperada
-            'Falla': 13              # falla
-        }
-        
-        # Rellenar campos excepto Nro NC usando mapeo correcto
-        for name in self.enable_chain_order[1:]:
-            if name in field_mapping:
-                w, _ = self.fields[name]
-                db_index = field_mapping[name]
-                value = row[db_index] if row[db_index] is not None else ''
-                w.setText(str(value))
-                logger.debug(f"Campo '{name}' cargado: {value}")
-            else:
-                logger.warning(f"Campo '{name}' no tiene mapeo definido")
+        self.load_record_into_form(record)
                 
         logger.info(f"Datos de NC {nro} cargados para edición")
-        QtWidgets.QMessageBox.information(self,"Editar","Modifique los campos y presione Guardar.")
+        self.notify("Editar",f"Datos de NC {nro} cargados. Modifique los campos y presione Guardar.")
+
+    def load_row_into_form(self, row):
+        """Rellenar los campos (excepto Nro NC) a partir de una fila nc, por nombre de columna"""
+        values = row_to_form_values(row)
+        for name in self.enable_chain_order[1:]:
+            w, _ = self.fields[name]
+            w.setText(values[name])
+            logger.debug("Campo '%s' cargado: %s", name, values[name])
+
+    def load_record_into_form(self, record):
+        """Cargar NC, acciones, adjuntos e Ishikawa de un registro de la caché para edición"""
+        self.load_row_into_form(record.nc)
+        # Las acciones se reemplazan al guardar: se cargan para no perderlas en la edición
+        self.actions_temp = [{'tarea': a['tarea'], 'tiempo': a['tiempo_estimado'], 'responsable': a['responsable'],
+                              'fecha_realizacion': a['fecha_realizacion'], 'estado': a['estado']}
+                             for a in record.acciones]
+        self.attached_files = list(record.adjuntos)
+        self.ishikawa_result = record.nc['ishikawa'] or ''
+        if self.rapid_mode:
+            self.set_inline_actions(self.actions_temp)
+        # Argumentos %: sin formateo cuando el perfil de logging no incluye DEBUG
+        logger.debug("Cargadas %d acciones y %d adjuntos (caché: %d aciertos, %d fallos)",
+                     len(self.actions_temp), len(self.attached_files), self.nc_cache.hits, self.nc_cache.misses)
 
     def reset_form(self):
         for w,_ in self.fields.values():
@@ -651,6 +1403,11 @@ class MainWindow(QtWidgets.QMainWindow):
         self.attached_files=[]
         self.actions_temp=[]
         self.ishikawa_result=''
+        self.duplicates_list.clear()
+        self.duplicates_list.hide()
+        self.autofilled_desc = None
+        if self.actions_table is not None:
+            self.set_inline_actions([])
         self.enable_widgets_by_order()
 
 if __name__=='__main__':
@@ -662,12 +1419,21 @@ if __name__=='__main__':
     
     try:
         init_db()
+        STARTUP.mark('init_db')
         logger.info("Inicializando aplicación PyQt6...")
         app=QtWidgets.QApplication(sys.argv)
+        STARTUP.mark('qapplication')
         
         win=MainWindow()
         win.show()
+        STARTUP.mark('mainwindow')
         logger.info("Aplicación iniciada exitosamente")
+        if STARTUP.enabled:
+            def report_startup():
+                path = STARTUP.finish('primer_pintado', LOG_DIR)
+                logger.info(f"Perfil de arranque: {STARTUP.total()*1000:.0f} ms hasta el primer pintado; informe en {path}")
+            # Se ejecuta en la primera vuelta del event loop, con la ventana ya mostrada
+            QtCore.QTimer.singleShot(0, report_startup)
         
         sys.exit(app.exec())
         
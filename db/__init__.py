@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Paquete de datos para NC AC FABEN
+Contiene el esquema de las tablas y las utilidades de acceso a la base de datos
+"""
+
+from .schema import (
+    FieldDef,
+    NC_SCHEMA,
+    ACCION_SCHEMA,
+    NC_FORM_FIELDS,
+    NC_FIELDS_BY_LABEL,
+    NC_COLUMNS,
+    ACCION_COLUMNS,
+    NC_WRITE_COLUMNS,
+    ACCION_WRITE_COLUMNS,
+    NC_EXPORT_HEADERS,
+    ISHIKAWA_CATEGORIAS,
+    ensure_columns,
+    parse_form_values,
+    row_to_form_values,
+    parse_ishikawa
+)
+from .repository import (
+    connect,
+    init_schema,
+    schema_is_current,
+    NCRepository,
+    AccionRepository
+)
+from .cache import NCRecordCache, CachedNC
+from .migrations import migrate, SCHEMA_VERSION
+
+__version__ = "1.0.0"
+__author__ = "FABEN IT"
+
+# Exportar funciones principales
+__all__ = [
+    'FieldDef',
+    'NC_SCHEMA',
+    'ACCION_SCHEMA',
+    'NC_FORM_FIELDS',
+    'NC_FIELDS_BY_LABEL',
+    'NC_COLUMNS',
+    'ACCION_COLUMNS',
+    'NC_WRITE_COLUMNS',
+    'ACCION_WRITE_COLUMNS',
+    'NC_EXPORT_HEADERS',
+    'ISHIKAWA_CATEGORIAS',
+    'ensure_columns',
+    'parse_form_values',
+    'row_to_form_values',
+    'parse_ishikawa',
+    'connect',
+    'init_schema',
+    'schema_is_current',
+    'NCRepository',
+    'AccionRepository',
+    'NCRecordCache',
+    'CachedNC',
+    'migrate',
+    'SCHEMA_VERSION'
+]
@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+"""
+Importación masiva (sin interfaz gráfica) de NC, acciones y catálogo de productos desde CSV o XLSX
+Lee las filas en streaming, las valida con las mismas reglas del formulario
+(db/schema.py) y las inserta por lotes con executemany (las NC, en una sola transacción).
+Las filas rechazadas se escriben en un CSV con el motivo del rechazo.
+
+Uso:
+    python -m db.bulk_import nc_historico.xlsx --acciones acciones.csv --db nc_ac_faben.db
+    python -m db.bulk_import --productos maestro_erp.csv
+"""
+
+import argparse
+import csv
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+
+from . import dates, migrations, schema
+from .catalog import PRODUCTO_SELECT_ALL_SQL, PRODUCTO_UPSERT_SQL
+from .repository import connect, init_schema, NCRepository, AccionRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 20000
+
+# Encabezados aceptados: nombre de columna o etiqueta del formulario (sin distinguir mayúsculas)
+_NC_HEADERS = {}
+for _f in schema.NC_SCHEMA:
+    _NC_HEADERS[_f.column.lower()] = _f.column
+    if _f.label:
+        _NC_HEADERS[_f.label.lower()] = _f.column
+_ACCION_HEADERS = {c.lower(): c for c in schema.ACCION_WRITE_COLUMNS if c != 'nc_id'}
+_ACCION_HEADERS.update({'nro_nc': 'nro_nc', 'nro nc': 'nro_nc', 'tiempo': 'tiempo_estimado'})
+# Volcados del ERP: código y descripción con los nombres de columna más comunes
+_PRODUCTO_HEADERS = {h: 'cod_producto' for h in ('cod_producto', 'cod. producto', 'codigo', 'código', 'cod',
+                                                 'articulo', 'artículo')}
+_PRODUCTO_HEADERS.update({h: 'desc_producto' for h in ('desc_producto', 'desc. producto', 'descripcion',
+                                                        'descripción', 'desc')})
+
+ESTADOS_ACCION = ('Abierta', 'En curso', 'Cerrada')
+# Formato en que la aplicación guarda cada fecha (el de la definición de la columna)
+FECHA_FORMAT = next(f.date_format for f in schema.NC_SCHEMA if f.column == 'fecha')
+FECHA_REALIZACION_FORMAT = next(f.date_format for f in schema.ACCION_SCHEMA if f.column == 'fecha_realizacion')
+
+
+class ImportResult:
+    """Resumen de una importación"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.read = 0
+        self.inserted = 0
+        self.updated = 0
+        self.rejected = 0
+        self.elapsed = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        return (f"{self.kind}: {self.read} leídas, {self.inserted} insertadas, {self.updated} actualizadas, "
+                f"{self.rejected} rechazadas en {self.elapsed:.2f}s ({self.rows_per_second:,.0f} filas/s)")
+
+
+def _cell_to_text(value):
+    """Normalizar un valor de celda (CSV o XLSX) al texto que validaría el formulario"""
+    if type(value) is str:                  # Todas las celdas de un CSV
+        return value.strip()
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(value, date):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _iter_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as fh:
+        sample = fh.read(4096)
+        fh.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+        except csv.Error:
+            dialect = csv.excel
+        reader = csv.reader(fh, dialect)
+        yield from reader
+
+
+def _iter_xlsx(path, sheet=None):
+    from openpyxl import load_workbook  # sólo se necesita para XLSX
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        ws = wb[sheet] if sheet else wb.active
+        yield from ws.iter_rows(values_only=True)
+    finally:
+        wb.close()
+
+
+def iter_records(path, header_map, sheet=None):
+    """Recorrer un CSV/XLSX como (nro_de_linea, {columna: texto}, fila_original) en streaming"""
+    path = Path(path)
+    rows = _iter_xlsx(path, sheet) if path.suffix.lower() in ('.xlsx', '.xlsm') else _iter_csv(path)
+    header = None
+    for line_no, raw in enumerate(rows, 1):
+        if header is None:
+            header = [header_map.get(_cell_to_text(h).lower()) for h in raw]
+            unknown = [_cell_to_text(h) for h, col in zip(raw, header) if col is None and h]
+            if unknown:
+                logger.warning(f"Columnas ignoradas en {path.name}: {', '.join(unknown)}")
+            continue
+        if not any(v not in (None, '') for v in raw):
+            continue
+        texts = [_cell_to_text(v) for v in raw]
+        yield line_no, {col: texts[i] for i, col in enumerate(header) if col and i < len(texts)}, texts
+
+
+class _RejectWriter:
+    """Escritor perezoso del CSV de filas rechazadas"""
+
+    def __init__(self, path):
+        self.path = Path(path) if path else None
+        self._fh = None
+        self._writer = None
+
+    def write(self, line_no, texts, reason):
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._fh = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._fh)
+            self._writer.writerow(['linea', 'motivo', 'datos'])
+        self._writer.writerow([line_no, reason, ' | '.join(texts)])
+
+    def close(self):
+        if self._fh:
+            self._fh.close()
+
+
+def validate_nc(record, default_fecha):
+    """Validar una fila con las reglas del formulario. Devuelve (params, None) o (None, motivo)"""
+    for f in schema.NC_FORM_FIELDS:
+        value = record.get(f.column, '')
+        if not f.validator(value):
+            return None, f"Campo '{f.label}' inválido: {value!r}"
+    params = {f.column: f.parser(record[f.column]) for f in schema.NC_FORM_FIELDS}
+    fecha = record.get('fecha')
+    if fecha:
+        parsed = dates.parse_datetime(fecha)
+        if parsed is None:
+            return None, f"Fecha inválida: {fecha!r}"
+        fecha = parsed.strftime(FECHA_FORMAT)
+    params['fecha'] = fecha or default_fecha
+    params['observaciones'] = record.get('observaciones', '')
+    params['ishikawa'] = record.get('ishikawa', '')
+    return params, None
+
+
+def validate_accion(record, id_map):
+    """Validar una acción y resolver su NC. Devuelve (params, None) o (None, motivo)"""
+    nro = record.get('nro_nc', '')
+    if not nro.isdigit():
+        return None, f"Nro NC inválido: {nro!r}"
+    nc_id = id_map.get(int(nro))
+    if nc_id is None:
+        return None, f"No existe NC {nro}"
+    if not record.get('tarea', '').strip():
+        return None, "Tarea vacía"
+    estado = record.get('estado') or 'Abierta'
+    if estado not in ESTADOS_ACCION:
+        return None, f"Estado inválido: {estado!r}"
+    params = {c: record.get(c, '') for c in schema.ACCION_WRITE_COLUMNS}
+    if params['fecha_realizacion']:
+        parsed = dates.parse_datetime(params['fecha_realizacion'])
+        if parsed is None:
+            return None, f"Fecha de realización inválida: {params['fecha_realizacion']!r}"
+        params['fecha_realizacion'] = parsed.strftime(FECHA_REALIZACION_FORMAT)
+    params.update(nc_id=nc_id, estado=estado)
+    return params, None
+
+
+@contextmanager
+def _bulk_nc_transaction(conn, result):
+    """Carga de NC en una sola transacción y sin los triggers por fila de nc_datos
+    (migrations.BULK_SUSPENDED_TRIGGERS): con ellos cada NC actualiza kpi_mensual y pareto_mensual
+    por separado. El DROP de los triggers, la carga y su reposición se confirman juntos: si la carga
+    falla o el proceso muere, SQLite revierte también el DROP, y otras conexiones esperan el bloqueo
+    de escritura en vez de guardar sin triggers. Los resúmenes se ponen al día al final con una
+    sentencia agrupada: sólo las NC nuevas si no hubo actualizaciones"""
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        since_id = conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {schema.NC_DATA_TABLE}").fetchone()[0]
+        migrations.suspend_bulk_triggers(conn)
+        yield
+        migrations.restore_bulk_triggers(conn, None if result.updated else since_id)
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+
+
+def import_nc(conn, path, rejects_path=None, update_existing=False, batch_size=DEFAULT_BATCH_SIZE, sheet=None):
+    """Importar NC desde CSV/XLSX. Los duplicados se rechazan salvo update_existing=True"""
+    result = ImportResult('NC')
+    repo = NCRepository(conn)
+    rejects = _RejectWriter(rejects_path)
+    existing = set(repo.id_map())
+    seen = set()
+    default_fecha = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    inserts, updates = [], []
+    start = time.perf_counter()
+
+    def flush():
+        if inserts:
+            result.inserted += repo.insert_many(inserts)
+            migrations.stamp_bulk_rows(conn)
+        if updates:
+            repo.upsert_many(updates)
+            result.updated += len(updates)
+        inserts.clear()
+        updates.clear()
+
+    try:
+        with _bulk_nc_transaction(conn, result):
+            for line_no, record, texts in iter_records(path, _NC_HEADERS, sheet):
+                result.read += 1
+                params, reason = validate_nc(record, default_fecha)
+                if params is not None:
+                    nro = params['nro_nc']
+                    if nro in seen:
+                        params, reason = None, f"NC {nro} repetida en el archivo"
+                    elif nro in existing and not update_existing:
+                        params, reason = None, f"NC {nro} ya existe en la base de datos"
+                if params is None:
+                    result.rejected += 1
+                    rejects.write(line_no, texts, reason)
+                    continue
+                seen.add(nro)
+                (updates if nro in existing else inserts).append(params)
+                if len(inserts) + len(updates) >= batch_size:
+                    flush()
+            flush()
+    finally:
+        rejects.close()
+    result.elapsed = time.perf_counter() - start
+    logger.info(f"Importación desde {Path(path).name} - {result}")
+    return result
+
+
+def import_acciones(conn, path, rejects_path=None, batch_size=DEFAULT_BATCH_SIZE, sheet=None):
+    """Importar acciones desde CSV/XLSX; cada fila referencia su NC por nro_nc"""
+    result = ImportResult('Acciones')
+    repo = AccionRepository(conn)
+    rejects = _RejectWriter(rejects_path)
+    id_map = NCRepository(conn).id_map()
+    pending = []
+    start = time.perf_counter()
+
+    def flush():
+        with conn:
+            if pending:
+                result.inserted += repo.insert_many(pending)
+        pending.clear()
+
+    try:
+        for line_no, record, texts in iter_records(path, _ACCION_HEADERS, sheet):
+            result.read += 1
+            params, reason = validate_accion(record, id_map)
+            if params is None:
+                result.rejected += 1
+                rejects.write(line_no, texts, reason)
+                continue
+            pending.append(params)
+            if len(pending) >= batch_size:
+                flush()
+        flush()
+    finally:
+        rejects.close()
+    result.elapsed = time.perf_counter() - start
+    logger.info(f"Importación desde {Path(path).name} - {result}")
+    return result
+
+
+def import_productos(conn, path, rejects_path=None, batch_size=DEFAULT_BATCH_SIZE, sheet=None):
+    """Importar el catálogo de productos desde un volcado del ERP (código y descripción).
+    Los códigos existentes actualizan su descripción; los que no cambian no se reescriben"""
+    result = ImportResult('Productos')
+    rejects = _RejectWriter(rejects_path)
+    existing = {row[1]: row[2] for row in conn.execute(PRODUCTO_SELECT_ALL_SQL)}
+    seen = set()
+    pending = []
+    start = time.perf_counter()
+
+    def flush():
+        with conn:
+            if pending:
+                conn.executemany(PRODUCTO_UPSERT_SQL, pending)
+        pending.clear()
+
+    try:
+        for line_no, record, texts in iter_records(path, _PRODUCTO_HEADERS, sheet):
+            result.read += 1
+            cod, desc = record.get('cod_producto', ''), record.get('desc_producto', '')
+            reason = None
+            if not schema.NC_FIELDS_BY_LABEL['Cod. Producto'].validator(cod):
+                reason = "Código de producto vacío"
+            elif not schema.NC_FIELDS_BY_LABEL['Desc. Producto'].validator(desc):
+                reason = f"Descripción vacía para {cod}"
+            elif cod in seen:
+                reason = f"Producto {cod} repetido en el archivo"
+            if reason:
+                result.rejected += 1
+                rejects.write(line_no, texts, reason)
+                continue
+            seen.add(cod)
+            if cod not in existing:
+                result.inserted += 1
+            elif existing[cod] != desc:
+                result.updated += 1
+            else:
+                continue
+            pending.append({'cod_producto': cod, 'desc_producto': desc})
+            if len(pending) >= batch_size:
+                flush()
+        flush()
+    finally:
+        rejects.close()
+    result.elapsed = time.perf_counter() - start
+    logger.info(f"Importación desde {Path(path).name} - {result}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importación masiva de NC, acciones y productos desde CSV/XLSX")
+    parser.add_argument('archivo', nargs='?', help="CSV/XLSX de NC")
+    parser.add_argument('--acciones', help="CSV/XLSX de acciones (columna nro_nc para vincular)")
+    parser.add_argument('--productos', help="CSV/XLSX del catálogo de productos del ERP (código y descripción)")
+    parser.add_argument('--db', default=str(Path.cwd() / 'nc_ac_faben.db'), help="Base de datos SQLite")
+    parser.add_argument('--hoja', help="Hoja a leer en archivos XLSX (por defecto la activa)")
+    parser.add_argument('--actualizar', action='store_true', help="Actualizar NC existentes en vez de rechazarlas")
+    parser.add_argument('--lote', type=int, default=DEFAULT_BATCH_SIZE, help="Filas por transacción")
+    parser.add_argument('--rechazos', help="Prefijo del CSV de rechazos (por defecto junto a cada archivo)")
+    args = parser.parse_args(argv)
+
+    if not args.archivo and not args.acciones and not args.productos:
+        parser.error("Indique un archivo de NC, --acciones y/o --productos")
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    def rejects_for(path):
+        if args.rechazos:
+            return f"{args.rechazos}_{Path(path).stem}.csv"
+        return Path(path).with_name(f"{Path(path).stem}_rechazos.csv")
+
+    conn = connect(args.db)
+    try:
+        init_schema(conn)
+        results = []
+        if args.productos:
+            results.append(import_productos(conn, args.productos, rejects_for(args.productos),
+                                            args.lote, args.hoja))
+        if args.archivo:
+            results.append(import_nc(conn, args.archivo, rejects_for(args.archivo),
+                                     args.actualizar, args.lote, args.hoja))
+        if args.acciones:
+            results.append(import_acciones(conn, args.acciones, rejects_for(args.acciones),
+                                           args.lote, args.hoja))
+    finally:
+        conn.close()
+
+    for r in results:
+        print(f"✅ {r}")
+    return 1 if any(r.rejected for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Caché LRU de NC abiertas recientemente
+Guarda la NC, sus acciones y sus adjuntos por nro_nc. Se invalida explícitamente
+al guardar y por completo cuando PRAGMA data_version indica que otro proceso escribió
+"""
+
+import logging
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CachedNC(NamedTuple):
+    nc: object                 # sqlite3.Row de la tabla nc
+    acciones: Tuple            # filas de acciones en orden de carga
+    adjuntos: Tuple[str, ...]  # nombres de archivo en attachments/, sin duplicados
+
+
+def split_adjuntos(acciones):
+    """Lista de adjuntos únicos a partir del campo 'adjuntos' ('a||b') de las acciones"""
+    seen = OrderedDict()
+    for a in acciones:
+        for name in (a['adjuntos'] or '').split('||'):
+            if name:
+                seen[name] = None
+    return tuple(seen)
+
+
+class NCRecordCache:
+    """Caché LRU por nro_nc sobre NCRepository/AccionRepository"""
+
+    def __init__(self, nc_repo, accion_repo, maxsize=32):
+        self.nc_repo = nc_repo
+        self.accion_repo = accion_repo
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        return self.nc_repo.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_external_writes(self):
+        """Vaciar la caché si otra conexión confirmó cambios desde la última consulta"""
+        version = self._read_data_version()
+        if version != self._data_version:
+            if self._entries:
+                logger.debug(f"data_version cambió ({self._data_version} -> {version}), caché vaciada")
+            self._entries.clear()
+            self._data_version = version
+
+    def get(self, nro_nc) -> Optional[CachedNC]:
+        self._check_external_writes()
+        entry = self._entries.get(nro_nc)
+        if entry is not None:
+            self._entries.move_to_end(nro_nc)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        row = self.nc_repo.get_by_nro(nro_nc)
+        if row is None:
+            return None
+        acciones = tuple(self.accion_repo.list_for_nc(row['id']))
+        entry = CachedNC(row, acciones, split_adjuntos(acciones))
+        self._entries[nro_nc] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, nro_nc):
+        """Descartar una NC (llamar después de escribirla desde esta conexión)"""
+        self._entries.pop(nro_nc, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, nro_nc):
+        return nro_nc in self._entries
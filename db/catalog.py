@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Catálogo de productos: código -> descripción e id entero
+La tabla productos (migración 5) se carga completa en un diccionario la primera vez
+que se consulta, así que completar la descripción al escribir un código no toca la base.
+Al guardar una NC con un código nuevo se agrega al catálogo (es el diccionario de
+cod_producto, migración 6); la importación del ERP (db/bulk_import.py --productos)
+actualiza descripciones.
+"""
+
+import logging
+import time
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+PRODUCTO_SELECT_ALL_SQL = "SELECT id, cod_producto, desc_producto FROM productos"
+PRODUCTO_SELECT_SQL = "SELECT id, cod_producto, desc_producto FROM productos WHERE cod_producto = ?"
+PRODUCTO_UPSERT_SQL = ("INSERT INTO productos (cod_producto, desc_producto) VALUES (:cod_producto, :desc_producto) "
+                       "ON CONFLICT(cod_producto) DO UPDATE SET desc_producto = excluded.desc_producto "
+                       "WHERE desc_producto IS NOT excluded.desc_producto")
+
+
+class Producto(NamedTuple):
+    id: int
+    cod_producto: str
+    desc_producto: str
+
+
+class ProductCatalog:
+    """Catálogo de productos en memoria, indexado por código.
+    Se descarta si otra conexión escribe en la base (PRAGMA data_version)"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._by_code = None
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _index(self):
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._by_code = None
+            self._data_version = version
+        if self._by_code is None:
+            start = time.perf_counter()
+            self._by_code = {row[1]: Producto(*row) for row in self.conn.execute(PRODUCTO_SELECT_ALL_SQL)}
+            logger.debug(f"Catálogo de productos cargado: {len(self._by_code)} códigos en "
+                         f"{(time.perf_counter() - start) * 1000:.1f} ms")
+        return self._by_code
+
+    def __len__(self):
+        return len(self._index())
+
+    def lookup(self, cod_producto) -> Optional[Producto]:
+        return self._index().get((cod_producto or '').strip())
+
+    def description(self, cod_producto):
+        producto = self.lookup(cod_producto)
+        return producto.desc_producto if producto else None
+
+    def refresh(self, cod_producto):
+        """Releer un código de la base (por ejemplo tras guardar una NC que lo agregó al catálogo)"""
+        if self._by_code is None:
+            return
+        cod_producto = (cod_producto or '').strip()
+        row = self.conn.execute(PRODUCTO_SELECT_SQL, (cod_producto,)).fetchone()
+        if row:
+            self._by_code[cod_producto] = Producto(*row)
+        else:
+            self._by_code.pop(cod_producto, None)
+
+    def upsert_many(self, rows):
+        """Insertar o actualizar productos {cod_producto, desc_producto}; el llamador confirma la transacción"""
+        rows = list(rows)
+        self.conn.executemany(PRODUCTO_UPSERT_SQL, rows)
+        self._by_code = None
+        return len(rows)
+
+    def invalidate(self):
+        self._by_code = None
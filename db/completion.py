@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Autocompletado de Cliente, Cod. Producto y Responsable
+Cada campo tiene un índice de prefijos en memoria (lista ordenada por clave en minúsculas,
+búsqueda con bisect) que se arma la primera vez que se usa con los valores distintos de la
+base, se actualiza al guardar y se descarta si otro proceso escribió en la base.
+Los valores se leen de las tablas diccionario de la migración 6 (un valor por fila),
+en lugar de recorrer nc y acciones; productos incluye los códigos del maestro del ERP.
+"""
+
+import bisect
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LIMIT = 20
+
+# campo: consulta de valores distintos (diccionarios de la migración 6)
+COMPLETION_SOURCES = {
+    'cliente': "SELECT valor FROM clientes",
+    'cod_producto': "SELECT cod_producto FROM productos",
+    'responsable': "SELECT valor FROM responsables",
+}
+
+
+def _key(value):
+    return value.casefold()
+
+
+class PrefixIndex:
+    """Valores distintos ordenados por clave sin distinguir mayúsculas; completa por prefijo con bisect"""
+
+    def __init__(self, values=()):
+        pairs = {}
+        for v in values:
+            v = (v or '').strip()
+            if v:
+                pairs.setdefault(_key(v), v)
+        self._keys = sorted(pairs)
+        self._values = [pairs[k] for k in self._keys]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def add(self, value):
+        """Insertar un valor nuevo (O(n) por el desplazamiento de la lista, sin reordenar)"""
+        value = (value or '').strip()
+        if not value:
+            return False
+        key = _key(value)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return False
+        self._keys.insert(i, key)
+        self._values.insert(i, value)
+        return True
+
+    def complete(self, prefix, limit=DEFAULT_LIMIT):
+        """Hasta limit valores que empiezan con prefix, en orden alfabético"""
+        key = _key(prefix.strip())
+        if not key:
+            return []
+        start = bisect.bisect_left(self._keys, key)
+        out = []
+        for i in range(start, min(start + limit, len(self._keys))):
+            if not self._keys[i].startswith(key):
+                break
+            out.append(self._values[i])
+        return out
+
+
+class CompletionSource:
+    """Índices de prefijos por campo, construidos de forma perezosa desde la base"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._indexes = {}
+        self._data_version = self._read_data_version()
+
+    def _read_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def index(self, field):
+        version = self._read_data_version()
+        if version != self._data_version:
+            self._indexes.clear()
+            self._data_version = version
+        idx = self._indexes.get(field)
+        if idx is None:
+            if field not in COMPLETION_SOURCES:
+                raise ValueError(f"Campo sin autocompletado: {field}")
+            start = time.perf_counter()
+            idx = PrefixIndex(row[0] for row in self.conn.execute(COMPLETION_SOURCES[field]))
+            self._indexes[field] = idx
+            logger.debug("Autocompletado '%s': %d valores en %.1f ms", field, len(idx), (time.perf_counter() - start) * 1000)
+        return idx
+
+    def complete(self, field, prefix, limit=DEFAULT_LIMIT):
+        return self.index(field).complete(prefix, limit)
+
+    def add(self, field, value):
+        """Registrar un valor guardado (sólo si el índice ya se construyó; si no, lo leerá de la base)"""
+        idx = self._indexes.get(field)
+        if idx is not None:
+            idx.add(value)
+
+    def invalidate(self):
+        """Descartar los índices (se reconstruyen en el próximo uso)"""
+        self._indexes.clear()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Fechas para consultas por rango
+created_at / updated_at de nc son epoch UTC en segundos (migración 7) y
+fecha_realizacion de acciones es texto 'YYYY-MM-DD'; las tres columnas tienen índice,
+así que un rango [desde, hasta) recorre sólo las filas del rango.
+Las fechas sin hora se toman en hora local, como las guarda la aplicación.
+"""
+
+from datetime import date, datetime, timedelta
+
+# Formatos de fecha aceptados al importar además de ISO (día antes que mes, como en las planillas locales)
+DAY_FIRST_FORMATS = ('%d/%m/%Y %H:%M:%S', '%d/%m/%Y %H:%M', '%d/%m/%Y', '%d-%m-%Y %H:%M:%S', '%d-%m-%Y %H:%M',
+                     '%d-%m-%Y')
+# Números de serie de Excel (días desde 1899-12-30) que se toman como fecha: 1927 a 2173
+EXCEL_EPOCH = datetime(1899, 12, 30)
+EXCEL_SERIAL_RANGE = (10_000, 100_000)
+
+
+def to_epoch(value):
+    """Epoch UTC (int) de un epoch, datetime/date (hora local) o texto 'YYYY-MM-DD[ HH:MM:SS]'"""
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else int(value)
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.strip())
+    if not isinstance(value, datetime):
+        value = datetime(value.year, value.month, value.day)
+    return int(value.timestamp())
+
+
+def parse_datetime(value):
+    """datetime de un texto ISO, DD/MM/AAAA[ HH:MM[:SS]] o número de serie de Excel; None si no se reconoce"""
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    text = str(value).strip()
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        pass
+    for fmt in DAY_FIRST_FORMATS:
+        try:
+            return datetime.strptime(text, fmt)
+        except ValueError:
+            pass
+    try:
+        serial = float(text.replace(',', '.'))
+    except ValueError:
+        return None
+    if EXCEL_SERIAL_RANGE[0] <= serial < EXCEL_SERIAL_RANGE[1]:
+        return (EXCEL_EPOCH + timedelta(days=serial)).replace(microsecond=0)
+    return None
+
+
+def from_epoch(value):
+    """datetime local de un epoch (None si no hay valor)"""
+    return None if value is None else datetime.fromtimestamp(value)
+
+
+def to_iso_date(value):
+    """Texto 'YYYY-MM-DD' de una fecha, datetime o texto (para fecha_realizacion)"""
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime('%Y-%m-%d')
+
+
+def month_range(year, month):
+    """(primer día del mes, primer día del mes siguiente)"""
+    start = date(year, month, 1)
+    return start, date(year + month // 12, month % 12 + 1, 1)
+
+
+def quarter_range(year, quarter):
+    """(primer día del trimestre, primer día del trimestre siguiente); quarter de 1 a 4"""
+    if not 1 <= quarter <= 4:
+        raise ValueError(f"Trimestre inválido: {quarter}")
+    start, _ = month_range(year, 3 * quarter - 2)
+    _, end = month_range(year, 3 * quarter)
+    return start, end
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Indicadores de calidad precalculados (costo, scrap, recuperado y cantidad de NC)
+Se leen de kpi_mensual, que los triggers de la migración 2 mantienen al día en cada
+alta, edición o baja de nc: una consulta recorre grupos, no la tabla nc completa.
+"""
+
+from .migrations import KPI_DIMENSIONS, KPI_MEASURES, rebuild_kpi_summary
+
+# Etiquetas de la UI para cada dimensión y medida
+KPI_LABELS = {
+    'mes': 'Mes',
+    'cliente': 'Cliente',
+    'cod_producto': 'Cod. Producto',
+    'cantidad': 'NC',
+    'costo': 'Costo',
+    'cant_scrap': 'Cant. Scrap',
+    'cant_recuperada': 'Cant. Recuperada',
+    'cant_invol': 'Cant. Invol.',
+}
+
+KPI_VALUES = ('cantidad',) + KPI_MEASURES
+
+
+def _where(desde, hasta):
+    """Filtro por rango de meses 'YYYY-MM' (inclusive), sobre el prefijo de la clave primaria"""
+    clauses, params = [], []
+    if desde:
+        clauses.append("mes >= ?")
+        params.append(desde)
+    if hasta:
+        clauses.append("mes <= ?")
+        params.append(hasta)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def kpi_summary(conn, group_by=('mes',), desde=None, hasta=None):
+    """Indicadores agrupados por las dimensiones pedidas (subconjunto de mes/cliente/cod_producto).
+    Devuelve filas sqlite3.Row con las dimensiones, 'cantidad' y las sumas de KPI_MEASURES"""
+    unknown = [d for d in group_by if d not in KPI_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Dimensión de KPI desconocida: {', '.join(unknown)}")
+    where, params = _where(desde, hasta)
+    sums = ', '.join(f"SUM({v}) AS {v}" for v in KPI_VALUES)
+    if not group_by:
+        return conn.execute(f"SELECT {sums} FROM kpi_mensual{where}", params).fetchall()
+    dims = ', '.join(group_by)
+    sql = f"SELECT {dims}, {sums} FROM kpi_mensual{where} GROUP BY {dims} ORDER BY {dims}"
+    return conn.execute(sql, params).fetchall()
+
+
+def kpi_totals(conn, desde=None, hasta=None):
+    """Totales del rango como {medida: valor}"""
+    row = kpi_summary(conn, (), desde, hasta)[0]
+    return {v: (row[v] or 0) for v in KPI_VALUES}
+
+
+def rebuild_kpis(conn):
+    """Recalcular kpi_mensual desde nc (reparación; en uso normal lo mantienen los triggers)"""
+    with conn:
+        conn.execute("BEGIN")
+        rebuild_kpi_summary(conn)
+    return conn.execute("SELECT COUNT(*) FROM kpi_mensual").fetchone()[0]
@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+Migraciones del esquema de NC AC FABEN
+Cada migración se aplica una sola vez; la versión aplicada se guarda en PRAGMA user_version
+"""
+
+import logging
+import sqlite3
+
+from . import overdue, schema
+from .schema import ISHIKAWA_CATEGORIAS
+
+logger = logging.getLogger(__name__)
+
+
+def _execute_script(cur, script):
+    """Ejecutar un script sentencia por sentencia dentro de la transacción actual
+    (executescript haría COMMIT implícito y la migración dejaría de ser atómica)"""
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            cur.execute(statement)
+            statement = ''
+
+
+def _m1_change_tracking(cur):
+    """Seguimiento de cambios: row_version por fila, contador global y registro de borrados"""
+    _execute_script(cur, '''
+    CREATE TABLE IF NOT EXISTS cambios_seq (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        valor INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO cambios_seq (id, valor) VALUES (1, 0);
+
+    CREATE TABLE IF NOT EXISTS borrados (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        tabla TEXT NOT NULL,
+        fila_id INTEGER NOT NULL,
+        nc_id INTEGER,
+        row_version INTEGER NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_borrados_version ON borrados(row_version);
+
+    CREATE TABLE IF NOT EXISTS export_estado (
+        destino TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        fecha TEXT
+    );
+
+    -- Filas existentes: versión 1, de modo que la primera exportación incremental las incluya
+    UPDATE nc SET row_version = 1 WHERE row_version IS NULL;
+    UPDATE acciones SET row_version = 1 WHERE row_version IS NULL;
+    UPDATE cambios_seq SET valor = MAX(valor, 1) WHERE id = 1;
+
+    CREATE INDEX IF NOT EXISTS idx_nc_row_version ON nc(row_version);
+    CREATE INDEX IF NOT EXISTS idx_acciones_row_version ON acciones(row_version);
+    CREATE INDEX IF NOT EXISTS idx_acciones_nc_id ON acciones(nc_id);
+    ''')
+    for table in ('nc', 'acciones'):
+        _execute_script(cur, _version_triggers_sql(table, table))
+
+
+# Epoch UTC en segundos: ahora y a partir de un texto de fecha en hora local
+NOW_EPOCH_SQL = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+
+def _epoch_sql(expr):
+    return f"CAST(strftime('%s', {expr}, 'utc') AS INTEGER)"
+
+
+def _insert_timestamps_sql(prefix):
+    """SET de created_at (desde fecha si falta) y updated_at de una NC recién insertada"""
+    return (f"created_at = COALESCE({prefix}created_at, {_epoch_sql(f'{prefix}fecha')}, {NOW_EPOCH_SQL}), "
+            f"updated_at = COALESCE({prefix}updated_at, {NOW_EPOCH_SQL})")
+
+
+def _version_triggers_sql(table, data_table, timestamps=False):
+    """Triggers de row_version y registro de borrados sobre la tabla física data_table.
+    En borrados se guarda el nombre lógico (nc / acciones) que usa la exportación incremental.
+    Con timestamps la misma UPDATE completa created_at (desde fecha, para NC importadas) y updated_at"""
+    ins_extra = upd_extra = ''
+    if timestamps:
+        ins_extra = f", {_insert_timestamps_sql('NEW.')}"
+        upd_extra = f", updated_at = {NOW_EPOCH_SQL}"
+    nc_id = 'OLD.id' if table == 'nc' else 'OLD.nc_id'
+    return f'''
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_version_ins AFTER INSERT ON {data_table}
+    BEGIN
+        UPDATE cambios_seq SET valor = valor + 1 WHERE id = 1;
+        UPDATE {data_table} SET row_version = (SELECT valor FROM cambios_seq WHERE id = 1){ins_extra}
+        WHERE id = NEW.id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_version_upd AFTER UPDATE ON {data_table}
+    WHEN NEW.row_version IS OLD.row_version
+    BEGIN
+        UPDATE cambios_seq SET valor = valor + 1 WHERE id = 1;
+        UPDATE {data_table} SET row_version = (SELECT valor FROM cambios_seq WHERE id = 1){upd_extra}
+        WHERE id = NEW.id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_{table}_borrado AFTER DELETE ON {data_table}
+    BEGIN
+        UPDATE cambios_seq SET valor = valor + 1 WHERE id = 1;
+        INSERT INTO borrados (tabla, fila_id, nc_id, row_version)
+        VALUES ('{table}', OLD.id, {nc_id}, (SELECT valor FROM cambios_seq WHERE id = 1));
+    END;
+    '''
+
+
+# Dimensiones y medidas de los indicadores precalculados (tabla kpi_mensual)
+KPI_DIMENSIONS = ('mes', 'cliente', 'cod_producto')
+KPI_MEASURES = ('costo', 'cant_scrap', 'cant_recuperada', 'cant_invol')
+
+
+def _col(alias, column, dict_columns=()):
+    """Columna de una fila de nc en un trigger; las codificadas (migración 6) se leen de su diccionario"""
+    for d in dict_columns:
+        if d.column == column:
+            return f"(SELECT {d.key} FROM {d.table} WHERE id = {alias}.{d.id_column})"
+    return f"{alias}.{column}"
+
+
+def _tracked(columns, dict_columns=()):
+    """Columnas físicas para AFTER UPDATE OF"""
+    ids = {d.column: d.id_column for d in dict_columns}
+    return ', '.join(ids.get(c, c) for c in columns)
+
+
+def _kpi_key(alias, dict_columns=()):
+    return (f"COALESCE(substr({alias}.fecha, 1, 7), ''), COALESCE({_col(alias, 'cliente', dict_columns)}, ''), "
+            f"COALESCE({_col(alias, 'cod_producto', dict_columns)}, '')")
+
+
+def _kpi_add_sql(alias, sign, dict_columns=()):
+    """Sumar (sign='+') o restar (sign='-') una fila de nc a su grupo de kpi_mensual"""
+    values = ', '.join([f"{sign}1"] + [f"{sign}COALESCE({alias}.{m}, 0)" for m in KPI_MEASURES])
+    sets = ', '.join(f"{m} = {m} + excluded.{m}" for m in ('cantidad',) + KPI_MEASURES)
+    return (f"INSERT INTO kpi_mensual (mes, cliente, cod_producto, cantidad, {', '.join(KPI_MEASURES)}) "
+            f"VALUES ({_kpi_key(alias, dict_columns)}, {values}) "
+            f"ON CONFLICT(mes, cliente, cod_producto) DO UPDATE SET {sets};")
+
+
+def _kpi_triggers_sql(table='nc', dict_columns=()):
+    """Triggers que mantienen kpi_mensual sobre la tabla física de nc"""
+    # La resta deja a cero el grupo que queda sin NC: se elimina para no acumular grupos vacíos
+    prune = (f"DELETE FROM kpi_mensual WHERE cantidad = 0 AND mes = COALESCE(substr(OLD.fecha, 1, 7), '') "
+             f"AND cliente = COALESCE({_col('OLD', 'cliente', dict_columns)}, '') "
+             f"AND cod_producto = COALESCE({_col('OLD', 'cod_producto', dict_columns)}, '');")
+    tracked = _tracked(('fecha', 'cliente', 'cod_producto') + KPI_MEASURES, dict_columns)
+    return f'''
+    CREATE TRIGGER IF NOT EXISTS trg_nc_kpi_ins AFTER INSERT ON {table}
+    BEGIN
+        {_kpi_add_sql('NEW', '+', dict_columns)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_nc_kpi_upd AFTER UPDATE OF {tracked} ON {table}
+    BEGIN
+        {_kpi_add_sql('OLD', '-', dict_columns)}
+        {prune}
+        {_kpi_add_sql('NEW', '+', dict_columns)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_nc_kpi_del AFTER DELETE ON {table}
+    BEGIN
+        {_kpi_add_sql('OLD', '-', dict_columns)}
+        {prune}
+    END;
+    '''
+
+
+def _m2_kpi_summary(cur):
+    """Indicadores por mes × cliente × producto mantenidos por triggers sobre nc"""
+    measures = ',\n        '.join(f"{m} REAL NOT NULL DEFAULT 0" for m in KPI_MEASURES)
+    _execute_script(cur, f'''
+    CREATE TABLE IF NOT EXISTS kpi_mensual (
+        mes TEXT NOT NULL,
+        cliente TEXT NOT NULL,
+        cod_producto TEXT NOT NULL,
+        cantidad INTEGER NOT NULL DEFAULT 0,
+        {measures},
+        PRIMARY KEY (mes, cliente, cod_producto)
+    ) WITHOUT ROWID;
+    {_kpi_backfill_sql()}
+    ''')
+    _execute_script(cur, _kpi_triggers_sql())
+
+
+def _kpi_backfill_sql():
+    """Recalcular kpi_mensual completo desde nc"""
+    return f"DELETE FROM kpi_mensual;\n{_kpi_merge_sql('1')}"
+
+
+def rebuild_kpi_summary(cur):
+    """Recalcular kpi_mensual desde nc dentro de la transacción actual (la misma consulta de la migración)"""
+    _execute_script(cur, _kpi_backfill_sql())
+
+
+def _kpi_merge_sql(where):
+    """Sumar a kpi_mensual las NC que cumplen where, agrupadas en una sola sentencia"""
+    sets = ', '.join(f"{m} = {m} + excluded.{m}" for m in ('cantidad',) + KPI_MEASURES)
+    return f'''
+    INSERT INTO kpi_mensual (mes, cliente, cod_producto, cantidad, {', '.join(KPI_MEASURES)})
+    SELECT {_kpi_key('nc')}, COUNT(*), {', '.join(f"TOTAL(nc.{m})" for m in KPI_MEASURES)}
+    FROM nc WHERE {where} GROUP BY 1, 2, 3
+    ON CONFLICT(mes, cliente, cod_producto) DO UPDATE SET {sets};
+    '''
+
+
+# Dimensiones de pareto_mensual con un valor por NC (la categoría Ishikawa puede tener varios)
+PARETO_DIMENSIONS = ('falla', 'cliente', 'cod_producto')
+
+
+def _pareto_add_sql(alias, sign, dict_columns=()):
+    """Sumar o restar una fila de nc en pareto_mensual: una fila por dimensión y una por categoría Ishikawa"""
+    mes = f"COALESCE(substr({alias}.fecha, 1, 7), '')"
+    values = f"{sign}1, {sign}COALESCE({alias}.costo, 0)"
+    upsert = ("ON CONFLICT(dimension, mes, valor) DO UPDATE SET "
+              "cantidad = cantidad + excluded.cantidad, costo = costo + excluded.costo;")
+    dims = ', '.join(f"('{d}', COALESCE(trim({_col(alias, d, dict_columns)}), ''))" for d in PARETO_DIMENSIONS)
+    categorias = ', '.join(f"('{c}')" for c in ISHIKAWA_CATEGORIAS)
+    insert = "INSERT INTO pareto_mensual (dimension, mes, valor, cantidad, costo)"
+    return (f"{insert} SELECT d.column1, {mes}, d.column2, {values} FROM (VALUES {dims}) d WHERE 1 {upsert}\n"
+            f"        {insert} SELECT 'ishikawa', {mes}, c.column1, {values} FROM (VALUES {categorias}) c "
+            f"WHERE instr(';;' || COALESCE({alias}.ishikawa, ''), ';;' || c.column1 || ':|') > 0 {upsert}")
+
+
+def _pareto_prune_sql(dict_columns=()):
+    """Eliminar los grupos de la fila anterior que quedaron sin NC (por clave exacta)"""
+    mes = "COALESCE(substr(OLD.fecha, 1, 7), '')"
+    deletes = [f"DELETE FROM pareto_mensual WHERE dimension = '{d}' AND mes = {mes} "
+               f"AND valor = COALESCE(trim({_col('OLD', d, dict_columns)}), '') AND cantidad = 0;"
+               for d in PARETO_DIMENSIONS]
+    deletes.append(f"DELETE FROM pareto_mensual WHERE dimension = 'ishikawa' AND mes = {mes} AND cantidad = 0;")
+    return '\n        '.join(deletes)
+
+
+def _m3_pareto_summary(cur):
+    """Frecuencia y costo por mes de cada falla, cliente, producto y categoría Ishikawa,
+    mantenidos por triggers (kpi_mensual cruza cliente × producto y tiene demasiados grupos para esto)"""
+    _execute_script(cur, f'''
+    CREATE TABLE IF NOT EXISTS pareto_mensual (
+        dimension TEXT NOT NULL,
+        mes TEXT NOT NULL,
+        valor TEXT NOT NULL,
+        cantidad INTEGER NOT NULL DEFAULT 0,
+        costo REAL NOT NULL DEFAULT 0,
+        PRIMARY KEY (dimension, mes, valor)
+    ) WITHOUT ROWID;
+    {_pareto_backfill_sql()}
+    ''')
+    _execute_script(cur, _pareto_triggers_sql())
+
+
+def _pareto_backfill_sql():
+    """Recalcular pareto_mensual completo desde nc"""
+    return f"DELETE FROM pareto_mensual;\n{_pareto_merge_sql('1')}"
+
+
+def _pareto_merge_sql(where):
+    """Sumar a pareto_mensual las NC que cumplen where: una sentencia agrupada por dimensión"""
+    categorias = ', '.join(f"('{c}')" for c in ISHIKAWA_CATEGORIAS)
+    upsert = ("ON CONFLICT(dimension, mes, valor) DO UPDATE SET "
+              "cantidad = cantidad + excluded.cantidad, costo = costo + excluded.costo;")
+    dims = '\n'.join(f'''
+    INSERT INTO pareto_mensual (dimension, mes, valor, cantidad, costo)
+    SELECT '{d}', COALESCE(substr(n.fecha, 1, 7), ''), COALESCE(trim(n.{d}), ''), COUNT(*), TOTAL(n.costo)
+    FROM nc n WHERE {where} GROUP BY 2, 3 {upsert}''' for d in PARETO_DIMENSIONS)
+    return f'''{dims}
+    INSERT INTO pareto_mensual (dimension, mes, valor, cantidad, costo)
+    SELECT 'ishikawa', COALESCE(substr(n.fecha, 1, 7), ''), c.column1, COUNT(*), TOTAL(n.costo)
+    FROM nc n JOIN (VALUES {categorias}) c
+      ON instr(';;' || COALESCE(n.ishikawa, ''), ';;' || c.column1 || ':|') > 0
+    WHERE {where} GROUP BY 2, 3 {upsert}
+    '''
+
+
+def _pareto_triggers_sql(table='nc', dict_columns=()):
+    """Triggers que mantienen pareto_mensual sobre la tabla física de nc"""
+    tracked = _tracked(('fecha', 'costo', 'ishikawa') + PARETO_DIMENSIONS, dict_columns)
+    return f'''
+    CREATE TRIGGER IF NOT EXISTS trg_nc_pareto_ins AFTER INSERT ON {table}
+    BEGIN
+        {_pareto_add_sql('NEW', '+', dict_columns)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_nc_pareto_upd AFTER UPDATE OF {tracked} ON {table}
+    BEGIN
+        {_pareto_add_sql('OLD', '-', dict_columns)}
+        {_pareto_prune_sql(dict_columns)}
+        {_pareto_add_sql('NEW', '+', dict_columns)}
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_nc_pareto_del AFTER DELETE ON {table}
+    BEGIN
+        {_pareto_add_sql('OLD', '-', dict_columns)}
+        {_pareto_prune_sql(dict_columns)}
+    END;
+    '''
+
+
+def _m4_falla_indexes(cur):
+    """Índices para buscar NC por falla y por producto (detección de duplicados)"""
+    _execute_script(cur, '''
+    CREATE INDEX IF NOT EXISTS idx_nc_falla ON nc(falla);
+    CREATE INDEX IF NOT EXISTS idx_nc_producto_falla ON nc(cod_producto, falla);
+    ''')
+
+
+def _m5_product_catalog(cur):
+    """Catálogo de productos (código -> descripción) y nc.producto_id entero mantenido por triggers.
+    Los códigos cargados a mano se agregan al catálogo; la importación del ERP actualiza descripciones"""
+    existing = {r[1] for r in cur.execute("PRAGMA table_info(nc)")}
+    if 'producto_id' not in existing:
+        cur.execute("ALTER TABLE nc ADD COLUMN producto_id INTEGER REFERENCES productos(id)")
+    _execute_script(cur, '''
+    CREATE TABLE IF NOT EXISTS productos (
+        id INTEGER PRIMARY KEY,
+        cod_producto TEXT NOT NULL UNIQUE,
+        desc_producto TEXT NOT NULL DEFAULT ''
+    );
+
+    -- Descripción de la NC más reciente de cada código (columnas sueltas con MAX: fila del máximo)
+    INSERT OR IGNORE INTO productos (cod_producto, desc_producto)
+    SELECT cod, descripcion FROM (
+        SELECT trim(cod_producto) AS cod, coalesce(desc_producto, '') AS descripcion, MAX(id)
+        FROM nc WHERE trim(coalesce(cod_producto, '')) <> '' GROUP BY trim(cod_producto)
+    ) ORDER BY cod;
+
+    -- Sin el trigger de versión durante el relleno, para no marcar todas las NC como modificadas
+    DROP TRIGGER IF EXISTS trg_nc_version_upd;
+    UPDATE nc SET producto_id = (SELECT p.id FROM productos p WHERE p.cod_producto = trim(nc.cod_producto));
+    CREATE INDEX IF NOT EXISTS idx_nc_producto_id ON nc(producto_id);
+
+    CREATE TRIGGER IF NOT EXISTS trg_nc_producto_ins AFTER INSERT ON nc
+    WHEN trim(coalesce(NEW.cod_producto, '')) <> ''
+    BEGIN
+        INSERT INTO productos (cod_producto, desc_producto)
+        VALUES (trim(NEW.cod_producto), coalesce(NEW.desc_producto, ''))
+        ON CONFLICT(cod_producto) DO NOTHING;
+        UPDATE nc SET producto_id = (SELECT id FROM productos WHERE cod_producto = trim(NEW.cod_producto))
+        WHERE id = NEW.id;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_nc_producto_upd AFTER UPDATE OF cod_producto ON nc
+    WHEN NEW.cod_producto IS NOT OLD.cod_producto
+    BEGIN
+        INSERT INTO productos (cod_producto, desc_producto)
+        SELECT trim(NEW.cod_producto), coalesce(NEW.desc_producto, '')
+        WHERE trim(coalesce(NEW.cod_producto, '')) <> ''
+        ON CONFLICT(cod_producto) DO NOTHING;
+        UPDATE nc SET producto_id = (SELECT id FROM productos WHERE cod_producto = trim(NEW.cod_producto))
+        WHERE id = NEW.id;
+    END;
+    ''')
+    _execute_script(cur, _version_triggers_sql('nc', 'nc'))
+
+
+def _view_triggers_sql(view, table, write_columns, dict_columns):
+    """INSTEAD OF sobre la vista histórica: las escrituras con texto siguen funcionando
+    y se traducen a ids (dando de alta los valores nuevos en su diccionario)"""
+    ensure = '\n        '.join(f"{d.ensure_sql('NEW.')};" for d in dict_columns)
+    columns = ('id',) + write_columns
+    insert = schema.data_insert_sql(table, columns, dict_columns, prefix='NEW.')
+    update = schema.data_update_sql(table, columns, 'id', dict_columns, prefix='NEW.', where='id = OLD.id')
+    return f'''
+    CREATE TRIGGER IF NOT EXISTS trg_{view}_vista_ins INSTEAD OF INSERT ON {view}
+    BEGIN
+        {ensure}
+        {insert};
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_{view}_vista_upd INSTEAD OF UPDATE ON {view}
+    BEGIN
+        {ensure}
+        {update};
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_{view}_vista_del INSTEAD OF DELETE ON {view}
+    BEGIN
+        DELETE FROM {table} WHERE id = OLD.id;
+    END;
+    '''
+
+
+def _m6_dictionary_encoding(cur):
+    """Codificar cliente, producto, descripción, responsable y estado como ids de tablas diccionario.
+    Los datos pasan a nc_datos / acciones_datos; nc y acciones quedan como vistas con las columnas
+    de texto de siempre, así que las consultas y exportaciones existentes no cambian"""
+    # (vista, tabla física, esquema lógico, columnas codificadas, ids visibles en la vista, restricciones)
+    tables = (('nc', schema.NC_DATA_TABLE, schema.NC_SCHEMA, schema.NC_DICT_COLUMNS, ('producto_id',), ()),
+              ('acciones', schema.ACCION_DATA_TABLE, schema.ACCION_SCHEMA, schema.ACCION_DICT_COLUMNS, (),
+               (f'FOREIGN KEY(nc_id) REFERENCES {schema.NC_DATA_TABLE}(id)',)))
+    for view, table, fields, dict_columns, ids, extra in tables:
+        for d in dict_columns:
+            cur.execute(d.ddl())       # productos ya existe (migración 5)
+            value = d.value_sql(f'{view}.{d.column}')
+            cols = [d.key] + [c for c, _ in d.extra]
+            values = [value] + [f"COALESCE({view}.{src}, '')" for _, src in d.extra]
+            cur.execute(f"INSERT OR IGNORE INTO {d.table} ({', '.join(cols)}) "
+                        f"SELECT {', '.join(values)} FROM {view} WHERE {value} IS NOT NULL ORDER BY {view}.id")
+        cur.execute(schema.create_table_sql(table, schema.data_fields(fields, dict_columns), extra))
+        columns = ('id',) + tuple(f.column for f in fields)
+        cur.execute(schema.data_insert_sql(table, columns, dict_columns, prefix=f'{view}.', source=view))
+        # Conservar el contador de AUTOINCREMENT (los ids borrados no se reutilizan)
+        _execute_script(cur, f'''
+        UPDATE sqlite_sequence SET seq = MAX(seq, (SELECT seq FROM sqlite_sequence WHERE name = '{view}'))
+        WHERE name = '{table}';
+        INSERT INTO sqlite_sequence (name, seq)
+        SELECT '{table}', seq FROM sqlite_sequence
+        WHERE name = '{view}' AND NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = '{table}');
+        ''')
+    # Borrar las tablas de texto (se llevan sus índices y triggers) y crear las vistas
+    cur.execute("DROP TABLE acciones")
+    cur.execute("DROP TABLE nc")
+    for view, table, fields, dict_columns, ids, extra in tables:
+        cur.execute(schema.view_sql(view, table, fields, dict_columns, ids))
+        write_columns = tuple(f.column for f in fields if f.writable)
+        _execute_script(cur, _version_triggers_sql(view, table))
+        _execute_script(cur, _view_triggers_sql(view, table, write_columns, dict_columns))
+    _execute_script(cur, f'''
+    CREATE INDEX IF NOT EXISTS idx_nc_row_version ON {schema.NC_DATA_TABLE}(row_version);
+    CREATE INDEX IF NOT EXISTS idx_nc_falla ON {schema.NC_DATA_TABLE}(falla);
+    CREATE INDEX IF NOT EXISTS idx_nc_producto_falla ON {schema.NC_DATA_TABLE}(producto_id, falla);
+    CREATE INDEX IF NOT EXISTS idx_acciones_row_version ON {schema.ACCION_DATA_TABLE}(row_version);
+    CREATE INDEX IF NOT EXISTS idx_acciones_nc_id ON {schema.ACCION_DATA_TABLE}(nc_id);
+    ''')
+    _execute_script(cur, _kpi_triggers_sql(schema.NC_DATA_TABLE, schema.NC_DICT_COLUMNS))
+    _execute_script(cur, _pareto_triggers_sql(schema.NC_DATA_TABLE, schema.NC_DICT_COLUMNS))
+    # Los códigos de producto ahora se leen sin espacios en los extremos (como en pareto_mensual)
+    _execute_script(cur, _kpi_backfill_sql())
+
+
+def _m7_timestamps(cur):
+    """created_at / updated_at de nc como epoch UTC con índice, e índice por fecha de realización de acciones.
+    Las NC existentes toman ambas marcas de fecha (la única fecha guardada hasta ahora)"""
+    table = schema.NC_DATA_TABLE
+    # Sin los triggers de versión durante el relleno, para no marcar todas las NC como modificadas
+    _execute_script(cur, '''
+    DROP TRIGGER IF EXISTS trg_nc_version_ins;
+    DROP TRIGGER IF EXISTS trg_nc_version_upd;
+    DROP VIEW IF EXISTS nc;
+    ''')
+    existing = {r[1] for r in cur.execute(f"PRAGMA table_info({table})")}
+    for column in ('created_at', 'updated_at'):
+        if column not in existing:
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {column} INTEGER")
+    fecha = f"COALESCE({_epoch_sql('fecha')}, {NOW_EPOCH_SQL})"
+    _execute_script(cur, f'''
+    UPDATE {table} SET created_at = COALESCE(created_at, {fecha}), updated_at = COALESCE(updated_at, {fecha})
+    WHERE created_at IS NULL OR updated_at IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_nc_created_at ON {table}(created_at);
+    CREATE INDEX IF NOT EXISTS idx_nc_updated_at ON {table}(updated_at);
+    CREATE INDEX IF NOT EXISTS idx_acciones_fecha_realizacion ON {schema.ACCION_DATA_TABLE}(fecha_realizacion);
+    ''')
+    # La vista se recrea con las columnas nuevas (y con ella sus triggers INSTEAD OF)
+    cur.execute(schema.view_sql('nc', table, schema.NC_SCHEMA, schema.NC_DICT_COLUMNS, ('producto_id',)))
+    _execute_script(cur, _view_triggers_sql('nc', table, schema.NC_WRITE_COLUMNS, schema.NC_DICT_COLUMNS))
+    _execute_script(cur, _version_triggers_sql('nc', table, timestamps=True))
+
+
+def _m8_overdue_actions(cur):
+    """Índice parcial de acciones abiertas por fecha de realización y vista acciones_vencidas.
+    El estado es un id del diccionario: 'Cerrada' se da de alta para fijar su id en el índice"""
+    cur.execute(f"INSERT OR IGNORE INTO estados (valor) VALUES ('{overdue.CLOSED_STATE}')")
+    closed_id = cur.execute("SELECT id FROM estados WHERE valor = ?", (overdue.CLOSED_STATE,)).fetchone()[0]
+    cur.execute(overdue.overdue_index_sql(closed_id))
+    cur.execute(overdue.overdue_view_sql(closed_id))
+
+
+# (versión, descripción, función). Agregar siempre al final con versión creciente.
+MIGRATIONS = [
+    (1, "Seguimiento de cambios para exportación incremental", _m1_change_tracking),
+    (2, "Indicadores mensuales precalculados por cliente y producto", _m2_kpi_summary),
+    (3, "Resumen mensual por falla, cliente, producto y causa Ishikawa para Pareto", _m3_pareto_summary),
+    (4, "Índices por falla y producto para detectar NC duplicadas", _m4_falla_indexes),
+    (5, "Catálogo de productos e id entero de producto en nc", _m5_product_catalog),
+    (6, "Columnas de texto repetido codificadas con diccionarios (nc y acciones pasan a ser vistas)",
+     _m6_dictionary_encoding),
+    (7, "Marcas created_at / updated_at en nc e índices por rango de fechas", _m7_timestamps),
+    (8, "Índice parcial de acciones abiertas por vencimiento y vista acciones_vencidas", _m8_overdue_actions),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn, target=None):
+    """Aplicar las migraciones pendientes (hasta target si se indica). Devuelve la lista de versiones aplicadas"""
+    current = get_version(conn)
+    applied = []
+    for version, description, func in MIGRATIONS:
+        if version <= current or (target is not None and version > target):
+            continue
+        logger.info(f"Aplicando migración {version}: {description}")
+        cur = conn.cursor()
+        try:
+            cur.execute("BEGIN")
+            func(cur)
+            cur.execute(f"PRAGMA user_version = {version}")
+            cur.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                cur.execute("ROLLBACK")
+            logger.error(f"Error en migración {version}: se revirtió")
+            raise
+        applied.append(version)
+    return applied
+
+
+# Importación masiva (db/bulk_import.py): estos triggers por fila de nc_datos se suspenden durante la carga;
+# row_version y las marcas se completan por lote y los resúmenes se recalculan una vez al final
+BULK_SUSPENDED_TRIGGERS = ('trg_nc_version_ins',) + tuple(
+    f'trg_nc_{summary}_{event}' for summary in ('kpi', 'pareto') for event in ('ins', 'upd', 'del'))
+
+
+def missing_bulk_triggers(cur):
+    """Triggers de BULK_SUSPENDED_TRIGGERS que faltan en la base (p. ej. tras una carga interrumpida
+    en una versión anterior): se reponen con restore_bulk_triggers"""
+    placeholders = ', '.join('?' * len(BULK_SUSPENDED_TRIGGERS))
+    present = {r[0] for r in cur.execute(
+        f"SELECT name FROM sqlite_master WHERE type = 'trigger' AND name IN ({placeholders})",
+        BULK_SUSPENDED_TRIGGERS)}
+    return [name for name in BULK_SUSPENDED_TRIGGERS if name not in present]
+
+
+def suspend_bulk_triggers(cur):
+    """Quitar los triggers de BULK_SUSPENDED_TRIGGERS (restore_bulk_triggers los repone)"""
+    for name in BULK_SUSPENDED_TRIGGERS:
+        cur.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+
+def stamp_bulk_rows(cur):
+    """row_version, created_at y updated_at de las NC insertadas sin trg_nc_version_ins (una versión por lote)"""
+    _execute_script(cur, f'''
+    UPDATE cambios_seq SET valor = valor + 1 WHERE id = 1;
+    UPDATE {schema.NC_DATA_TABLE} SET row_version = (SELECT valor FROM cambios_seq WHERE id = 1),
+        {_insert_timestamps_sql('')}
+    WHERE row_version IS NULL;
+    ''')
+
+
+def restore_bulk_triggers(cur, since_id=None):
+    """Reponer los triggers suspendidos y poner al día kpi_mensual y pareto_mensual con INSERT ... SELECT ... GROUP BY.
+    Con since_id (carga sólo de altas) se suman las NC de id mayor; sin él ambos se recalculan completos"""
+    stamp_bulk_rows(cur)
+    _execute_script(cur, _version_triggers_sql('nc', schema.NC_DATA_TABLE, timestamps=True))
+    _execute_script(cur, _kpi_triggers_sql(schema.NC_DATA_TABLE, schema.NC_DICT_COLUMNS))
+    _execute_script(cur, _pareto_triggers_sql(schema.NC_DATA_TABLE, schema.NC_DICT_COLUMNS))
+    if since_id is None:
+        _execute_script(cur, _kpi_backfill_sql())
+        _execute_script(cur, _pareto_backfill_sql())
+    else:
+        _execute_script(cur, _kpi_merge_sql(f'id > {int(since_id)}'))
+        _execute_script(cur, _pareto_merge_sql(f'id > {int(since_id)}'))
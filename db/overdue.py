@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Acciones correctivas vencidas: abiertas (estado distinto de 'Cerrada') con fecha de
+realización anterior a hoy
+El índice parcial idx_acciones_abiertas (migración 8) sólo contiene las acciones no
+cerradas, ordenadas por fecha de realización, así que la consulta recorre las vencidas
+y no toda la tabla. El estado se guarda como id del diccionario estados: el filtro usa
+el id de 'Cerrada' como literal, igual que el índice, y las consultas lo piden con
+INDEXED BY (con pocas filas o sin ANALYZE el planificador elegiría el índice completo).
+Uso sin interfaz: python -m db.overdue [--db archivo] [--fecha AAAA-MM-DD] [--por-responsable]
+"""
+
+import logging
+import sys
+from datetime import date
+from pathlib import Path
+
+from .dates import to_iso_date
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATE = 'Cerrada'
+OVERDUE_INDEX = 'idx_acciones_abiertas'
+OVERDUE_VIEW = 'acciones_vencidas'
+TODAY_SQL = "date('now', 'localtime')"
+
+
+def closed_state_id(conn):
+    """Id de 'Cerrada' en el diccionario estados (la migración 8 lo da de alta)"""
+    row = conn.execute("SELECT id FROM estados WHERE valor = ?", (CLOSED_STATE,)).fetchone()
+    return row[0] if row else None
+
+
+def open_filter_sql(closed_id, alias=''):
+    """Condición de acción abierta; debe coincidir literalmente con la del índice parcial"""
+    return f"{alias}estado_id IS NOT {int(closed_id)}"
+
+
+def overdue_index_sql(closed_id):
+    return (f"CREATE INDEX IF NOT EXISTS {OVERDUE_INDEX} "
+            f"ON acciones_datos(fecha_realizacion, responsable_id, estado_id) WHERE {open_filter_sql(closed_id)}")
+
+
+def overdue_select_sql(closed_id, today=':hoy', where=None):
+    """Acciones abiertas con fecha_realizacion en ['', today), las más atrasadas primero.
+    today es un parámetro (':hoy') o una expresión SQL (la vista usa la fecha actual)"""
+    extra = f" AND {where}" if where else ''
+    return f'''SELECT a.id, a.nc_id, n.nro_nc, a.tarea, r.valor AS responsable, a.fecha_realizacion,
+           e.valor AS estado, CAST(julianday({today}) - julianday(a.fecha_realizacion) AS INTEGER) AS dias_vencida
+    FROM acciones_datos a INDEXED BY {OVERDUE_INDEX}
+    JOIN nc_datos n ON n.id = a.nc_id
+    LEFT JOIN responsables r ON r.id = a.responsable_id
+    LEFT JOIN estados e ON e.id = a.estado_id
+    WHERE {open_filter_sql(closed_id, 'a.')} AND a.fecha_realizacion > '' AND a.fecha_realizacion < {today}{extra}
+    ORDER BY a.fecha_realizacion, a.id'''
+
+
+def overdue_view_sql(closed_id):
+    return f"CREATE VIEW IF NOT EXISTS {OVERDUE_VIEW} AS {overdue_select_sql(closed_id, TODAY_SQL)}"
+
+
+def _today(today):
+    return to_iso_date(today or date.today())
+
+
+def overdue_actions(conn, today=None, responsable=None):
+    """Acciones vencidas a la fecha today (por defecto hoy), opcionalmente de un responsable"""
+    closed_id = closed_state_id(conn)
+    if closed_id is None:
+        return []
+    where = "r.valor = :responsable" if responsable is not None else None
+    sql = overdue_select_sql(closed_id, where=where)
+    return conn.execute(sql, {'hoy': _today(today), 'responsable': responsable}).fetchall()
+
+
+def overdue_by_responsable(conn, today=None):
+    """Cantidad de acciones vencidas por responsable y la fecha más atrasada de cada uno.
+    Sólo lee el índice parcial (cubre responsable_id y estado_id) y el diccionario de responsables"""
+    closed_id = closed_state_id(conn)
+    if closed_id is None:
+        return []
+    sql = f'''SELECT r.valor AS responsable, v.cantidad, v.mas_antigua FROM (
+        SELECT responsable_id, COUNT(*) AS cantidad, MIN(fecha_realizacion) AS mas_antigua
+        FROM acciones_datos INDEXED BY {OVERDUE_INDEX}
+        WHERE {open_filter_sql(closed_id)} AND fecha_realizacion > '' AND fecha_realizacion < :hoy
+        GROUP BY responsable_id
+    ) v LEFT JOIN responsables r ON r.id = v.responsable_id
+    ORDER BY v.cantidad DESC, v.mas_antigua'''
+    return conn.execute(sql, {'hoy': _today(today)}).fetchall()
+
+
+def overdue_count(conn, today=None):
+    return sum(row['cantidad'] for row in overdue_by_responsable(conn, today))
+
+
+def main(argv=None):
+    import argparse     # sólo la línea de comandos: la aplicación importa este módulo al migrar
+    parser = argparse.ArgumentParser(description="Listado de acciones correctivas abiertas vencidas")
+    parser.add_argument('--db', default=str(Path.cwd() / 'nc_ac_faben.db'), help="Base de datos SQLite")
+    parser.add_argument('--fecha', help="Fecha de referencia AAAA-MM-DD (por defecto hoy)")
+    parser.add_argument('--responsable', help="Sólo las acciones de este responsable")
+    parser.add_argument('--por-responsable', action='store_true', help="Sólo la cantidad por responsable")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+
+    from .repository import connect, init_schema
+    conn = connect(args.db)
+    try:
+        init_schema(conn)
+        if args.por_responsable:
+            rows = overdue_by_responsable(conn, args.fecha)
+            for row in rows:
+                print(f"{row['responsable'] or '(sin responsable)'}: {row['cantidad']} "
+                      f"(la más atrasada del {row['mas_antigua']})")
+            total = sum(row['cantidad'] for row in rows)
+        else:
+            rows = overdue_actions(conn, args.fecha, args.responsable)
+            for row in rows:
+                print(f"NC {row['nro_nc']} - {row['tarea']} - {row['responsable'] or '(sin responsable)'} - "
+                      f"vencida el {row['fecha_realizacion']} ({row['dias_vencida']} días) - {row['estado']}")
+            total = len(rows)
+    finally:
+        conn.close()
+
+    print(f"{'⚠️' if total else '✅'} {total} acciones vencidas al {_today(args.fecha)}")
+    # Código de salida 1 si hay vencidas, para usarlo desde tareas programadas
+    return 1 if total else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Análisis de Pareto de NC por falla, producto, cliente y categoría Ishikawa
+Las sumas por mes ya están precalculadas por triggers en pareto_mensual (migración 3),
+así que un rango de meses se resuelve recorriendo grupos con la clave primaria.
+El acumulado se calcula con NumPy si está instalado. Los resultados se guardan
+en caché por (dimensión, métrica, rango).
+"""
+
+import importlib.util
+import logging
+from collections import OrderedDict
+from itertools import accumulate
+from typing import NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None
+
+# dimensión: etiqueta (todas se leen de pareto_mensual, clave primaria (dimension, mes, valor))
+DIMENSIONS = {
+    'falla': 'Falla',
+    'ishikawa': 'Categoría Ishikawa',
+    'cod_producto': 'Cod. Producto',
+    'cliente': 'Cliente',
+}
+METRICS = {'cantidad': 'Cantidad de NC', 'costo': 'Costo'}
+
+PARETO_HEADERS = ('valor', 'cantidad', 'costo', 'porcentaje', 'acumulado')
+
+
+class ParetoItem(NamedTuple):
+    valor: str
+    cantidad: int
+    costo: float
+    porcentaje: float    # % de la métrica sobre el total
+    acumulado: float     # % acumulado hasta este elemento
+
+
+class ParetoResult(NamedTuple):
+    dimension: str
+    metric: str
+    desde: Optional[str]
+    hasta: Optional[str]
+    total: float
+    items: Tuple[ParetoItem, ...]
+
+    def vital_few(self, threshold=80.0):
+        """Elementos que acumulan hasta el umbral (incluido el que lo cruza)"""
+        out = []
+        for item in self.items:
+            out.append(item)
+            if item.acumulado >= threshold:
+                break
+        return out
+
+
+def pareto_sql(dimension, metric, desde=None, hasta=None):
+    """Consulta agregada de un rango de meses 'YYYY-MM' (inclusive) y sus parámetros"""
+    if dimension not in DIMENSIONS:
+        raise ValueError(f"Dimensión de Pareto desconocida: {dimension} (opciones: {', '.join(DIMENSIONS)})")
+    if metric not in METRICS:
+        raise ValueError(f"Métrica de Pareto desconocida: {metric} (opciones: {', '.join(METRICS)})")
+    clauses, params = ["dimension = ?"], [dimension]
+    if desde:
+        clauses.append("mes >= ?")
+        params.append(desde)
+    if hasta:
+        clauses.append("mes <= ?")
+        params.append(hasta)
+    sql = (f"SELECT valor, SUM(cantidad) AS cantidad, SUM(costo) AS costo FROM pareto_mensual "
+           f"WHERE {' AND '.join(clauses)} GROUP BY valor ORDER BY {metric} DESC, valor")
+    return sql, params
+
+
+def _percentages(values):
+    """(porcentajes, acumulados, total) de una serie ya ordenada de mayor a menor"""
+    if HAS_NUMPY:
+        import numpy as np
+        arr = np.asarray(values, dtype=float)
+        total = float(arr.sum())
+        if not total:
+            return [0.0] * len(values), [0.0] * len(values), 0.0
+        pct = arr * (100.0 / total)
+        return pct.tolist(), np.cumsum(pct).tolist(), total
+    total = float(sum(values))
+    if not total:
+        return [0.0] * len(values), [0.0] * len(values), 0.0
+    pct = [v * 100.0 / total for v in values]
+    return pct, list(accumulate(pct)), total
+
+
+def compute_pareto(conn, dimension='falla', metric='cantidad', desde=None, hasta=None, top=None):
+    """Pareto sin caché. top limita los elementos devueltos (los porcentajes usan el total completo)"""
+    sql, params = pareto_sql(dimension, metric, desde, hasta)
+    rows = conn.execute(sql, params).fetchall()
+    values = [row[metric] or 0 for row in rows]
+    pct, acc, total = _percentages(values)
+    items = tuple(ParetoItem(r['valor'], r['cantidad'], round(r['costo'] or 0, 2), p, a)
+                  for r, p, a in zip(rows[:top] if top else rows, pct, acc))
+    return ParetoResult(dimension, metric, desde, hasta, total, items)
+
+
+class ParetoEngine:
+    """Pareto con caché LRU por (dimensión, métrica, desde, hasta, top).
+    La caché se vacía cuando cambia la base: escrituras propias (total_changes)
+    o de otra conexión (PRAGMA data_version)"""
+
+    def __init__(self, conn, maxsize=64):
+        self.conn = conn
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._state = self._db_state()
+
+    def _db_state(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0], self.conn.total_changes
+
+    def get(self, dimension='falla', metric='cantidad', desde=None, hasta=None, top=None) -> ParetoResult:
+        state = self._db_state()
+        if state != self._state:
+            self._entries.clear()
+            self._state = state
+        key = (dimension, metric, desde or None, hasta or None, top)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        entry = compute_pareto(self.conn, *key)
+        self._entries[key] = entry
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
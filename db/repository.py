@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Capa de acceso a datos para NC AC FABEN
+Repositorios de NC y acciones con un conjunto fijo de sentencias parametrizadas,
+independientes de la interfaz gráfica (no requieren Qt).
+Se lee de las vistas nc / acciones y se escribe en las tablas físicas codificadas
+(migración 6), dando de alta antes los textos nuevos en sus diccionarios.
+"""
+
+import logging
+import sqlite3
+from itertools import islice
+
+from . import schema
+from .dates import to_epoch, to_iso_date
+from .migrations import SCHEMA_VERSION, get_version, migrate, missing_bulk_triggers, restore_bulk_triggers
+
+logger = logging.getLogger(__name__)
+
+# Límite de parámetros por sentencia en versiones antiguas de SQLite
+MAX_PARAMS = 900
+# Filas por executemany en las escrituras masivas (los diccionarios se completan por lote)
+WRITE_BATCH_SIZE = 10000
+
+# --- Sentencias de NC ---
+NC_EXISTS_SQL = f"SELECT 1 FROM {schema.NC_DATA_TABLE} WHERE nro_nc=? LIMIT 1"
+NC_ID_SQL = f"SELECT id FROM {schema.NC_DATA_TABLE} WHERE nro_nc=?"
+NC_COUNT_SQL = f"SELECT COUNT(*) FROM {schema.NC_DATA_TABLE}"
+NC_ID_MAP_SQL = f"SELECT nro_nc, id FROM {schema.NC_DATA_TABLE}"
+NC_NEXT_NRO_SQL = f"SELECT COALESCE(MAX(nro_nc), 0) + 1 FROM {schema.NC_DATA_TABLE}"
+NC_UPSERT_SQL = (schema.NC_DATA_INSERT_SQL + " ON CONFLICT(nro_nc) DO UPDATE SET "
+                 + ','.join(f'{f.column}=excluded.{f.column}' for f in schema.NC_DATA_SCHEMA
+                            if f.writable and f.column != 'nro_nc'))
+
+# --- Sentencias de acciones ---
+ACCION_SELECT_BY_NC_SQL = schema.select_sql('acciones', schema.ACCION_COLUMNS, where='nc_id=?') + " ORDER BY id"
+ACCION_DELETE_BY_NC_SQL = f"DELETE FROM {schema.ACCION_DATA_TABLE} WHERE nc_id=?"
+ACCION_SELECT_ALL_SQL = schema.select_sql('acciones', schema.ACCION_COLUMNS) + " ORDER BY id"
+
+# Todas las sentencias fijas; las consultas IN (...) por lotes varían según el tamaño del lote
+STATEMENTS = (
+    schema.NC_DATA_INSERT_SQL, schema.NC_DATA_UPDATE_SQL, schema.NC_SELECT_BY_NRO_SQL, schema.NC_SELECT_ALL_SQL,
+    schema.ACCION_DATA_INSERT_SQL, NC_EXISTS_SQL, NC_ID_SQL, NC_COUNT_SQL, NC_ID_MAP_SQL, NC_NEXT_NRO_SQL,
+    NC_UPSERT_SQL, ACCION_SELECT_BY_NC_SQL, ACCION_DELETE_BY_NC_SQL, ACCION_SELECT_ALL_SQL,
+) + schema.NC_DICT_ENSURE_SQL + schema.ACCION_DICT_ENSURE_SQL
+
+# Columna que da de alta cada sentencia de diccionario: por lote basta una fila por valor distinto
+ENSURE_COLUMNS = dict(zip(schema.NC_DICT_ENSURE_SQL + schema.ACCION_DICT_ENSURE_SQL,
+                          [d.column for d in schema.NC_DICT_COLUMNS + schema.ACCION_DICT_COLUMNS]))
+
+# Caché de sentencias de la conexión: las fijas más margen para las variantes por lote
+STATEMENT_CACHE_SIZE = len(STATEMENTS) + 64
+
+
+def connect(db_file):
+    """Abrir conexión con caché de sentencias dimensionado y filas sqlite3.Row"""
+    conn = sqlite3.connect(db_file, cached_statements=STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def schema_is_current(conn):
+    """La base ya tiene todas las migraciones (las tablas y columnas nuevas llegan por migración)
+    y conserva los triggers que la importación masiva suspende"""
+    return get_version(conn) == SCHEMA_VERSION and not missing_bulk_triggers(conn)
+
+
+def init_schema(conn):
+    """Crear/verificar las tablas del esquema y devolver las columnas agregadas por tabla.
+    Con la base al día sólo lee PRAGMA user_version y la lista de triggers (arranque de la aplicación)"""
+    if schema_is_current(conn):
+        return {'nc': [], 'acciones': []}
+    cur = conn.cursor()
+    added = {}
+    for table, create_sql, fields in (('nc', schema.NC_CREATE_SQL, schema.NC_SCHEMA),
+                                      ('acciones', schema.ACCION_CREATE_SQL, schema.ACCION_SCHEMA)):
+        row = cur.execute("SELECT type FROM sqlite_master WHERE name=?", (table,)).fetchone()
+        if row and row[0] == 'view':
+            # Base codificada (migración 6): las columnas nuevas las agregan las migraciones
+            added[table] = []
+            continue
+        cur.execute(create_sql)
+        added[table] = schema.ensure_columns(cur, table, fields)
+    conn.commit()
+    migrate(conn)
+    missing = missing_bulk_triggers(conn)
+    if missing:
+        # Reponerlos y recalcular los resúmenes: las NC guardadas sin ellos no tienen versión ni resumen
+        logger.warning(f"Faltaban triggers de la base, se reponen: {', '.join(missing)}")
+        with conn:
+            conn.execute("BEGIN")
+            restore_bulk_triggers(conn)
+    return added
+
+
+def _chunks(values, size=MAX_PARAMS):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _range_sql(table, columns, column, desde, hasta):
+    """SELECT de un rango [desde, hasta) de una columna indexada, ordenado por esa columna"""
+    clauses, params = [], []
+    if desde is not None:
+        clauses.append(f"{column} >= ?")
+        params.append(desde)
+    if hasta is not None:
+        clauses.append(f"{column} < ?")
+        params.append(hasta)
+    return schema.select_sql(table, columns, where=' AND '.join(clauses) or None) + f" ORDER BY {column}", params
+
+
+def _write_many(conn, ensure_sqls, sql, rows):
+    """executemany por lotes: primero los textos nuevos en los diccionarios, después las filas"""
+    rows = iter(rows)
+    total = 0
+    while True:
+        batch = list(islice(rows, WRITE_BATCH_SIZE))
+        if not batch:
+            return total
+        for ensure in ensure_sqls:
+            conn.executemany(ensure, _first_per_value(batch, ENSURE_COLUMNS[ensure]))
+        total += conn.executemany(sql, batch).rowcount
+
+
+def _first_per_value(rows, column):
+    """Primera fila de cada valor de column (el alta es INSERT OR IGNORE: la primera es la que queda)"""
+    first = {}
+    for row in rows:
+        first.setdefault(row[column], row)
+    return first.values()
+
+
+def _write_one(conn, ensure_sqls, sql, params):
+    for ensure in ensure_sqls:
+        conn.execute(ensure, params)
+    return conn.execute(sql, params)
+
+
+class NCRepository:
+    """Acceso a la tabla nc"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def exists(self, nro_nc):
+        return self.conn.execute(NC_EXISTS_SQL, (nro_nc,)).fetchone() is not None
+
+    def get_id(self, nro_nc):
+        row = self.conn.execute(NC_ID_SQL, (nro_nc,)).fetchone()
+        return row[0] if row else None
+
+    def get_by_nro(self, nro_nc):
+        return self.conn.execute(schema.NC_SELECT_BY_NRO_SQL, (nro_nc,)).fetchone()
+
+    def get_many(self, nros):
+        """Obtener varias NC en lotes: {nro_nc: fila}"""
+        result = {}
+        base = schema.select_sql('nc', schema.NC_COLUMNS)
+        for chunk in _chunks(nros):
+            sql = f"{base} WHERE nro_nc IN ({','.join('?' * len(chunk))})"
+            for row in self.conn.execute(sql, chunk):
+                result[row['nro_nc']] = row
+        return result
+
+    def count(self):
+        return self.conn.execute(NC_COUNT_SQL).fetchone()[0]
+
+    def next_nro(self):
+        """Número siguiente al mayor registrado (MAX por el índice único de nro_nc)"""
+        return self.conn.execute(NC_NEXT_NRO_SQL).fetchone()[0]
+
+    def id_map(self):
+        """{nro_nc: id} de todas las NC (recorre sólo el índice de nro_nc)"""
+        return dict(self.conn.execute(NC_ID_MAP_SQL).fetchall())
+
+    def created_between(self, desde=None, hasta=None):
+        """NC dadas de alta en [desde, hasta) (fechas, datetimes o epoch), por el índice de created_at"""
+        sql, params = _range_sql('nc', schema.NC_COLUMNS, 'created_at', to_epoch(desde), to_epoch(hasta))
+        return self.conn.execute(sql, params).fetchall()
+
+    def updated_between(self, desde=None, hasta=None):
+        """NC modificadas por última vez en [desde, hasta), por el índice de updated_at"""
+        sql, params = _range_sql('nc', schema.NC_COLUMNS, 'updated_at', to_epoch(desde), to_epoch(hasta))
+        return self.conn.execute(sql, params).fetchall()
+
+    def iter_all(self, batch_size=1000):
+        """Recorrer todas las NC en orden de id sin cargar la tabla completa en memoria"""
+        cur = self.conn.execute(schema.NC_SELECT_ALL_SQL)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def insert(self, params):
+        return _write_one(self.conn, schema.NC_DICT_ENSURE_SQL, schema.NC_DATA_INSERT_SQL, params).lastrowid
+
+    def update(self, params):
+        _write_one(self.conn, schema.NC_DICT_ENSURE_SQL, schema.NC_DATA_UPDATE_SQL, params)
+        return self.get_id(params['nro_nc'])
+
+    def save(self, params):
+        """Insertar o actualizar una NC según exista su número. Devuelve (id, es_actualizacion)"""
+        if self.exists(params['nro_nc']):
+            return self.update(params), True
+        return self.insert(params), False
+
+    def insert_many(self, rows):
+        return _write_many(self.conn, schema.NC_DICT_ENSURE_SQL, schema.NC_DATA_INSERT_SQL, rows)
+
+    def upsert_many(self, rows):
+        """Insertar o actualizar muchas NC con una sola sentencia preparada"""
+        return _write_many(self.conn, schema.NC_DICT_ENSURE_SQL, NC_UPSERT_SQL, rows)
+
+
+class AccionRepository:
+    """Acceso a la tabla acciones"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def list_for_nc(self, nc_id):
+        return self.conn.execute(ACCION_SELECT_BY_NC_SQL, (nc_id,)).fetchall()
+
+    def get_many(self, nc_ids):
+        """Obtener acciones de varias NC en lotes: {nc_id: [filas]}"""
+        result = {nc_id: [] for nc_id in nc_ids}
+        base = schema.select_sql('acciones', schema.ACCION_COLUMNS)
+        for chunk in _chunks(nc_ids):
+            sql = f"{base} WHERE nc_id IN ({','.join('?' * len(chunk))}) ORDER BY id"
+            for row in self.conn.execute(sql, chunk):
+                result[row['nc_id']].append(row)
+        return result
+
+    def due_between(self, desde=None, hasta=None):
+        """Acciones con fecha de realización en [desde, hasta), por el índice de fecha_realizacion"""
+        sql, params = _range_sql('acciones', schema.ACCION_COLUMNS, 'fecha_realizacion',
+                                 to_iso_date(desde), to_iso_date(hasta))
+        return self.conn.execute(sql, params).fetchall()
+
+    def iter_all(self, batch_size=1000):
+        cur = self.conn.execute(ACCION_SELECT_ALL_SQL)
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            yield from rows
+
+    def delete_for_nc(self, nc_id):
+        return self.conn.execute(ACCION_DELETE_BY_NC_SQL, (nc_id,)).rowcount
+
+    def insert_many(self, rows):
+        return _write_many(self.conn, schema.ACCION_DICT_ENSURE_SQL, schema.ACCION_DATA_INSERT_SQL, rows)
+
+    def replace_for_nc(self, nc_id, rows):
+        """Reemplazar todas las acciones de una NC"""
+        self.delete_for_nc(nc_id)
+        return self.insert_many([dict(r, nc_id=nc_id) for r in rows])
+
+    def upsert_many(self, nc_rows):
+        """Reemplazar las acciones de varias NC: {nc_id: [acciones]}"""
+        self.conn.executemany(ACCION_DELETE_BY_NC_SQL, [(nc_id,) for nc_id in nc_rows])
+        return self.insert_many([dict(r, nc_id=nc_id) for nc_id, rows in nc_rows.items() for r in rows])
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Esquema declarativo de las tablas de NC AC FABEN
+Una única definición de columnas a partir de la cual se generan el formulario,
+las sentencias SQL, el mapeo fila -> widget y los encabezados de exportación
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Tuple
+
+
+def _is_float(s):
+    try:
+        float(s)
+        return True
+    except:
+        return False
+
+
+def _is_int(s):
+    return s.isdigit()
+
+
+def _not_empty(s):
+    return len(s.strip()) > 0
+
+
+@dataclass(frozen=True)
+class FieldDef:
+    """Definición de una columna y, si corresponde, de su campo en el formulario"""
+    column: str
+    sql_type: str
+    label: Optional[str] = None          # Etiqueta en la UI (None = no se edita en el formulario)
+    parser: Callable[[str], Any] = str   # Texto del widget -> valor para la base de datos
+    validator: Optional[Callable[[str], bool]] = None
+    constraint: str = ''                 # Restricción adicional en el DDL (ej. UNIQUE)
+    writable: bool = True                # False = la mantiene la base de datos (triggers), no INSERT/UPDATE
+    date_format: Optional[str] = None    # Formato strftime si la columna TEXT guarda una fecha
+
+    @property
+    def in_form(self):
+        return self.label is not None
+
+    def ddl(self):
+        return f"{self.column} {self.sql_type} {self.constraint}".strip()
+
+
+# Columnas de la tabla nc, en el orden físico de la tabla.
+# Los campos con etiqueta forman el formulario y la cadena de habilitación en este mismo orden.
+NC_SCHEMA: Tuple[FieldDef, ...] = (
+    FieldDef('nro_nc', 'INTEGER', 'Nro NC', int, _is_int, 'UNIQUE'),
+    FieldDef('fecha', 'TEXT', date_format='%Y-%m-%d %H:%M:%S'),
+    FieldDef('resultado_matriz', 'REAL', 'Resultado Matriz', float, _is_float),
+    FieldDef('op', 'INTEGER', 'OP', int, _is_int),
+    FieldDef('cant_invol', 'REAL', 'Cant. Invol.', float, _is_float),
+    FieldDef('cod_producto', 'TEXT', 'Cod. Producto', str, _not_empty),
+    FieldDef('desc_producto', 'TEXT', 'Desc. Producto', str, _not_empty),
+    FieldDef('cliente', 'TEXT', 'Cliente', str, _not_empty),
+    FieldDef('cant_scrap', 'REAL', 'Cant. Scrap', float, _is_float),
+    FieldDef('costo', 'REAL', 'Costo', float, _is_float),
+    FieldDef('cant_recuperada', 'REAL', 'Cant. Recuperada', float, _is_float),
+    FieldDef('observaciones', 'TEXT'),
+    FieldDef('falla', 'TEXT', 'Falla', str, _not_empty),
+    FieldDef('ishikawa', 'TEXT'),
+    FieldDef('row_version', 'INTEGER', writable=False),
+    FieldDef('created_at', 'INTEGER', writable=False),   # Alta (epoch UTC, lo mantiene un trigger)
+    FieldDef('updated_at', 'INTEGER', writable=False),   # Última modificación (epoch UTC)
+)
+
+# Columnas de la tabla acciones (se cargan desde ActionDialog, no desde el formulario)
+ACCION_SCHEMA: Tuple[FieldDef, ...] = (
+    FieldDef('nc_id', 'INTEGER'),
+    FieldDef('tarea', 'TEXT'),
+    FieldDef('tiempo_estimado', 'TEXT'),
+    FieldDef('responsable', 'TEXT'),
+    FieldDef('fecha_realizacion', 'TEXT', date_format='%Y-%m-%d'),
+    FieldDef('estado', 'TEXT'),
+    FieldDef('adjuntos', 'TEXT'),
+    FieldDef('row_version', 'INTEGER', writable=False),
+)
+
+# Categorías (6M) del diagrama de Ishikawa, en el orden del diálogo
+ISHIKAWA_CATEGORIAS: Tuple[str, ...] = ('Máquina', 'Método', 'Material', 'Mano de obra', 'Medio ambiente', 'Medición')
+
+
+
+@dataclass(frozen=True)
+class DictColumn:
+    """Columna de texto repetido guardada como id entero de una tabla diccionario.
+    La tabla física (nc_datos / acciones_datos) guarda id_column; la vista con el nombre
+    histórico (nc / acciones) devuelve el texto, así que las consultas existentes no cambian"""
+    column: str                          # Columna de texto de la vista (ej. cliente)
+    table: str                           # Tabla diccionario (ej. clientes)
+    id_column: str                       # Columna entera de la tabla física (ej. cliente_id)
+    key: str = 'valor'                   # Columna de texto de la tabla diccionario
+    trim: bool = False                   # Guardar sin espacios en los extremos y sin vacíos (códigos)
+    extra: Tuple[Tuple[str, str], ...] = ()  # (columna del diccionario, columna de origen) al dar de alta
+
+    def value_sql(self, ref):
+        """Expresión del texto a guardar a partir de un parámetro (:cliente) o fila (NEW.cliente)"""
+        return f"NULLIF(trim({ref}), '')" if self.trim else ref
+
+    def ensure_sql(self, prefix):
+        """Dar de alta el valor en el diccionario si no existe (prefix ':' para parámetros, 'NEW.' en triggers)"""
+        value = self.value_sql(f"{prefix}{self.column}")
+        cols = [self.key] + [c for c, _ in self.extra]
+        values = [value] + [f"COALESCE({prefix}{src}, '')" for _, src in self.extra]
+        return (f"INSERT OR IGNORE INTO {self.table} ({', '.join(cols)}) "
+                f"SELECT {', '.join(values)} WHERE {value} IS NOT NULL")
+
+    def id_sql(self, prefix):
+        """Subconsulta del id del valor en el diccionario"""
+        return f"(SELECT id FROM {self.table} WHERE {self.key} = {self.value_sql(f'{prefix}{self.column}')})"
+
+    def ddl(self):
+        return f"CREATE TABLE IF NOT EXISTS {self.table} (id INTEGER PRIMARY KEY, {self.key} TEXT NOT NULL UNIQUE)"
+
+
+# Columnas codificadas como diccionario. cod_producto usa el catálogo de productos
+# (migración 5): los códigos nuevos se agregan con la descripción cargada en la NC
+NC_DICT_COLUMNS: Tuple[DictColumn, ...] = (
+    DictColumn('cod_producto', 'productos', 'producto_id', key='cod_producto', trim=True,
+               extra=(('desc_producto', 'desc_producto'),)),
+    DictColumn('desc_producto', 'descripciones', 'desc_producto_id'),
+    DictColumn('cliente', 'clientes', 'cliente_id'),
+)
+ACCION_DICT_COLUMNS: Tuple[DictColumn, ...] = (
+    DictColumn('responsable', 'responsables', 'responsable_id'),
+    DictColumn('estado', 'estados', 'estado_id'),
+)
+NC_DATA_TABLE = 'nc_datos'
+ACCION_DATA_TABLE = 'acciones_datos'
+
+NC_FORM_FIELDS: Tuple[FieldDef, ...] = tuple(f for f in NC_SCHEMA if f.in_form)
+NC_FIELDS_BY_LABEL = {f.label: f for f in NC_FORM_FIELDS}
+NC_COLUMNS: Tuple[str, ...] = tuple(f.column for f in NC_SCHEMA)
+ACCION_COLUMNS: Tuple[str, ...] = tuple(f.column for f in ACCION_SCHEMA)
+NC_WRITE_COLUMNS: Tuple[str, ...] = tuple(f.column for f in NC_SCHEMA if f.writable)
+ACCION_WRITE_COLUMNS: Tuple[str, ...] = tuple(f.column for f in ACCION_SCHEMA if f.writable)
+
+
+# --- Generación de SQL ---
+def create_table_sql(table, fields, extra=()):
+    """CREATE TABLE IF NOT EXISTS con clave primaria autoincremental"""
+    defs = ['id INTEGER PRIMARY KEY AUTOINCREMENT'] + [f.ddl() for f in fields] + list(extra)
+    body = ',\n    '.join(defs)
+    return f"CREATE TABLE IF NOT EXISTS {table} (\n    {body}\n)"
+
+
+def insert_sql(table, columns):
+    """INSERT con parámetros nombrados (:columna)"""
+    cols = ','.join(columns)
+    params = ','.join(f':{c}' for c in columns)
+    return f"INSERT INTO {table} ({cols}) VALUES ({params})"
+
+
+def update_sql(table, columns, key):
+    """UPDATE de todas las columnas salvo la clave, filtrando por la clave"""
+    sets = ','.join(f'{c}=:{c}' for c in columns if c != key)
+    return f"UPDATE {table} SET {sets} WHERE {key}=:{key}"
+
+
+def select_sql(table, columns, where=None):
+    """SELECT con lista explícita de columnas (id incluido)"""
+    sql = f"SELECT id,{','.join(columns)} FROM {table}"
+    if where:
+        sql += f" WHERE {where}"
+    return sql
+
+
+def data_fields(fields, dict_columns):
+    """Columnas de la tabla física: las codificadas pasan a ser enteros con referencia al diccionario"""
+    by_column = {d.column: d for d in dict_columns}
+    out = []
+    for f in fields:
+        d = by_column.get(f.column)
+        out.append(f if d is None else FieldDef(d.id_column, 'INTEGER', constraint=f'REFERENCES {d.table}(id)'))
+    return tuple(out)
+
+
+def _data_values(columns, dict_columns, prefix):
+    """(columnas físicas, expresiones) para escribir columns con los textos resueltos a ids"""
+    by_column = {d.column: d for d in dict_columns}
+    cols, values = [], []
+    for c in columns:
+        d = by_column.get(c)
+        cols.append(c if d is None else d.id_column)
+        values.append(f'{prefix}{c}' if d is None else d.id_sql(prefix))
+    return cols, values
+
+
+def data_insert_sql(table, columns, dict_columns, prefix=':', source=None):
+    """INSERT en la tabla física resolviendo los textos codificados con subconsultas al diccionario.
+    Con source copia las filas de esa tabla (prefix debe ser 'tabla.')"""
+    cols, values = _data_values(columns, dict_columns, prefix)
+    if source:
+        return f"INSERT INTO {table} ({','.join(cols)}) SELECT {','.join(values)} FROM {source}"
+    return f"INSERT INTO {table} ({','.join(cols)}) VALUES ({','.join(values)})"
+
+
+def data_update_sql(table, columns, key, dict_columns, prefix=':', where=None):
+    """UPDATE de la tabla física resolviendo los textos codificados"""
+    cols, values = _data_values([c for c in columns if c != key], dict_columns, prefix)
+    sets = ','.join(f'{c}={v}' for c, v in zip(cols, values))
+    return f"UPDATE {table} SET {sets} WHERE {where or f'{key}={prefix}{key}'}"
+
+
+def view_sql(view, table, fields, dict_columns, expose_ids=()):
+    """Vista con el nombre y las columnas de texto históricas sobre la tabla física codificada"""
+    by_column = {d.column: d for d in dict_columns}
+    cols, joins = ['t.id'], []
+    for i, f in enumerate(fields):
+        d = by_column.get(f.column)
+        if d is None:
+            cols.append(f't.{f.column}')
+        else:
+            cols.append(f'd{i}.{d.key} AS {f.column}')
+            joins.append(f'LEFT JOIN {d.table} d{i} ON d{i}.id = t.{d.id_column}')
+    cols += [f't.{c}' for c in expose_ids]
+    return f"CREATE VIEW IF NOT EXISTS {view} AS SELECT {', '.join(cols)} FROM {table} t {' '.join(joins)}"
+
+
+def ensure_columns(cur, table, fields):
+    """Agregar a una tabla existente las columnas del esquema que todavía no tiene"""
+    existing = {r[1] for r in cur.execute(f"PRAGMA table_info({table})")}
+    added = []
+    for f in fields:
+        if f.column not in existing:
+            # ALTER TABLE no admite UNIQUE: la restricción sólo aplica a tablas nuevas
+            cur.execute(f"ALTER TABLE {table} ADD COLUMN {f.column} {f.sql_type}")
+            added.append(f.column)
+    return added
+
+
+# Sentencias generadas una sola vez al importar: el texto idéntico permite que
+# el caché de sentencias de sqlite3 las prepare una vez y las reutilice
+NC_CREATE_SQL = create_table_sql('nc', NC_SCHEMA)
+ACCION_CREATE_SQL = create_table_sql('acciones', ACCION_SCHEMA,
+                                     extra=('FOREIGN KEY(nc_id) REFERENCES nc(id)',))
+NC_INSERT_SQL = insert_sql('nc', NC_WRITE_COLUMNS)
+NC_UPDATE_SQL = update_sql('nc', NC_WRITE_COLUMNS, key='nro_nc')
+NC_SELECT_BY_NRO_SQL = select_sql('nc', NC_COLUMNS, where='nro_nc=?')
+NC_SELECT_ALL_SQL = select_sql('nc', NC_COLUMNS) + " ORDER BY id"
+ACCION_INSERT_SQL = insert_sql('acciones', ACCION_WRITE_COLUMNS)
+
+# Escritura sobre las tablas físicas codificadas (migración 6); la lectura sigue usando las vistas
+NC_DATA_SCHEMA = data_fields(NC_SCHEMA, NC_DICT_COLUMNS)
+ACCION_DATA_SCHEMA = data_fields(ACCION_SCHEMA, ACCION_DICT_COLUMNS)
+NC_DATA_INSERT_SQL = data_insert_sql(NC_DATA_TABLE, NC_WRITE_COLUMNS, NC_DICT_COLUMNS)
+NC_DATA_UPDATE_SQL = data_update_sql(NC_DATA_TABLE, NC_WRITE_COLUMNS, 'nro_nc', NC_DICT_COLUMNS)
+ACCION_DATA_INSERT_SQL = data_insert_sql(ACCION_DATA_TABLE, ACCION_WRITE_COLUMNS, ACCION_DICT_COLUMNS)
+NC_DICT_ENSURE_SQL: Tuple[str, ...] = tuple(d.ensure_sql(':') for d in NC_DICT_COLUMNS)
+ACCION_DICT_ENSURE_SQL: Tuple[str, ...] = tuple(d.ensure_sql(':') for d in ACCION_DICT_COLUMNS)
+
+# Encabezados de exportación (mismo orden que NC_SELECT_ALL_SQL)
+NC_EXPORT_HEADERS: Tuple[str, ...] = ('id',) + NC_COLUMNS
+
+
+def parse_form_values(texts):
+    """Convertir {etiqueta: texto} del formulario en {columna: valor} usando los parsers del esquema"""
+    return {f.column: f.parser(texts[f.label]) for f in NC_FORM_FIELDS}
+
+
+def row_to_form_values(row):
+    """Convertir una fila (sqlite3.Row o dict) en {etiqueta: texto} para los widgets"""
+    values = {}
+    for f in NC_FORM_FIELDS:
+        value = row[f.column]
+        values[f.label] = '' if value is None else str(value)
+    return values
+
+
+def parse_ishikawa(text):
+    """Separar el texto de IshikawaDialog ('M:|p1||p2;;M2:|...') en [(categoría, [porqués])]"""
+    causes = []
+    for part in (text or '').split(';;'):
+        if not part:
+            continue
+        categoria, _, whys = part.partition(':|')
+        causes.append((categoria, whys.split('||') if whys else []))
+    return causes
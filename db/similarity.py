@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Detección de NC posiblemente duplicadas por similitud del texto de la falla
+Índice invertido de trigramas sobre los textos de falla distintos (normalizados: sin
+acentos, minúsculas, sin puntuación). Los candidatos salen de los trigramas menos
+frecuentes de la consulta, con un tope de postings recorridos para acotar la latencia,
+y se ordenan por similitud de Jaccard; luego se buscan las NC con esas fallas por
+índice, priorizando las del mismo producto.
+El índice se construye en un hilo aparte con su propia conexión la primera vez que se pide
+una sugerencia, se actualiza al guardar y se reconstruye si otro proceso escribió en la base
+(PRAGMA data_version). Guarda como máximo MAX_INDEXED_FALLAS textos: con más fallas distintas
+se indexan sólo las más recientes.
+"""
+
+import logging
+import math
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from collections import Counter
+from typing import NamedTuple
+
+from .schema import NC_DATA_TABLE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_THRESHOLD = 0.45      # Jaccard mínimo entre conjuntos de trigramas
+POSTINGS_BUDGET = 10000       # ids recorridos como máximo para generar candidatos
+MAX_CANDIDATES = 50           # candidatos verificados por consulta
+MIN_QUERY_LENGTH = 4          # no se sugiere con menos caracteres normalizados
+MAX_INDEXED_FALLAS = 100000   # textos distintos en el índice (unos 65 MB); con más, los más recientes
+
+# Fallas distintas de la más reciente a la más antigua (recorre sólo el índice idx_nc_falla)
+FALLAS_SQL = (f"SELECT falla FROM {NC_DATA_TABLE} WHERE falla IS NOT NULL "
+              f"GROUP BY falla ORDER BY MAX(id) DESC LIMIT ?")
+SAME_PRODUCT_SQL = ("SELECT nro_nc, fecha, cod_producto, falla FROM nc "
+                    "WHERE cod_producto = ? AND falla = ? ORDER BY id DESC LIMIT ?")
+ANY_PRODUCT_SQL = "SELECT nro_nc, fecha, cod_producto, falla FROM nc WHERE falla = ? ORDER BY id DESC LIMIT ?"
+
+_NON_ALNUM = re.compile(r'[^0-9a-z]+')
+
+
+def normalize(text):
+    """Minúsculas, sin acentos ni puntuación y con espacios simples"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c)).lower()
+    return _NON_ALNUM.sub(' ', text).strip()
+
+
+def trigrams(norm):
+    padded = f" {norm} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class Suggestion(NamedTuple):
+    nro_nc: int
+    fecha: str
+    cod_producto: str
+    falla: str
+    score: float              # similitud de Jaccard de la falla (0..1)
+    same_product: bool
+
+
+class FallaIndex:
+    """Índice de trigramas sobre textos de falla distintos"""
+
+    def __init__(self):
+        self._ids = {}            # texto normalizado -> id
+        self._texts = []          # id -> texto normalizado
+        self._raw = []            # id -> primer texto original
+        self._variants = {}       # id -> otros textos originales que normalizan igual
+        self._postings = {}       # trigrama -> array('I') de ids
+
+    def add(self, raw):
+        """Agregar un texto de falla. Devuelve True si era un texto nuevo"""
+        norm = normalize(raw)
+        if not norm:
+            return False
+        text_id = self._ids.get(norm)
+        if text_id is not None:
+            if raw not in self.originals(text_id):
+                self._variants.setdefault(text_id, []).append(raw)
+            return False
+        text_id = len(self._texts)
+        self._ids[norm] = text_id
+        self._texts.append(norm)
+        self._raw.append(raw)
+        postings = self._postings
+        for gram in trigrams(norm):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = array('I', (text_id,))
+            else:
+                ids.append(text_id)
+        return True
+
+    def build(self, texts):
+        for raw in texts:
+            self.add(raw)
+        return self
+
+    def __len__(self):
+        return len(self._texts)
+
+    def originals(self, text_id):
+        """Textos tal como se guardaron en nc para un id del índice"""
+        return [self._raw[text_id]] + self._variants.get(text_id, [])
+
+    def search(self, text, limit=10, threshold=DEFAULT_THRESHOLD):
+        """Textos similares como [(similitud, [textos originales])] de mayor a menor"""
+        norm = normalize(text)
+        if len(norm) < MIN_QUERY_LENGTH:
+            return []
+        query = trigrams(norm)
+        known = sorted((g for g in query if g in self._postings), key=lambda g: len(self._postings[g]))
+        # Filtro por prefijo: un texto con Jaccard >= umbral comparte al menos uno de los
+        # len(query) - ceil(umbral * len(query)) + 1 trigramas más raros de la consulta
+        # (los trigramas que no aparecen en el índice son los más raros y no aportan candidatos).
+        # Los trigramas muy frecuentes se cortan por presupuesto: la búsqueda pasa a ser aproximada
+        prefix = len(query) - math.ceil(threshold * len(query)) + 1 - (len(query) - len(known))
+        counts = Counter()
+        scanned = postings = 0
+        for gram in known[:max(prefix, 0)]:
+            ids = self._postings[gram]
+            if counts and postings + len(ids) > POSTINGS_BUDGET:
+                break
+            counts.update(ids)
+            postings += len(ids)
+            scanned += 1
+        # Un texto por encima del umbral comparte ceil(umbral * len(query)) trigramas conocidos,
+        # así que entre los recorridos comparte al menos eso menos los que no se recorrieron
+        min_count = math.ceil(threshold * len(query)) - (len(known) - scanned)
+        candidates = [i for i, c in counts.items() if c >= min_count] if min_count > 1 else list(counts)
+        if len(candidates) > MAX_CANDIDATES:
+            candidates = [i for i, _ in counts.most_common(MAX_CANDIDATES)]
+        results = []
+        q_len = len(query)
+        for text_id in candidates:
+            # Verificación sin construir el conjunto del candidato: trigramas de la consulta
+            # contenidos en el texto y len(texto) como tamaño de su conjunto de trigramas
+            padded = f" {self._texts[text_id]} "
+            shared = sum(map(padded.__contains__, query))
+            score = shared / (q_len + max(len(padded) - 2, shared) - shared)
+            if score >= threshold:
+                results.append((score, text_id))
+        results.sort(key=lambda r: (-r[0], r[1]))
+        return [(round(score, 3), self.originals(text_id)) for score, text_id in results[:limit]]
+
+
+class DuplicateFinder:
+    """Sugerencias de NC existentes parecidas a la que se está cargando"""
+
+    def __init__(self, conn, connect=None, max_texts=MAX_INDEXED_FALLAS):
+        self.conn = conn
+        self.max_texts = max_texts
+        self.index = None
+        self._pending = []
+        self._lock = threading.Lock()
+        self._thread = None
+        self._connect = connect   # con connect, la primera sugerencia construye el índice en segundo plano
+        self._data_version = self._read_data_version()
+
+    @property
+    def ready(self):
+        return self.index is not None
+
+    @property
+    def building(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def _read_data_version(self):
+        return self.conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_external_writes(self):
+        """Reconstruir en segundo plano si otra conexión confirmó cambios (el índice actual sigue en uso)"""
+        version = self._read_data_version()
+        if version != self._data_version and self._connect and not self.building:
+            logger.debug("data_version cambió, reconstruyendo índice de fallas")
+            self._data_version = version
+            self.build_async(self._connect)
+
+    def build(self, conn=None):
+        """Construir el índice (en el hilo actual) leyendo las fallas distintas de la base"""
+        start = time.perf_counter()
+        conn = conn or self.conn
+        index = FallaIndex().build(row[0] for row in conn.execute(FALLAS_SQL, (self.max_texts,)))
+        if len(index) >= self.max_texts:
+            logger.info(f"Índice de fallas limitado a las {self.max_texts} fallas distintas más recientes")
+        with self._lock:
+            for raw in self._pending:
+                index.add(raw)
+            self._pending.clear()
+            self.index = index
+        logger.info(f"Índice de fallas construido: {len(index)} textos en {time.perf_counter() - start:.2f}s")
+        return index
+
+    def build_async(self, connect):
+        """Construir el índice en un hilo aparte; connect() abre la conexión de ese hilo"""
+        self._connect = connect
+
+        def worker():
+            conn = connect()
+            try:
+                self.build(conn)
+            except Exception as e:
+                logger.error(f"Error construyendo el índice de fallas: {e}")
+            finally:
+                conn.close()
+        self._thread = threading.Thread(target=worker, name='indice-fallas', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def warm_up(self):
+        """Empezar a construir el índice en segundo plano si todavía no existe (requiere connect)"""
+        if self.index is None and self._connect and not self.building:
+            self.build_async(self._connect)
+
+    def add(self, falla):
+        """Registrar la falla de una NC recién guardada"""
+        with self._lock:
+            if self.index is not None:
+                self.index.add(falla)
+            if self.index is None or self.building:
+                self._pending.append(falla)
+
+    def suggest(self, falla, cod_producto=None, limit=5, exclude_nro=None, threshold=DEFAULT_THRESHOLD):
+        """NC existentes con falla parecida; primero las del mismo producto, luego por similitud"""
+        self._check_external_writes()
+        if self.index is None:
+            if len(normalize(falla)) >= MIN_QUERY_LENGTH:
+                self.warm_up()
+            return []
+        suggestions = []
+        for score, raws in self.index.search(falla, limit=limit, threshold=threshold):
+            for raw in raws:
+                rows = []
+                if cod_producto:
+                    rows = self.conn.execute(SAME_PRODUCT_SQL, (cod_producto, raw, limit)).fetchall()
+                rows += self.conn.execute(ANY_PRODUCT_SQL, (raw, limit)).fetchall()
+                for nro, fecha, producto, texto in rows:
+                    if nro != exclude_nro:
+                        suggestions.append(Suggestion(nro, fecha, producto, texto, score, producto == cod_producto))
+        seen, unique = set(), []
+        for s in sorted(suggestions, key=lambda s: (not s.same_product, -s.score, -s.nro_nc)):
+            if s.nro_nc not in seen:
+                seen.add(s.nro_nc)
+                unique.append(s)
+        return unique[:limit]
@@ -0,0 +1,34 @@
+#!/usr/bin/env python3
+"""
+Paquete de diagnóstico de rendimiento para NC AC FABEN
+Medición del arranque de la aplicación en cada puesto, perfil de la sesión en curso,
+vigilante de bloqueos de la interfaz y latencia del event loop
+"""
+
+import importlib
+
+from .startup import StartupProfiler, process_elapsed
+from .eventloop import LagMonitor
+
+# Perfilador y vigilante: se importan con el primer acceso (la aplicación los crea desde el
+# menú Diagnóstico, no al iniciar)
+_LAZY = {'RuntimeProfiler': 'profiling', 'SamplingProfiler': 'profiling', 'GuiWatchdog': 'watchdog'}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        return getattr(importlib.import_module(f'.{_LAZY[name]}', __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__version__ = "1.0.0"
+__author__ = "FABEN IT"
+
+# Exportar funciones principales
+__all__ = [
+    'StartupProfiler',
+    'process_elapsed',
+    'RuntimeProfiler',
+    'SamplingProfiler',
+    'GuiWatchdog',
+    'LagMonitor',
+]
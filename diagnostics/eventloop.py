@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Monitor de latencia del event loop de Qt
+Un QTimer de alta frecuencia llama a tick(); la demora respecto del intervalo esperado
+es el tiempo en que el hilo de la interfaz no atendió eventos. Cada demora va a un
+histograma y las que superan stall_ms (bloqueos perceptibles) se atribuyen a una
+operación:
+  - la operación registrada más larga que terminó desde el tick anterior (el manejador
+    que bloqueó el event loop), o
+  - si no terminó ninguna, la operación más interna todavía en curso (p. ej. save_record
+    esperando en un QMessageBox, cuyo event loop anidado sí atiende el timer), o
+  - '(sin operación)' si el bloqueo ocurrió fuera de las operaciones registradas.
+Las operaciones se registran con el decorador track() o el administrador de contexto
+operation(); con el monitor desactivado (enabled=False) no registran nada y la función
+decorada se llama directamente. Cada summary_s segundos se escribe un resumen en el log con el histograma
+y las operaciones que más bloquean, para decidir cuáles sacar del hilo de la interfaz.
+"""
+
+import functools
+import inspect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+TICK_INTERVAL_MS = 20
+STALL_MS = 50
+SUMMARY_SECONDS = 300
+BUCKETS_MS = (16, 33, 50, 100, 250, 500, 1000, 2000)
+NO_OPERATION = '(sin operación)'
+
+logger = logging.getLogger(__name__)
+
+
+def bucket_labels():
+    """Etiquetas del histograma: '<16', '16-33', ..., '>=2000'"""
+    labels = [f"<{BUCKETS_MS[0]}"]
+    labels += [f"{low}-{high}" for low, high in zip(BUCKETS_MS, BUCKETS_MS[1:])]
+    return labels + [f">={BUCKETS_MS[-1]}"]
+
+
+class OperationStats:
+    """Llamadas, duración y bloqueos atribuidos a una operación"""
+    __slots__ = ('calls', 'total', 'longest', 'stalls', 'stall_total', 'stall_max')
+
+    def __init__(self):
+        self.calls = self.stalls = 0
+        self.total = self.longest = self.stall_total = self.stall_max = 0.0
+
+
+class LagMonitor:
+    """Histograma de la demora del event loop y bloqueos por operación (todo en milisegundos)"""
+
+    def __init__(self, interval_ms=TICK_INTERVAL_MS, stall_ms=STALL_MS, summary_s=SUMMARY_SECONDS,
+                 clock=time.perf_counter, enabled=True):
+        self.enabled = enabled
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self.summary_s = summary_s
+        self.clock = clock
+        self.thread_id = threading.get_ident()
+        self._stack = []               # operaciones en curso (la última es la más interna)
+        self.reset()
+
+    def reset(self):
+        """Vaciar histograma y estadísticas (las operaciones en curso se conservan)"""
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+        self.samples = 0
+        self.stalls = 0
+        self.stall_total = 0.0
+        self.stall_max = 0.0
+        self.operations = {}           # nombre -> OperationStats
+        self._finished = []            # (duración, nombre) terminadas desde el tick anterior
+        self._last_tick = None
+        self._last_summary = None
+
+    # --- Operaciones -----------------------------------------------------------------
+
+    @contextmanager
+    def operation(self, name):
+        """Registrar una operación del hilo de la interfaz (en otros hilos no se registra)"""
+        if not self.enabled or threading.get_ident() != self.thread_id:
+            yield
+            return
+        self._stack.append(name)
+        start = self.clock()
+        try:
+            yield
+        finally:
+            elapsed = (self.clock() - start) * 1000
+            self._stack.pop()
+            self._finished.append((elapsed, name))
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = OperationStats()
+            stats.calls += 1
+            stats.total += elapsed
+            stats.longest = max(stats.longest, elapsed)
+
+    def track(self, name=None):
+        """Decorador: registrar cada llamada a la función como una operación"""
+        def decorator(func):
+            label = name or func.__name__
+            code = func.__code__
+            # Qt pasa los argumentos de la señal (p. ej. checked de clicked): se descartan
+            # los posicionales que la función no acepta
+            max_args = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if max_args is not None:
+                    args = args[:max_args]
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self.operation(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @property
+    def current_operation(self):
+        return self._stack[-1] if self._stack else None
+
+    # --- Muestreo ----------------------------------------------------------------------
+
+    def _attribute(self):
+        if self._finished:
+            return max(self._finished)[1]
+        return self.current_operation or NO_OPERATION
+
+    def tick(self, now=None):
+        """Llamada desde el QTimer; devuelve la demora en ms (None en el primer tick)"""
+        now = self.clock() if now is None else now
+        last, self._last_tick = self._last_tick, now
+        if last is None:
+            self._last_summary = now
+            self._finished.clear()
+            return None
+        lag = max(0.0, (now - last) * 1000 - self.interval_ms)
+        self.samples += 1
+        index = 0
+        while index < len(BUCKETS_MS) and lag >= BUCKETS_MS[index]:
+            index += 1
+        self.histogram[index] += 1
+        if lag >= self.stall_ms:
+            name = self._attribute()
+            self.stalls += 1
+            self.stall_total += lag
+            self.stall_max = max(self.stall_max, lag)
+            stats = self.operations.get(name)
+            if stats is None:
+                stats = self.operations[name] = OperationStats()
+            stats.stalls += 1
+            stats.stall_total += lag
+            stats.stall_max = max(stats.stall_max, lag)
+        self._finished.clear()
+        if self.summary_s and now - self._last_summary >= self.summary_s:
+            self._last_summary = now
+            self.log_summary()
+        return lag
+
+    def restart(self):
+        """Volver a medir desde el próximo tick (al reanudar el timer)"""
+        self._last_tick = None
+
+    # --- Resumen -----------------------------------------------------------------------
+
+    def summary(self, top=10):
+        lines = [f"Latencia del event loop: {self.samples} muestras cada {self.interval_ms} ms, "
+                 f"{self.stalls} bloqueos >= {self.stall_ms} ms "
+                 f"(total {self.stall_total:.0f} ms, máximo {self.stall_max:.0f} ms)",
+                 "Histograma de demoras (ms): " + " | ".join(
+                     f"{label}: {count}" for label, count in zip(bucket_labels(), self.histogram))]
+        ranked = sorted(self.operations.items(), key=lambda item: (-item[1].stall_total, -item[1].total))
+        if ranked:
+            lines.append(f"{'Operación':<28}{'bloqueos':>9}{'ms bloq.':>10}{'máx':>8}"
+                         f"{'llamadas':>10}{'ms total':>10}{'máx':>8}")
+        for name, s in ranked[:top]:
+            lines.append(f"{name:<28}{s.stalls:>9}{s.stall_total:>10.0f}{s.stall_max:>8.0f}"
+                         f"{s.calls:>10}{s.total:>10.0f}{s.longest:>8.0f}")
+        return '\n'.join(lines)
+
+    def log_summary(self):
+        logger.info(self.summary())
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Perfil de la sesión en curso, activable desde el menú Diagnóstico
+Dos modos:
+  - 'cprofile': cProfile en el hilo que lo inicia (el hilo de la interfaz); al detenerlo
+    guarda perfil_<fecha>.prof y un resumen de texto con las funciones más costosas.
+  - 'sampling': un hilo toma la pila del hilo de la interfaz con sys._current_frames()
+    cada pocos milisegundos; al detenerlo guarda perfil_<fecha>.folded con las pilas
+    colapsadas ("a;b;c cantidad"), que abren flamegraph.pl y speedscope.
+El muestreo no frena al hilo observado salvo por el GIL, así que sirve para sesiones largas.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+PROFILE_MODES = ('cprofile', 'sampling')
+SAMPLE_INTERVAL_MS = 5
+
+
+def frame_label(frame):
+    """Nombre de una función en la pila colapsada: función (archivo:línea de definición)"""
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame):
+    """Pila desde el punto de entrada hasta la función en ejecución, separada por ';'"""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class SamplingProfiler:
+    """Muestreo periódico de la pila de un hilo (por defecto el principal)"""
+
+    def __init__(self, thread_id=None, interval_ms=SAMPLE_INTERVAL_MS):
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.interval = interval_ms / 1000
+        self.stacks = {}               # pila colapsada -> muestras
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """Tomar una muestra ahora (la usa el hilo de muestreo; también sirve en pruebas)"""
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        stack = collapse_stack(frame)
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='perfil-muestreo', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def write_collapsed(self, path):
+        """Pilas colapsadas ordenadas por muestras, una por línea"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items(), key=lambda item: -item[1]):
+                f.write(f"{stack} {count}\n")
+
+
+class RuntimeProfiler:
+    """Iniciar y detener un perfil de la sesión; stop() guarda los archivos en el directorio de logs"""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else Path.cwd() / 'log'
+        self.mode = None
+        self.started = None
+        self._profiler = None
+
+    @property
+    def running(self):
+        return self.mode is not None
+
+    def start(self, mode='cprofile', interval_ms=SAMPLE_INTERVAL_MS):
+        """Iniciar en el hilo a perfilar. ValueError si el modo no existe, RuntimeError si ya corre
+        un perfil o si el intérprete tiene otro perfilador activo"""
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Modo de perfil desconocido: {mode}")
+        if self.running:
+            raise RuntimeError(f"Ya hay un perfil '{self.mode}' en curso")
+        if mode == 'cprofile':
+            import cProfile
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as e:        # otro perfilador activo en el intérprete
+                raise RuntimeError(str(e)) from e
+        else:
+            profiler = SamplingProfiler(interval_ms=interval_ms)
+            profiler.start()
+        self._profiler = profiler
+        self.mode = mode
+        self.started = time.perf_counter()
+
+    def stop(self, top=40):
+        """Detener el perfil y guardarlo; devuelve la ruta del archivo principal (None si no corría)"""
+        if not self.running:
+            return None
+        from datetime import datetime
+        elapsed = time.perf_counter() - self.started
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.directory / f"perfil_{datetime.now():%Y%m%d_%H%M%S}"
+        profiler, mode = self._profiler, self.mode
+        self._profiler = self.mode = self.started = None
+        if mode == 'cprofile':
+            import io
+            import pstats
+            profiler.disable()
+            path = base.with_suffix('.prof')
+            profiler.dump_stats(str(path))
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(top)
+            base.with_suffix('.txt').write_text(
+                f"Perfil cProfile de {elapsed:.1f} s (las {top} funciones con mayor tiempo acumulado)\n"
+                + out.getvalue(), encoding='utf-8')
+        else:
+            profiler.stop()
+            path = base.with_suffix('.folded')
+            profiler.write_collapsed(path)
+        return path
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Perfil del arranque de la aplicación (--profile-startup)
+Marca con time.perf_counter (monotónico) el fin de cada fase del arranque: importaciones,
+logging, init_db, QApplication, MainWindow y primer pintado. El tiempo anterior a Python
+se estima con la hora de creación del proceso; en el ejecutable --onefile se toma la del
+bootloader (proceso padre), así que incluye el desempaquetado de PyInstaller.
+Al terminar escribe un informe de texto en log/ y agrega una fila a log/startup_profile.csv
+para comparar los puestos; con --cprofile además guarda el perfil (.prof) y las funciones
+más costosas en el informe.
+Sin --profile-startup el perfilador queda desactivado y mark() no hace nada.
+"""
+
+import os
+import sys
+import time
+
+PROFILE_FLAG = '--profile-startup'
+CPROFILE_FLAG = '--cprofile'
+CSV_NAME = 'startup_profile.csv'
+BEFORE_PYTHON = 'proceso'       # fase desde la creación del proceso hasta el perfilador
+
+
+def _linux_elapsed(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    start_ticks = int(fields[19])      # campo 22 (starttime); fields[0] es el campo 3
+    with open('/proc/uptime') as f:
+        uptime = float(f.read().split()[0])
+    return uptime - start_ticks / os.sysconf('SC_CLK_TCK')
+
+
+def _windows_elapsed(pid):
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.windll.kernel32
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(0x1000, False, pid)      # PROCESS_QUERY_LIMITED_INFORMATION
+    if not handle:
+        return None
+    try:
+        creation, exited, kernel, user, now = (wintypes.FILETIME() for _ in range(5))
+        if not kernel32.GetProcessTimes(wintypes.HANDLE(handle), ctypes.byref(creation), ctypes.byref(exited),
+                                        ctypes.byref(kernel), ctypes.byref(user)):
+            return None
+        kernel32.GetSystemTimeAsFileTime(ctypes.byref(now))
+    finally:
+        kernel32.CloseHandle(wintypes.HANDLE(handle))
+
+    def ticks(ft):                     # FILETIME: intervalos de 100 ns
+        return (ft.dwHighDateTime << 32) | ft.dwLowDateTime
+    return (ticks(now) - ticks(creation)) / 1e7
+
+
+def run_mode():
+    """'onefile' / 'onedir' en el ejecutable de PyInstaller, 'python' desde el código fuente"""
+    if not getattr(sys, 'frozen', False):
+        return 'python'
+    # --onefile desempaqueta en un directorio temporal _MEIxxxxxx
+    return 'onefile' if os.path.basename(getattr(sys, '_MEIPASS', '')).startswith('_MEI') else 'onedir'
+
+
+def process_elapsed(pid=None):
+    """Segundos desde la creación del proceso pid (por defecto el actual, o el bootloader del
+    ejecutable --onefile, que es quien desempaqueta). None si el sistema no lo informa"""
+    if pid is None:
+        pid = os.getppid() if run_mode() == 'onefile' else os.getpid()
+    try:
+        if sys.platform.startswith('linux'):
+            return _linux_elapsed(pid)
+        if sys.platform == 'win32':
+            return _windows_elapsed(pid)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    return None
+
+
+class StartupProfiler:
+    """Marcas de tiempo por fase del arranque; crearlo antes de las demás importaciones"""
+
+    def __init__(self, enabled=True, use_cprofile=False):
+        self.enabled = enabled
+        self.start = time.perf_counter()
+        self.before_start = process_elapsed() if enabled else None
+        self.marks = []                # (fase, perf_counter al terminar la fase)
+        self.profile = None
+        self.report_path = None
+        if enabled and use_cprofile:
+            import cProfile
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+    @classmethod
+    def from_argv(cls, argv):
+        """Activado con --profile-startup; --cprofile agrega el perfil por función"""
+        enabled = PROFILE_FLAG in argv
+        return cls(enabled, enabled and CPROFILE_FLAG in argv)
+
+    def mark(self, phase):
+        """Terminar una fase (sin efecto si el perfilador está desactivado)"""
+        if self.enabled:
+            self.marks.append((phase, time.perf_counter()))
+
+    def phases(self):
+        """[(fase, segundos)] en orden, con el tiempo anterior a Python si se pudo medir"""
+        out = [(BEFORE_PYTHON, self.before_start)] if self.before_start is not None else []
+        previous = self.start
+        for phase, t in self.marks:
+            out.append((phase, t - previous))
+            previous = t
+        return out
+
+    def total(self):
+        return sum(seconds for _, seconds in self.phases())
+
+    def report(self, top=30):
+        import platform
+        from datetime import datetime
+        total = self.total() or 1e-9
+        lines = [f"Perfil de arranque NC AC FABEN - {datetime.now():%Y-%m-%d %H:%M:%S}",
+                 f"Equipo: {platform.node()}   Modo: {run_mode()}   Python {platform.python_version()}",
+                 "",
+                 f"{'Fase':<16}{'ms':>10}{'%':>8}"]
+        for phase, seconds in self.phases():
+            lines.append(f"{phase:<16}{seconds * 1000:>10.1f}{seconds / total * 100:>8.1f}")
+        lines.append(f"{'total':<16}{total * 1000:>10.1f}")
+        if self.before_start is None:
+            lines.append(f"(sin '{BEFORE_PYTHON}': el sistema no informa la hora de creación del proceso)")
+        if self.profile is not None:
+            import io
+            import pstats
+            out = io.StringIO()
+            pstats.Stats(self.profile, stream=out).sort_stats('cumulative').print_stats(top)
+            lines += ["", f"cProfile (las {top} funciones con mayor tiempo acumulado):", out.getvalue()]
+        return '\n'.join(lines) + '\n'
+
+    def _append_csv(self, path, stamp):
+        import csv
+        import platform
+        row = {'fecha': stamp, 'equipo': platform.node(), 'modo': run_mode(),
+               'python': platform.python_version(), 'total_ms': f"{self.total() * 1000:.1f}"}
+        row.update((phase, f"{seconds * 1000:.1f}") for phase, seconds in self.phases())
+        fields = list(row)
+        exists = path.exists()
+        if exists:
+            # Se respetan las columnas del archivo existente para poder comparar corridas
+            with open(path, newline='', encoding='utf-8') as f:
+                fields = next(csv.reader(f), fields)
+        with open(path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+            if not exists:
+                writer.writeheader()
+            writer.writerow(row)
+
+    def finish(self, phase=None, directory=None):
+        """Cerrar la última fase, detener cProfile y escribir informe, .prof y fila del CSV.
+        Devuelve la ruta del informe (None si el perfilador está desactivado)"""
+        if not self.enabled:
+            return None
+        from datetime import datetime
+        from pathlib import Path
+        if phase:
+            self.mark(phase)
+        if self.profile is not None:
+            self.profile.disable()
+        directory = Path(directory) if directory else Path.cwd() / 'log'
+        directory.mkdir(parents=True, exist_ok=True)
+        now = datetime.now()
+        self.report_path = directory / f"startup_{now:%Y%m%d_%H%M%S}.txt"
+        self.report_path.write_text(self.report(), encoding='utf-8')
+        if self.profile is not None:
+            self.profile.dump_stats(str(self.report_path.with_suffix('.prof')))
+        self._append_csv(directory / CSV_NAME, f"{now:%Y-%m-%d %H:%M:%S}")
+        self.enabled = False
+        return self.report_path
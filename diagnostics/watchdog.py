@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Vigilante de bloqueos del hilo de la interfaz
+El hilo de la interfaz llama a beat() con un QTimer; un hilo aparte revisa cada pocos
+milisegundos cuánto pasó desde el último latido. Si supera el umbral, registra un WARNING
+con la pila del hilo de la interfaz en ese momento (sys._current_frames), es decir, la
+operación que lo está bloqueando. Cada bloqueo se registra una sola vez; al volver el
+latido se registra su duración total.
+No vigila hasta recibir el primer latido, así que no avisa si el event loop aún no arrancó.
+"""
+
+import logging
+import sys
+import threading
+import time
+
+DEFAULT_THRESHOLD_MS = 500
+
+logger = logging.getLogger(__name__)
+
+
+class GuiWatchdog:
+    """Detectar y registrar bloqueos del hilo de la interfaz de más de threshold_ms"""
+
+    def __init__(self, threshold_ms=DEFAULT_THRESHOLD_MS, thread_id=None, clock=time.monotonic):
+        self.threshold_ms = threshold_ms
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.clock = clock
+        self.stalls = 0                # bloqueos registrados
+        self.last_stack = None
+        self._last_beat = None
+        self._stalled_since = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def beat_interval_ms(self):
+        """Intervalo del QTimer de latidos: bastante menor que el umbral"""
+        return max(20, self.threshold_ms // 5)
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def beat(self):
+        """Latido desde el hilo de la interfaz"""
+        now = self.clock()
+        if self._stalled_since is not None:
+            logger.warning(f"La interfaz volvió a responder tras {(now - self._stalled_since) * 1000:.0f} ms bloqueada")
+            self._stalled_since = None
+        self._last_beat = now
+
+    def check(self, now=None):
+        """Revisar el último latido; devuelve la pila registrada si se detectó un bloqueo nuevo"""
+        last = self._last_beat
+        if last is None or self._stalled_since is not None:
+            return None
+        now = self.clock() if now is None else now
+        blocked_ms = (now - last) * 1000
+        if blocked_ms < self.threshold_ms:
+            return None
+        import traceback
+        frame = sys._current_frames().get(self.thread_id)
+        stack = ''.join(traceback.format_stack(frame)) if frame is not None else '(hilo no encontrado)\n'
+        self._stalled_since = last
+        self.stalls += 1
+        self.last_stack = stack
+        logger.warning(f"Interfaz bloqueada hace {blocked_ms:.0f} ms (umbral {self.threshold_ms} ms); "
+                       f"pila del hilo de la interfaz:\n{stack}")
+        return stack
+
+    def _run(self):
+        interval = max(0.01, self.threshold_ms / 4000)
+        while not self._stop.wait(interval):
+            self.check()
+
+    def start(self):
+        if self.running:
+            return
+        self._last_beat = self._stalled_since = None
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='vigilante-interfaz', daemon=True)
+        self._thread.start()
+        logger.info(f"Vigilante de la interfaz activo (umbral {self.threshold_ms} ms)")
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        logger.info("Vigilante de la interfaz detenido")
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Paquete de exportación para NC AC FABEN
+Contiene los escritores por formato (XLSX, CSV, Parquet/Arrow), la exportación incremental
+y la exportación de auditoría
+"""
+
+from .formats import (
+    FORMATS,
+    DEFAULT_FORMAT,
+    available_formats,
+    format_from_path,
+    get_writer,
+    export_nc,
+    export_pareto
+)
+from .delta import (
+    DEFAULT_DESTINO,
+    DeltaResult,
+    export_delta,
+    get_mark,
+    current_version
+)
+from .audit import export_audit
+
+__version__ = "1.0.0"
+__author__ = "FABEN IT"
+
+# Exportar funciones principales
+__all__ = [
+    'FORMATS',
+    'DEFAULT_FORMAT',
+    'available_formats',
+    'format_from_path',
+    'get_writer',
+    'export_nc',
+    'export_pareto',
+    'DEFAULT_DESTINO',
+    'DeltaResult',
+    'export_delta',
+    'get_mark',
+    'current_version',
+    'export_audit'
+]
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Exportación de NC desde la línea de comandos
+
+Uso:
+    python -m export --formato csv               # genera export_nc.csv
+    python -m export --salida datos.parquet      # formato deducido por la extensión
+    python -m export --incremental --formato parquet
+    python -m export --auditoria                 # NC, acciones, adjuntos e Ishikawa
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from db.repository import connect, init_schema
+from .formats import FORMATS, available_formats, export_nc
+from .delta import DEFAULT_DESTINO, export_delta
+from .audit import export_audit
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m export', description="Exportación de NC AC FABEN")
+    parser.add_argument('--db', default=str(Path.cwd() / 'nc_ac_faben.db'), help="Base de datos SQLite")
+    parser.add_argument('--formato', choices=list(FORMATS), help="Formato de salida (por defecto según --salida o xlsx)")
+    parser.add_argument('--salida', help="Archivo de salida")
+    modo = parser.add_mutually_exclusive_group()
+    modo.add_argument('--incremental', action='store_true', help="Sólo cambios desde la última exportación")
+    modo.add_argument('--resincronizar', action='store_true', help="Exportación completa que reinicia la marca")
+    modo.add_argument('--auditoria', action='store_true', help="Hojas de NC, acciones, adjuntos y causas Ishikawa")
+    parser.add_argument('--destino', default=DEFAULT_DESTINO, help="Destino de la exportación incremental")
+    args = parser.parse_args(argv)
+
+    if args.formato and args.formato not in available_formats():
+        parser.error(f"El formato {args.formato} requiere instalar {FORMATS[args.formato][4]}")
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    conn = connect(args.db)
+    try:
+        init_schema(conn)
+        if args.incremental or args.resincronizar:
+            result = export_delta(conn, args.salida, args.destino, args.resincronizar, args.formato)
+            print(f"✅ {result}")
+        elif args.auditoria:
+            path, counts, elapsed = export_audit(conn, args.salida, args.formato)
+            detalle = ', '.join(f"{n} {hoja}" for hoja, n in counts.items())
+            print(f"✅ Auditoría exportada a {path} ({detalle}) en {elapsed:.2f}s")
+        else:
+            path, counts, elapsed = export_nc(conn, args.salida, args.formato)
+            print(f"✅ {counts.get('nc', 0)} NC exportadas a {path} en {elapsed:.2f}s")
+    finally:
+        conn.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
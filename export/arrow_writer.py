@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Escritura Parquet / Arrow IPC para las exportaciones de NC AC FABEN (dependencia opcional: pyarrow)
+Las columnas se tipan según el esquema: INTEGER -> int64, REAL -> float64,
+TEXT con formato de fecha -> timestamp/date, resto -> string.
+Las filas se escriben en lotes (record batches) sin cargar la tabla completa en memoria.
+"""
+
+from db import schema
+from .csv_writer import sheet_path
+
+BATCH_SIZE = 65536
+
+# Tipo de cada columna conocida por nombre; ids y 'nro_nc' (de joins) son enteros
+_FIELDS = {f.column: f for f in schema.NC_SCHEMA + schema.ACCION_SCHEMA}
+# Columnas fuera del esquema: ids de joins y de la auditoría, y las del Pareto (db.pareto.PARETO_HEADERS)
+_INTEGER_HEADERS = ('id', 'nc_id', 'fila_id', 'accion_id', 'nro_nc', 'nro_porque', 'row_version', 'cantidad')
+_REAL_HEADERS = ('porcentaje', 'acumulado')
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ImportError("La exportación Parquet/Arrow requiere pyarrow (pip install pyarrow)") from None
+
+
+def arrow_schema(headers):
+    """Esquema Arrow para una lista de encabezados"""
+    pa = _require_pyarrow()
+    fields = []
+    for h in headers:
+        f = _FIELDS.get(h)
+        if h in _INTEGER_HEADERS or (f and f.sql_type == 'INTEGER'):
+            t = pa.int64()
+        elif h in _REAL_HEADERS or (f and f.sql_type == 'REAL'):
+            t = pa.float64()
+        elif f and f.date_format:
+            t = pa.timestamp('s') if '%H' in f.date_format else pa.date32()
+        else:
+            t = pa.string()
+        fields.append(pa.field(h, t))
+    return pa.schema(fields)
+
+
+def _coerce(values, target):
+    """Convertir valores sueltos que SQLite guardó con otro tipo (texto en columna REAL, etc.)"""
+    out = []
+    for v in values:
+        if v is None or v == '':
+            out.append(None)
+            continue
+        try:
+            out.append(target(v))
+        except (TypeError, ValueError):
+            out.append(None)
+    return out
+
+
+def _column(values, field, headers_fmt):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    t = field.type
+    if pa.types.is_timestamp(t) or pa.types.is_date(t):
+        texts = pa.array([v if v else None for v in values], type=pa.string())
+        ts = pc.strptime(texts, format=headers_fmt[field.name], unit='s', error_is_null=True)
+        return ts.cast(pa.date32()) if pa.types.is_date(t) else ts
+    try:
+        return pa.array(values, type=t)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        if pa.types.is_integer(t):
+            return pa.array(_coerce(values, int), type=t)
+        if pa.types.is_floating(t):
+            return pa.array(_coerce(values, float), type=t)
+        return pa.array([None if v is None else str(v) for v in values], type=t)
+
+
+def _batches(rows, arrow_sch, batch_size):
+    import pyarrow as pa
+
+    formats = {f.name: _FIELDS[f.name].date_format for f in arrow_sch if f.name in _FIELDS}
+    batch = []
+    for row in rows:
+        batch.append(tuple(row))
+        if len(batch) >= batch_size:
+            yield _to_batch(batch, arrow_sch, formats, pa)
+            batch = []
+    if batch:
+        yield _to_batch(batch, arrow_sch, formats, pa)
+
+
+def _to_batch(batch, arrow_sch, formats, pa):
+    columns = list(zip(*batch))
+    arrays = [_column(list(col), field, formats) for col, field in zip(columns, arrow_sch)]
+    return pa.RecordBatch.from_arrays(arrays, schema=arrow_sch)
+
+
+def _write(path, sheets, open_writer, batch_size):
+    sheets = list(sheets)
+    counts = {}
+    for name, headers, rows in sheets:
+        arrow_sch = arrow_schema(headers)
+        writer = open_writer(sheet_path(path, name, len(sheets) > 1), arrow_sch)
+        n = 0
+        try:
+            for rb in _batches(rows, arrow_sch, batch_size):
+                writer.write_batch(rb)
+                n += rb.num_rows
+        finally:
+            writer.close()
+        counts[name] = n
+    return counts
+
+
+def write_parquet(path, sheets, batch_size=BATCH_SIZE):
+    """Escribir cada hoja como Parquet (compresión zstd). Devuelve {hoja: filas}"""
+    _require_pyarrow()
+    import pyarrow.parquet as pq
+    return _write(path, sheets, lambda p, s: pq.ParquetWriter(str(p), s, compression='zstd'), batch_size)
+
+
+def write_arrow(path, sheets, batch_size=BATCH_SIZE):
+    """Escribir cada hoja como archivo Arrow IPC (Feather v2). Devuelve {hoja: filas}"""
+    pa = _require_pyarrow()
+    return _write(path, sheets, lambda p, s: pa.ipc.new_file(str(p), s), batch_size)
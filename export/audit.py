@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Exportación de auditoría de NC AC FABEN
+Una hoja por entidad (NC, acciones, adjuntos y causas Ishikawa) leídas dentro de una
+única transacción de lectura, de modo que todas las hojas reflejan el mismo estado.
+Cada hoja se recorre con un cursor (joins por índice, sin consultas por NC) y se
+escribe en streaming con el escritor del formato elegido.
+"""
+
+import logging
+import time
+from pathlib import Path
+
+from db import schema
+from .formats import DEFAULT_FORMAT, format_from_path, get_writer, suffix_for
+
+logger = logging.getLogger(__name__)
+
+ACCION_AUDIT_HEADERS = ('id',) + schema.ACCION_COLUMNS + ('nro_nc',)
+ADJUNTO_AUDIT_HEADERS = ('nro_nc', 'accion_id', 'archivo')
+ISHIKAWA_AUDIT_HEADERS = ('nro_nc', 'categoria', 'nro_porque', 'porque')
+
+# acciones recorridas por idx_acciones_nc_id; la NC se resuelve por su clave primaria
+ACCION_AUDIT_SQL = (f"SELECT a.id,{','.join('a.' + c for c in schema.ACCION_COLUMNS)},n.nro_nc "
+                    f"FROM acciones a JOIN nc n ON n.id = a.nc_id ORDER BY a.nc_id, a.id")
+ADJUNTO_AUDIT_SQL = ("SELECT n.nro_nc, a.id, a.adjuntos FROM acciones a JOIN nc n ON n.id = a.nc_id "
+                     "WHERE a.adjuntos <> '' ORDER BY a.nc_id, a.id")
+ISHIKAWA_AUDIT_SQL = "SELECT nro_nc, ishikawa FROM nc WHERE ishikawa <> '' ORDER BY id"
+
+
+def _adjunto_rows(cursor):
+    """Un archivo por fila. save_record repite los adjuntos de la NC en cada acción:
+    se informa cada archivo una sola vez, con la primera acción que lo lleva"""
+    current_nc, seen = None, set()
+    for nro_nc, accion_id, adjuntos in cursor:
+        if nro_nc != current_nc:
+            current_nc, seen = nro_nc, set()
+        for name in adjuntos.split('||'):
+            if name and name not in seen:
+                seen.add(name)
+                yield nro_nc, accion_id, name
+
+
+def _ishikawa_rows(cursor):
+    """Una fila por cada 'por qué' respondido de cada categoría M seleccionada"""
+    for nro_nc, texto in cursor:
+        for categoria, whys in schema.parse_ishikawa(texto):
+            answered = [(i, w) for i, w in enumerate(whys, 1) if w.strip()]
+            if not answered:
+                yield nro_nc, categoria, None, ''
+            for i, why in answered:
+                yield nro_nc, categoria, i, why
+
+
+def audit_sheets(conn):
+    """Hojas (nombre, encabezados, filas) de la auditoría. Llamar dentro de una transacción"""
+    return [
+        ('nc', schema.NC_EXPORT_HEADERS, conn.execute(schema.NC_SELECT_ALL_SQL)),
+        ('acciones', ACCION_AUDIT_HEADERS, conn.execute(ACCION_AUDIT_SQL)),
+        ('adjuntos', ADJUNTO_AUDIT_HEADERS, _adjunto_rows(conn.execute(ADJUNTO_AUDIT_SQL))),
+        ('ishikawa', ISHIKAWA_AUDIT_HEADERS, _ishikawa_rows(conn.execute(ISHIKAWA_AUDIT_SQL))),
+    ]
+
+
+def export_audit(conn, path=None, fmt=None, writer=None):
+    """Exportar NC, acciones, adjuntos y causas Ishikawa. Devuelve (path, {hoja: filas}, segundos)"""
+    fmt = fmt or (format_from_path(path) if path else DEFAULT_FORMAT)
+    path = Path(path) if path else Path.cwd() / f"export_nc_auditoria{suffix_for(fmt)}"
+    writer = writer or get_writer(fmt)
+    start = time.perf_counter()
+    # Lectura consistente: todas las hojas dentro de la misma transacción de lectura
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        counts = writer(path, audit_sheets(conn))
+    finally:
+        if own_transaction:
+            conn.execute("COMMIT")
+    elapsed = time.perf_counter() - start
+    detalle = ', '.join(f"{n} {hoja}" for hoja, n in counts.items())
+    logger.info(f"Exportación de auditoría {fmt}: {detalle} -> {path.name} en {elapsed:.3f}s")
+    return path, counts, elapsed
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Escritura CSV en streaming para las exportaciones de NC AC FABEN
+Una fila en memoria a la vez; varias hojas generan un archivo por hoja
+"""
+
+import csv
+from pathlib import Path
+
+
+def sheet_path(path, name, multiple):
+    """Archivo de una hoja: el mismo path si hay una sola, <nombre>_<hoja><ext> si hay varias"""
+    path = Path(path)
+    return path.with_name(f"{path.stem}_{name}{path.suffix}") if multiple else path
+
+
+def write_csv(path, sheets, batch_size=10000):
+    """Escribir cada (nombre, encabezados, filas) como CSV UTF-8. Devuelve {hoja: filas}"""
+    sheets = list(sheets)
+    counts = {}
+    for name, headers, rows in sheets:
+        with open(sheet_path(path, name, len(sheets) > 1), 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.writer(fh)
+            writer.writerow(headers)
+            n = 0
+            batch = []
+            for row in rows:
+                batch.append(tuple(row))
+                if len(batch) >= batch_size:
+                    writer.writerows(batch)
+                    n += len(batch)
+                    batch.clear()
+            writer.writerows(batch)
+            counts[name] = n + len(batch)
+    return counts
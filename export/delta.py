@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Exportación incremental de NC y acciones
+Exporta sólo lo creado, modificado o borrado desde la última exportación exitosa
+de cada destino, usando row_version (mantenida por triggers, ver db/migrations.py)
+como marca de agua. También permite una resincronización completa.
+
+Uso:
+    python -m export.delta                 # cambios desde la última exportación
+    python -m export.delta --completo      # resincronización completa
+    python -m export.delta --formato parquet
+"""
+
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from db import schema
+from db.repository import connect, init_schema
+from .formats import FORMATS, DEFAULT_FORMAT, format_from_path, get_writer, suffix_for
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DESTINO = 'bi'
+
+VERSION_SQL = "SELECT valor FROM cambios_seq WHERE id = 1"
+MARK_SQL = "SELECT version FROM export_estado WHERE destino = ?"
+SET_MARK_SQL = ("INSERT INTO export_estado (destino, version, fecha) VALUES (?, ?, ?) "
+                "ON CONFLICT(destino) DO UPDATE SET version = excluded.version, fecha = excluded.fecha")
+PRUNE_BORRADOS_SQL = "DELETE FROM borrados WHERE row_version <= (SELECT MIN(version) FROM export_estado)"
+
+_RANGE = 'row_version > ? AND row_version <= ?'
+NC_DELTA_SQL = schema.select_sql('nc', schema.NC_COLUMNS, where=_RANGE) + " ORDER BY row_version"
+ACCION_DELTA_HEADERS = ('id',) + schema.ACCION_COLUMNS + ('nro_nc',)
+ACCION_DELTA_SQL = (f"SELECT a.id,{','.join('a.' + c for c in schema.ACCION_COLUMNS)},n.nro_nc "
+                    f"FROM acciones a LEFT JOIN nc n ON n.id = a.nc_id "
+                    f"WHERE a.row_version > ? AND a.row_version <= ? ORDER BY a.row_version")
+BORRADOS_HEADERS = ('tabla', 'fila_id', 'nc_id', 'row_version')
+BORRADOS_SQL = f"SELECT {','.join(BORRADOS_HEADERS)} FROM borrados WHERE {_RANGE} ORDER BY row_version"
+
+
+class DeltaResult:
+    """Resumen de una exportación incremental"""
+
+    def __init__(self, destino, desde, hasta, full):
+        self.destino = destino
+        self.desde = desde
+        self.hasta = hasta
+        self.full = full
+        self.path = None
+        self.counts = {}
+        self.elapsed = 0.0
+
+    @property
+    def empty(self):
+        return self.path is None
+
+    def __str__(self):
+        if self.empty:
+            return f"Sin cambios para '{self.destino}' desde la versión {self.desde}"
+        detalle = ', '.join(f"{n} {hoja}" for hoja, n in self.counts.items())
+        modo = 'completa' if self.full else 'incremental'
+        return (f"Exportación {modo} '{self.destino}' versiones {self.desde}..{self.hasta}: "
+                f"{detalle} -> {self.path.name} en {self.elapsed:.2f}s")
+
+
+def current_version(conn):
+    return conn.execute(VERSION_SQL).fetchone()[0]
+
+
+def get_mark(conn, destino=DEFAULT_DESTINO):
+    row = conn.execute(MARK_SQL, (destino,)).fetchone()
+    return row[0] if row else 0
+
+
+def set_mark(conn, destino, version):
+    with conn:
+        conn.execute(SET_MARK_SQL, (destino, version, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        conn.execute(PRUNE_BORRADOS_SQL)
+
+
+def default_path(desde, hasta, full, suffix='.xlsx'):
+    nombre = f"export_nc_completo_{hasta}" if full else f"export_nc_delta_{desde}_{hasta}"
+    return Path.cwd() / f"{nombre}{suffix}"
+
+
+def export_delta(conn, path=None, destino=DEFAULT_DESTINO, full=False, fmt=None, writer=None):
+    """Exportar los cambios pendientes del destino (o todo si full=True) y avanzar su marca.
+    Sin fmt, el formato se deduce de la extensión de path (xlsx si no hay path).
+    La marca sólo se actualiza si el archivo se escribió sin errores."""
+    fmt = fmt or (format_from_path(path) if path else DEFAULT_FORMAT)
+    writer = writer or get_writer(fmt)
+    start = time.perf_counter()
+    # Lectura consistente: versión tope y filas dentro de la misma transacción de lectura
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN")
+    try:
+        hasta = current_version(conn)
+        desde = 0 if full else get_mark(conn, destino)
+        result = DeltaResult(destino, desde, hasta, full)
+        if hasta > desde:
+            path = Path(path) if path else default_path(desde, hasta, full, suffix_for(fmt))
+            sheets = [('nc', schema.NC_EXPORT_HEADERS, conn.execute(NC_DELTA_SQL, (desde, hasta))),
+                      ('acciones', ACCION_DELTA_HEADERS, conn.execute(ACCION_DELTA_SQL, (desde, hasta)))]
+            if not full:
+                sheets.append(('borrados', BORRADOS_HEADERS, conn.execute(BORRADOS_SQL, (desde, hasta))))
+            result.counts = writer(path, sheets)
+            result.path = path
+    finally:
+        if own_transaction:
+            conn.execute("COMMIT")
+
+    if not result.empty or full:
+        set_mark(conn, destino, hasta)
+    result.elapsed = time.perf_counter() - start
+    logger.info(str(result))
+    return result
+
+
+def main(argv=None):
+    import argparse     # sólo la línea de comandos: la aplicación importa este módulo al arrancar
+    parser = argparse.ArgumentParser(description="Exportación incremental de NC y acciones")
+    parser.add_argument('--db', default=str(Path.cwd() / 'nc_ac_faben.db'), help="Base de datos SQLite")
+    parser.add_argument('--destino', default=DEFAULT_DESTINO, help="Nombre del destino (una marca por destino)")
+    parser.add_argument('--completo', action='store_true', help="Resincronización completa")
+    parser.add_argument('--formato', choices=list(FORMATS), help="Formato de salida (por defecto según --salida o xlsx)")
+    parser.add_argument('--salida', help="Archivo de salida (por defecto export_nc_delta_<desde>_<hasta>.<ext>)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
+    conn = connect(args.db)
+    try:
+        init_schema(conn)
+        result = export_delta(conn, args.salida, args.destino, args.completo, args.formato)
+    finally:
+        conn.close()
+    print(f"✅ {result}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,23 @@
+#!/usr/bin/env python3
+"""
+Escritura de hojas Excel para las exportaciones de NC AC FABEN
+Usa el modo write-only de openpyxl: las filas se vuelcan a disco a medida que se agregan
+"""
+
+
+def write_xlsx(path, sheets):
+    """Escribir un libro con una hoja por cada (nombre, encabezados, filas). Devuelve {hoja: filas}"""
+    from openpyxl import Workbook  # sólo se necesita al exportar
+
+    wb = Workbook(write_only=True)
+    counts = {}
+    for name, headers, rows in sheets:
+        ws = wb.create_sheet(title=name)
+        ws.append(list(headers))
+        n = 0
+        for row in rows:
+            ws.append(tuple(row))
+            n += 1
+        counts[name] = n
+    wb.save(path)
+    return counts
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Formatos de exportación disponibles para NC AC FABEN
+Registro de escritores por formato y exportación completa de la tabla nc
+"""
+
+import importlib
+import importlib.util
+import logging
+import time
+from pathlib import Path
+
+from db import schema
+from db.repository import NCRepository
+
+logger = logging.getLogger(__name__)
+
+# formato: (descripción, extensión, módulo, función, dependencia opcional)
+FORMATS = {
+    'xlsx': ('Excel', '.xlsx', 'export.excel', 'write_xlsx', 'openpyxl'),
+    'csv': ('CSV', '.csv', 'export.csv_writer', 'write_csv', None),
+    'parquet': ('Parquet', '.parquet', 'export.arrow_writer', 'write_parquet', 'pyarrow'),
+    'arrow': ('Arrow IPC', '.arrow', 'export.arrow_writer', 'write_arrow', 'pyarrow'),
+}
+
+DEFAULT_FORMAT = 'xlsx'
+
+
+def available_formats():
+    """Formatos cuya dependencia está instalada, en orden de registro"""
+    return [fmt for fmt, (_, _, _, _, dep) in FORMATS.items()
+            if dep is None or importlib.util.find_spec(dep) is not None]
+
+
+def suffix_for(fmt):
+    return FORMATS[fmt][1]
+
+
+def format_from_path(path):
+    """Deducir el formato a partir de la extensión (por defecto xlsx)"""
+    suffix = Path(path).suffix.lower()
+    for fmt, (_, ext, _, _, _) in FORMATS.items():
+        if ext == suffix or (fmt == 'arrow' and suffix == '.feather'):
+            return fmt
+    return DEFAULT_FORMAT
+
+
+def get_writer(fmt):
+    """Función escritora (path, hojas) -> {hoja: filas} del formato pedido"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato de exportación desconocido: {fmt} (opciones: {', '.join(FORMATS)})")
+    _, _, module, func, _ = FORMATS[fmt]
+    return getattr(importlib.import_module(module), func)
+
+
+def export_nc(conn, path=None, fmt=None):
+    """Exportar la tabla nc completa. Devuelve (path, {hoja: filas}, segundos)"""
+    fmt = fmt or (format_from_path(path) if path else DEFAULT_FORMAT)
+    path = Path(path) if path else Path.cwd() / f"export_nc{suffix_for(fmt)}"
+    start = time.perf_counter()
+    counts = get_writer(fmt)(path, [('nc', schema.NC_EXPORT_HEADERS, NCRepository(conn).iter_all())])
+    elapsed = time.perf_counter() - start
+    logger.info(f"Exportación {fmt} de {counts.get('nc', 0)} NC a {path.name} en {elapsed:.3f}s")
+    return path, counts, elapsed
+
+
+def export_pareto(result, path=None, fmt=None):
+    """Exportar un ParetoResult (db/pareto.py) como hoja 'pareto'. Devuelve (path, {hoja: filas})"""
+    from db.pareto import PARETO_HEADERS
+    fmt = fmt or (format_from_path(path) if path else DEFAULT_FORMAT)
+    rango = f"_{result.desde or 'inicio'}_{result.hasta or 'fin'}" if result.desde or result.hasta else ''
+    path = Path(path) if path else Path.cwd() / f"pareto_{result.dimension}_{result.metric}{rango}{suffix_for(fmt)}"
+    rows = ((i.valor, i.cantidad, i.costo, round(i.porcentaje, 2), round(i.acumulado, 2)) for i in result.items)
+    counts = get_writer(fmt)(path, [('pareto', PARETO_HEADERS, rows)])
+    logger.info(f"Pareto {result.dimension}/{result.metric} exportado a {path.name}")
+    return path, counts
@@ -8,6 +8,10 @@ from .logging_config import (
     setup_development_logging,
     setup_production_logging,
     setup_debug_logging,
+    setup_logging_off,
+    setup_logging_profile,
+    select_logging_profile,
+    LOG_PROFILES,
     log_performance,
     get_module_logger,
     mask_sensitive_data
@@ -21,6 +25,10 @@ __all__ = [
     'setup_development_logging',
     'setup_production_logging', 
     'setup_debug_logging',
+    'setup_logging_off',
+    'setup_logging_profile',
+    'select_logging_profile',
+    'LOG_PROFILES',
     'log_performance',
     'get_module_logger',
     'mask_sensitive_data'
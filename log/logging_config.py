@@ -2,14 +2,23 @@
 """
 Configuración de logging para NC AC FABEN
 Módulo independiente para manejo de logs con diferentes niveles y formatos
+El perfil (production, development, debug, off) se elige al iniciar con --log-profile,
+la variable NC_AC_LOG_PROFILE o la sección [logging] de nc_ac_faben.ini
 """
 
 import logging
 import logging.handlers
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
 
+LOG_PROFILES = ('production', 'development', 'debug', 'off')
+LOG_PROFILE_FLAG = '--log-profile'
+LOG_PROFILE_ENV = 'NC_AC_LOG_PROFILE'
+CONFIG_FILE = 'nc_ac_faben.ini'
+BATCH_CAPACITY = 200            # registros acumulados en memoria antes de escribir (producción)
+
 class LoggingConfig:
     """Configurador de sistema de logging para la aplicación"""
     
@@ -18,13 +27,17 @@ class LoggingConfig:
                  console_output=True,
                  file_output=True,
                  max_file_size_mb=10,
-                 backup_count=5):
+                 backup_count=5,
+                 batch_size=0):
         
         self.log_level = log_level
         self.console_output = console_output
         self.file_output = file_output
         self.max_file_size_mb = max_file_size_mb
         self.backup_count = backup_count
+        # Con batch_size > 0 los archivos se escriben en lotes (MemoryHandler); un WARNING
+        # o superior descarga el lote de inmediato, y logging.shutdown() al salir el resto
+        self.batch_size = batch_size
         
         # Determinar el directorio de logs
         if Path.cwd().name == 'log':
@@ -43,9 +56,13 @@ class LoggingConfig:
         # Configuración del logger principal
         logger = logging.getLogger()
         logger.setLevel(self.log_level)
+        # Deshacer un perfil 'off' anterior
+        logging.disable(logging.NOTSET)
         
         # Limpiar handlers existentes
-        logger.handlers.clear()
+        for handler in logger.handlers[:]:
+            logger.removeHandler(handler)
+            handler.close()
         
         # Formato para logs
         formatter = logging.Formatter(
@@ -67,7 +84,7 @@ class LoggingConfig:
             )
             file_handler.setLevel(logging.INFO)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            logger.addHandler(self._batched(file_handler))
             
             # Handler separado para debug (solo errores y debug)
             debug_handler = logging.handlers.RotatingFileHandler(
@@ -86,7 +103,7 @@ class LoggingConfig:
                                             logging.ERROR, logging.CRITICAL]
             
             debug_handler.addFilter(DebugFilter())
-            logger.addHandler(debug_handler)
+            logger.addHandler(self._batched(debug_handler))
         
         # Handler para consola
         if self.console_output:
@@ -103,6 +120,18 @@ class LoggingConfig:
         
         return logger
 
+    def _batched(self, handler):
+        """Envolver el handler de archivo en un MemoryHandler si se pidió escritura en lotes"""
+        if self.batch_size <= 0:
+            return handler
+        memory = logging.handlers.MemoryHandler(self.batch_size, flushLevel=logging.WARNING,
+                                                target=handler)
+        # El nivel y el filtro se aplican antes de acumular, no al descargar
+        memory.setLevel(handler.level)
+        for log_filter in handler.filters:
+            memory.addFilter(log_filter)
+        return memory
+
 def setup_production_logging():
     """Configuración optimizada para producción"""
     config = LoggingConfig(
@@ -110,7 +139,8 @@ def setup_production_logging():
         console_output=False,
         file_output=True,
         max_file_size_mb=5,
-        backup_count=3
+        backup_count=3,
+        batch_size=BATCH_CAPACITY
     )
     return config.setup_logging()
 
@@ -136,6 +166,62 @@ def setup_debug_logging():
     )
     return config.setup_logging()
 
+def setup_logging_off():
+    """Sin registros: logging.disable descarta cada llamada en la primera comprobación"""
+    logger = logging.getLogger()
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+        handler.close()
+    logger.addHandler(logging.NullHandler())
+    logging.disable(logging.CRITICAL)
+    return logger
+
+PROFILE_SETUP = {
+    'production': setup_production_logging,
+    'development': setup_development_logging,
+    'debug': setup_debug_logging,
+    'off': setup_logging_off,
+}
+
+def default_logging_profile():
+    """production en el ejecutable de PyInstaller, development desde el código fuente"""
+    return 'production' if getattr(sys, 'frozen', False) else 'development'
+
+def select_logging_profile(argv=None, environ=None, config_file=None):
+    """Elegir el perfil de logging. Devuelve (perfil, origen).
+    Prioridad: --log-profile NOMBRE, variable NC_AC_LOG_PROFILE, 'perfil' de la sección
+    [logging] de nc_ac_faben.ini (directorio actual) y, si no se indica, el predeterminado.
+    Un nombre desconocido se ignora y se usa el predeterminado, indicándolo en el origen"""
+    argv = sys.argv if argv is None else argv
+    environ = os.environ if environ is None else environ
+    requested = None
+    for i, arg in enumerate(argv):
+        if arg.startswith(LOG_PROFILE_FLAG + '='):
+            requested = (arg.split('=', 1)[1], 'línea de comandos')
+        elif arg == LOG_PROFILE_FLAG and i + 1 < len(argv):
+            requested = (argv[i + 1], 'línea de comandos')
+    if requested is None and environ.get(LOG_PROFILE_ENV):
+        requested = (environ[LOG_PROFILE_ENV], f'variable {LOG_PROFILE_ENV}')
+    if requested is None:
+        path = Path(config_file) if config_file else Path.cwd() / CONFIG_FILE
+        if path.exists():
+            import configparser
+            parser = configparser.ConfigParser()
+            parser.read(path, encoding='utf-8')
+            value = parser.get('logging', 'perfil', fallback='')
+            if value:
+                requested = (value, f'archivo {path.name}')
+    if requested is None:
+        return default_logging_profile(), 'predeterminado'
+    name, source = requested[0].strip().lower(), requested[1]
+    if name not in LOG_PROFILES:
+        return default_logging_profile(), f"predeterminado (perfil desconocido '{requested[0]}' en {source})"
+    return name, source
+
+def setup_logging_profile(profile):
+    """Configurar el logging con uno de LOG_PROFILES"""
+    return PROFILE_SETUP[profile]()
+
 # Función de utilidad para logging de performance
 def log_performance(func):
     """Decorador para medir tiempo de ejecución de funciones y métodos"""
@@ -157,7 +243,7 @@ def log_performance(func):
         start_time = time.time()
         
         try:
-            logger.debug(f"Iniciando ejecución de {func_name}")
+            logger.debug("Iniciando ejecución de %s", func_name)
             result = func(*args, **kwargs)
             end_time = time.time()
             execution_time = end_time - start_time
@@ -205,4 +291,6 @@ if __name__ == '__main__':
     print("Configuraciones de logging disponibles:")
     print("- setup_production_logging(): Para producción")
     print("- setup_development_logging(): Para desarrollo") 
-    print("- setup_debug_logging(): Para debugging intensivo")
\ No newline at end of file
+    print("- setup_debug_logging(): Para debugging intensivo")
+    print("- setup_logging_off(): Sin registros")
+    print(f"- select_logging_profile(): {LOG_PROFILE_FLAG}, {LOG_PROFILE_ENV} o {CONFIG_FILE}")
\ No newline at end of file
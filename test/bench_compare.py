@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Comparación de corridas de la suite de benchmarks contra una base guardada en el repositorio
+La base de cada escala vive en test/baselines/suite_<escala>.json (la genera --guardar-base).
+Sin --actual vuelve a correr la suite con la misma escala, repeticiones, operaciones,
+semilla y benchmarks que la base, y compara benchmark por benchmark:
+  - cociente de medianas actual / base (> 1 es más lento)
+  - intervalo de confianza del cociente por bootstrap de las muestras de ambas corridas
+  - regresión: el cociente supera 1 + umbral y todo el intervalo queda por encima de 1
+    (la demora es mayor que el umbral y no se explica por el ruido entre repeticiones)
+  - mejora: el caso simétrico, por debajo de 1 / (1 + umbral)
+  - confirmación: los benchmarks con regresión se vuelven a medir solos (--confirmar veces) y
+    sólo cuentan si la regresión se repite en todas las mediciones; así una ráfaga de carga
+    del equipo durante una parte de la corrida no hace fallar la comparación
+Sale con código 1 si hay alguna regresión. Las bases sólo son comparables en el mismo equipo:
+si el equipo difiere se avisa, y conviene regenerar la base en el equipo que corre la comparación.
+
+Uso:
+    python test/bench_compare.py [--escala 10k] [--umbral 0.25] [--umbral-bench exportar_xlsx=0.4]
+                                 [--confirmar 2]
+    python test/bench_compare.py --actual test/resultados/suite_10k_20251019_101500.json
+    python test/bench_compare.py --guardar-base [--escala 10k] [--repeticiones 7]
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+BASELINE_DIR = current_dir / 'baselines'
+DEFAULT_THRESHOLD = 0.25
+CONFIDENCE = 0.95
+RESAMPLES = 2000
+
+REGRESSION = 'regresión'
+IMPROVEMENT = 'mejora'
+UNCHANGED = 'sin cambio'
+MISSING = 'sin datos'
+
+
+class Comparison(NamedTuple):
+    name: str
+    unit: str
+    base: Optional[float]          # mediana de la base
+    current: Optional[float]       # mediana actual
+    ratio: Optional[float]         # actual / base
+    low: Optional[float]           # intervalo de confianza del cociente
+    high: Optional[float]
+    threshold: float
+    status: str
+
+
+def baseline_path(escala):
+    return BASELINE_DIR / f"suite_{escala}.json"
+
+
+def bootstrap_ratio_ci(base, current, confidence=CONFIDENCE, resamples=RESAMPLES, seed=0):
+    """Intervalo (bajo, alto) del cociente de medianas remuestreando ambas series con reemplazo"""
+    rnd = random.Random(seed)
+    ratios = []
+    for _ in range(resamples):
+        b = statistics.median(rnd.choices(base, k=len(base)))
+        c = statistics.median(rnd.choices(current, k=len(current)))
+        if b > 0:
+            ratios.append(c / b)
+    if not ratios:
+        return None, None
+    ratios.sort()
+    tail = (1 - confidence) / 2
+    return ratios[int(tail * len(ratios))], ratios[min(len(ratios) - 1, int((1 - tail) * len(ratios)))]
+
+
+def compare_benchmark(name, base, current, threshold):
+    unit = (base or current or {}).get('unidad', '')
+    if not base or not current or 'muestras' not in base or 'muestras' not in current:
+        return Comparison(name, unit, base and base.get('mediana'), current and current.get('mediana'),
+                          None, None, None, threshold, MISSING)
+    base_median = statistics.median(base['muestras'])
+    current_median = statistics.median(current['muestras'])
+    if base_median <= 0:
+        return Comparison(name, unit, base_median, current_median, None, None, None, threshold, MISSING)
+    ratio = current_median / base_median
+    low, high = bootstrap_ratio_ci(base['muestras'], current['muestras'])
+    status = UNCHANGED
+    if ratio > 1 + threshold and low is not None and low > 1:
+        status = REGRESSION
+    elif ratio < 1 / (1 + threshold) and high is not None and high < 1:
+        status = IMPROVEMENT
+    return Comparison(name, unit, base_median, current_median, ratio, low, high, threshold, status)
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD, overrides=None):
+    """Comparar dos resultados de bench_suite.py; devuelve [Comparison] en el orden de la base"""
+    overrides = overrides or {}
+    names = list(baseline['resultados'])
+    names += [n for n in current['resultados'] if n not in baseline['resultados']]
+    return [compare_benchmark(name, baseline['resultados'].get(name), current['resultados'].get(name),
+                              overrides.get(name, threshold))
+            for name in names]
+
+
+def confirm(baseline, comparisons, settings, runner, rounds=1, threshold=DEFAULT_THRESHOLD, overrides=None):
+    """Volver a medir sólo los benchmarks con regresión, hasta rounds veces.
+    Una regresión que no se repite queda con la comparación de la última medición;
+    devuelve (comparaciones, corridas de confirmación)"""
+    comparisons = list(comparisons)
+    reruns = []
+    for _ in range(rounds):
+        suspects = [c.name for c in comparisons if c.status == REGRESSION]
+        if not suspects:
+            break
+        print(f"\n🔁 Confirmando: {', '.join(suspects)}")
+        current = runner(**dict(settings, only=suspects))
+        reruns.append(current)
+        again = {c.name: c for c in compare(baseline, current, threshold, overrides) if c.name in suspects}
+        comparisons = [again.get(c.name, c) if c.status == REGRESSION else c for c in comparisons]
+    return comparisons, reruns
+
+
+def report(comparisons):
+    lines = [f"{'Benchmark':<22}{'base':>11}{'actual':>11}  {'unidad':<12}{'cociente':>9}{'IC 95%':>17}  estado"]
+    for c in comparisons:
+        base = f"{c.base:.3f}" if c.base is not None else '-'
+        current = f"{c.current:.3f}" if c.current is not None else '-'
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else '-'
+        ci = f"[{c.low:.2f}, {c.high:.2f}]" if c.low is not None else '-'
+        mark = {REGRESSION: '❌', IMPROVEMENT: '🚀', UNCHANGED: '✅', MISSING: '⚪'}[c.status]
+        lines.append(f"{c.name:<22}{base:>11}{current:>11}  {c.unit:<12}{ratio:>9}{ci:>17}  {mark} {c.status}"
+                     + (f" (umbral {c.threshold:.0%})" if c.status == REGRESSION else ''))
+    return '\n'.join(lines)
+
+
+def suite_settings(baseline):
+    """Parámetros para repetir la corrida de la base (los formatos no instalados quedan 'sin datos')"""
+    from export.formats import available_formats
+    measured = [r for r in baseline['resultados'].values() if 'operaciones' in r]
+    return dict(count=baseline['nc'], repetitions=baseline['repeticiones'],
+                ops=measured[0]['operaciones'] if measured else 50, seed=baseline['semilla'],
+                escala=baseline['escala'], only=list(baseline['resultados']),
+                formats=[n[len('exportar_'):] for n in baseline['resultados']
+                         if n.startswith('exportar_') and n[len('exportar_'):] in available_formats()])
+
+
+def save_result(result, escala):
+    import bench_suite
+    path = bench_suite.RESULTS_DIR / f"comparacion_{escala}_{result['fecha'].replace(':', '')}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding='utf-8')
+    return path
+
+
+def parse_overrides(values, parser):
+    overrides = {}
+    for value in values or ():
+        name, sep, threshold = value.partition('=')
+        try:
+            overrides[name.strip()] = float(threshold)
+        except ValueError:
+            parser.error(f"--umbral-bench espera nombre=umbral: {value}")
+        if not sep:
+            parser.error(f"--umbral-bench espera nombre=umbral: {value}")
+    return overrides
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comparar la suite de benchmarks contra la base del repositorio")
+    parser.add_argument('--escala', default='10k', help="Escala de la base (suite_<escala>.json)")
+    parser.add_argument('--base', help="Archivo de base (por defecto test/baselines/suite_<escala>.json)")
+    parser.add_argument('--actual', help="Resultado ya medido a comparar (sin volver a correr la suite)")
+    parser.add_argument('--umbral', type=float, default=DEFAULT_THRESHOLD, help="Demora tolerada (0.25 = 25 %%)")
+    parser.add_argument('--umbral-bench', action='append', metavar='NOMBRE=UMBRAL',
+                        help="Umbral propio de un benchmark (se puede repetir)")
+    parser.add_argument('--confirmar', type=int, default=2,
+                        help="Veces que se vuelven a medir las regresiones antes de fallar (0 = ninguna)")
+    parser.add_argument('--guardar-base', action='store_true', help="Correr la suite y guardar el resultado como base")
+    parser.add_argument('--repeticiones', type=int, default=5, help="Con --guardar-base: muestras por benchmark")
+    parser.add_argument('--operaciones', type=int, default=50, help="Con --guardar-base: operaciones por muestra")
+    args = parser.parse_args(argv)
+    overrides = parse_overrides(args.umbral_bench, parser)
+    base_file = Path(args.base) if args.base else baseline_path(args.escala)
+
+    import bench_suite
+    if args.guardar_base:
+        from synthetic_data import SCALES
+        count = SCALES[args.escala] if args.escala in SCALES else int(args.escala)
+        result = bench_suite.run(count, args.repeticiones, args.operaciones, escala=args.escala)
+        base_file.parent.mkdir(parents=True, exist_ok=True)
+        base_file.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding='utf-8')
+        print(f"✅ Base guardada en {base_file}")
+        return 0
+
+    if not base_file.exists():
+        print(f"❌ No existe la base {base_file}: generarla con --guardar-base")
+        return 1
+    baseline = json.loads(base_file.read_text(encoding='utf-8'))
+    if args.actual:
+        current = json.loads(Path(args.actual).read_text(encoding='utf-8'))
+    else:
+        current = bench_suite.run(**suite_settings(baseline))
+        save_result(current, baseline['escala'])
+
+    print(f"\n📊 Base: {base_file.name} ({baseline['fecha']}, commit {baseline.get('commit') or '?'}, "
+          f"{baseline['equipo']})   Actual: commit {current.get('commit') or '?'}")
+    if baseline['equipo'] != current['equipo']:
+        print(f"⚠️  Equipos distintos ({baseline['equipo']} / {current['equipo']}): "
+              f"los tiempos pueden no ser comparables")
+    comparisons = compare(baseline, current, args.umbral, overrides)
+    if not args.actual:
+        comparisons, reruns = confirm(baseline, comparisons, suite_settings(baseline), bench_suite.run,
+                                      args.confirmar, args.umbral, overrides)
+        for rerun in reruns:
+            save_result(rerun, baseline['escala'])
+    print(report(comparisons))
+    regressions = [c.name for c in comparisons if c.status == REGRESSION]
+    if regressions:
+        print(f"❌ Regresiones: {', '.join(regressions)}")
+        return 1
+    print(f"✅ Sin regresiones mayores al umbral ({args.umbral:.0%})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark del autocompletado por prefijo (db/completion.py)
+Arma el índice con códigos de producto sintéticos y mide la latencia de completar
+cada tecla de códigos existentes. Objetivo: muy por debajo de 1 ms por tecla.
+
+Uso:
+    python test/bench_completion.py [valores]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db.completion import PrefixIndex
+
+FAMILIAS = ['BRD', 'TAP', 'EJE', 'BRI', 'CUB', 'SOP', 'RUE', 'CAR']
+
+
+def synthetic_codes(count, seed=5):
+    rnd = random.Random(seed)
+    return [f"{rnd.choice(FAMILIAS)}-{rnd.randint(0, 99999):05d}-{chr(65 + n % 26)}"
+            for n in range(count)]
+
+
+def run(count=50000, queries=500):
+    codes = synthetic_codes(count)
+    start = time.perf_counter()
+    index = PrefixIndex(codes)
+    print(f"📄 Índice de {len(index)} valores armado en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    rnd = random.Random(3)
+    latencies = []
+    for _ in range(queries):
+        code = rnd.choice(codes)
+        for i in range(1, len(code) + 1):
+            start = time.perf_counter()
+            index.complete(code[:i].lower())
+            latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"⏱️  Por tecla: mediana {statistics.median(latencies):.3f} ms, p95 {p95:.3f} ms, "
+          f"máx {latencies[-1]:.3f} ms ({len(latencies)} consultas)")
+    return latencies
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
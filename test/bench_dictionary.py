@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la codificación por diccionario (migración 6)
+Carga NC sintéticas en las tablas de texto originales, copia la base y migra una copia
+hasta la versión 5 (texto) y la otra hasta la actual (ids enteros). Compara el tamaño
+del archivo y el tiempo de agregaciones por cliente y producto, y de la lectura completa.
+
+Uso:
+    python test/bench_dictionary.py [filas]
+"""
+
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository, schema
+from db.migrations import migrate
+from bench_pareto import synthetic_ncs
+
+TIPOS = ['Tapa de cilindro', 'Brida de acople', 'Eje de transmisión', 'Soporte de motor', 'Carcasa de bomba']
+ACABADOS = ['mecanizada', 'fundición gris', 'acero SAE 1045', 'aluminio inyectado', 'con tratamiento térmico']
+
+QUERIES = (
+    ("NC y costo por cliente",
+     "SELECT cliente, COUNT(*), TOTAL(costo) FROM nc GROUP BY cliente",
+     "SELECT c.valor, x.n, x.costo FROM (SELECT cliente_id, COUNT(*) AS n, TOTAL(costo) AS costo "
+     "FROM nc_datos GROUP BY cliente_id) x LEFT JOIN clientes c ON c.id = x.cliente_id"),
+    ("NC y costo por producto",
+     "SELECT cod_producto, desc_producto, COUNT(*), TOTAL(costo) FROM nc GROUP BY cod_producto, desc_producto",
+     "SELECT p.cod_producto, d.valor, x.n, x.costo FROM (SELECT producto_id, desc_producto_id, COUNT(*) AS n, "
+     "TOTAL(costo) AS costo FROM nc_datos GROUP BY producto_id, desc_producto_id) x "
+     "LEFT JOIN productos p ON p.id = x.producto_id LEFT JOIN descripciones d ON d.id = x.desc_producto_id"),
+    ("NC de un cliente",
+     "SELECT COUNT(*) FROM nc WHERE cliente = 'Metalúrgica Sur'",
+     "SELECT COUNT(*) FROM nc_datos WHERE cliente_id = (SELECT id FROM clientes WHERE valor = 'Metalúrgica Sur')"),
+)
+
+
+def synthetic_rows(rows):
+    """NC con descripción por producto (como la cargaría el usuario), no una constante"""
+    rnd = random.Random(3)
+    descs = {}
+    for row in synthetic_ncs(rows):
+        code = row['cod_producto']
+        if code not in descs:
+            descs[code] = f"{rnd.choice(TIPOS)} {rnd.choice(ACABADOS)} {code}"
+        row['desc_producto'] = descs[code]
+        yield row
+
+
+def _timed(conn, sql, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql).fetchall()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _read_all(conn):
+    start = time.perf_counter()
+    count = sum(1 for _ in conn.execute(schema.NC_SELECT_ALL_SQL))
+    return count, (time.perf_counter() - start) * 1000
+
+
+def run(rows=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        texto, codificada = Path(tmp) / 'texto.db', Path(tmp) / 'codificada.db'
+        conn = repository.connect(texto)
+        conn.execute(schema.NC_CREATE_SQL)
+        conn.execute(schema.ACCION_CREATE_SQL)
+        start = time.perf_counter()
+        with conn:
+            conn.executemany(schema.NC_INSERT_SQL, synthetic_rows(rows))
+        conn.close()
+        print(f"📄 {rows} NC cargadas en {time.perf_counter() - start:.1f}s")
+        shutil.copy(texto, codificada)
+
+        conns = {}
+        for path, target in ((texto, 5), (codificada, None)):
+            conn = repository.connect(path)
+            start = time.perf_counter()
+            migrate(conn, target)
+            conn.execute("VACUUM")
+            print(f"⏱️  Migración hasta la versión {target or 'actual'}: {time.perf_counter() - start:.1f}s")
+            conns[path] = conn
+
+        size_t, size_c = texto.stat().st_size, codificada.stat().st_size
+        print(f"💾 Tamaño: texto {size_t / 2**20:.1f} MB, codificada {size_c / 2**20:.1f} MB "
+              f"({(1 - size_c / size_t) * 100:.0f}% menos)")
+        conn_t, conn_c = conns[texto], conns[codificada]
+        for name, sql, direct in QUERIES:
+            t, v, d = _timed(conn_t, sql), _timed(conn_c, sql), _timed(conn_c, direct)
+            print(f"⏱️  {name:<24} texto {t:8.1f} ms | vista {v:8.1f} ms | ids {d:8.1f} ms")
+        (n, t), (_, c) = _read_all(conn_t), _read_all(conn_c)
+        print(f"⏱️  {'Lectura completa':<24} texto {t:8.1f} ms | vista {c:8.1f} ms ({n} filas)")
+        for conn in conns.values():
+            conn.close()
+    return size_t, size_c
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
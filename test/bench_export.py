@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark de formatos de exportación (export/formats.py)
+Compara tiempo de escritura y tamaño de archivo de XLSX (openpyxl), CSV, Parquet y Arrow
+para la tabla nc con filas sintéticas. Los formatos sin dependencia instalada se omiten.
+
+Uso:
+    python test/bench_export.py [filas] [formato ...]
+    python test/bench_export.py 1000000
+    python test/bench_export.py 200000 csv parquet
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db.schema import NC_EXPORT_HEADERS
+from export.formats import FORMATS, available_formats, get_writer, suffix_for
+
+CLIENTES = ['Cliente A', 'Cliente B', 'Metalúrgica Sur', 'Autopartes Norte', 'Industrias Río']
+FALLAS = ['Rebaba', 'Fisura', 'Medida fuera de tolerancia', 'Golpe', 'Falta de llenado']
+
+
+def synthetic_nc_rows(rows, seed=42):
+    """Filas con el mismo orden de columnas que NC_EXPORT_HEADERS"""
+    rnd = random.Random(seed)
+    for n in range(1, rows + 1):
+        prod = rnd.randint(1, 2000)
+        invol = float(rnd.randint(1, 1000))
+        scrap = float(rnd.randint(0, int(invol)))
+        yield (n, n, f'2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 08:{rnd.randint(0, 59):02d}:00',
+               round(rnd.uniform(0, 10), 2), rnd.randint(1000, 99999), invol, f'P{prod:05d}', f'Producto {prod}',
+               rnd.choice(CLIENTES), scrap, round(scrap * rnd.uniform(1, 20), 2), invol - scrap, '',
+               rnd.choice(FALLAS), '', n)
+
+
+def run(rows=1000000, formats=None):
+    formats = formats or list(FORMATS)
+    installed = available_formats()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            if fmt not in installed:
+                print(f"⏭️  {fmt}: omitido (falta {FORMATS[fmt][4]})")
+                continue
+            path = Path(tmp) / f"bench{suffix_for(fmt)}"
+            start = time.perf_counter()
+            get_writer(fmt)(path, [('nc', NC_EXPORT_HEADERS, synthetic_nc_rows(rows))])
+            elapsed = time.perf_counter() - start
+            size_mb = path.stat().st_size / (1024 * 1024)
+            results.append((fmt, elapsed, size_mb))
+            print(f"⏱️  {fmt:<8} {rows:>9} filas  {elapsed:8.2f}s  {rows / elapsed:>10,.0f} filas/s  {size_mb:8.1f} MB")
+
+    base = next((r for r in results if r[0] == 'xlsx'), None)
+    if base:
+        print("\nComparación contra openpyxl (xlsx):")
+        for fmt, elapsed, size_mb in results:
+            print(f"   • {fmt:<8} {base[1] / elapsed:5.1f}x más rápido, {size_mb / base[2] * 100:5.1f}% del tamaño")
+    return results
+
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    run(n, sys.argv[2:] or None)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark de importación masiva de NC (db/bulk_import.py)
+Genera un CSV sintético y mide el tiempo de importación en una base temporal.
+Objetivo: 100.000 filas en pocos segundos. Falla si la importación de NC supera el límite
+(escalado a la cantidad de filas) o si kpi_mensual / pareto_mensual no cuentan todas las NC.
+
+Uso:
+    python test/bench_import.py [filas] [--max-s 6]
+"""
+
+import argparse
+import csv
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.bulk_import import import_nc, import_acciones
+
+CLIENTES = ['Cliente A', 'Cliente B', 'Metalúrgica Sur', 'Autopartes Norte', 'Industrias Río']
+FALLAS = ['Rebaba', 'Fisura', 'Medida fuera de tolerancia', 'Golpe', 'Falta de llenado']
+
+
+def write_synthetic_csv(path, rows, seed=42):
+    rnd = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['nro_nc', 'fecha', 'resultado_matriz', 'op', 'cant_invol', 'cod_producto',
+                         'desc_producto', 'cliente', 'cant_scrap', 'costo', 'cant_recuperada', 'falla'])
+        for n in range(1, rows + 1):
+            prod = rnd.randint(1, 2000)
+            invol = rnd.randint(1, 1000)
+            scrap = rnd.randint(0, invol)
+            writer.writerow([n, f'2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} 08:00:00',
+                             round(rnd.uniform(0, 10), 2), rnd.randint(1000, 99999), invol,
+                             f'P{prod:05d}', f'Producto {prod}', rnd.choice(CLIENTES), scrap,
+                             round(scrap * rnd.uniform(1, 20), 2), invol - scrap, rnd.choice(FALLAS)])
+
+
+def write_synthetic_acciones(path, rows, seed=43):
+    rnd = random.Random(seed)
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh)
+        writer.writerow(['nro_nc', 'tarea', 'tiempo_estimado', 'responsable', 'fecha_realizacion', 'estado'])
+        for n in range(1, rows + 1):
+            writer.writerow([n, 'Acción correctiva', '2h', f'Responsable {rnd.randint(1, 50)}',
+                             f'2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}',
+                             rnd.choice(['Abierta', 'En curso', 'Cerrada'])])
+
+
+def run(rows=100000, max_s=6.0):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        t0 = time.perf_counter()
+        write_synthetic_csv(tmp / 'nc.csv', rows)
+        write_synthetic_acciones(tmp / 'acciones.csv', rows)
+        print(f"📄 CSV sintéticos generados ({rows} filas c/u) en {time.perf_counter() - t0:.2f}s")
+
+        conn = repository.connect(tmp / 'bench.db')
+        repository.init_schema(conn)
+        nc_result = import_nc(conn, tmp / 'nc.csv', tmp / 'rechazos.csv')
+        acc_result = import_acciones(conn, tmp / 'acciones.csv', tmp / 'rechazos_acciones.csv')
+        # Los resúmenes se ponen al día al final de la carga, no por fila: tienen que contar todas las NC
+        summaries = [conn.execute(sql).fetchone()[0] for sql in (
+            "SELECT TOTAL(cantidad) FROM kpi_mensual",
+            "SELECT TOTAL(cantidad) FROM pareto_mensual WHERE dimension = 'falla'")]
+        conn.close()
+
+    print(f"⏱️  {nc_result}")
+    print(f"⏱️  {acc_result}")
+    limit = max_s * rows / 100000
+    ok = True
+    if summaries != [nc_result.inserted] * 2:
+        print(f"❌ kpi_mensual / pareto_mensual cuentan {summaries} NC de {nc_result.inserted}")
+        ok = False
+    if nc_result.elapsed > limit:
+        print(f"❌ La importación de NC superó el límite de {limit:.2f}s ({max_s:g}s cada 100.000 filas)")
+        ok = False
+    if ok:
+        print(f"✅ Importación de NC dentro del límite de {limit:.2f}s y resúmenes al día")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importación masiva de NC y acciones sintéticas")
+    parser.add_argument('filas', type=int, nargs='?', default=100000, help="Filas de cada CSV")
+    parser.add_argument('--max-s', type=float, default=6.0, help="Límite para las NC en segundos cada 100.000 filas")
+    args = parser.parse_args(argv)
+    return 0 if run(args.filas, args.max_s) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
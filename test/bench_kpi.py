@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark de indicadores precalculados (db/kpi.py)
+Importa NC sintéticas y compara la agregación completa de nc contra la lectura de kpi_mensual.
+
+Uso:
+    python test/bench_kpi.py [filas]
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.bulk_import import import_nc
+from db.kpi import kpi_summary
+from bench_import import write_synthetic_csv
+
+FULL_SCAN_SQL = ("SELECT substr(fecha, 1, 7) AS mes, cliente, COUNT(*), TOTAL(costo), TOTAL(cant_scrap), "
+                 "TOTAL(cant_recuperada), TOTAL(cant_invol) FROM nc GROUP BY 1, 2 ORDER BY 1, 2")
+
+
+def _timed(func, repeat=5):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(rows=100000):
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_synthetic_csv(tmp / 'nc.csv', rows)
+        conn = repository.connect(tmp / 'bench.db')
+        repository.init_schema(conn)
+        print(f"⏱️  {import_nc(conn, tmp / 'nc.csv')}")
+
+        scan, scan_rows = _timed(lambda: conn.execute(FULL_SCAN_SQL).fetchall())
+        kpi, kpi_rows = _timed(lambda: kpi_summary(conn, ('mes', 'cliente')))
+        grupos = conn.execute("SELECT COUNT(*) FROM kpi_mensual").fetchone()[0]
+        conn.close()
+
+    assert len(scan_rows) == len(kpi_rows)
+    print(f"⏱️  Agregación completa de nc: {scan * 1000:8.2f} ms ({rows} filas)")
+    print(f"⏱️  kpi_mensual:               {kpi * 1000:8.2f} ms ({grupos} grupos)  {scan / kpi:5.1f}x más rápido")
+    return scan, kpi
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
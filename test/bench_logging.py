@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la latencia de guardado y edición según el perfil de logging
+Para cada perfil (production, development, debug, off) lanza un proceso nuevo con
+NC_AC_LOG_PROFILE, crea la ventana principal sin mostrarla (QT_QPA_PLATFORM=offscreen)
+y mide con los métodos de la propia ventana:
+  - guardar: save_record de una NC nueva con dos acciones
+  - editar:  Nro NC + edit_record_by_number + save_record de una NC existente
+Informa mediana y p95 en ms por operación y los bytes escritos en log/.
+
+Uso:
+    python test/bench_logging.py [--operaciones 200] [--perfiles production,development]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from log import LOG_PROFILES
+
+APP = parent_dir / 'NC_AC_Registrador_Faben.py'
+
+# Proceso hijo: guardados y ediciones con los diálogos de confirmación desactivados
+CHILD = r'''
+import importlib.util, json, logging, sys, time
+sys.path.insert(0, {root!r})
+spec = importlib.util.spec_from_file_location('app', {app!r})
+app_mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(app_mod)
+from PyQt6 import QtWidgets
+for name in ('information', 'warning', 'critical'):
+    setattr(QtWidgets.QMessageBox, name, staticmethod(lambda *a, **k: None))
+QtWidgets.QMessageBox.question = staticmethod(lambda *a, **k: QtWidgets.QMessageBox.StandardButton.Retry)
+app_mod.init_db()
+app = QtWidgets.QApplication(sys.argv)
+win = app_mod.MainWindow()
+
+def fill(nro):
+    values = {{'Nro NC': str(nro), 'Resultado Matriz': '1.5', 'OP': str(nro), 'Cant. Invol.': '10',
+              'Cod. Producto': f'P{{nro % 50}}', 'Desc. Producto': f'Producto {{nro % 50}}',
+              'Cliente': f'Cliente {{nro % 20}}', 'Cant. Scrap': '2', 'Costo': '30',
+              'Cant. Recuperada': '8', 'Falla': f'Rebaba en zona {{nro % 7}}'}}
+    for field, value in values.items():
+        win.fields[field][0].setText(value)
+    win.actions_temp = [{{'tarea': f'Tarea {{i}}', 'tiempo': '1h', 'responsable': 'QA',
+                         'fecha_realizacion': '2025-01-01', 'estado': 'Abierta'}} for i in range(2)]
+
+save, edit = [], []
+for nro in range(1, {ops} + 1):
+    fill(nro)
+    t0 = time.perf_counter()
+    win.save_record()
+    save.append(time.perf_counter() - t0)
+for nro in range(1, {ops} + 1):
+    t0 = time.perf_counter()
+    win.fields['Nro NC'][0].setText(str(nro))
+    win.edit_record_by_number(nro)
+    win.fields['Costo'][0].setText('45')
+    win.save_record()
+    edit.append(time.perf_counter() - t0)
+logging.shutdown()
+print('BENCH ' + json.dumps({{'guardar': save, 'editar': edit}}), flush=True)
+'''
+
+
+def p95(values):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+
+def run_profile(profile, ops):
+    """Medir un perfil en un directorio de trabajo vacío; devuelve (datos del hijo, bytes de log)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, NC_AC_LOG_PROFILE=profile)
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        script = CHILD.format(root=str(parent_dir), app=str(APP), ops=ops)
+        proc = subprocess.run([sys.executable, '-c', script], cwd=tmp, env=env, capture_output=True,
+                              text=True, encoding='utf-8', timeout=600)
+        lines = [line for line in proc.stdout.splitlines() if line.startswith('BENCH ')]
+        if not lines:
+            raise RuntimeError(f"El perfil {profile} no terminó el benchmark:\n{proc.stderr[-2000:]}")
+        log_dir = Path(tmp) / 'log'
+        written = sum(f.stat().st_size for f in log_dir.glob('*.log')) if log_dir.exists() else 0
+        return json.loads(lines[-1][6:]), written
+
+
+def run(ops=200, profiles=LOG_PROFILES):
+    print(f"⏱️  Latencia por operación ({ops} guardados y {ops} ediciones por perfil)")
+    print(f"   {'perfil':<12}{'guardar med':>12}{'p95':>8}{'editar med':>12}{'p95':>8}{'log KB':>10}")
+    for profile in profiles:
+        data, written = run_profile(profile, ops)
+        save = [t * 1000 for t in data['guardar']]
+        edit = [t * 1000 for t in data['editar']]
+        print(f"   {profile:<12}{statistics.median(save):>12.2f}{p95(save):>8.2f}"
+              f"{statistics.median(edit):>12.2f}{p95(edit):>8.2f}{written / 1024:>10.1f}")
+    print("✅ Benchmark de perfiles de logging completado")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Latencia de guardado/edición por perfil de logging")
+    parser.add_argument('--operaciones', type=int, default=200, help="Guardados y ediciones por perfil")
+    parser.add_argument('--perfiles', default=','.join(LOG_PROFILES), help="Perfiles separados por coma")
+    args = parser.parse_args(argv)
+    profiles = [p.strip() for p in args.perfiles.split(',') if p.strip()]
+    unknown = [p for p in profiles if p not in LOG_PROFILES]
+    if unknown:
+        parser.error(f"Perfiles desconocidos: {', '.join(unknown)}")
+    run(args.operaciones, profiles)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
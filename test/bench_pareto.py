@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark del análisis de Pareto (db/pareto.py)
+Carga NC sintéticas y mide cada Pareto (sin caché y con caché) contra la agregación directa sobre nc.
+Objetivo: menos de 100 ms por Pareto con 1.000.000 de NC.
+
+Uso:
+    python test/bench_pareto.py [filas]
+"""
+
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.pareto import DIMENSIONS, HAS_NUMPY, METRICS, ParetoEngine, compute_pareto
+from db.repository import NCRepository
+from db.schema import ISHIKAWA_CATEGORIAS
+from test_repository import _nc
+
+CLIENTES = ['Cliente A', 'Cliente B', 'Metalúrgica Sur', 'Autopartes Norte', 'Industrias Río']
+FALLAS = ['Rebaba', 'Fisura', 'Medida fuera de tolerancia', 'Golpe', 'Falta de llenado']
+
+
+def synthetic_ncs(rows, seed=42):
+    rnd = random.Random(seed)
+    for n in range(1, rows + 1):
+        cats = rnd.sample(ISHIKAWA_CATEGORIAS, rnd.randint(0, 2))
+        yield _nc(n, fecha=f'202{rnd.randint(3, 5)}-{rnd.randint(1, 12):02d}-10 08:00:00',
+                  cliente=rnd.choice(CLIENTES), cod_producto=f'P{rnd.randint(1, 2000):05d}',
+                  falla=f"{rnd.choice(FALLAS)} {rnd.randint(1, 40)}", costo=round(rnd.uniform(1, 500), 2),
+                  ishikawa=';;'.join(f"{c}:|por qué" for c in cats))
+
+
+def run(rows=1000000):
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = repository.connect(Path(tmp) / 'bench.db')
+        repository.init_schema(conn)
+        start = time.perf_counter()
+        with conn:
+            NCRepository(conn).insert_many(synthetic_ncs(rows))
+        print(f"📄 {rows} NC cargadas en {time.perf_counter() - start:.1f}s (numpy: {'sí' if HAS_NUMPY else 'no'})")
+
+        start = time.perf_counter()
+        conn.execute("SELECT falla, COUNT(*), TOTAL(costo) FROM nc GROUP BY falla ORDER BY 2 DESC").fetchall()
+        print(f"⏱️  Agregación directa sobre nc (falla): {(time.perf_counter() - start) * 1000:8.1f} ms")
+
+        engine = ParetoEngine(conn)
+        worst = 0.0
+        for dimension in DIMENSIONS:
+            for metric in METRICS:
+                for desde, hasta in ((None, None), ('2024-01', '2024-06')):
+                    start = time.perf_counter()
+                    result = compute_pareto(conn, dimension, metric, desde, hasta)
+                    elapsed = (time.perf_counter() - start) * 1000
+                    worst = max(worst, elapsed)
+                    engine.get(dimension, metric, desde, hasta)
+                    start = time.perf_counter()
+                    engine.get(dimension, metric, desde, hasta)
+                    cached = (time.perf_counter() - start) * 1000
+                    rango = f"{desde}..{hasta}" if desde else "todo"
+                    print(f"⏱️  {dimension:<13} {metric:<9} {rango:<16} {len(result.items):>6} elementos "
+                          f"{elapsed:8.1f} ms  (caché {cached:.3f} ms)")
+        conn.close()
+    print(f"{'✅' if worst < 100 else '⚠️ '} Peor caso sin caché: {worst:.1f} ms")
+    return worst
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
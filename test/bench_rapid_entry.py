@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la carga rápida contra el flujo estándar de MainWindow
+Carga la misma serie de NC sintéticas (tandas con el mismo cliente y producto, como las de un
+inspector en la línea) con eventos reales de teclado y mouse sobre el arnés sin ventanas:
+- estándar: clic en Nro NC, Tab entre campos, clic en "Agregar Acción" y Aceptar por acción,
+  clic en Guardar;
+- rápida: número propuesto, Enter entre campos vacíos, acciones en la tabla del formulario,
+  Ctrl+Enter para guardar y seguir con el mismo cliente/producto.
+Por NC informa pulsaciones, clics, cambios entre teclado y mouse, milisegundos de procesamiento
+y los segundos de operador estimados con el modelo KLM (Keystroke-Level Model). Al final compara
+las dos bases: ambos flujos tienen que guardar exactamente lo mismo.
+
+Uso:
+    python test/bench_rapid_entry.py [--nc 2000] [--cargas 40] [--semilla 42]
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+from db.schema import NC_FORM_FIELDS
+from gui_harness import MainWindowHarness
+from synthetic_data import SyntheticGenerator
+
+# Modelo KLM (Card, Moran y Newell): segundos por operación de un operador con práctica
+KLM_KEY = 0.28            # K: pulsación (mecanógrafo promedio)
+KLM_POINT = 1.1           # P: llevar el puntero a un control
+KLM_CLICK = 0.2           # BB: presionar y soltar el botón
+KLM_HOMING = 0.4          # H: mover la mano entre teclado y mouse
+MAX_RUN = 5               # NC seguidas con el mismo cliente y producto
+CLONED = ('Cliente', 'Cod. Producto', 'Desc. Producto')
+
+
+def entry_batch(generator, first, count, seed):
+    """[(valores del formulario, acciones)] con tandas de 1..MAX_RUN NC del mismo cliente/producto"""
+    from db.schema import row_to_form_values
+    rnd = random.Random(seed)
+    batch, run_left, shared = [], 0, {}
+    for nro in range(first, first + count):
+        nc, acciones = generator.record(nro, first + count)
+        values = row_to_form_values(nc)
+        if run_left:
+            values.update(shared)
+            run_left -= 1
+        else:
+            shared = {name: values[name] for name in CLONED}
+            run_left = rnd.randint(1, MAX_RUN) - 1
+        # Fecha y estado quedan con el valor por defecto (hoy, Abierta) en los dos flujos
+        batch.append((values, [dict(tarea=a['tarea'], tiempo=a['tiempo_estimado'], responsable=a['responsable'])
+                               for a in acciones[:2]]))
+    return batch
+
+
+def operator_seconds(keystrokes, clicks, homings):
+    return keystrokes * KLM_KEY + clicks * (KLM_POINT + KLM_CLICK) + homings * KLM_HOMING
+
+
+def field_name(h, widget):
+    return next((name for name, (w, _) in h.window.fields.items() if w is widget), None)
+
+
+def standard_entry(h, values, acciones, same_as_next):
+    """Flujo estándar: la cadena habilita los campos en orden y las acciones van por ActionDialog"""
+    w = h.window
+    h.click(w.fields['Nro NC'][0])
+    h.type_text(values['Nro NC'])
+    for name in w.enable_chain_order[1:]:
+        h.press('Tab')
+        if not w.fields[name][0].text():          # la descripción la completa el catálogo
+            h.type_text(values[name])
+    for action in acciones:
+        def fill(dlg, action=action):
+            h.type_text(action['tarea'], dlg.tarea)
+            h.press('Tab', widget=dlg.tarea)
+            h.type_text(action['tiempo'], dlg.tiempo)
+            h.press('Tab', widget=dlg.tiempo)
+            h.type_text(action['responsable'], dlg.responsable)
+            h.click()                             # Aceptar
+            return True
+        h.hooks.on_dialog('ActionDialog', fill)
+        h.click(w.action_btn)
+    h.click(w.save_btn)
+
+
+def rapid_entry(h, values, acciones, same_as_next):
+    """Carga rápida: Enter entre campos vacíos, acciones en la tabla, Ctrl+Enter conserva cliente/producto"""
+    w = h.window
+    saved = False
+    while (name := field_name(h, h.focused())) is not None:
+        h.type_text(values[name])
+        remaining = any(not w.fields[n][0].text() for n in w.enable_chain_order[w.enable_chain_order.index(name)+1:])
+        if remaining:
+            h.press('Return')
+        elif acciones:
+            h.press('Tab')                        # del último campo a la tabla de acciones
+        elif same_as_next:
+            h.press('Return', 'Control')
+            saved = True
+            break
+        else:
+            h.press('Return')
+            saved = True
+            break
+    for i, action in enumerate(acciones):
+        if i:
+            for _ in range(3):                    # fecha, estado y primera celda de la fila nueva
+                h.press('Tab')
+        h.type_text(action['tarea'])
+        h.press('Tab')
+        h.type_text(action['tiempo'])
+        h.press('Tab')
+        h.type_text(action['responsable'])
+    if not saved:
+        if same_as_next:
+            h.press('Return', 'Control')
+        else:
+            h.press('Return')                     # confirma la celda
+            h.press('Return')                     # Enter sobre la tabla: guardar
+
+
+def measure(flow, batch, count, seed):
+    """Cargar la serie con un flujo; devuelve métricas por NC y las filas guardadas"""
+    per_nc = []
+    with MainWindowHarness(nc=count, seed=seed) as h:
+        h.show()
+        if flow is rapid_entry:
+            h.press('R', 'Control')               # menú Carga > Modo de carga rápida
+            assert h.window.rapid_mode
+        setup = (h.keystrokes, h.clicks, h.homings)
+        for i, (values, acciones) in enumerate(batch):
+            same_as_next = i + 1 < len(batch) and all(batch[i + 1][0][n] == values[n] for n in CLONED)
+            # Sin reiniciar el último dispositivo: volver del mouse al teclado entre NC también cuenta
+            before = (h.keystrokes, h.clicks, h.homings)
+            start = time.perf_counter()
+            flow(h, values, acciones, same_as_next)
+            elapsed = (time.perf_counter() - start) * 1000
+            message = h.hooks.last()
+            if message is None or message.title != 'Registro Guardado' or not message.text.startswith(
+                    f"✅ NC {values['Nro NC']} "):
+                raise RuntimeError(f"NC {values['Nro NC']} no se guardó ({flow.__name__}): {message}")
+            per_nc.append((h.keystrokes - before[0], h.clicks - before[1], h.homings - before[2], elapsed))
+        first = int(batch[0][0]['Nro NC'])
+        rows = {}
+        for nro in range(first, first + len(batch)):
+            record = h.window.nc_cache.get(nro)
+            nc = {f.column: record.nc[f.column] for f in NC_FORM_FIELDS}
+            rows[nro] = (nc, [{k: a[k] for k in ('tarea', 'tiempo_estimado', 'responsable', 'fecha_realizacion',
+                                                  'estado')} for a in record.acciones])
+    return per_nc, setup, rows
+
+
+def summarize(per_nc, setup):
+    keystrokes = [m[0] for m in per_nc]
+    clicks = [m[1] for m in per_nc]
+    homings = [m[2] for m in per_nc]
+    n = len(per_nc)
+    total = (sum(keystrokes) + setup[0], sum(clicks) + setup[1], sum(homings) + setup[2])
+    return {'teclas': total[0] / n, 'clics': total[1] / n, 'cambios': total[2] / n,
+            'segundos': operator_seconds(*total) / n,
+            'ms': statistics.median(m[3] for m in per_nc)}
+
+
+def run(count=2000, cargas=40, seed=42):
+    generator = SyntheticGenerator(seed)
+    batch = entry_batch(generator, count + 1, cargas, seed)
+    runs = 1 + sum(1 for a, b in zip(batch, batch[1:]) if any(a[0][n] != b[0][n] for n in CLONED))
+    print(f"📄 {cargas} NC en {runs} tandas de cliente/producto, "
+          f"{sum(len(a) for _, a in batch)} acciones, base con {count} NC")
+    results, stored = {}, {}
+    for label, flow in (('Estándar', standard_entry), ('Rápida', rapid_entry)):
+        per_nc, setup, stored[label] = measure(flow, batch, count, seed)
+        results[label] = summarize(per_nc, setup)
+    if stored['Estándar'] != stored['Rápida']:
+        diff = [nro for nro in stored['Estándar'] if stored['Estándar'][nro] != stored['Rápida'].get(nro)]
+        raise RuntimeError(f"Los flujos guardaron datos distintos en las NC {diff[:10]}")
+
+    print(f"{'Flujo':<10}{'teclas':>9}{'clics':>8}{'cambios':>9}{'s (KLM)':>10}{'ms proc.':>10}   (por NC)")
+    for label, r in results.items():
+        print(f"{label:<10}{r['teclas']:>9.1f}{r['clics']:>8.1f}{r['cambios']:>9.1f}"
+              f"{r['segundos']:>10.1f}{r['ms']:>10.1f}")
+    std, rapid = results['Estándar'], results['Rápida']
+    print(f"⏱️  Carga rápida: {1 - rapid['segundos'] / std['segundos']:.0%} menos tiempo de operador, "
+          f"{std['teclas'] - rapid['teclas']:.1f} teclas y {std['clics'] - rapid['clics']:.1f} clics menos por NC")
+    print("✅ Ambos flujos guardaron los mismos datos")
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Carga rápida contra flujo estándar: teclas y segundos por NC")
+    parser.add_argument('--nc', type=int, default=2000, help="NC sintéticas en la base (catálogo y autocompletado)")
+    parser.add_argument('--cargas', type=int, default=40, help="NC cargadas con cada flujo")
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args(argv)
+    run(args.nc, args.cargas, args.semilla)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la detección de duplicados (db/similarity.py)
+Construye el índice de trigramas con textos de falla sintéticos y mide la latencia de
+búsqueda con variantes mal escritas de textos existentes. Objetivo: pocos ms por búsqueda.
+
+Uso:
+    python test/bench_similarity.py [textos] [consultas]
+"""
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db.similarity import FallaIndex
+
+DEFECTOS = ['Rebaba', 'Fisura', 'Golpe', 'Rayadura', 'Porosidad', 'Falta de llenado', 'Deformación',
+            'Oxidación', 'Medida fuera de tolerancia', 'Rosca dañada', 'Pintura descascarada', 'Soldadura fría']
+ZONAS = ['borde', 'tapa', 'eje', 'brida', 'cara interna', 'cara externa', 'agujero', 'rosca', 'base', 'pestaña']
+DETALLES = ['lado operador', 'lado motor', 'en zona de sujeción', 'tras mecanizado', 'al desmoldar',
+            'en inspección final', 'detectado por cliente', 'en línea 2', 'en línea 3', 'en embalaje']
+
+
+def synthetic_fallas(count, seed=7):
+    rnd = random.Random(seed)
+    for n in range(count):
+        yield (f"{rnd.choice(DEFECTOS)} en {rnd.choice(ZONAS)} {rnd.choice(DETALLES)} "
+               f"pieza {rnd.randint(1, 9999)} molde {n % 997}")
+
+
+def misspell(text, rnd):
+    """Variante con un par de errores de tipeo y sin acentos"""
+    chars = list(text.replace('ó', 'o').replace('í', 'i').replace('ñ', 'n'))
+    for _ in range(2):
+        i = rnd.randrange(len(chars))
+        chars[i] = rnd.choice('aeiourstln ')
+    return ''.join(chars)
+
+
+def run(count=1000000, queries=500):
+    texts = list(synthetic_fallas(count))
+    start = time.perf_counter()
+    index = FallaIndex().build(texts)
+    print(f"📄 Índice de {len(index)} textos construido en {time.perf_counter() - start:.1f}s")
+
+    rnd = random.Random(11)
+    latencies, found = [], 0
+    for _ in range(queries):
+        original = rnd.choice(texts)
+        query = misspell(original, rnd)
+        start = time.perf_counter()
+        results = index.search(query, limit=5)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found += any(original in raws for _, raws in results)
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"⏱️  Búsqueda: mediana {statistics.median(latencies):.2f} ms, p95 {p95:.2f} ms, "
+          f"máx {latencies[-1]:.2f} ms; original encontrado en {found * 100 / queries:.0f}% de las consultas")
+    return latencies
+
+
+if __name__ == '__main__':
+    run(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 500)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Benchmark del arranque de la aplicación (tiempo hasta la primera ventana)
+Lanza NC_AC_Registrador_Faben.py en un proceso nuevo con una base ya migrada, repite
+los pasos de su bloque __main__ y mide desde el lanzamiento del proceso hasta el primer
+ciclo del event loop con la ventana visible. Una corrida extra con -X importtime lista
+los módulos que más demoran en importarse.
+Falla (código de salida 1) si la mediana supera --max-ms o si al mostrar la ventana ya
+se importó alguno de los módulos que sólo se cargan al usarlos (exportación a Excel,
+Parquet, numpy, ...).
+
+Uso:
+    python test/bench_startup.py [--corridas N] [--max-ms 1000] [--nc 2000]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import NCRepository
+
+APP = parent_dir / 'NC_AC_Registrador_Faben.py'
+
+# Módulos que no deben estar cargados cuando aparece la ventana
+DEFERRED_MODULES = ('openpyxl', 'pyarrow', 'numpy', 'export.excel', 'export.arrow_writer',
+                    'db.kpi', 'db.pareto', 'db.similarity', 'export.formats', 'export.delta', 'export.audit',
+                    'diagnostics.profiling', 'diagnostics.watchdog', 'shutil', 'argparse')
+
+# Proceso hijo: los pasos del bloque __main__ con marcas de tiempo por fase
+CHILD = r'''
+import time
+t0 = time.perf_counter()
+import importlib.util, sys
+sys.path.insert(0, {root!r})
+spec = importlib.util.spec_from_file_location('app', {app!r})
+app_mod = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(app_mod)
+t1 = time.perf_counter()
+app_mod.init_db()
+t2 = time.perf_counter()
+from PyQt6 import QtCore, QtWidgets
+app = QtWidgets.QApplication(sys.argv)
+t3 = time.perf_counter()
+win = app_mod.MainWindow()
+win.show()
+t4 = time.perf_counter()
+
+def first_window():
+    t5 = time.perf_counter()
+    import json
+    phases = {{'imports': t1 - t0, 'init_db': t2 - t1, 'qapplication': t3 - t2,
+               'mainwindow': t4 - t3, 'primer_ciclo': t5 - t4}}
+    loaded = [m for m in {deferred!r} if m in sys.modules]
+    print('BENCH ' + json.dumps({{'phases': phases, 'loaded': loaded}}), flush=True)
+    app.quit()
+
+QtCore.QTimer.singleShot(0, first_window)
+app.exec()
+'''
+
+
+def prepare_db(workdir, count):
+    """Base migrada con NC sintéticas en el directorio de trabajo del proceso hijo"""
+    conn = repository.connect(workdir / 'nc_ac_faben.db')
+    repository.init_schema(conn)
+    NCRepository(conn).insert_many(
+        dict(nro_nc=n, fecha=f'2025-{n % 12 + 1:02d}-01 08:00:00', resultado_matriz=1.0, op=n,
+             cant_invol=10.0, cod_producto=f'P{n % 300}', desc_producto=f'Producto {n % 300}',
+             cliente=f'Cliente {n % 40}', cant_scrap=1.0, costo=50.0, cant_recuperada=9.0,
+             observaciones='', falla=f'Falla {n % 500} en zona {n % 7}', ishikawa='')
+        for n in range(1, count + 1))
+    conn.commit()
+    conn.close()
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    # Como en el ejecutable, los módulos ya compilados: se permite escribir __pycache__
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    return env
+
+
+def launch(script, workdir, extra_args=()):
+    """Ejecutar el hijo; devuelve (segundos hasta la primera ventana, datos del hijo, stderr)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, *extra_args, '-c', script], cwd=workdir, env=child_env(),
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8')
+    data = None
+    for line in proc.stdout:
+        if line.startswith('BENCH '):
+            elapsed = time.perf_counter() - start
+            data = json.loads(line[6:])
+    _, err = proc.communicate(timeout=120)
+    if data is None:
+        raise RuntimeError(f"La aplicación no llegó a mostrar la ventana:\n{err[-2000:]}")
+    return elapsed, data, err
+
+
+def top_imports(importtime_output, limit=10):
+    """Módulos de primer nivel con mayor tiempo acumulado según -X importtime"""
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if not name.startswith('  '):          # un espacio: importación de primer nivel
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def run(runs=5, max_ms=1000.0, nc=2000):
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        prepare_db(workdir, nc)
+        script = CHILD.format(root=str(parent_dir), app=str(APP), deferred=DEFERRED_MODULES)
+        launch(script, workdir)          # calentamiento: __pycache__ y caché del sistema de archivos
+
+        totals, phases = [], []
+        for _ in range(runs):
+            elapsed, data, _ = launch(script, workdir)
+            totals.append(elapsed * 1000)
+            phases.append(data['phases'])
+        _, data, err = launch(script, workdir, ('-X', 'importtime'))
+
+    median = statistics.median(totals)
+    print(f"⏱️  Hasta la primera ventana: mediana {median:.0f} ms, mín {min(totals):.0f} ms, "
+          f"máx {max(totals):.0f} ms ({runs} corridas, {nc} NC)")
+    for phase in phases[0]:
+        print(f"   {phase:<13} {statistics.median(p[phase] for p in phases) * 1000:7.1f} ms")
+    print("📦 Importaciones más lentas (acumulado):")
+    for micros, name in top_imports(err):
+        print(f"   {name:<28} {micros / 1000:7.1f} ms")
+
+    ok = True
+    if data['loaded']:
+        print(f"❌ Módulos diferidos cargados antes de la ventana: {', '.join(data['loaded'])}")
+        ok = False
+    if median > max_ms:
+        print(f"❌ El arranque superó el límite de {max_ms:.0f} ms")
+        ok = False
+    if ok:
+        print(f"✅ Arranque dentro del límite de {max_ms:.0f} ms y sin importaciones diferidas")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo hasta la primera ventana de NC AC FABEN")
+    parser.add_argument('--corridas', type=int, default=5, help="Corridas medidas (además del calentamiento)")
+    parser.add_argument('--max-ms', type=float, default=1000.0, help="Límite para la mediana en milisegundos")
+    parser.add_argument('--nc', type=int, default=2000, help="NC sintéticas en la base de prueba")
+    args = parser.parse_args(argv)
+    return 0 if run(args.corridas, args.max_ms, args.nc) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
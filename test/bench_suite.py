@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks de punta a punta con datos sintéticos (test/synthetic_data.py)
+Genera una base de 10k, 100k o 1M NC con acciones, Ishikawa y adjuntos en un directorio
+temporal y mide, sin mostrar ventanas (QT_QPA_PLATFORM=offscreen):
+  - guardar, edicion_busqueda, edicion_guardar: MainWindow.save_record / edit_record_by_number
+  - exportar_<formato>, exportar_incremental: export_nc y export_delta
+  - indice_duplicados, buscar_duplicados, autocompletar, buscar_vencimientos, vencidas
+  - log_production, log_development: costo por registro de cada perfil de logging
+Cada benchmark corre una vez de calentamiento y luego --repeticiones veces; cada repetición
+es una muestra (promedio por operación o tiempo total). Los resultados van a un JSON con
+las muestras y los datos del equipo para comparar corridas (test/bench_compare.py).
+Sin PyQt6 los benchmarks de la ventana se marcan como omitidos.
+
+Uso:
+    python test/bench_suite.py [--escala 10k|100k|1m | --nc N] [--repeticiones 5]
+                               [--operaciones 50] [--formatos csv,xlsx] [--solo 'exportar_*,guardar']
+                               [--salida resultados.json]
+"""
+
+import argparse
+import fnmatch
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+from db import repository
+from db.completion import CompletionSource
+from db.dates import month_range
+from db.overdue import overdue_by_responsable
+from db.repository import AccionRepository, NCRepository
+from db.schema import row_to_form_values
+from db.similarity import DuplicateFinder
+from export.delta import export_delta
+from export.formats import available_formats, export_nc, suffix_for
+from gui_harness import DialogHooks
+from log import setup_logging_profile
+from synthetic_data import DEFAULT_SEED, REFERENCE_DATE, SCALES, SyntheticGenerator, attachment_names, \
+    scale_count, write_attachments
+
+SUITE_VERSION = 1
+RESULTS_DIR = current_dir / 'resultados'
+APP = parent_dir / 'NC_AC_Registrador_Faben.py'
+LOG_RECORDS = 2000                 # registros por repetición en los benchmarks de logging
+
+
+class Context:
+    """Estado compartido por los benchmarks de una corrida"""
+
+    def __init__(self, workdir, count, ops, seed):
+        self.workdir = workdir
+        self.count = count
+        self.ops = ops
+        self.generator = SyntheticGenerator(seed)
+        self.rnd = random.Random(seed)
+        self.conn = None
+        self.app_mod = None
+        self.window = None
+        self.next_nro = count + 1  # NC nuevas para guardar
+        self.finder = None
+        self.completions = None
+        self.hooks = None
+
+    def random_nros(self):
+        return [self.rnd.randint(1, self.count) for _ in range(self.ops)]
+
+
+def load_window(ctx):
+    """Importar la aplicación en el directorio de trabajo y crear MainWindow sin mostrarla.
+    Devuelve el motivo si no se puede (p. ej. PyQt6 no instalado)"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    os.environ.setdefault('NC_AC_LOG_PROFILE', 'production')
+    try:
+        import importlib.util
+        from PyQt6 import QtWidgets
+    except ImportError as e:
+        return f"PyQt6 no disponible ({e})"
+    spec = importlib.util.spec_from_file_location('nc_ac_app', APP)
+    app_mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(app_mod)
+    # Sin diálogos modales: avisos registrados y "continuar" ante una NC existente
+    ctx.hooks = DialogHooks().install(QtWidgets)
+    ctx.qapp = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    app_mod.init_db()
+    ctx.app_mod = app_mod
+    ctx.window = app_mod.MainWindow()
+    # El índice de duplicados se arma en segundo plano con la primera consulta: armarlo ya y
+    # esperar, para no competir por la CPU con las mediciones
+    ctx.window.duplicates.warm_up()
+    deadline = time.perf_counter() + 600
+    while not ctx.window.duplicates.ready and time.perf_counter() < deadline:
+        time.sleep(0.05)
+    return None
+
+
+# --- Benchmarks ----------------------------------------------------------------------------
+# Cada función hace una repetición y devuelve su muestra en la unidad declarada
+
+def bench_guardar(ctx):
+    w = ctx.window
+    records = [ctx.generator.record(nro, ctx.count) for nro in range(ctx.next_nro, ctx.next_nro + ctx.ops)]
+    ctx.next_nro += ctx.ops
+    for _, acciones in records:
+        write_attachments(ctx.app_mod.ATTACH_DIR, attachment_names(acciones))
+    elapsed = 0.0
+    for nc, acciones in records:
+        for label, text in row_to_form_values(nc).items():
+            w.fields[label][0].setText(text)
+        w.actions_temp = [{'tarea': a['tarea'], 'tiempo': a['tiempo_estimado'], 'responsable': a['responsable'],
+                           'fecha_realizacion': a['fecha_realizacion'], 'estado': a['estado']} for a in acciones]
+        w.attached_files = attachment_names(acciones)
+        w.ishikawa_result = nc['ishikawa']
+        start = time.perf_counter()
+        w.save_record()
+        elapsed += time.perf_counter() - start
+    return elapsed * 1000 / ctx.ops
+
+
+def bench_edicion_busqueda(ctx):
+    w = ctx.window
+    w.nc_cache.clear()
+    start = time.perf_counter()
+    for nro in ctx.random_nros():
+        w.edit_record_by_number(nro)
+    return (time.perf_counter() - start) * 1000 / ctx.ops
+
+
+def bench_edicion_guardar(ctx):
+    w = ctx.window
+    start = time.perf_counter()
+    for nro in ctx.random_nros():
+        w.fields['Nro NC'][0].setText(str(nro))
+        w.edit_record_by_number(nro)
+        w.fields['Costo'][0].setText(f"{ctx.rnd.uniform(1, 500):.2f}")
+        w.save_record()
+    return (time.perf_counter() - start) * 1000 / ctx.ops
+
+
+def make_export_bench(fmt):
+    def bench(ctx):
+        path = ctx.workdir / f"export_nc{suffix_for(fmt)}"
+        start = time.perf_counter()
+        export_nc(ctx.conn, path, fmt)
+        return (time.perf_counter() - start) * 1000
+    return bench
+
+
+def bench_exportar_incremental(ctx):
+    nc_repo = NCRepository(ctx.conn)
+    for nro in ctx.random_nros():
+        nc, _ = ctx.generator.record(nro, ctx.count)
+        nc_repo.update(dict(nc, costo=round(ctx.rnd.uniform(1, 500), 2)))
+    ctx.conn.commit()
+    fmt = 'csv' if 'csv' in available_formats() else available_formats()[0]
+    start = time.perf_counter()
+    export_delta(ctx.conn, ctx.workdir / f"delta{suffix_for(fmt)}", fmt=fmt)
+    return (time.perf_counter() - start) * 1000
+
+
+def bench_indice_duplicados(ctx):
+    finder = DuplicateFinder(ctx.conn)
+    start = time.perf_counter()
+    finder.build()
+    elapsed = time.perf_counter() - start
+    ctx.finder = finder
+    return elapsed * 1000
+
+
+def bench_buscar_duplicados(ctx):
+    if ctx.finder is None:
+        bench_indice_duplicados(ctx)
+    queries = [(ctx.generator.falla(ctx.rnd), f"P{ctx.rnd.randint(1, 5000):05d}") for _ in range(ctx.ops)]
+    start = time.perf_counter()
+    for falla, cod in queries:
+        ctx.finder.suggest(falla, cod)
+    return (time.perf_counter() - start) * 1000 / ctx.ops
+
+
+def bench_autocompletar(ctx):
+    if ctx.completions is None:
+        ctx.completions = CompletionSource(ctx.conn)
+    clientes, productos = ctx.generator.clientes, ctx.generator.productos
+    queries = [('cliente', ctx.rnd.choice(clientes)[:ctx.rnd.randint(1, 4)]) for _ in range(ctx.ops)]
+    queries += [('cod_producto', ctx.rnd.choice(productos)[0][:ctx.rnd.randint(2, 5)]) for _ in range(ctx.ops)]
+    start = time.perf_counter()
+    for field, prefix in queries:
+        ctx.completions.complete(field, prefix)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def bench_buscar_vencimientos(ctx):
+    acciones = AccionRepository(ctx.conn)
+    months = [(ctx.rnd.randint(2023, 2025), ctx.rnd.randint(1, 12)) for _ in range(ctx.ops)]
+    start = time.perf_counter()
+    for year, month in months:
+        acciones.due_between(*month_range(year, month))
+    return (time.perf_counter() - start) * 1000 / ctx.ops
+
+
+def bench_vencidas(ctx):
+    start = time.perf_counter()
+    for _ in range(ctx.ops):
+        overdue_by_responsable(ctx.conn, REFERENCE_DATE.isoformat())
+    return (time.perf_counter() - start) * 1000 / ctx.ops
+
+
+def make_log_bench(profile):
+    def bench(ctx):
+        setup_logging_profile(profile)
+        log = logging.getLogger('bench_suite')
+        start = time.perf_counter()
+        for i in range(LOG_RECORDS):
+            log.info(f"Guardando NC número: {i}")
+            log.debug("Campo '%s' cargado: %s", 'Costo', i)
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+        elapsed = time.perf_counter() - start
+        setup_logging_profile('production')
+        return elapsed * 1e6 / LOG_RECORDS
+    return bench
+
+
+def benchmarks(formats):
+    """[(nombre, unidad, función, requiere_ventana)] en orden de ejecución"""
+    items = [('guardar', 'ms/op', bench_guardar, True),
+             ('edicion_busqueda', 'ms/op', bench_edicion_busqueda, True),
+             ('edicion_guardar', 'ms/op', bench_edicion_guardar, True)]
+    items += [(f"exportar_{fmt}", 'ms', make_export_bench(fmt), False) for fmt in formats]
+    items += [('exportar_incremental', 'ms', bench_exportar_incremental, False),
+              ('indice_duplicados', 'ms', bench_indice_duplicados, False),
+              ('buscar_duplicados', 'ms/op', bench_buscar_duplicados, False),
+              ('autocompletar', 'ms/op', bench_autocompletar, False),
+              ('buscar_vencimientos', 'ms/op', bench_buscar_vencimientos, False),
+              ('vencidas', 'ms/op', bench_vencidas, False)]
+    items += [(f"log_{profile}", 'us/registro', make_log_bench(profile), False)
+              for profile in ('production', 'development')]
+    return items
+
+
+# --- Corrida -------------------------------------------------------------------------------
+
+def git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=parent_dir, capture_output=True,
+                             text=True, timeout=10)
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def summarize(unit, samples, ops):
+    return {'unidad': unit, 'muestras': [round(s, 4) for s in samples], 'mediana': round(statistics.median(samples), 4),
+            'minimo': round(min(samples), 4), 'maximo': round(max(samples), 4), 'operaciones': ops}
+
+
+def run(count, repetitions=5, ops=50, formats=None, only=None, seed=DEFAULT_SEED, escala=None):
+    formats = formats or available_formats()
+    result = {'suite': 'nc_ac_faben', 'version': SUITE_VERSION, 'fecha': datetime.now().isoformat(timespec='seconds'),
+              'equipo': platform.node(), 'plataforma': platform.platform(), 'python': platform.python_version(),
+              'commit': git_commit(), 'escala': escala or str(count), 'nc': count, 'semilla': seed,
+              'repeticiones': repetitions, 'resultados': {}}
+    cwd = os.getcwd()
+    tmp = tempfile.TemporaryDirectory()
+    try:
+        workdir = Path(tmp.name)
+        # La aplicación ubica base, adjuntos y logs en el directorio de trabajo
+        os.chdir(workdir)
+        ctx = Context(workdir, count, ops, seed)
+        ctx.conn = repository.connect(workdir / 'nc_ac_faben.db')
+        repository.init_schema(ctx.conn)
+        start = time.perf_counter()
+        totals = ctx.generator.populate(ctx.conn, count)
+        result['generacion_s'] = round(time.perf_counter() - start, 2)
+        result.update(acciones=totals['acciones'], adjuntos=totals['adjuntos'])
+        print(f"🧪 Base sintética: {count} NC, {totals['acciones']} acciones, {totals['adjuntos']} adjuntos "
+              f"en {result['generacion_s']}s")
+
+        selected = [b for b in benchmarks(formats)
+                    if not only or any(fnmatch.fnmatch(b[0], pattern) for pattern in only)]
+        gui_error = load_window(ctx) if any(b[3] for b in selected) else None
+        for name, unit, func, needs_window in selected:
+            if needs_window and gui_error:
+                result['resultados'][name] = {'unidad': unit, 'omitido': gui_error}
+                print(f"   {name:<22} omitido: {gui_error}")
+                continue
+            func(ctx)                                  # calentamiento
+            samples = [func(ctx) for _ in range(repetitions)]
+            result['resultados'][name] = summary = summarize(unit, samples, ops)
+            print(f"   {name:<22} {summary['mediana']:>10.3f} {unit:<12} "
+                  f"(mín {summary['minimo']:.3f}, máx {summary['maximo']:.3f})")
+        ctx.conn.close()
+        if ctx.window is not None:
+            ctx.window.close()
+            ctx.window.conn.close()
+            ctx.hooks.uninstall()
+    finally:
+        logging.shutdown()
+        os.chdir(cwd)
+        tmp.cleanup()
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de NC AC FABEN con datos sintéticos")
+    parser.add_argument('--escala', choices=sorted(SCALES), default='10k', help="Cantidad de NC predefinida")
+    parser.add_argument('--nc', type=int, help="Cantidad de NC (reemplaza --escala)")
+    parser.add_argument('--repeticiones', type=int, default=5, help="Muestras por benchmark")
+    parser.add_argument('--operaciones', type=int, default=50, help="Operaciones por muestra")
+    parser.add_argument('--formatos', help="Formatos a exportar, separados por coma (por defecto los disponibles)")
+    parser.add_argument('--solo', help="Benchmarks a correr, separados por coma (admite comodines)")
+    parser.add_argument('--semilla', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--salida', help="Archivo JSON (por defecto test/resultados/suite_<escala>_<fecha>.json)")
+    args = parser.parse_args(argv)
+
+    count = scale_count(args.escala, args.nc)
+    escala = str(count) if args.nc else args.escala
+    formats = [f.strip() for f in args.formatos.split(',')] if args.formatos else None
+    unknown = [f for f in formats or () if f not in available_formats()]
+    if unknown:
+        parser.error(f"Formatos no disponibles: {', '.join(unknown)}")
+    only = [p.strip() for p in args.solo.split(',')] if args.solo else None
+
+    result = run(count, args.repeticiones, args.operaciones, formats, only, args.semilla, escala)
+    path = Path(args.salida) if args.salida else RESULTS_DIR / f"suite_{escala}_{datetime.now():%Y%m%d_%H%M%S}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(result, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"✅ Resultados en {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
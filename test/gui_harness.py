@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Arnés sin ventanas para recorrer los flujos de MainWindow desde scripts y pruebas
+Importa la aplicación en un directorio de trabajo propio (base, adjuntos, logs y exportaciones
+quedan ahí), crea MainWindow con la plataforma offscreen de Qt y reemplaza los diálogos por
+DialogHooks: los mensajes se registran en vez de mostrarse (también los avisos no modales de
+MainWindow.notify, con kind 'notificacion'), QMessageBox.question responde
+"continuar", QInputDialog.getInt y QFileDialog.getOpenFileNames toman respuestas de una cola,
+y los diálogos propios (ActionDialog, IshikawaDialog) se completan con una función.
+Cada flujo (guardar, editar, exportar...) se mide con perf_counter, así que se puede repetir
+miles de veces por corrida y ver la distribución de tiempos. show(), type_text(), press() y
+click() envían eventos reales de teclado y mouse y cuentan pulsaciones y clics.
+
+Uso en pruebas:
+    with MainWindowHarness(nc=1000) as h:
+        h.save(1001, {'Cliente': 'ACME', 'Falla': 'Rebaba'}, acciones=[{'tarea': 'Ajustar'}])
+        assert h.hooks.last().title == 'Registro Guardado'
+        h.edit(1001)
+        h.export('csv')
+        print(h.timings.summary())
+
+Prueba de carga:
+    python test/gui_harness.py [--nc 10000] [--guardados 1000] [--ediciones 1000]
+                               [--exportaciones 3] [--formato csv] [--log-profile off]
+"""
+
+import argparse
+import importlib.util
+import logging
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import NamedTuple
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+APP = parent_dir / 'NC_AC_Registrador_Faben.py'
+MAX_MESSAGES = 1000                # mensajes guardados (los más recientes)
+FIELD_DEFAULTS = {'Resultado Matriz': '5', 'OP': '100', 'Cant. Invol.': '10', 'Cod. Producto': 'P00001',
+                  'Desc. Producto': 'Pieza de prueba', 'Cliente': 'Cliente de prueba', 'Cant. Scrap': '2',
+                  'Costo': '100', 'Cant. Recuperada': '8', 'Falla': 'Rebaba en borde'}
+ACTION_DEFAULTS = {'tarea': '', 'tiempo': '', 'responsable': '', 'fecha_realizacion': '', 'estado': 'Abierta'}
+
+
+class Message(NamedTuple):
+    kind: str                      # information, warning, critical, question o notificacion
+    title: str
+    text: str
+
+
+class DialogHooks:
+    """Reemplazos de los diálogos modales de Qt; cada respuesta se puede cambiar en la prueba"""
+
+    def __init__(self, question_answer='Retry'):
+        self.messages = deque(maxlen=MAX_MESSAGES)
+        self.question_answer = question_answer       # nombre de QMessageBox.StandardButton
+        self.int_answers = deque()                   # valores para QInputDialog.getInt (vacía: cancelar)
+        self.file_answers = deque()                  # listas de rutas para getOpenFileNames
+        self.dialog_handlers = {}                    # nombre de clase -> función(dlg) -> aceptar
+        self._qt = None
+        self._saved = []
+
+    # --- Respuestas ---
+    def _message(self, kind):
+        def hook(parent, title, text, *args, **kwargs):
+            self.messages.append(Message(kind, title, text))
+            if kind == 'question':
+                return getattr(self._qt.QMessageBox.StandardButton, self.question_answer)
+            return self._qt.QMessageBox.StandardButton.Ok
+        return staticmethod(hook)
+
+    def _get_int(self, parent, title, label, *args, **kwargs):
+        if self.int_answers:
+            return self.int_answers.popleft(), True
+        return 0, False
+
+    def _get_open_file_names(self, parent=None, *args, **kwargs):
+        files = list(self.file_answers.popleft()) if self.file_answers else []
+        return [str(f) for f in files], ''
+
+    def _exec_dialog(self, dlg):
+        """QDialog.exec: el manejador de la clase completa el diálogo y decide si se acepta"""
+        handler = self.dialog_handlers.get(type(dlg).__name__)
+        accepted = bool(handler and handler(dlg))
+        return self._qt.QDialog.DialogCode.Accepted if accepted else self._qt.QDialog.DialogCode.Rejected
+
+    def on_dialog(self, class_name, handler):
+        self.dialog_handlers[class_name] = handler
+
+    # --- Instalación ---
+    def install(self, qtwidgets=None):
+        """Reemplazar los métodos estáticos y QDialog.exec en el módulo QtWidgets"""
+        if qtwidgets is None:
+            from PyQt6 import QtWidgets as qtwidgets
+        self._qt = qtwidgets
+        patches = [(qtwidgets.QMessageBox, kind, self._message(kind))
+                   for kind in ('information', 'warning', 'critical', 'question')]
+        patches += [(qtwidgets.QInputDialog, 'getInt', staticmethod(self._get_int)),
+                    (qtwidgets.QFileDialog, 'getOpenFileNames', staticmethod(self._get_open_file_names)),
+                    (qtwidgets.QDialog, 'exec', lambda dlg: self._exec_dialog(dlg))]
+        for cls, name, value in patches:
+            self._saved.append((cls, name, cls.__dict__.get(name)))
+            setattr(cls, name, value)
+        return self
+
+    def uninstall(self):
+        for cls, name, original in reversed(self._saved):
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._saved.clear()
+
+    # --- Consulta ---
+    def last(self, kind=None):
+        for message in reversed(self.messages):
+            if kind is None or message.kind == kind:
+                return message
+        return None
+
+    @property
+    def errors(self):
+        return [m for m in self.messages if m.kind in ('warning', 'critical')]
+
+    def clear(self):
+        self.messages.clear()
+
+
+class Timings:
+    """Tiempos por flujo en milisegundos"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def record(self, name, ms):
+        self.samples[name].append(ms)
+
+    def stats(self, name):
+        values = sorted(self.samples[name])
+        p95 = values[min(len(values) - 1, int(0.95 * len(values)))]
+        return {'n': len(values), 'mediana': statistics.median(values), 'p95': p95, 'max': values[-1],
+                'total': sum(values)}
+
+    def summary(self):
+        lines = [f"{'Flujo':<16}{'n':>7}{'mediana':>10}{'p95':>10}{'máx':>10}  (ms)"]
+        for name in self.samples:
+            s = self.stats(name)
+            lines.append(f"{name:<16}{s['n']:>7}{s['mediana']:>10.2f}{s['p95']:>10.2f}{s['max']:>10.2f}")
+        return '\n'.join(lines)
+
+
+class MainWindowHarness:
+    """MainWindow sin ventanas en un directorio de trabajo temporal (o el indicado)"""
+
+    def __init__(self, workdir=None, nc=0, seed=42, log_profile='off'):
+        self.workdir = Path(workdir) if workdir else None
+        self.nc = nc
+        self.seed = seed
+        self.log_profile = log_profile
+        self.hooks = DialogHooks()
+        self.timings = Timings()
+        self.app_mod = None
+        self.window = None
+        self._tmp = None
+        self.reset_input_counts()
+
+    def __enter__(self):
+        self._cwd = os.getcwd()
+        self._environ = {k: os.environ.get(k) for k in ('QT_QPA_PLATFORM', 'NC_AC_LOG_PROFILE')}
+        self._root = logging.getLogger()
+        self._logging = (self._root.handlers[:], self._root.level, logging.root.manager.disable)
+        if self.workdir is None:
+            self._tmp = tempfile.TemporaryDirectory()
+            self.workdir = Path(self._tmp.name)
+        self.workdir.mkdir(parents=True, exist_ok=True)
+        try:
+            self._start()
+        except BaseException:
+            self.__exit__(*sys.exc_info())
+            raise
+        return self
+
+    def _start(self):
+        os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        os.environ['NC_AC_LOG_PROFILE'] = self.log_profile
+        # La aplicación ubica base, adjuntos y logs en el directorio de trabajo al importarse
+        os.chdir(self.workdir)
+        if self.nc:
+            from db import repository
+            from synthetic_data import SyntheticGenerator
+            conn = repository.connect(self.workdir / 'nc_ac_faben.db')
+            repository.init_schema(conn)
+            SyntheticGenerator(self.seed).populate(conn, self.nc)
+            conn.close()
+        from PyQt6 import QtWidgets
+        spec = importlib.util.spec_from_file_location('nc_ac_app', APP)
+        self.app_mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(self.app_mod)
+        self.qapp = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+        self.hooks.install(QtWidgets)
+        self.app_mod.init_db()
+        self.window = self.app_mod.MainWindow()
+        self.window.notify = self._recorded(self.window.notify)
+        self.wait_ready()
+
+    def _recorded(self, notify):
+        """Registrar los avisos no modales junto a los mensajes de los diálogos"""
+        def recorded(titulo, texto):
+            self.hooks.messages.append(Message('notificacion', titulo, texto))
+            notify(titulo, texto)
+        return recorded
+
+    def __exit__(self, *exc):
+        self.hooks.uninstall()
+        if self.window is not None:
+            from PyQt6 import QtCore
+            conn = self.window.conn
+            self.window.close()
+            # Borrar la ventana ya: sus timers (duplicados, latencia) no deben dispararse en el próximo arnés
+            self.window.deleteLater()
+            QtCore.QCoreApplication.sendPostedEvents(None, QtCore.QEvent.Type.DeferredDelete.value)
+            conn.close()
+            self.window = None
+        handlers, level, disable = self._logging
+        for handler in self._root.handlers[:]:
+            self._root.removeHandler(handler)
+            if handler not in handlers:
+                handler.close()
+        for handler in handlers:
+            self._root.addHandler(handler)
+        self._root.setLevel(level)
+        logging.disable(disable)
+        for key, value in self._environ.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        os.chdir(self._cwd)
+        if self._tmp is not None:
+            self._tmp.cleanup()
+        return False
+
+    def wait_ready(self, timeout=600):
+        """Armar el índice de duplicados (la aplicación lo arma con la primera falla escrita) y esperarlo"""
+        self.window.duplicates.warm_up()
+        deadline = time.perf_counter() + timeout
+        while not self.window.duplicates.ready and time.perf_counter() < deadline:
+            time.sleep(0.01)
+
+    def process_events(self):
+        self.qapp.processEvents()
+
+    def timed(self, name, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            self.timings.record(name, (time.perf_counter() - start) * 1000)
+
+    # --- Formulario ---
+    def fill(self, values):
+        """Escribir los campos del formulario (etiquetas de self.fields)"""
+        for label, text in values.items():
+            self.window.fields[label][0].setText(str(text))
+
+    def values(self):
+        return {label: w.text() for label, (w, _) in self.window.fields.items()}
+
+    # --- Flujos ---
+    def save(self, nro, values=None, acciones=(), adjuntos=(), ishikawa=''):
+        """Completar el formulario y guardar; devuelve el último mensaje mostrado"""
+        w = self.window
+        self.fill({**FIELD_DEFAULTS, **(values or {}), 'Nro NC': nro})
+        w.actions_temp = [{**ACTION_DEFAULTS, **a} for a in acciones]
+        w.attached_files = list(adjuntos)
+        w.ishikawa_result = ishikawa
+        self.timed('guardar', w.save_record)
+        return self.hooks.last()
+
+    def edit(self, nro):
+        """Menú Editar: ingresar el número en el QInputDialog; devuelve los valores cargados
+        (el menú no completa Nro NC: antes de guardar hay que escribirlo, como el usuario)"""
+        self.hooks.int_answers.append(nro)
+        self.timed('editar', self.window.edit_record)
+        return self.values()
+
+    def edit_by_number(self, nro):
+        """Edición desde el campo Nro NC (doble clic en un duplicado o número existente)"""
+        self.window.fields['Nro NC'][0].setText(str(nro))
+        self.timed('editar_numero', self.window.edit_record_by_number, nro)
+        return self.values()
+
+    def add_action(self, **action):
+        """Agregar una acción completando ActionDialog como lo haría el usuario"""
+        def fill(dlg):
+            from PyQt6 import QtCore
+            for name in ('tarea', 'tiempo', 'responsable'):
+                getattr(dlg, name).setText(action.get(name, ''))
+            if action.get('fecha_realizacion'):
+                dlg.fecha_realizacion.setDate(QtCore.QDate.fromString(action['fecha_realizacion'], 'yyyy-MM-dd'))
+            dlg.estado.setCurrentText(action.get('estado', 'Abierta'))
+            return True
+        self.hooks.on_dialog('ActionDialog', fill)
+        self.timed('accion', self.window.open_action)
+        return self.window.actions_temp[-1]
+
+    def attach(self, paths):
+        self.hooks.file_answers.append(paths)
+        self.timed('adjuntar', self.window.attach_files)
+        return list(self.window.attached_files)
+
+    def export(self, fmt='csv'):
+        """Exportar con el formato elegido en el combo; devuelve la ruta del archivo"""
+        combo = self.window.export_format
+        combo.setCurrentIndex(combo.findData(fmt))
+        self.timed(f'exportar_{fmt}', self.window.export_data)
+        from export.formats import suffix_for
+        return self.workdir / f"export_nc{suffix_for(fmt)}"
+
+    def export_changes(self, full=False):
+        self.timed('exportar_cambios', self.window.export_changes, full)
+        return self.hooks.last()
+
+    # --- Teclado y mouse ---
+    # Eventos reales con QtTest (foco, atajos, Tab/Enter). Se cuentan pulsaciones, clics y los
+    # cambios entre teclado y mouse, que es lo que cuesta al operador además del procesamiento.
+    def show(self):
+        """Mostrar la ventana (offscreen): el foco y los atajos necesitan una ventana activa"""
+        self.window.show()
+        self.window.activateWindow()
+        self.process_events()
+
+    def rapid(self, enabled=True):
+        """Activar o desactivar el modo de carga rápida desde el menú Carga"""
+        self.window.rapid_act.setChecked(enabled)
+        self.process_events()
+
+    def focused(self):
+        return self.qapp.focusWidget()
+
+    def _device(self, device):
+        if self.last_device is not None and device != self.last_device:
+            self.homings += 1
+        self.last_device = device
+
+    def type_text(self, text, widget=None):
+        """Escribir tecla por tecla en el widget indicado o en el que tiene el foco (que puede cambiar
+        con la primera tecla, p. ej. al abrirse el editor de una celda)"""
+        from PyQt6 import QtCore, QtGui
+        from PyQt6.QtTest import QTest
+        self._device('teclado')
+        for char in str(text):
+            target = widget or self.focused()
+            if char.isascii():
+                QTest.keyClicks(target, char)
+            else:
+                # QTest sólo simula teclas ASCII: la tecla con tilde llega como evento con su texto
+                for kind in (QtCore.QEvent.Type.KeyPress, QtCore.QEvent.Type.KeyRelease):
+                    self.qapp.sendEvent(target, QtGui.QKeyEvent(kind, 0, QtCore.Qt.KeyboardModifier.NoModifier,
+                                                                char))
+            self.process_events()
+        self.keystrokes += len(str(text))
+
+    def press(self, key, *modifiers, widget=None):
+        """Pulsar una tecla ('Return', 'Tab'...) con modificadores ('Control', 'Shift'...);
+        cada modificador cuenta como una pulsación más"""
+        from PyQt6 import QtCore
+        from PyQt6.QtTest import QTest
+        mods = QtCore.Qt.KeyboardModifier.NoModifier
+        for name in modifiers:
+            mods |= getattr(QtCore.Qt.KeyboardModifier, f'{name}Modifier')
+        self._device('teclado')
+        QTest.keyClick(widget or self.focused(), getattr(QtCore.Qt.Key, f'Key_{key}'), mods)
+        self.process_events()               # la vista confirma la celda con una llamada encolada
+        self.keystrokes += 1 + len(modifiers)
+
+    def click(self, widget=None):
+        """Clic izquierdo en el widget (sin widget sólo se cuenta, p. ej. el Aceptar de un diálogo simulado)"""
+        self._device('mouse')
+        if widget is not None:
+            from PyQt6 import QtCore
+            from PyQt6.QtTest import QTest
+            QTest.mouseClick(widget, QtCore.Qt.MouseButton.LeftButton)
+            self.process_events()
+        self.clicks += 1
+
+    def reset_input_counts(self):
+        self.keystrokes = self.clicks = self.homings = 0
+        self.last_device = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de los flujos de MainWindow sin ventanas")
+    parser.add_argument('--nc', type=int, default=10_000, help="NC sintéticas iniciales")
+    parser.add_argument('--guardados', type=int, default=1000, help="NC nuevas a guardar")
+    parser.add_argument('--ediciones', type=int, default=1000, help="Ediciones (cargar y volver a guardar)")
+    parser.add_argument('--exportaciones', type=int, default=3)
+    parser.add_argument('--formato', default='csv')
+    parser.add_argument('--log-profile', default='off', help="Perfil de logging de la aplicación")
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args(argv)
+
+    from synthetic_data import SyntheticGenerator
+    generator = SyntheticGenerator(args.semilla)
+    rnd = random.Random(args.semilla)
+    with MainWindowHarness(nc=args.nc, seed=args.semilla, log_profile=args.log_profile) as h:
+        from db.schema import row_to_form_values
+        for nro in range(args.nc + 1, args.nc + args.guardados + 1):
+            nc, acciones = generator.record(nro, args.nc + args.guardados)
+            h.save(nro, row_to_form_values(nc), [dict(tarea=a['tarea'], tiempo=a['tiempo_estimado'],
+                                                      responsable=a['responsable'],
+                                                      fecha_realizacion=a['fecha_realizacion'],
+                                                      estado=a['estado']) for a in acciones],
+                   ishikawa=nc['ishikawa'])
+        total = args.nc + args.guardados
+        for _ in range(args.ediciones if total else 0):
+            nro = rnd.randint(1, total)
+            values = h.edit(nro)
+            values.update({'Nro NC': nro, 'Costo': f"{rnd.uniform(1, 500):.2f}"})
+            h.fill(values)
+            h.timed('guardar_edicion', h.window.save_record)
+        for _ in range(args.exportaciones):
+            h.export(args.formato)
+        errors = h.hooks.errors
+        print(h.timings.summary())
+    if errors:
+        print(f"❌ {len(errors)} mensajes de error, el último: {errors[-1].title}: {errors[-1].text}")
+        return 1
+    print("✅ Flujos completados sin mensajes de error")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Generador sintético reproducible de NC, acciones, análisis Ishikawa y adjuntos
+Cada NC se genera con su propio Random(semilla, número), así que la NC 1234 tiene el mismo
+producto, cliente, falla, Ishikawa y acciones con 10.000 o con 1.000.000 de filas (sólo las
+fechas se reparten según la escala) y los benchmarks de distintas escalas son comparables.
+Distribuciones pensadas para parecerse a la planta:
+  - clientes y productos con frecuencia de Zipf (pocos concentran la mayoría de las NC)
+  - fallas armadas con defecto + zona (+ medida), con casi-duplicados como en la realidad
+  - fechas crecientes con el número de NC a lo largo de tres años
+  - 0 a 4 acciones por NC; las viejas casi siempre cerradas, algunas abiertas vencidas
+  - Ishikawa en el 60 % de las NC y adjuntos en la cuarta parte de las acciones
+
+Uso:
+    python test/synthetic_data.py [--escala 10k|100k|1m | --nc N] [--db nc_ac_faben.db] [--semilla 42]
+"""
+
+import argparse
+import random
+import sys
+import time
+from bisect import bisect
+from datetime import date, timedelta
+from itertools import accumulate
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import AccionRepository, NCRepository
+from db.schema import ISHIKAWA_CATEGORIAS
+
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+DEFAULT_SEED = 42
+START_DATE = date(2023, 1, 1)
+SPAN_DAYS = 3 * 365
+REFERENCE_DATE = date(2025, 12, 31)      # "hoy" de los datos: decide qué acciones siguen abiertas
+
+EMPRESAS = ['Metalúrgica', 'Autopartes', 'Industrias', 'Fundición', 'Plásticos', 'Forjas', 'Estampados',
+            'Tornería', 'Matricería', 'Componentes']
+LUGARES = ['Sur', 'Norte', 'del Litoral', 'Río', 'Central', 'Andina', 'del Valle', 'Pampeana']
+PIEZAS = ['Soporte', 'Brida', 'Buje', 'Carcasa', 'Eje', 'Tapa', 'Engranaje', 'Perno', 'Arandela', 'Manguito']
+MATERIALES = ['acero', 'aluminio', 'bronce', 'nylon', 'fundición gris', 'inoxidable']
+DEFECTOS = ['Rebaba', 'Fisura', 'Medida fuera de tolerancia', 'Golpe', 'Falta de llenado', 'Porosidad',
+            'Rayadura', 'Deformación', 'Oxidación', 'Rosca dañada', 'Mal tratamiento térmico',
+            'Falta de mecanizado', 'Pintura descascarada', 'Soldadura incompleta', 'Contaminación']
+ZONAS = ['zona de apoyo', 'cara frontal', 'diámetro interior', 'diámetro exterior', 'agujero pasante',
+         'borde', 'rosca', 'chavetero', 'alojamiento', 'superficie de sellado', 'nervio', 'base']
+PORQUES = ['Herramienta desgastada', 'Parámetros fuera de especificación', 'Operador sin capacitación',
+           'Materia prima fuera de norma', 'Instrumento sin calibrar', 'Temperatura ambiente elevada',
+           'Falta de mantenimiento preventivo', 'Instructivo desactualizado', 'Cambio de proveedor',
+           'Vibración en la máquina', 'Apuro por entrega', 'Falta de control en recepción']
+TAREAS = ['Reemplazar herramienta', 'Capacitar al operador', 'Actualizar instructivo', 'Calibrar instrumento',
+          'Reclamar al proveedor', 'Ajustar parámetros de proceso', 'Agregar control 100 %',
+          'Revisar plan de mantenimiento', 'Segregar y retrabajar lote', 'Modificar dispositivo de sujeción']
+OBSERVACIONES = ['Lote retenido en depósito', 'Cliente informado', 'Se repite en el turno noche',
+                 'Reclamo formal del cliente', 'Detectado en inspección final', 'Detectado en línea']
+EXTENSIONES = ['pdf', 'jpg', 'png', 'xlsx']
+ESTADOS_ABIERTOS = ['Abierta', 'En curso']
+ACCIONES_PESOS = [15, 35, 30, 15, 5]      # probabilidad (%) de 0, 1, 2, 3 y 4 acciones
+
+
+def zipf_cumulative(count, exponent=1.1):
+    """Pesos acumulados de Zipf para elegir con bisect (rango 1 el más frecuente)"""
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def ishikawa_text(rnd):
+    """Texto con el formato de IshikawaDialog: 'Categoría:|p1||p2;;Categoría2:|...'"""
+    parts = []
+    for categoria in rnd.sample(ISHIKAWA_CATEGORIAS, rnd.randint(1, 3)):
+        whys = rnd.sample(PORQUES, rnd.randint(1, 5))
+        parts.append(f"{categoria}:|{'||'.join(whys)}")
+    return ';;'.join(parts)
+
+
+class SyntheticGenerator:
+    """NC y acciones reproducibles a partir de una semilla"""
+
+    def __init__(self, seed=DEFAULT_SEED, clientes=200, productos=5000, responsables=40):
+        self.seed = seed
+        rnd = random.Random(seed)
+        self.clientes = [f"{rnd.choice(EMPRESAS)} {rnd.choice(LUGARES)} {i}" for i in range(1, clientes + 1)]
+        self.productos = [(f"P{i:05d}", f"{rnd.choice(PIEZAS)} {rnd.choice(MATERIALES)} {rnd.randint(4, 120)} mm")
+                          for i in range(1, productos + 1)]
+        self.responsables = [f"Responsable {i:02d}" for i in range(1, responsables + 1)]
+        self._clientes_cum = zipf_cumulative(clientes)
+        self._productos_cum = zipf_cumulative(productos)
+        self._responsables_cum = zipf_cumulative(responsables, 0.8)
+
+    def _rng(self, nro):
+        return random.Random(self.seed * 10_000_019 + nro)
+
+    @staticmethod
+    def _pick(rnd, values, cumulative):
+        return values[bisect(cumulative, rnd.random() * cumulative[-1])]
+
+    def falla(self, rnd):
+        text = f"{rnd.choice(DEFECTOS)} en {rnd.choice(ZONAS)}"
+        if rnd.random() < 0.3:
+            text += f" ({rnd.randint(1, 50) / 10:.1f} mm)"
+        return text
+
+    def record(self, nro, count=None):
+        """(nc, [acciones]) de la NC número nro; count reparte las fechas en el período"""
+        rnd = self._rng(nro)
+        count = count or nro
+        day = START_DATE + timedelta(days=min(SPAN_DAYS - 1, int((nro - 1) * SPAN_DAYS / count)))
+        cod, desc = self._pick(rnd, self.productos, self._productos_cum)
+        invol = rnd.randint(1, 500)
+        scrap = rnd.randint(0, invol)
+        nc = dict(nro_nc=nro, fecha=f"{day.isoformat()} {rnd.randint(6, 21):02d}:{rnd.randint(0, 59):02d}:00",
+                  resultado_matriz=round(rnd.uniform(1, 25), 1), op=100_000 + nro, cant_invol=float(invol),
+                  cod_producto=cod, desc_producto=desc,
+                  cliente=self._pick(rnd, self.clientes, self._clientes_cum),
+                  cant_scrap=float(scrap), costo=round(rnd.lognormvariate(4, 1), 2),
+                  cant_recuperada=float(invol - scrap),
+                  observaciones=rnd.choice(OBSERVACIONES) if rnd.random() < 0.3 else '',
+                  falla=self.falla(rnd), ishikawa=ishikawa_text(rnd) if rnd.random() < 0.6 else '')
+        acciones = []
+        for k in range(rnd.choices(range(len(ACCIONES_PESOS)), ACCIONES_PESOS)[0]):
+            due = day + timedelta(days=rnd.randint(3, 60))
+            if due < REFERENCE_DATE - timedelta(days=30):
+                estado = 'Cerrada' if rnd.random() < 0.95 else rnd.choice(ESTADOS_ABIERTOS)
+            else:
+                estado = rnd.choice(ESTADOS_ABIERTOS)
+            adjuntos = ''
+            if rnd.random() < 0.25:
+                adjuntos = '||'.join(f"NC{nro}_A{k + 1}_{j + 1}.{rnd.choice(EXTENSIONES)}"
+                                     for j in range(rnd.randint(1, 2)))
+            acciones.append(dict(tarea=rnd.choice(TAREAS), tiempo_estimado=f"{rnd.randint(1, 40)}h",
+                                 responsable=self._pick(rnd, self.responsables, self._responsables_cum),
+                                 fecha_realizacion=due.isoformat(), estado=estado, adjuntos=adjuntos))
+        return nc, acciones
+
+    def records(self, first, last, count=None):
+        for nro in range(first, last + 1):
+            yield self.record(nro, count)
+
+    def populate(self, conn, count, batch_size=20_000, progress=None):
+        """Insertar las NC 1..count con sus acciones, confirmando por lotes.
+        Devuelve {'nc': filas, 'acciones': filas, 'adjuntos': nombres}"""
+        nc_repo, accion_repo = NCRepository(conn), AccionRepository(conn)
+        totals = {'nc': 0, 'acciones': 0, 'adjuntos': 0}
+        for first in range(1, count + 1, batch_size):
+            last = min(count, first + batch_size - 1)
+            batch = list(self.records(first, last, count))
+            nc_repo.insert_many(nc for nc, _ in batch)
+            ids = dict(conn.execute("SELECT nro_nc, id FROM nc_datos WHERE nro_nc BETWEEN ? AND ?", (first, last)))
+            acciones = [dict(a, nc_id=ids[nc['nro_nc']]) for nc, rows in batch for a in rows]
+            accion_repo.insert_many(acciones)
+            conn.commit()
+            totals['nc'] += len(batch)
+            totals['acciones'] += len(acciones)
+            totals['adjuntos'] += sum(len(a['adjuntos'].split('||')) for a in acciones if a['adjuntos'])
+            if progress:
+                progress(last, count)
+        return totals
+
+
+def attachment_names(acciones):
+    """Nombres de adjuntos de una lista de acciones (campo 'a||b')"""
+    return [name for a in acciones for name in (a['adjuntos'] or '').split('||') if name]
+
+
+def write_attachments(directory, names, size=4096, seed=DEFAULT_SEED):
+    """Crear los archivos adjuntos con contenido reproducible; devuelve las rutas"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for name in names:
+        path = directory / name
+        path.write_bytes(random.Random(f"{seed}:{name}").randbytes(size))
+        paths.append(path)
+    return paths
+
+
+def scale_count(escala=None, nc=None):
+    """Cantidad de NC a partir de --escala (10k, 100k, 1m) o --nc"""
+    if nc:
+        return nc
+    return SCALES[(escala or '10k').lower()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Base sintética de NC AC FABEN")
+    parser.add_argument('--escala', choices=sorted(SCALES), default='10k', help="Cantidad de NC predefinida")
+    parser.add_argument('--nc', type=int, help="Cantidad de NC (reemplaza --escala)")
+    parser.add_argument('--db', default='nc_ac_faben.db', help="Base a crear o completar")
+    parser.add_argument('--semilla', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args(argv)
+    count = scale_count(args.escala, args.nc)
+
+    conn = repository.connect(args.db)
+    repository.init_schema(conn)
+    if NCRepository(conn).count():
+        print(f"❌ {args.db} ya tiene NC: usar una base vacía")
+        return 1
+    start = time.perf_counter()
+    totals = SyntheticGenerator(args.semilla).populate(
+        conn, count, progress=lambda done, total: print(f"   {done}/{total} NC", end='\r'))
+    conn.close()
+    print()
+    print(f"✅ {totals['nc']} NC, {totals['acciones']} acciones y {totals['adjuntos']} adjuntos "
+          f"en {time.perf_counter() - start:.1f}s ({args.db})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
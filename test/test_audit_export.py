@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la exportación de auditoría (export/audit.py)
+Usa un escritor en memoria y, si está disponible, CSV en un directorio temporal
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import NCRepository, AccionRepository
+from db.schema import parse_ishikawa
+from export.audit import export_audit
+from test_delta_export import _memory_writer
+from test_repository import _nc, _accion
+
+
+def _audit_db():
+    conn = repository.connect(':memory:')
+    repository.init_schema(conn)
+    ncs, acciones = NCRepository(conn), AccionRepository(conn)
+    ishikawa = "Máquina:|desgaste||sin mantenimiento||;;Método:|"
+    nc1 = ncs.insert(_nc(1, ishikawa=ishikawa))
+    adjuntos = dict(_accion('a1'), adjuntos='foto.jpg||informe.pdf')
+    acciones.replace_for_nc(nc1, [adjuntos, dict(adjuntos, tarea='a2')])
+    ncs.insert(_nc(2))
+    acciones.replace_for_nc(ncs.insert(_nc(3)), [_accion('b1')])
+    conn.commit()
+    return conn
+
+
+def test_parse_ishikawa():
+    """El texto de IshikawaDialog se separa en categorías y porqués"""
+    assert parse_ishikawa('') == [] and parse_ishikawa(None) == []
+    assert parse_ishikawa("Máquina:|a||b;;Material:|c") == [('Máquina', ['a', 'b']), ('Material', ['c'])]
+    print("✅ Parseo de Ishikawa correcto")
+
+
+def test_audit_sheets():
+    """Cuatro hojas con acciones unidas a su NC, adjuntos sin repetir y un porqué por fila"""
+    conn = _audit_db()
+    out = {}
+    path, counts, _ = export_audit(conn, 'auditoria.xlsx', writer=_memory_writer(out))
+    assert path.name == 'auditoria.xlsx'
+    assert counts == {'nc': 3, 'acciones': 3, 'adjuntos': 2, 'ishikawa': 3}
+    assert [(r['nro_nc'], r['tarea']) for r in out['acciones']] == [(1, 'a1'), (1, 'a2'), (3, 'b1')]
+    assert [r['archivo'] for r in out['adjuntos']] == ['foto.jpg', 'informe.pdf']
+    assert {r['accion_id'] for r in out['adjuntos']} == {out['acciones'][0]['id']}
+    assert [(r['categoria'], r['nro_porque']) for r in out['ishikawa']] == [('Máquina', 1), ('Máquina', 2), ('Método', None)]
+    assert not conn.in_transaction
+    conn.close()
+    print("✅ Hojas de auditoría correctas")
+
+
+def test_audit_csv_files():
+    """En CSV cada hoja se escribe en su propio archivo"""
+    conn = _audit_db()
+    with tempfile.TemporaryDirectory() as tmp:
+        _, counts, _ = export_audit(conn, Path(tmp) / 'auditoria.csv')
+        names = sorted(p.name for p in Path(tmp).iterdir())
+        assert names == ['auditoria_acciones.csv', 'auditoria_adjuntos.csv',
+                         'auditoria_ishikawa.csv', 'auditoria_nc.csv']
+        assert counts['acciones'] == 3
+    conn.close()
+    print("✅ Auditoría en CSV correcta")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE EXPORTACIÓN DE AUDITORÍA")
+    print("=" * 50)
+    test_parse_ishikawa()
+    test_audit_sheets()
+    test_audit_csv_files()
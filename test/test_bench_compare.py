@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la comparación de benchmarks contra la base (test/bench_compare.py)
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+from bench_compare import IMPROVEMENT, MISSING, REGRESSION, UNCHANGED, bootstrap_ratio_ci, compare, confirm, \
+    suite_settings
+
+
+def result(**benchmarks):
+    """Resultado mínimo de bench_suite.py con las muestras de cada benchmark"""
+    return {'nc': 1000, 'repeticiones': 5, 'semilla': 42, 'escala': '1k',
+            'resultados': {name: {'unidad': 'ms/op', 'muestras': samples, 'operaciones': 20}
+                           for name, samples in benchmarks.items()}}
+
+
+def test_bootstrap_interval():
+    """El intervalo contiene al cociente y se angosta con muestras estables"""
+    base = [10.0, 10.2, 9.9, 10.1, 10.0]
+    low, high = bootstrap_ratio_ci(base, [x * 1.5 for x in base])
+    assert 1.4 < low <= 1.5 <= high < 1.6
+    noisy = [10.0, 14.0, 8.0, 15.0, 9.0]
+    wide_low, wide_high = bootstrap_ratio_ci(base, noisy)
+    assert wide_high - wide_low > high - low
+    assert bootstrap_ratio_ci(base, noisy) == (wide_low, wide_high)   # semilla fija: reproducible
+    print("✅ Intervalo de confianza por bootstrap")
+
+
+def test_statuses():
+    """Regresión sólo si supera el umbral y todo el intervalo está por encima de 1"""
+    base = result(guardar=[3.0, 3.1, 2.9, 3.0, 3.05], exportar_csv=[200, 205, 198, 202, 201],
+                  buscar=[1.0, 1.02, 0.98, 1.0, 1.01], ruidoso=[1.0, 1.0, 1.0, 1.0, 1.0],
+                  exportar_xlsx=[2000, 2010, 1990, 2005, 1995])
+    current = result(guardar=[4.5, 4.6, 4.4, 4.5, 4.55], exportar_csv=[120, 121, 119, 122, 120],
+                     buscar=[1.05, 1.0, 1.1, 1.02, 1.04], ruidoso=[1.0, 3.0, 1.0, 3.0, 1.0],
+                     nuevo=[5.0, 5.0, 5.0])
+    by_name = {c.name: c for c in compare(base, current, threshold=0.25)}
+    assert by_name['guardar'].status == REGRESSION and round(by_name['guardar'].ratio, 2) == 1.5
+    assert by_name['exportar_csv'].status == IMPROVEMENT
+    assert by_name['buscar'].status == UNCHANGED
+    assert by_name['ruidoso'].status == UNCHANGED and by_name['ruidoso'].low <= 1   # mediana igual, ruido
+    assert by_name['exportar_xlsx'].status == MISSING and by_name['nuevo'].status == MISSING
+    assert list(by_name)[-1] == 'nuevo'
+
+    relaxed = {c.name: c for c in compare(base, current, 0.25, {'guardar': 0.6})}
+    assert relaxed['guardar'].status == UNCHANGED and relaxed['guardar'].threshold == 0.6
+    print("✅ Estados regresión/mejora/sin cambio/sin datos")
+
+
+def test_confirmation():
+    """Una regresión que no se repite al volver a medir no hace fallar la comparación"""
+    base = result(guardar=[3.0, 3.1, 2.9, 3.0, 3.05], exportar_csv=[200, 205, 198, 202, 201])
+    first = result(guardar=[4.5, 4.6, 4.4, 4.5, 4.55], exportar_csv=[300, 301, 299, 302, 300])
+    calls = []
+
+    def runner(**settings):
+        calls.append(settings['only'])
+        if settings['only'] == ['guardar', 'exportar_csv']:
+            return result(guardar=[4.5, 4.6, 4.4, 4.5, 4.55], exportar_csv=[201, 200, 203, 199, 202])
+        return result(guardar=[4.6, 4.5, 4.4, 4.5, 4.5])
+
+    comparisons, reruns = confirm(base, compare(base, first, 0.25), suite_settings(base), runner, rounds=2,
+                                  threshold=0.25)
+    statuses = {c.name: c.status for c in comparisons}
+    assert statuses == {'guardar': REGRESSION, 'exportar_csv': UNCHANGED}
+    assert calls == [['guardar', 'exportar_csv'], ['guardar']] and len(reruns) == 2
+
+    calls.clear()
+    assert confirm(base, compare(base, first, 0.25), suite_settings(base), runner, rounds=0)[1] == []
+    assert calls == []
+    print("✅ Regresiones confirmadas volviendo a medir")
+
+
+def test_suite_settings():
+    """La corrida actual repite los parámetros de la base"""
+    settings = suite_settings(result(guardar=[1.0], exportar_csv=[1.0], exportar_desconocido=[1.0]))
+    assert settings['count'] == 1000 and settings['repetitions'] == 5 and settings['ops'] == 20
+    assert settings['seed'] == 42 and settings['escala'] == '1k'
+    assert settings['only'] == ['guardar', 'exportar_csv', 'exportar_desconocido']
+    assert settings['formats'] == ['csv']
+    print("✅ Parámetros de la base")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE LA COMPARACIÓN DE BENCHMARKS")
+    print("=" * 50)
+    test_bootstrap_interval()
+    test_statuses()
+    test_confirmation()
+    test_suite_settings()
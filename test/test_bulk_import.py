@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la importación masiva (db/bulk_import.py)
+Usa archivos CSV temporales; no requiere Qt ni openpyxl
+"""
+
+import csv
+import subprocess
+import sys
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.bulk_import import import_nc, import_acciones
+from db.migrations import BULK_SUSPENDED_TRIGGERS, missing_bulk_triggers
+from db.repository import NCRepository
+from test_repository import _nc
+
+NC_HEADER = ['Nro NC', 'Resultado Matriz', 'OP', 'Cant. Invol.', 'Cod. Producto', 'Desc. Producto',
+             'Cliente', 'Cant. Scrap', 'Costo', 'Cant. Recuperada', 'Falla', 'fecha']
+
+
+def _write_csv(path, header, rows, delimiter=';'):
+    with open(path, 'w', newline='', encoding='utf-8') as fh:
+        writer = csv.writer(fh, delimiter=delimiter)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+
+def test_import_nc_and_acciones():
+    """Filas válidas se insertan; inválidas y duplicadas van al archivo de rechazos"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        conn = repository.connect(':memory:')
+        repository.init_schema(conn)
+
+        _write_csv(tmp / 'nc.csv', NC_HEADER, [
+            [1, 1.5, 10, 100, 'P1', 'Producto 1', 'Cliente A', 5, 50, 95, 'Rebaba', '2024-03-01 10:00:00'],
+            [2, 2.5, 20, 200, 'P2', 'Producto 2', 'Cliente B', 10, 80, 190, 'Fisura', ''],
+            ['x', 2.5, 20, 200, 'P2', 'Producto 2', 'Cliente B', 10, 80, 190, 'Fisura', ''],
+            [3, '1,5', 20, 200, 'P3', 'Producto 3', 'Cliente B', 10, 80, 190, 'Fisura', ''],
+            [2, 2.5, 20, 200, 'P2', 'Producto 2', 'Cliente B', 10, 80, 190, 'Repetida', ''],
+        ])
+        result = import_nc(conn, tmp / 'nc.csv', tmp / 'rechazos.csv', batch_size=1)
+        assert (result.read, result.inserted, result.rejected) == (5, 2, 3)
+        assert conn.execute("SELECT fecha FROM nc WHERE nro_nc=1").fetchone()[0] == '2024-03-01 10:00:00'
+        with open(tmp / 'rechazos.csv', encoding='utf-8') as fh:
+            assert len(list(csv.reader(fh))) == 4
+
+        # Reimportar: rechazo por existente, o actualización con update_existing
+        assert import_nc(conn, tmp / 'nc.csv').rejected == 5
+        assert import_nc(conn, tmp / 'nc.csv', update_existing=True).updated == 2
+
+        # Fechas de planilla: DD/MM/AAAA y número de serie de Excel se guardan en el formato de la aplicación
+        _write_csv(tmp / 'fechas.csv', NC_HEADER, [
+            [10, 1.5, 10, 100, 'P1', 'Producto 1', 'Cliente A', 5, 50, 95, 'Rebaba', '05/03/2024 08:30'],
+            [11, 1.5, 10, 100, 'P1', 'Producto 1', 'Cliente A', 5, 50, 95, 'Rebaba', '45352.5'],
+            [12, 1.5, 10, 100, 'P1', 'Producto 1', 'Cliente A', 5, 50, 95, 'Rebaba', '2024-03-07T09:15:00'],
+            [13, 1.5, 10, 100, 'P1', 'Producto 1', 'Cliente A', 5, 50, 95, 'Rebaba', '31/02/2024'],
+            [14, 1.5, 10, 100, 'P1', 'Producto 1', 'Cliente A', 5, 50, 95, 'Rebaba', 'marzo'],
+        ])
+        result = import_nc(conn, tmp / 'fechas.csv', tmp / 'rechazos_fechas.csv')
+        assert (result.inserted, result.rejected) == (3, 2)
+        fechas = dict(tuple(r) for r in conn.execute("SELECT nro_nc, fecha FROM nc WHERE nro_nc >= 10"))
+        assert fechas == {10: '2024-03-05 08:30:00', 11: '2024-03-01 12:00:00', 12: '2024-03-07 09:15:00'}
+        with open(tmp / 'rechazos_fechas.csv', encoding='utf-8') as fh:
+            assert [row[1] for row in csv.reader(fh)][1:] == ["Fecha inválida: '31/02/2024'", "Fecha inválida: 'marzo'"]
+
+        _write_csv(tmp / 'acciones.csv', ['nro_nc', 'tarea', 'responsable', 'estado'], [
+            [1, 'Ajustar matriz', 'QA', 'Abierta'],
+            [2, 'Capacitar', 'Producción', ''],
+            [9, 'Sin NC', 'QA', 'Abierta'],
+            [1, 'Estado malo', 'QA', 'Pendiente'],
+        ], delimiter=',')
+        result = import_acciones(conn, tmp / 'acciones.csv')
+        assert (result.inserted, result.rejected) == (2, 2)
+
+        _write_csv(tmp / 'acciones_fechas.csv', ['nro_nc', 'tarea', 'fecha_realizacion'], [
+            [10, 'Medir', '15/04/2024'],
+            [11, 'Medir', '45397'],
+            [12, 'Medir', '2024-04-20 00:00:00'],
+            [12, 'Medir', '2024-13-01'],
+        ])
+        result = import_acciones(conn, tmp / 'acciones_fechas.csv')
+        assert (result.inserted, result.rejected) == (3, 1)
+        fechas = [r[0] for r in conn.execute("SELECT a.fecha_realizacion FROM acciones a JOIN nc ON nc.id = a.nc_id "
+                                             "WHERE nc.nro_nc >= 10 ORDER BY nc.nro_nc")]
+        assert fechas == ['2024-04-15', '2024-04-15', '2024-04-20']
+        conn.close()
+    print("✅ Importación masiva correcta")
+
+
+def _summaries(conn):
+    """kpi_mensual y pareto_mensual (sin Ishikawa) junto a las mismas agregaciones calculadas desde nc"""
+    kpi = {tuple(r[:4]): round(r[4], 6) for r in conn.execute(
+        "SELECT mes, cliente, cod_producto, cantidad, costo FROM kpi_mensual")}
+    pareto = {tuple(r[:4]): round(r[4], 6) for r in conn.execute(
+        "SELECT dimension, mes, valor, cantidad, costo FROM pareto_mensual WHERE dimension != 'ishikawa'")}
+    count, cost = Counter(), Counter()
+    for r in conn.execute("SELECT substr(fecha, 1, 7), cliente, cod_producto, falla, costo FROM nc"):
+        for key in (('kpi', r[0], r[1], r[2]), ('falla', r[0], r[3]), ('cliente', r[0], r[1]),
+                    ('cod_producto', r[0], r[2])):
+            count[key] += 1
+            cost[key] += r[4]
+    expected_kpi = {k[1:] + (n,): round(cost[k], 6) for k, n in count.items() if k[0] == 'kpi'}
+    expected_pareto = {k + (n,): round(cost[k], 6) for k, n in count.items() if k[0] != 'kpi'}
+    return (kpi, pareto), (expected_kpi, expected_pareto)
+
+
+def test_import_summaries():
+    """La carga masiva suspende los triggers por fila y deja kpi_mensual, pareto_mensual y row_version al día"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        conn = repository.connect(':memory:')
+        repository.init_schema(conn)
+        _write_csv(tmp / 'previas.csv', NC_HEADER, [
+            [n, 1.5, 10, 100, 'P1', 'Producto 1', 'Cliente A', 5, 10 * n, 95, 'Rebaba', f'2024-0{n}-01 08:00:00']
+            for n in (1, 2)])
+        import_nc(conn, tmp / 'previas.csv')
+        version = conn.execute("SELECT valor FROM cambios_seq").fetchone()[0]
+
+        # Altas sobre una base con datos: se suman sólo las NC nuevas
+        _write_csv(tmp / 'nc.csv', NC_HEADER, [
+            [n, 1.5, 10, 100, f'P{n % 3}', 'Producto', f'Cliente {"AB"[n % 2]}', 5, 10 * n, 95,
+             ('Rebaba', 'Fisura')[n % 2], f'2024-0{1 + n % 4}-15 09:00:00'] for n in range(3, 40)])
+        assert import_nc(conn, tmp / 'nc.csv', batch_size=10).inserted == 37
+        actual, expected = _summaries(conn)
+        assert actual == expected
+        triggers = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")}
+        assert set(BULK_SUSPENDED_TRIGGERS) <= triggers
+        assert conn.execute("SELECT COUNT(*) FROM nc WHERE row_version <= ? OR created_at IS NULL "
+                            "OR updated_at IS NULL", (version,)).fetchone()[0] == 2
+
+        # Actualizaciones: cambian de mes, cliente y falla; los resúmenes se recalculan completos
+        _write_csv(tmp / 'cambios.csv', NC_HEADER, [
+            [n, 1.5, 10, 100, 'P9', 'Producto 9', 'Cliente C', 5, 1, 95, 'Golpe', '2023-12-01 10:00:00']
+            for n in (1, 5, 6)])
+        assert import_nc(conn, tmp / 'cambios.csv', update_existing=True).updated == 3
+        actual, expected = _summaries(conn)
+        assert actual == expected
+
+        # Los triggers quedaron repuestos: un alta común actualiza los resúmenes
+        with conn:
+            NCRepository(conn).insert_many([_nc(99, fecha='2024-06-01 08:00:00', cliente='Cliente D', costo=5)])
+        actual, expected = _summaries(conn)
+        assert actual == expected and ('2024-06', 'Cliente D', 'P99', 1) in actual[0]
+        conn.close()
+    print("✅ Resúmenes e historial de cambios al día después de la carga masiva")
+
+
+# Proceso hijo: importa y muere (sin cerrar la conexión) después del primer lote
+CRASHING_IMPORT = r'''
+import os, sys
+sys.path.insert(0, {root!r})
+from db import bulk_import, repository
+insert_many = bulk_import.NCRepository.insert_many
+def crash(self, rows):
+    insert_many(self, rows)
+    os._exit(3)
+bulk_import.NCRepository.insert_many = crash
+bulk_import.import_nc(repository.connect({db!r}), {csv!r}, batch_size=10)
+'''
+
+
+def test_interrupted_import():
+    """Si el proceso muere durante la carga se revierte todo, también la suspensión de los triggers;
+    una base que quedó sin ellos se repara en init_schema"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db = tmp / 'nc.db'
+        conn = repository.connect(db)
+        repository.init_schema(conn)
+        with conn:
+            NCRepository(conn).insert_many([_nc(1, fecha='2024-01-01 08:00:00')])
+        _write_csv(tmp / 'nc.csv', NC_HEADER, [
+            [n, 1.5, 10, 100, 'P1', 'Producto 1', 'Cliente A', 5, n, 95, 'Rebaba', '2024-02-01 08:00:00']
+            for n in range(2, 40)])
+        script = CRASHING_IMPORT.format(root=str(parent_dir), db=str(db), csv=str(tmp / 'nc.csv'))
+        assert subprocess.run([sys.executable, '-c', script]).returncode == 3
+        assert missing_bulk_triggers(conn) == [] and repository.schema_is_current(conn)
+        assert conn.execute("SELECT COUNT(*) FROM nc").fetchone()[0] == 1
+        actual, expected = _summaries(conn)
+        assert actual == expected
+
+        # Base dejada sin triggers (carga interrumpida de una versión anterior) y una NC guardada así
+        with conn:
+            for name in BULK_SUSPENDED_TRIGGERS:
+                conn.execute(f"DROP TRIGGER {name}")
+            NCRepository(conn).insert_many([_nc(2, fecha='2024-03-01 08:00:00')])
+        assert not repository.schema_is_current(conn)
+        repository.init_schema(conn)
+        assert repository.schema_is_current(conn)
+        assert conn.execute("SELECT COUNT(*) FROM nc WHERE row_version IS NULL OR created_at IS NULL").fetchone()[0] == 0
+        actual, expected = _summaries(conn)
+        assert actual == expected and ('2024-03', 'Cliente', 'P2', 1) in actual[0]
+        conn.close()
+    print("✅ Carga interrumpida revertida y triggers faltantes repuestos")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE IMPORTACIÓN MASIVA")
+    print("=" * 50)
+    test_import_nc_and_acciones()
+    test_import_summaries()
+    test_interrupted_import()
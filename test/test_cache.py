@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la caché LRU de NC (db/cache.py)
+Verifica aciertos, desalojo LRU, invalidación al guardar y por escrituras de otra conexión
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import NCRepository, AccionRepository
+from db.cache import NCRecordCache
+from test_repository import _nc, _accion
+
+
+def test_lru_and_invalidation():
+    """La caché sirve aciertos, desaloja la menos usada y se invalida al escribir"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = Path(tmp) / 'cache.db'
+        conn = repository.connect(db_file)
+        repository.init_schema(conn)
+        ncs, acciones = NCRepository(conn), AccionRepository(conn)
+        for n in range(1, 4):
+            nc_id = ncs.insert(_nc(n))
+            acciones.replace_for_nc(nc_id, [dict(_accion('t'), adjuntos='a.pdf||b.png'), dict(_accion('u'), adjuntos='a.pdf')])
+        conn.commit()
+
+        cache = NCRecordCache(ncs, acciones, maxsize=2)
+        first = cache.get(1)
+        assert first.adjuntos == ('a.pdf', 'b.png') and len(first.acciones) == 2
+        assert cache.get(1) is first and cache.hits == 1
+        assert cache.get(99) is None
+
+        cache.get(2)
+        cache.get(3)
+        assert 1 not in cache and 2 in cache and 3 in cache
+
+        # Escritura propia: invalidación explícita
+        ncs.save(_nc(2, costo=1.0))
+        conn.commit()
+        cache.invalidate(2)
+        assert cache.get(2).nc['costo'] == 1.0
+
+        # Escritura de otra conexión: detectada por PRAGMA data_version
+        other = repository.connect(db_file)
+        NCRepository(other).save(_nc(3, costo=2.0))
+        other.commit()
+        other.close()
+        assert cache.get(3).nc['costo'] == 2.0
+        conn.close()
+    print("✅ Caché LRU e invalidación correctas")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE LA CACHÉ DE NC")
+    print("=" * 50)
+    test_lru_and_invalidation()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Pruebas del catálogo de productos (db/catalog.py, migración 5 e importación del ERP)
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository, schema
+from db.bulk_import import import_productos
+from db.catalog import ProductCatalog
+from db.repository import NCRepository
+from test_repository import _nc
+
+
+def _producto_ids(conn):
+    return dict(tuple(r) for r in conn.execute("SELECT nc.nro_nc, p.cod_producto FROM nc JOIN productos p ON p.id = nc.producto_id"))
+
+
+def _row_versions(conn):
+    return dict(tuple(r) for r in conn.execute("SELECT nro_nc, row_version FROM nc"))
+
+
+def test_migration_backfill_and_triggers():
+    """La migración arma el catálogo con la descripción más reciente; las escrituras mantienen producto_id"""
+    conn = repository.connect(':memory:')
+    conn.execute(schema.NC_CREATE_SQL)
+    conn.execute(schema.ACCION_CREATE_SQL)
+    conn.executemany(schema.NC_INSERT_SQL, [_nc(1, cod_producto='P1', desc_producto='Tapa vieja'),
+                                            _nc(2, cod_producto='P1 ', desc_producto='Tapa'),
+                                            _nc(3, cod_producto='P2', desc_producto='Eje')])
+    conn.commit()
+    repository.init_schema(conn)
+    productos = conn.execute("SELECT cod_producto, desc_producto FROM productos ORDER BY id").fetchall()
+    assert [tuple(r) for r in productos] == [('P1', 'Tapa'), ('P2', 'Eje')]
+    assert _producto_ids(conn) == {1: 'P1', 2: 'P1', 3: 'P2'}
+    # El relleno de producto_id no cuenta como modificación para la exportación incremental
+    assert _row_versions(conn) == {1: 1, 2: 1, 3: 1}
+
+    ncs = NCRepository(conn)
+    ncs.insert(_nc(4, cod_producto='P3', desc_producto='Brida'))
+    ncs.save(_nc(3, cod_producto='P1'))
+    ncs.upsert_many([_nc(1, cod_producto='P4', desc_producto='Buje')])
+    conn.commit()
+    assert _producto_ids(conn) == {1: 'P4', 2: 'P1', 3: 'P1', 4: 'P3'}
+    assert conn.execute("SELECT COUNT(*) FROM productos").fetchone()[0] == 4
+    versions = _row_versions(conn)
+    assert versions[2] == 1 and min(versions[1], versions[3], versions[4]) > 1
+    conn.close()
+    print("✅ Migración y triggers del catálogo correctos")
+
+
+def test_catalog_lookup_and_erp_import():
+    """El ERP actualiza descripciones; el catálogo en memoria se refresca y detecta escrituras externas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        db_file = tmp / 'nc.db'
+        conn = repository.connect(db_file)
+        repository.init_schema(conn)
+        NCRepository(conn).insert(_nc(1, cod_producto='P1', desc_producto='tapa'))
+        conn.commit()
+
+        catalog = ProductCatalog(conn)
+        assert catalog.description(' P1 ') == 'tapa' and catalog.lookup('P9') is None
+
+        with open(tmp / 'erp.csv', 'w', newline='', encoding='utf-8') as fh:
+            writer = csv.writer(fh, delimiter=';')
+            writer.writerow(['Código', 'Descripción', 'Familia'])
+            writer.writerows([['P1', 'Tapa 80 mm', 'A'], ['P2', 'Eje 20 mm', 'B'], ['', 'Sin código', 'B'],
+                              ['P2', 'Eje repetido', 'B'], ['P3', '', 'C']])
+        result = import_productos(conn, tmp / 'erp.csv', tmp / 'rechazos.csv')
+        assert (result.read, result.inserted, result.updated, result.rejected) == (5, 1, 1, 3)
+        assert catalog.description('P1') == 'tapa'                # escrituras propias: se invalida a mano
+        catalog.invalidate()
+        assert len(catalog) == 2 and catalog.lookup('P2').desc_producto == 'Eje 20 mm'
+
+        result = import_productos(conn, tmp / 'erp.csv')
+        assert (result.inserted, result.updated) == (0, 0)
+
+        NCRepository(conn).insert(_nc(2, cod_producto='P5', desc_producto='Buje'))
+        conn.commit()
+        assert catalog.lookup('P5') is None
+        catalog.refresh('P5')
+        assert catalog.lookup('P5').id == conn.execute("SELECT producto_id FROM nc WHERE nro_nc = 2").fetchone()[0]
+
+        other = repository.connect(db_file)
+        other.execute("UPDATE productos SET desc_producto = 'Buje bronce' WHERE cod_producto = 'P5'")
+        other.commit()
+        other.close()
+        assert catalog.description('P5') == 'Buje bronce'
+        conn.close()
+    print("✅ Catálogo e importación del ERP correctos")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DEL CATÁLOGO DE PRODUCTOS")
+    print("=" * 50)
+    test_migration_backfill_and_triggers()
+    test_catalog_lookup_and_erp_import()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Pruebas del autocompletado por prefijo (db/completion.py)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import NCRepository, AccionRepository
+from db.catalog import ProductCatalog
+from db.completion import CompletionSource, PrefixIndex
+from test_repository import _nc, _accion
+
+
+def test_prefix_index():
+    """Orden alfabético, sin distinguir mayúsculas, sin duplicados y con límite"""
+    index = PrefixIndex(['Faben', 'fabrica sur', 'FABEN', ' Acme ', '', None, 'Fábrica Norte'])
+    assert len(index) == 4
+    assert index.complete('fab') == ['Faben', 'fabrica sur']
+    assert index.complete('FÁB') == ['Fábrica Norte']
+    assert index.complete('') == [] and index.complete('zz') == []
+    assert index.add('Fabiola') and not index.add('faben')
+    assert index.complete('fab', limit=2) == ['Faben', 'Fabiola']
+    print("✅ Índice de prefijos correcto")
+
+
+def test_completion_source():
+    """Se arma al primer uso desde la base, se actualiza al guardar y se descarta con escrituras externas"""
+    tmp = tempfile.TemporaryDirectory()
+    db_file = Path(tmp.name) / 'nc.db'
+    conn = repository.connect(db_file)
+    repository.init_schema(conn)
+    ncs, acciones = NCRepository(conn), AccionRepository(conn)
+    nc_id = ncs.insert(_nc(1, cliente='Acme', cod_producto='P-100'))
+    ncs.insert_many([_nc(2, cliente='Acme', cod_producto='P-200'), _nc(3, cliente='Aceros SA', cod_producto='X-1')])
+    acciones.replace_for_nc(nc_id, [_accion('a'), dict(_accion('b'), responsable='Producción')])
+    conn.commit()
+
+    source = CompletionSource(conn)
+    assert source.complete('cliente', 'ac') == ['Aceros SA', 'Acme']
+    assert source.complete('cod_producto', 'p-') == ['P-100', 'P-200']
+    assert source.complete('responsable', 'pro') == ['Producción']
+    source.add('cliente', 'Acindar')
+    assert source.complete('cliente', 'aci') == ['Acindar']
+    try:
+        source.complete('falla', 'x')
+        assert False, "campo sin autocompletado aceptado"
+    except ValueError:
+        pass
+
+    other = repository.connect(db_file)
+    NCRepository(other).insert(_nc(4, cliente='Acuario'))
+    other.commit()
+    other.close()
+    assert source.complete('cliente', 'acu') == ['Acuario']
+
+    # Productos del maestro del ERP sin NC todavía
+    ProductCatalog(conn).upsert_many([{'cod_producto': 'P-300', 'desc_producto': 'Del ERP'}])
+    conn.commit()
+    assert source.complete('cod_producto', 'p-') == ['P-100', 'P-200', 'P-300']
+    conn.close()
+    tmp.cleanup()
+    print("✅ Fuente de autocompletado correcta")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE AUTOCOMPLETADO")
+    print("=" * 50)
+    test_prefix_index()
+    test_completion_source()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Pruebas de created_at / updated_at y de las consultas por rango de fechas (migración 7, db/dates.py)
+"""
+
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository, schema
+from db.dates import month_range, quarter_range, to_epoch
+from db.repository import NCRepository, AccionRepository, _range_sql
+from test_repository import _nc, _accion
+
+
+def test_periods():
+    assert month_range(2025, 12) == (date(2025, 12, 1), date(2026, 1, 1))
+    assert quarter_range(2025, 2) == (date(2025, 4, 1), date(2025, 7, 1))
+    assert to_epoch('2025-03-01') == to_epoch(date(2025, 3, 1)) == to_epoch(datetime(2025, 3, 1))
+    assert to_epoch('2025-03-01 00:00:10') - to_epoch('2025-03-01') == 10
+    try:
+        quarter_range(2025, 5)
+        assert False, "trimestre inválido aceptado"
+    except ValueError:
+        pass
+    print("✅ Períodos y conversión a epoch correctos")
+
+
+def test_timestamps_and_ranges():
+    """created_at sale de fecha (también en NC existentes e importadas); updated_at cambia al editar"""
+    conn = repository.connect(':memory:')
+    conn.execute(schema.NC_CREATE_SQL)
+    conn.execute(schema.ACCION_CREATE_SQL)
+    conn.executemany(schema.NC_INSERT_SQL, [_nc(1, fecha='2024-11-05 10:00:00')])
+    conn.commit()
+    repository.init_schema(conn)
+    ncs, acciones = NCRepository(conn), AccionRepository(conn)
+    row = conn.execute("SELECT created_at, updated_at FROM nc WHERE nro_nc = 1").fetchone()
+    assert row[0] == row[1] == to_epoch('2024-11-05 10:00:00')
+
+    ncs.insert_many([_nc(2, fecha='2025-01-20 08:00:00'), _nc(3, fecha='2025-02-03 09:30:00'),
+                     _nc(4, fecha='2025-04-01 00:00:00')])
+    acciones.replace_for_nc(ncs.get_id(2), [dict(_accion('a'), fecha_realizacion='2025-01-31'),
+                                            dict(_accion('b'), fecha_realizacion='2025-02-01')])
+    conn.commit()
+    before = time.time()
+    created = conn.execute("SELECT created_at FROM nc WHERE nro_nc = 3").fetchone()[0]
+    seq = conn.execute("SELECT valor FROM cambios_seq").fetchone()[0]
+    ncs.save(_nc(3, fecha=datetime.now().strftime('%Y-%m-%d %H:%M:%S'), costo=1.0))
+    conn.commit()
+    row = conn.execute("SELECT created_at, updated_at, row_version FROM nc WHERE nro_nc = 3").fetchone()
+    assert row[0] == created and row[1] >= int(before)
+    assert row[2] == seq + 1                       # una sola versión nueva por edición
+
+    assert [r['nro_nc'] for r in ncs.created_between(*quarter_range(2025, 1))] == [2, 3]
+    assert [r['nro_nc'] for r in ncs.created_between(*month_range(2025, 4))] == [4]
+    assert [r['nro_nc'] for r in ncs.created_between(hasta='2025-01-01')] == [1]
+    assert {r['nro_nc'] for r in ncs.updated_between(desde=before - 60)} == {2, 3, 4}   # la 1 es anterior
+    assert [r['tarea'] for r in acciones.due_between(*month_range(2025, 1))] == ['a']
+
+    # Las consultas son recorridos de rango por índice, no recorridos completos
+    for table, columns, column, index in (('nc', schema.NC_COLUMNS, 'created_at', 'idx_nc_created_at'),
+                                          ('nc', schema.NC_COLUMNS, 'updated_at', 'idx_nc_updated_at'),
+                                          ('acciones', schema.ACCION_COLUMNS, 'fecha_realizacion',
+                                           'idx_acciones_fecha_realizacion')):
+        sql, params = _range_sql(table, columns, column, 1, 2)
+        plan = ' '.join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+        assert f"USING INDEX {index} ({column}>? AND {column}<?)" in plan, plan
+    conn.close()
+    print("✅ Marcas de tiempo y rangos por índice correctos")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE FECHAS Y RANGOS")
+    print("=" * 50)
+    test_periods()
+    test_timestamps_and_ranges()
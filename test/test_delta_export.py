@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la exportación incremental (export/delta.py)
+Usa un escritor en memoria en lugar de openpyxl
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import NCRepository, AccionRepository
+from export.__main__ import main as export_main
+from export.delta import export_delta, get_mark
+from test_repository import _nc, _accion
+
+
+def _memory_writer(store):
+    def writer(path, sheets):
+        store.clear()
+        for name, headers, rows in sheets:
+            store[name] = [dict(zip(headers, r)) for r in rows]
+        return {name: len(rows) for name, rows in store.items()}
+    return writer
+
+
+def test_delta_export():
+    """Sólo se exporta lo cambiado desde la última marca; --completo exporta todo"""
+    conn = repository.connect(':memory:')
+    repository.init_schema(conn)
+    ncs, acciones = NCRepository(conn), AccionRepository(conn)
+    out = {}
+    writer = _memory_writer(out)
+
+    for n in (1, 2, 3):
+        acciones.replace_for_nc(ncs.insert(_nc(n)), [_accion(f't{n}')])
+    conn.commit()
+    first = export_delta(conn, 'x.xlsx', writer=writer)
+    assert first.counts == {'nc': 3, 'acciones': 3, 'borrados': 0}
+    assert get_mark(conn) == first.hasta
+
+    assert export_delta(conn, 'x.xlsx', writer=writer).empty
+
+    # Editar NC 2 reemplaza sus acciones: sale la NC, la acción nueva y el borrado de la anterior
+    nc_id, _ = ncs.save(_nc(2, costo=10.0))
+    acciones.replace_for_nc(nc_id, [_accion('nueva')])
+    conn.commit()
+    delta = export_delta(conn, 'x.xlsx', writer=writer)
+    assert [r['nro_nc'] for r in out['nc']] == [2]
+    assert [r['tarea'] for r in out['acciones']] == ['nueva'] and out['acciones'][0]['nro_nc'] == 2
+    assert [r['tabla'] for r in out['borrados']] == ['acciones']
+    assert delta.desde == first.hasta
+
+    full = export_delta(conn, 'x.xlsx', writer=writer, full=True)
+    assert full.counts == {'nc': 3, 'acciones': 3}
+
+    # Un error al escribir no avanza la marca
+    ncs.save(_nc(3, costo=1.0))
+    conn.commit()
+    mark = get_mark(conn)
+    def failing(path, sheets):
+        raise OSError("disco lleno")
+    try:
+        export_delta(conn, 'x.xlsx', writer=failing)
+    except OSError:
+        pass
+    assert get_mark(conn) == mark
+    conn.close()
+    print("✅ Exportación incremental correcta")
+
+
+def test_cli_incremental_csv():
+    """python -m export --incremental --salida cambios.csv escribe CSV (formato según la extensión)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        conn = repository.connect(tmp / 'nc.db')
+        repository.init_schema(conn)
+        NCRepository(conn).insert_many([_nc(1), _nc(2)])
+        conn.commit()
+        conn.close()
+        assert export_main(['--db', str(tmp / 'nc.db'), '--incremental', '--salida', str(tmp / 'cambios.csv')]) == 0
+        names = sorted(p.name for p in tmp.iterdir() if p.suffix == '.csv')
+        assert names == ['cambios_acciones.csv', 'cambios_borrados.csv', 'cambios_nc.csv']
+        with open(tmp / 'cambios_nc.csv', newline='', encoding='utf-8') as fh:
+            rows = list(csv.reader(fh))
+        assert rows[0][0] == 'id' and [r[rows[0].index('nro_nc')] for r in rows[1:]] == ['1', '2']
+    print("✅ Exportación incremental en CSV desde la línea de comandos")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE EXPORTACIÓN INCREMENTAL")
+    print("=" * 50)
+    test_delta_export()
+    test_cli_incremental_csv()
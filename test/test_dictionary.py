@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la codificación por diccionario (migración 6)
+nc y acciones pasan a ser vistas sobre tablas con ids enteros: los datos, los ids,
+los indicadores y las escrituras por SQL con texto tienen que seguir igual
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository, schema
+from db.kpi import kpi_summary
+from db.repository import NCRepository, AccionRepository
+from test_repository import _nc, _accion
+from test_kpi import FULL_SCAN_SQL, _snapshot
+
+# Columnas escritas por la aplicación (row_version y las marcas de tiempo las completa la base)
+NC_ROWS_SQL = f"SELECT id, {', '.join(schema.NC_WRITE_COLUMNS)} FROM nc ORDER BY id"
+ACCION_ROWS_SQL = f"SELECT id, {', '.join(schema.ACCION_WRITE_COLUMNS)} FROM acciones ORDER BY id"
+
+
+def _rows(conn, sql):
+    return [tuple(r) for r in conn.execute(sql)]
+
+
+def _legacy_db():
+    """Base con las tablas de texto originales (anterior a las migraciones) y una NC borrada"""
+    conn = repository.connect(':memory:')
+    conn.execute(schema.NC_CREATE_SQL)
+    conn.execute(schema.ACCION_CREATE_SQL)
+    conn.executemany(schema.NC_INSERT_SQL, [_nc(i, cliente=f'Cliente {i % 3}', cod_producto=f'P{i % 4}',
+                                                desc_producto=f'Producto {i % 4}', costo=10.0 * i)
+                                            for i in range(1, 21)])
+    conn.executemany(schema.ACCION_INSERT_SQL, [dict(_accion(f't{i}'), nc_id=i, estado='Cerrada' if i % 2 else 'Abierta')
+                                                for i in range(1, 11)])
+    conn.execute("DELETE FROM nc WHERE nro_nc = 20")
+    conn.commit()
+    return conn
+
+
+def test_migration_keeps_data():
+    """Mismas filas por las vistas, ids y contador de AUTOINCREMENT conservados, textos una sola vez"""
+    conn = _legacy_db()
+    before_nc, before_acc = _rows(conn, NC_ROWS_SQL), _rows(conn, ACCION_ROWS_SQL)
+    repository.init_schema(conn)
+    types = dict(tuple(r) for r in conn.execute("SELECT name, type FROM sqlite_master WHERE name IN "
+                                                "('nc', 'acciones', 'nc_datos', 'acciones_datos')"))
+    assert types == {'nc': 'view', 'acciones': 'view', 'nc_datos': 'table', 'acciones_datos': 'table'}
+    assert _rows(conn, NC_ROWS_SQL) == before_nc
+    assert _rows(conn, ACCION_ROWS_SQL) == before_acc
+    assert conn.execute("SELECT COUNT(*) FROM clientes").fetchone()[0] == 3
+    assert conn.execute("SELECT COUNT(*) FROM estados").fetchone()[0] == 2
+    assert conn.execute("SELECT typeof(cliente_id) FROM nc_datos LIMIT 1").fetchone()[0] == 'integer'
+
+    nc_id = NCRepository(conn).insert(_nc(20, cliente='Cliente nuevo'))
+    conn.commit()
+    assert nc_id == 21                                            # el id 20 borrado no se reutiliza
+    assert conn.execute("SELECT cliente FROM nc WHERE id = 21").fetchone()[0] == 'Cliente nuevo'
+    assert _snapshot(kpi_summary(conn, ('mes', 'cliente', 'cod_producto'))) == _snapshot(conn.execute(FULL_SCAN_SQL))
+    conn.close()
+    print("✅ Migración a diccionarios sin pérdida de datos")
+
+
+def test_writes_through_views_and_repository():
+    """INSERT/UPDATE/DELETE con texto sobre las vistas y el repositorio mantienen diccionarios e indicadores"""
+    conn = repository.connect(':memory:')
+    repository.init_schema(conn)
+    ncs, acciones = NCRepository(conn), AccionRepository(conn)
+    ncs.insert_many(_nc(i, cliente=f'C{i % 2}', fecha=f'2025-0{1 + i % 3}-01 08:00:00') for i in range(1, 9))
+    ncs.upsert_many([_nc(3, cliente='C9'), _nc(9, cliente='C0')])
+    acciones.replace_for_nc(ncs.get_id(1), [_accion('a'), dict(_accion('b'), responsable='Mantenimiento')])
+
+    params = _nc(10, cliente='Por SQL')
+    conn.execute(schema.NC_INSERT_SQL, params)
+    conn.execute("UPDATE nc SET cliente = 'C1', costo = 75 WHERE nro_nc = 2")
+    conn.execute("DELETE FROM nc WHERE nro_nc = 4")
+    conn.execute("UPDATE acciones SET estado = 'Cerrada' WHERE tarea = 'a'")
+    conn.commit()
+
+    assert conn.execute("SELECT cliente, costo FROM nc WHERE nro_nc = 2").fetchone()[:] == ('C1', 75.0)
+    assert conn.execute("SELECT cliente FROM nc WHERE nro_nc = 10").fetchone()[0] == 'Por SQL'
+    assert [r[0] for r in conn.execute("SELECT valor FROM clientes ORDER BY id")] == ['C1', 'C0', 'C9', 'Por SQL']
+    assert [r[0] for r in conn.execute("SELECT valor FROM responsables ORDER BY id")] == ['QA', 'Mantenimiento']
+    assert conn.execute("SELECT estado FROM acciones WHERE tarea = 'a'").fetchone()[0] == 'Cerrada'
+    assert conn.execute("SELECT COUNT(*) FROM borrados WHERE tabla = 'nc'").fetchone()[0] == 1
+    versions = [r[0] for r in conn.execute("SELECT row_version FROM nc ORDER BY row_version")]
+    assert len(set(versions)) == len(versions) == 9
+    assert _snapshot(kpi_summary(conn, ('mes', 'cliente', 'cod_producto'))) == _snapshot(conn.execute(FULL_SCAN_SQL))
+    conn.close()
+    print("✅ Escrituras por vistas y repositorio correctas")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE CODIFICACIÓN POR DICCIONARIO")
+    print("=" * 50)
+    test_migration_keeps_data()
+    test_writes_through_views_and_repository()
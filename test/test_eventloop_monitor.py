@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Pruebas del monitor de latencia del event loop (diagnostics/eventloop.py)
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from diagnostics.eventloop import NO_OPERATION, LagMonitor, bucket_labels
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 10.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms / 1000
+
+
+def test_histogram():
+    """La demora es el exceso sobre el intervalo y cae en su cubeta"""
+    clock = FakeClock()
+    monitor = LagMonitor(interval_ms=20, stall_ms=50, summary_s=0, clock=clock)
+    assert monitor.tick() is None                  # primer tick: sólo referencia
+    for ms in (20, 25, 60, 20 + 120, 20 + 3000):
+        clock.advance(ms)
+        monitor.tick()
+    counts = dict(zip(bucket_labels(), monitor.histogram))
+    assert monitor.samples == 5 and counts['<16'] == 2 and counts['33-50'] == 1
+    assert counts['100-250'] == 1 and counts['>=2000'] == 1
+    assert monitor.stalls == 2 and round(monitor.stall_max) == 3000
+    print("✅ Histograma de demoras correcto")
+
+
+def test_attribution():
+    """Un bloqueo se atribuye a la operación más larga terminada, o a la que sigue en curso"""
+    clock = FakeClock()
+    monitor = LagMonitor(interval_ms=20, stall_ms=50, summary_s=0, clock=clock)
+
+    class Window:
+        @monitor.track()
+        def save_record(self):
+            clock.advance(300)
+            self.refresh()
+
+        @monitor.track('refrescar')
+        def refresh(self):
+            clock.advance(100)
+
+    monitor.tick()
+    Window().save_record(False)                    # checked de clicked: se descarta
+    monitor.tick()
+    save = monitor.operations['save_record']
+    assert save.stalls == 1 and round(save.stall_total) == 380 and save.calls == 1 and round(save.longest) == 400
+    assert monitor.operations['refrescar'].stalls == 0 and monitor.operations['refrescar'].calls == 1
+
+    # Diálogo modal dentro de la operación: el event loop anidado sigue llamando a tick()
+    with monitor.operation('attach_files'):
+        clock.advance(200)
+        monitor.tick()
+        assert monitor.current_operation == 'attach_files'
+    clock.advance(30)
+    monitor.tick()                                 # cierre del diálogo sin demora
+    assert monitor.operations['attach_files'].stalls == 1
+
+    clock.advance(500)
+    monitor.tick()
+    monitor.tick()                                 # la operación ya terminada no se vuelve a culpar
+    assert monitor.operations[NO_OPERATION].stalls == 1 and monitor.operations['attach_files'].stalls == 1
+    print("✅ Bloqueos atribuidos a su operación")
+
+
+def test_other_threads_and_summary():
+    """Las operaciones de otros hilos no tocan la pila; el resumen ordena por tiempo bloqueado"""
+    clock = FakeClock()
+    monitor = LagMonitor(interval_ms=20, stall_ms=50, summary_s=60, clock=clock)
+    worker = threading.Thread(target=lambda: monitor.operation('hilo').__enter__())
+    worker.start()
+    worker.join()
+    assert monitor.current_operation is None and 'hilo' not in monitor.operations
+
+    monitor.tick()
+    for name, ms in (('export_data', 900), ('update_duplicates', 80)):
+        with monitor.operation(name):
+            clock.advance(ms)
+        monitor.tick()
+    text = monitor.summary()
+    assert text.index('export_data') < text.index('update_duplicates') and '2 bloqueos' in text
+    monitor.reset()
+    assert monitor.samples == 0 and monitor.operations == {}
+    print("✅ Resumen ordenado por tiempo bloqueado")
+
+
+def test_disabled():
+    """Desactivado, track() y operation() sólo llaman a la función: no hay pila ni estadísticas"""
+    clock = FakeClock()
+    monitor = LagMonitor(interval_ms=20, stall_ms=50, summary_s=0, clock=clock, enabled=False)
+
+    seen = []
+
+    @monitor.track()
+    def save_record(nro):
+        seen.append(monitor.current_operation)
+        return nro * 2
+
+    assert save_record(21, False) == 42              # checked de clicked: se descarta igual
+    with monitor.operation('export_data'):
+        seen.append(monitor.current_operation)
+    assert seen == [None, None] and monitor.operations == {}
+
+    monitor.enabled = True
+    assert save_record(5) == 10 and seen[-1] == 'save_record' and monitor.operations['save_record'].calls == 1
+    print("✅ Monitor desactivado sin costo por operación")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DEL MONITOR DE LATENCIA DEL EVENT LOOP")
+    print("=" * 50)
+    test_histogram()
+    test_attribution()
+    test_other_threads_and_summary()
+    test_disabled()
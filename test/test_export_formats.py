@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los formatos de exportación (export/formats.py)
+CSV siempre; Parquet sólo si pyarrow está instalado
+"""
+
+import csv
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import NCRepository
+from db.schema import NC_EXPORT_HEADERS
+from db.pareto import compute_pareto
+from export.formats import available_formats, export_nc, export_pareto, format_from_path
+from test_repository import _nc
+
+PARQUET_AVAILABLE = 'parquet' in available_formats()
+
+
+def _db_with_rows(n):
+    conn = repository.connect(':memory:')
+    repository.init_schema(conn)
+    NCRepository(conn).insert_many(_nc(i) for i in range(1, n + 1))
+    conn.commit()
+    return conn
+
+
+def test_csv_export():
+    """La exportación CSV conserva encabezados y filas"""
+    conn = _db_with_rows(25)
+    with tempfile.TemporaryDirectory() as tmp:
+        path, counts, _ = export_nc(conn, Path(tmp) / 'export_nc.csv')
+        assert counts == {'nc': 25}
+        with open(path, newline='', encoding='utf-8') as fh:
+            rows = list(csv.reader(fh))
+        assert tuple(rows[0]) == NC_EXPORT_HEADERS and len(rows) == 26
+    conn.close()
+    assert format_from_path('x.parquet') == 'parquet' and format_from_path('x.feather') == 'arrow'
+    print("✅ Exportación CSV correcta")
+
+
+@pytest.mark.skipif(not PARQUET_AVAILABLE, reason="pyarrow no instalado")
+def test_parquet_types():
+    """Parquet tipa columnas según el esquema (si pyarrow está disponible)"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    conn = _db_with_rows(3)
+    with tempfile.TemporaryDirectory() as tmp:
+        path, _, _ = export_nc(conn, Path(tmp) / 'export_nc.parquet')
+        table = pq.read_table(path)
+        assert table.schema.field('op').type == pa.int64()
+        assert table.schema.field('costo').type == pa.float64()
+        assert pa.types.is_timestamp(table.schema.field('fecha').type)
+        assert table.num_rows == 3
+
+        # Pareto: cantidad entera y porcentajes como números, no como texto
+        path, _ = export_pareto(compute_pareto(conn, 'cod_producto', 'costo'), Path(tmp) / 'pareto.parquet')
+        table = pq.read_table(path)
+        assert [table.schema.field(h).type for h in ('valor', 'cantidad', 'costo', 'porcentaje', 'acumulado')] == \
+            [pa.string(), pa.int64(), pa.float64(), pa.float64(), pa.float64()]
+        assert table.column('cantidad').to_pylist() == [1, 1, 1] and table.column('acumulado').to_pylist()[-1] == 100.0
+    conn.close()
+    print("✅ Exportación Parquet tipada correcta")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE FORMATOS DE EXPORTACIÓN")
+    print("=" * 50)
+    test_csv_export()
+    if PARQUET_AVAILABLE:
+        test_parquet_types()
+    else:
+        print("⏭️  pyarrow no instalado, prueba omitida")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Pruebas del arnés sin ventanas de MainWindow (test/gui_harness.py)
+"""
+
+import os
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+import pytest
+
+from gui_harness import DialogHooks, MainWindowHarness, Timings
+
+try:
+    import PyQt6.QtWidgets  # noqa: F401
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+
+def fake_qtwidgets():
+    """Módulo con la forma de QtWidgets para probar los reemplazos sin PyQt6"""
+    class QMessageBox:
+        StandardButton = SimpleNamespace(Ok='ok', Cancel='cancel', Retry='retry')
+
+        @staticmethod
+        def information(*args):
+            raise AssertionError("diálogo real")
+        warning = critical = question = information
+
+    class QDialog:
+        DialogCode = SimpleNamespace(Accepted=1, Rejected=0)
+
+        def exec(self):
+            raise AssertionError("diálogo real")
+
+    class QInputDialog:
+        getInt = QMessageBox.information
+
+    class QFileDialog:
+        getOpenFileNames = QMessageBox.information
+
+    return SimpleNamespace(QMessageBox=QMessageBox, QDialog=QDialog, QInputDialog=QInputDialog,
+                           QFileDialog=QFileDialog)
+
+
+def test_dialog_hooks():
+    """Mensajes registrados, respuestas en cola y restauración de los originales"""
+    qt = fake_qtwidgets()
+    original = qt.QMessageBox.__dict__['information']
+    hooks = DialogHooks().install(qt)
+    assert qt.QMessageBox.warning(None, 'Error', 'No se pudo') == 'ok'
+    assert qt.QMessageBox.question(None, 'NC Duplicada', '¿Continuar?') == 'retry'
+    hooks.question_answer = 'Cancel'
+    assert qt.QMessageBox.question(None, 'NC Duplicada', '¿Continuar?') == 'cancel'
+    assert [m.kind for m in hooks.messages] == ['warning', 'question', 'question']
+    assert hooks.last('warning').text == 'No se pudo' and len(hooks.errors) == 1
+
+    hooks.int_answers.extend([7, 8])
+    assert qt.QInputDialog.getInt(None, 'Editar', 'Nro') == (7, True)
+    assert qt.QInputDialog.getInt(None, 'Editar', 'Nro') == (8, True)
+    assert qt.QInputDialog.getInt(None, 'Editar', 'Nro') == (0, False)          # cola vacía: cancelar
+    hooks.file_answers.append([Path('a.pdf')])
+    assert qt.QFileDialog.getOpenFileNames(None, 'Adjuntar') == (['a.pdf'], '')
+    assert qt.QFileDialog.getOpenFileNames(None, 'Adjuntar') == ([], '')
+
+    class ActionDialog(qt.QDialog):
+        pass
+    assert ActionDialog().exec() == 0                                            # sin manejador: rechazar
+    hooks.on_dialog('ActionDialog', lambda dlg: setattr(dlg, 'tarea', 'Ajustar') or True)
+    dlg = ActionDialog()
+    assert dlg.exec() == 1 and dlg.tarea == 'Ajustar'
+
+    hooks.uninstall()
+    assert qt.QMessageBox.__dict__['information'] is original
+    assert 'getInt' in qt.QInputDialog.__dict__ and 'exec' in qt.QDialog.__dict__
+    print("✅ Diálogos reemplazados y restaurados")
+
+
+def test_timings():
+    timings = Timings()
+    for ms in range(1, 101):
+        timings.record('guardar', float(ms))
+    stats = timings.stats('guardar')
+    assert stats['n'] == 100 and stats['mediana'] == 50.5 and stats['p95'] == 96 and stats['max'] == 100
+    assert 'guardar' in timings.summary()
+    print("✅ Estadísticas de tiempos por flujo")
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="PyQt6 no instalado")
+def test_window_flows():
+    """Guardar, NC duplicada, editar, acción, adjuntos y exportación sin ventanas"""
+    from PyQt6 import QtWidgets
+    originals = (QtWidgets.QMessageBox.__dict__['information'], QtWidgets.QDialog.__dict__['exec'])
+    cwd = os.getcwd()
+    with MainWindowHarness(nc=30) as h:
+        assert Path.cwd() == h.workdir
+        message = h.save(31, {'Cliente': 'ACME', 'Falla': 'Fisura en base'},
+                         acciones=[{'tarea': 'Ajustar', 'responsable': 'Ana', 'fecha_realizacion': '2030-01-01'}])
+        assert message.title == 'Registro Guardado' and h.window.nc_repo.exists(31)
+
+        h.hooks.question_answer = 'Cancel'
+        h.save(31, {'Cliente': 'Otro'})
+        assert h.hooks.last().kind == 'question'
+        assert h.window.nc_repo.get_by_nro(31)['cliente'] == 'ACME'
+        h.hooks.question_answer = 'Retry'
+
+        values = h.edit(31)
+        assert values['Cliente'] == 'ACME' and values['Falla'] == 'Fisura en base'
+        assert h.window.actions_temp[0]['responsable'] == 'Ana'
+        h.edit(999)
+        assert h.hooks.last().title == 'No encontrado'
+
+        h.window.reset_form()
+        action = h.add_action(tarea='Capacitar', tiempo='2h', responsable='Luis', fecha_realizacion='2030-02-01')
+        assert action == {'tarea': 'Capacitar', 'tiempo': '2h', 'responsable': 'Luis',
+                          'fecha_realizacion': '2030-02-01', 'estado': 'Abierta'}
+        source = h.workdir / 'plano.pdf'
+        source.write_bytes(b'%PDF')
+        attached = h.attach([source])
+        assert len(attached) == 1 and (h.app_mod.ATTACH_DIR / attached[0]).exists()
+
+        path = h.export('csv')
+        assert path.exists() and h.hooks.last().text.endswith(path.name)
+        assert not h.hooks.errors[1:]                  # sólo el "No encontrado" esperado
+        assert set(h.timings.samples) >= {'guardar', 'editar', 'accion', 'adjuntar', 'exportar_csv'}
+        workdir = h.workdir
+
+    assert os.getcwd() == cwd and not workdir.exists()
+    assert (QtWidgets.QMessageBox.__dict__['information'], QtWidgets.QDialog.__dict__['exec']) == originals
+    print("✅ Flujos de MainWindow recorridos sin ventanas")
+
+
+@pytest.mark.skipif(not QT_AVAILABLE, reason="PyQt6 no instalado")
+def test_edit_keeps_fecha():
+    """Editar una NC conserva su fecha de alta: no cambia de mes en kpi_mensual ni en pareto_mensual"""
+    with MainWindowHarness(nc=30) as h:
+        conn = h.window.conn
+        fecha = h.window.nc_repo.get_by_nro(5)['fecha']
+        mes = fecha[:7]
+        assert mes != h.app_mod.datetime.now().strftime('%Y-%m')
+        kpi_sql = "SELECT TOTAL(cantidad), TOTAL(costo) FROM kpi_mensual WHERE mes = ?"
+        before = tuple(conn.execute(kpi_sql, (mes,)).fetchone())
+        costo = h.window.nc_repo.get_by_nro(5)['costo']
+
+        h.edit(5)
+        h.save(5, {**h.values(), 'Costo': str(costo + 100)})
+        assert h.hooks.last().title == 'Registro Actualizado'
+        row = h.window.nc_repo.get_by_nro(5)
+        assert row['fecha'] == fecha and row['costo'] == costo + 100
+        after = tuple(conn.execute(kpi_sql, (mes,)).fetchone())
+        assert after[0] == before[0] and round(after[1] - before[1], 6) == 100
+        assert conn.execute("SELECT COUNT(*) FROM pareto_mensual WHERE mes = ? AND dimension = 'falla'",
+                            (h.app_mod.datetime.now().strftime('%Y-%m'),)).fetchone()[0] == 0
+    print("✅ La edición conserva la fecha de alta de la NC")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DEL ARNÉS SIN VENTANAS")
+    print("=" * 50)
+    test_dialog_hooks()
+    test_timings()
+    if QT_AVAILABLE:
+        test_window_flows()
+        test_edit_keeps_fecha()
+    else:
+        print("⏭️  PyQt6 no instalado, pruebas de la ventana omitidas")
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los indicadores precalculados (db/kpi.py y migración 2)
+Compara kpi_mensual contra una agregación completa de nc después de altas, ediciones y bajas
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.kpi import kpi_summary, kpi_totals, rebuild_kpis
+from db.repository import NCRepository
+from test_repository import _nc
+
+FULL_SCAN_SQL = ("SELECT substr(fecha, 1, 7) AS mes, cliente, cod_producto, COUNT(*) AS cantidad, "
+                 "TOTAL(costo) AS costo, TOTAL(cant_scrap) AS cant_scrap FROM nc GROUP BY 1, 2, 3 ORDER BY 1, 2, 3")
+
+
+def _snapshot(rows):
+    return [(r['mes'], r['cliente'], r['cod_producto'], r['cantidad'], round(r['costo'], 6), round(r['cant_scrap'], 6))
+            for r in rows]
+
+
+def test_kpi_maintained_by_triggers():
+    """Altas, ediciones (upsert) y bajas dejan kpi_mensual igual a la agregación completa"""
+    conn = repository.connect(':memory:')
+    repository.init_schema(conn)
+    ncs = NCRepository(conn)
+    ncs.insert_many(_nc(i, fecha=f'2025-0{1 + i % 3}-10 08:00:00', cliente=f'C{i % 2}',
+                        cod_producto='P1', costo=10.0 * i) for i in range(1, 13))
+    ncs.upsert_many([_nc(3, fecha='2025-03-01 09:00:00', cliente='C9', costo=7.5)])
+    ncs.save(_nc(4, costo=1.25))
+    conn.execute("DELETE FROM nc WHERE nro_nc IN (5, 6)")
+    conn.commit()
+
+    expected = _snapshot(conn.execute(FULL_SCAN_SQL))
+    assert _snapshot(kpi_summary(conn, ('mes', 'cliente', 'cod_producto'))) == expected
+    assert conn.execute("SELECT COUNT(*) FROM kpi_mensual WHERE cantidad = 0").fetchone()[0] == 0
+
+    totals = kpi_totals(conn)
+    assert totals['cantidad'] == 10
+    assert round(totals['costo'], 6) == conn.execute("SELECT TOTAL(costo) FROM nc").fetchone()[0]
+    por_mes = kpi_summary(conn, ('mes',), desde='2025-02', hasta='2025-03')
+    assert [r['mes'] for r in por_mes] == ['2025-02', '2025-03']
+
+    assert rebuild_kpis(conn) == len(expected)
+    assert _snapshot(kpi_summary(conn, ('mes', 'cliente', 'cod_producto'))) == expected
+    conn.close()
+    print("✅ Indicadores mantenidos por triggers correctos")
+
+
+def test_kpi_invalid_dimension():
+    conn = repository.connect(':memory:')
+    repository.init_schema(conn)
+    try:
+        kpi_summary(conn, ('falla',))
+        assert False, "debería rechazar la dimensión"
+    except ValueError:
+        pass
+    assert kpi_totals(conn)['cantidad'] == 0
+    conn.close()
+    print("✅ Dimensión inválida rechazada")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE INDICADORES (KPI)")
+    print("=" * 50)
+    test_kpi_maintained_by_triggers()
+    test_kpi_invalid_dimension()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la selección del perfil de logging (--log-profile, NC_AC_LOG_PROFILE, nc_ac_faben.ini)
+"""
+
+import logging
+import logging.handlers
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from log import LOG_PROFILES, select_logging_profile, setup_logging_profile
+
+
+def restore_logging(handlers, level):
+    """Dejar el logger raíz como estaba antes de la prueba"""
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+    logging.disable(logging.NOTSET)
+
+
+def test_select_precedence():
+    """Línea de comandos > variable de entorno > archivo de configuración > predeterminado"""
+    with tempfile.TemporaryDirectory() as tmp:
+        ini = Path(tmp) / 'nc_ac_faben.ini'
+        ini.write_text("[logging]\nperfil = debug\n", encoding='utf-8')
+        env = {'NC_AC_LOG_PROFILE': 'off'}
+
+        assert select_logging_profile(['app.py', '--log-profile', 'production'], env, ini)[0] == 'production'
+        assert select_logging_profile(['app.py', '--log-profile=Production'], env, ini)[0] == 'production'
+        assert select_logging_profile(['app.py'], env, ini) == ('off', 'variable NC_AC_LOG_PROFILE')
+        assert select_logging_profile(['app.py'], {}, ini) == ('debug', 'archivo nc_ac_faben.ini')
+        assert select_logging_profile(['app.py'], {}, Path(tmp) / 'no_existe.ini') == ('development', 'predeterminado')
+
+        profile, source = select_logging_profile(['app.py', '--log-profile', 'verboso'], env, ini)
+        assert profile == 'development' and 'verboso' in source
+    assert set(LOG_PROFILES) == {'production', 'development', 'debug', 'off'}
+    print("✅ Prioridad de selección del perfil correcta")
+
+
+def test_profiles_handlers():
+    """production acumula en memoria sin DEBUG ni consola; development escribe directo; off no registra"""
+    root = logging.getLogger()
+    saved = (root.handlers[:], root.level)
+    cwd = os.getcwd()
+    tmp = tempfile.TemporaryDirectory()
+    try:
+        os.chdir(tmp.name)
+        log_file = Path(tmp.name) / 'log' / 'nc_ac_faben.log'
+
+        logger = setup_logging_profile('production')
+        assert logger.level == logging.INFO and not logger.isEnabledFor(logging.DEBUG)
+        assert all(isinstance(h, logging.handlers.MemoryHandler) for h in logger.handlers)
+        logging.getLogger('prueba').info("registro en lote")
+        assert 'registro en lote' not in log_file.read_text(encoding='utf-8')
+        logging.getLogger('prueba').warning("aviso inmediato")
+        text = log_file.read_text(encoding='utf-8')
+        assert 'registro en lote' in text and 'aviso inmediato' in text
+
+        logger = setup_logging_profile('development')
+        assert logger.isEnabledFor(logging.DEBUG)
+        assert not any(isinstance(h, logging.handlers.MemoryHandler) for h in logger.handlers)
+
+        setup_logging_profile('off')
+        size = log_file.stat().st_size
+        logging.getLogger('prueba').error("no debe escribirse")
+        assert log_file.stat().st_size == size and not logging.getLogger('prueba').isEnabledFor(logging.CRITICAL)
+
+        # Volver a un perfil con registros deshace el 'off'
+        setup_logging_profile('production')
+        assert logging.getLogger('prueba').isEnabledFor(logging.INFO)
+    finally:
+        restore_logging(*saved)
+        os.chdir(cwd)
+        tmp.cleanup()
+    print("✅ Handlers de cada perfil correctos")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE PERFILES DE LOGGING")
+    print("=" * 50)
+    test_select_precedence()
+    test_profiles_handlers()
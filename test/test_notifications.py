@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Pruebas de los avisos no modales de MainWindow (toast y barra de estado)
+Los éxitos de guardar, agregar acción, adjuntar, editar y exportar no abren QMessageBox;
+los errores y la confirmación de NC duplicada siguen siendo modales.
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+import pytest
+
+from gui_harness import MainWindowHarness
+
+try:
+    import PyQt6.QtWidgets  # noqa: F401
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+# Sin PyQt6 las pruebas figuran como omitidas (no como aprobadas)
+pytestmark = pytest.mark.skipif(not QT_AVAILABLE, reason="PyQt6 no instalado")
+
+
+def test_success_flows_are_not_modal():
+    """Guardar, acción, adjuntos, edición y exportación avisan sin QMessageBox"""
+    with MainWindowHarness(nc=10) as h:
+        h.save(11, acciones=[{'tarea': 'Ajustar'}])
+        h.add_action(tarea='Capacitar')
+        source = h.workdir / 'foto.jpg'
+        source.write_bytes(b'jpg')
+        h.attach([source])
+        h.edit(11)
+        h.edit_by_number(3)
+        h.export('csv')
+        h.export_changes()
+        kinds = [m.kind for m in h.hooks.messages]
+        assert kinds == ['notificacion'] * 7, kinds
+        assert [m.title for m in h.hooks.messages][:2] == ['Registro Guardado', 'Acción']
+
+        toast = h.window.toast
+        assert not toast.isHidden() and toast.timer.isActive() and toast.text() == h.hooks.last().text
+        assert h.window.statusBar().currentMessage().startswith('Exportar: ')
+        toast.timer.timeout.emit()
+        assert toast.isHidden() and h.window.statusBar().currentMessage().startswith('Exportar: ')
+    print("✅ Avisos de éxito sin diálogos modales")
+
+
+def test_errors_stay_modal():
+    """Errores y la pregunta por una NC existente siguen necesitando respuesta"""
+    with MainWindowHarness(nc=10) as h:
+        h.window.fields['Nro NC'][0].setText('')
+        h.timed('guardar', h.window.save_record)
+        assert h.hooks.last() == ('warning', 'Campo Requerido', h.hooks.last().text)
+        h.save(5)
+        assert [m.kind for m in h.hooks.messages][-2:] == ['question', 'notificacion']
+        assert h.hooks.last().title == 'Registro Actualizado'
+        h.edit(999)
+        assert h.hooks.last().kind == 'warning' and h.window.toast.text().startswith('✅ NC 5')
+    print("✅ Errores y confirmaciones siguen siendo modales")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE AVISOS NO MODALES")
+    print("=" * 50)
+    if not QT_AVAILABLE:
+        print("⏭️  PyQt6 no instalado, pruebas omitidas")
+        sys.exit(0)
+    test_success_flows_are_not_modal()
+    test_errors_stay_modal()
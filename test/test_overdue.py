@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Pruebas del seguimiento de acciones vencidas (migración 8, db/overdue.py)
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import overdue, repository
+from db.overdue import overdue_actions, overdue_by_responsable, overdue_count
+from test_repository import _nc, _accion, _open
+
+
+def _load(ncs, acciones):
+    """NC 1 con tres acciones (una cerrada) y NC 2 con dos; hoy es 2025-03-01"""
+    ncs.insert_many([_nc(1), _nc(2)])
+    acciones.replace_for_nc(ncs.get_id(1), [
+        dict(_accion('Vencida A'), responsable='Ana', fecha_realizacion='2025-01-10'),
+        dict(_accion('Cerrada'), responsable='Ana', fecha_realizacion='2025-01-05', estado='Cerrada'),
+        dict(_accion('Sin fecha'), responsable='Ana', fecha_realizacion=''),
+    ])
+    acciones.replace_for_nc(ncs.get_id(2), [
+        dict(_accion('Vencida B'), responsable='Beto', fecha_realizacion='2025-02-20', estado='En curso'),
+        dict(_accion('A tiempo'), responsable='Beto', fecha_realizacion='2025-03-01'),
+        dict(_accion('Vencida C'), responsable='Ana', fecha_realizacion='2025-02-01'),
+    ])
+
+
+def test_overdue_actions():
+    """Sólo las abiertas con fecha pasada, las más atrasadas primero y con los días de atraso"""
+    conn, ncs, acciones = _open()
+    _load(ncs, acciones)
+    conn.commit()
+    rows = overdue_actions(conn, '2025-03-01')
+    assert [r['tarea'] for r in rows] == ['Vencida A', 'Vencida C', 'Vencida B']
+    assert rows[0]['nro_nc'] == 1 and rows[0]['dias_vencida'] == 50 and rows[2]['estado'] == 'En curso'
+    assert [r['tarea'] for r in overdue_actions(conn, '2025-03-01', responsable='Beto')] == ['Vencida B']
+    assert [tuple(r) for r in overdue_by_responsable(conn, '2025-03-01')] == [
+        ('Ana', 2, '2025-01-10'), ('Beto', 1, '2025-02-20')]
+    assert overdue_count(conn, '2025-03-02') == 4 and overdue_count(conn, '2025-01-01') == 0
+
+    # Cerrar una acción la saca del índice parcial; la vista usa la fecha actual
+    conn.execute("UPDATE acciones SET estado = 'Cerrada' WHERE tarea = 'Vencida A'")
+    assert overdue_count(conn, '2025-03-01') == 2
+    assert sorted(r['tarea'] for r in conn.execute(f"SELECT tarea FROM {overdue.OVERDUE_VIEW}")) == \
+        ['A tiempo', 'Vencida B', 'Vencida C']
+    conn.close()
+    print("✅ Acciones vencidas y conteo por responsable correctos")
+
+
+def test_partial_index_plan():
+    """Las consultas recorren el índice parcial por rango de fecha; el conteo no lee la tabla"""
+    conn, ncs, acciones = _open()
+    closed_id = overdue.closed_state_id(conn)
+    assert closed_id is not None
+    sql = conn.execute("SELECT sql FROM sqlite_master WHERE name = ?", (overdue.OVERDUE_INDEX,)).fetchone()[0]
+    assert f"estado_id IS NOT {closed_id}" in sql
+
+    params = {'hoy': '2025-03-01', 'responsable': None}
+    sql = overdue.overdue_select_sql(closed_id)
+    plan = ' '.join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + sql, params))
+    assert f"USING INDEX {overdue.OVERDUE_INDEX} (fecha_realizacion>? AND fecha_realizacion<?)" in plan, plan
+    assert 'SCAN a' not in plan, plan
+
+    count_sql = (f"SELECT COUNT(*) FROM acciones_datos INDEXED BY {overdue.OVERDUE_INDEX} "
+                 f"WHERE {overdue.open_filter_sql(closed_id)} AND fecha_realizacion > '' "
+                 f"AND fecha_realizacion < :hoy GROUP BY responsable_id")
+    plan = ' '.join(r[3] for r in conn.execute("EXPLAIN QUERY PLAN " + count_sql, params))
+    assert f"USING COVERING INDEX {overdue.OVERDUE_INDEX}" in plan, plan
+    conn.close()
+    print("✅ Plan de consulta usa el índice parcial de acciones abiertas")
+
+
+def test_checker_cli():
+    """python -m db.overdue: código de salida 1 si hay vencidas"""
+    import tempfile
+    tmp = tempfile.TemporaryDirectory()
+    db_file = Path(tmp.name) / 'nc.db'
+    conn = repository.connect(db_file)
+    repository.init_schema(conn)
+    from db.repository import NCRepository, AccionRepository
+    _load(NCRepository(conn), AccionRepository(conn))
+    conn.commit()
+    conn.close()
+    assert overdue.main(['--db', str(db_file), '--fecha', '2025-03-01']) == 1
+    assert overdue.main(['--db', str(db_file), '--fecha', '2025-03-01', '--por-responsable']) == 1
+    assert overdue.main(['--db', str(db_file), '--fecha', '2025-01-01']) == 0
+    tmp.cleanup()
+    print("✅ Verificador sin interfaz correcto")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE ACCIONES VENCIDAS")
+    print("=" * 50)
+    test_overdue_actions()
+    test_partial_index_plan()
+    test_checker_cli()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Pruebas del análisis de Pareto (db/pareto.py y migración 3)
+Compara los resúmenes mantenidos por triggers contra agregaciones completas de nc
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.pareto import ParetoEngine, compute_pareto
+from db.repository import NCRepository
+from test_repository import _nc
+
+
+def _pareto_db():
+    conn = repository.connect(':memory:')
+    repository.init_schema(conn)
+    ncs = NCRepository(conn)
+    fallas = ['Rebaba'] * 6 + ['Fisura'] * 3 + ['Golpe']
+    ncs.insert_many(_nc(i, falla=f, fecha=f'2025-0{1 + i % 2}-05 10:00:00', costo=float(i),
+                        ishikawa='Máquina:|a||b;;Método:|c' if i % 2 else 'Material:|x')
+                    for i, f in enumerate(fallas, 1))
+    conn.commit()
+    return conn, ncs
+
+
+def test_pareto_by_falla():
+    """Orden por frecuencia, porcentajes y acumulado; el costo cambia el orden"""
+    conn, _ = _pareto_db()
+    result = compute_pareto(conn, 'falla', 'cantidad')
+    assert [(i.valor, i.cantidad) for i in result.items] == [('Rebaba', 6), ('Fisura', 3), ('Golpe', 1)]
+    assert result.total == 10 and result.items[0].porcentaje == 60.0
+    assert round(result.items[-1].acumulado, 6) == 100.0
+    assert [i.valor for i in result.vital_few()] == ['Rebaba', 'Fisura']
+    por_costo = compute_pareto(conn, 'falla', 'costo')
+    assert [i.valor for i in por_costo.items] == ['Fisura', 'Rebaba', 'Golpe'] and por_costo.total == sum(range(1, 11))
+    solo_enero = compute_pareto(conn, 'falla', desde='2025-01', hasta='2025-01')
+    assert sum(i.cantidad for i in solo_enero.items) == 5
+    conn.close()
+    print("✅ Pareto por falla correcto")
+
+
+def test_pareto_ishikawa_follows_edits():
+    """Las categorías Ishikawa se cuentan por NC y siguen a ediciones y bajas"""
+    conn, ncs = _pareto_db()
+    counts = {i.valor: i.cantidad for i in compute_pareto(conn, 'ishikawa').items}
+    assert counts == {'Máquina': 5, 'Método': 5, 'Material': 5}
+
+    ncs.save(_nc(1, falla='Golpe', ishikawa='Medición:|z', fecha='2025-02-05 10:00:00'))
+    conn.execute("DELETE FROM nc WHERE nro_nc = 2")
+    conn.commit()
+    counts = {i.valor: i.cantidad for i in compute_pareto(conn, 'ishikawa').items}
+    assert counts == {'Máquina': 4, 'Método': 4, 'Material': 4, 'Medición': 1}
+    fallas = {i.valor: i.cantidad for i in compute_pareto(conn, 'falla').items}
+    assert fallas == dict(conn.execute("SELECT falla, COUNT(*) FROM nc GROUP BY falla").fetchall())
+    assert conn.execute("SELECT COUNT(*) FROM pareto_mensual WHERE cantidad = 0").fetchone()[0] == 0
+    conn.close()
+    print("✅ Pareto Ishikawa actualizado por triggers")
+
+
+def test_pareto_engine_cache():
+    """La caché responde repeticiones y se vacía al escribir"""
+    conn, ncs = _pareto_db()
+    engine = ParetoEngine(conn)
+    first = engine.get('cliente', 'costo')
+    assert engine.get('cliente', 'costo') is first and engine.hits == 1
+    ncs.insert(_nc(50, cliente='Otro', costo=999.0))
+    conn.commit()
+    assert engine.get('cliente', 'costo').items[0].valor == 'Otro' and engine.misses == 2
+    try:
+        engine.get('observaciones')
+        assert False, "debería rechazar la dimensión"
+    except ValueError:
+        pass
+    conn.close()
+    print("✅ Caché de Pareto correcta")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE ANÁLISIS DE PARETO")
+    print("=" * 50)
+    test_pareto_by_falla()
+    test_pareto_ishikawa_follows_edits()
+    test_pareto_engine_cache()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Pruebas del modo de carga rápida de MainWindow (menú Carga, Ctrl+R)
+Se recorre con eventos reales de teclado sobre el arnés sin ventanas: número propuesto, Enter
+entre campos vacíos, acciones en la tabla del formulario y Ctrl+Enter para guardar y seguir con
+el mismo cliente y producto.
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+import pytest
+
+from gui_harness import FIELD_DEFAULTS, MainWindowHarness
+
+try:
+    import PyQt6.QtTest  # noqa: F401
+    QT_AVAILABLE = True
+except ImportError:
+    QT_AVAILABLE = False
+
+# Sin PyQt6 las pruebas figuran como omitidas (no como aprobadas)
+pytestmark = pytest.mark.skipif(not QT_AVAILABLE, reason="PyQt6 no instalado")
+
+
+def test_inline_action_values():
+    """Fecha vacía = hoy, fechas DD/MM/AAAA y estado por su inicial"""
+    with MainWindowHarness() as h:
+        inline_action = h.app_mod.inline_action
+        base = {'tarea': 'Ajustar', 'tiempo': '', 'responsable': '', 'fecha_realizacion': '', 'estado': ''}
+        action = inline_action(base, 1)
+        assert action['estado'] == 'Abierta' and len(action['fecha_realizacion']) == 10
+        action = inline_action(dict(base, fecha_realizacion='15/11/2030', estado='c'), 1)
+        assert (action['fecha_realizacion'], action['estado']) == ('2030-11-15', 'Cerrada')
+        assert inline_action(dict(base, estado='EN'), 1)['estado'] == 'En curso'
+        for bad in ({'fecha_realizacion': 'mañana'}, {'estado': 'x'}):
+            try:
+                inline_action(dict(base, **bad), 3)
+            except ValueError as e:
+                assert str(e).startswith('Fila 3:')
+            else:
+                raise AssertionError(f"se aceptó {bad}")
+    print("✅ Valores de las acciones de la tabla")
+
+
+def test_keyboard_entry():
+    """Dos NC seguidas sólo con el teclado: la segunda conserva cliente y producto"""
+    with MainWindowHarness(nc=20) as h:
+        w = h.window
+        h.show()
+        h.press('R', 'Control')
+        assert w.rapid_mode and w.fields['Nro NC'][0].text() == '21'
+        assert w.save_btn.isEnabled() and not w.actions_table.isHidden()
+        values = dict(FIELD_DEFAULTS, **{'Cod. Producto': 'Z-NUEVO', 'Cliente': 'ACME'})
+        for name in w.enable_chain_order[1:]:
+            assert h.focused() is w.fields[name][0], name
+            h.type_text(values[name])
+            h.press('Tab' if name == 'Falla' else 'Return')
+        assert h.focused() is w.actions_table
+        h.type_text('Ajustar')
+        h.press('Tab')
+        h.type_text('2h')
+        h.press('Tab')
+        h.type_text('Ana')
+        h.press('Return', 'Control')
+
+        assert h.hooks.last().text == '✅ NC 21 guardada correctamente.'
+        saved = w.nc_cache.get(21)
+        assert saved.nc['cliente'] == 'ACME' and saved.nc['falla'] == 'Rebaba en borde'
+        assert [(a['tarea'], a['tiempo_estimado'], a['responsable'], a['estado']) for a in saved.acciones] == \
+            [('Ajustar', '2h', 'Ana', 'Abierta')]
+        assert h.values()['Nro NC'] == '22'
+        assert [h.values()[n] for n in ('Cliente', 'Cod. Producto', 'Desc. Producto')] == \
+            ['ACME', 'Z-NUEVO', 'Pieza de prueba']
+        assert h.focused() is w.fields['Resultado Matriz'][0] and w.actions_table.rowCount() == 1
+        assert h.clicks == 0 and h.keystrokes > 0
+
+        for name in ('Resultado Matriz', 'OP', 'Cant. Invol.', 'Cant. Scrap', 'Costo', 'Cant. Recuperada', 'Falla'):
+            h.type_text(values[name])
+            h.press('Return')                      # en Falla, el último campo vacío, guarda
+        assert h.hooks.last().text == '✅ NC 22 guardada correctamente.'
+        assert w.nc_cache.get(22).nc['cod_producto'] == 'Z-NUEVO' and not w.nc_cache.get(22).acciones
+        assert h.values()['Cliente'] == '' and h.focused() is w.fields['Resultado Matriz'][0]
+        assert not h.hooks.errors
+    print("✅ Carga de NC sólo con el teclado")
+
+
+def test_required_fields():
+    """Ctrl+Enter con un campo vacío o inválido no guarda: aviso y foco en ese campo"""
+    with MainWindowHarness(nc=20) as h:
+        w = h.window
+        h.show()
+        h.rapid()
+        h.fill({**FIELD_DEFAULTS, 'Falla': ''})
+        w.fields['Cliente'][0].setFocus()
+        h.press('Return', 'Control')
+        assert h.hooks.last() == ('warning', 'Campo Requerido', '⚠️ El campo "Falla" es obligatorio.')
+        assert not w.nc_repo.exists(21) and h.focused() is w.fields['Falla'][0]
+
+        h.fill({'Falla': 'Rebaba en borde', 'Costo': 'abc'})
+        h.press('Return', 'Control')
+        assert h.hooks.last().title == 'Formato Incorrecto' and '"Costo"' in h.hooks.last().text
+        assert not w.nc_repo.exists(21) and h.focused() is w.fields['Costo'][0]
+
+        h.fill({'Costo': '100'})
+        h.press('Return', 'Control')
+        assert h.hooks.last().text == '✅ NC 21 guardada correctamente.'
+    print("✅ Campos obligatorios validados al guardar")
+
+
+def test_switching_modes():
+    """Acción por la tabla, filas inválidas, edición y vuelta a la cadena secuencial"""
+    with MainWindowHarness(nc=20) as h:
+        w = h.window
+        h.save(21, acciones=[{'tarea': 'Medir', 'responsable': 'Luis', 'fecha_realizacion': '2030-01-01'}])
+        h.rapid()
+        h.edit_by_number(21)
+        assert w.actions_table.rowCount() == 2 and w.actions_table.item(0, 2).text() == 'Luis'
+        w.open_action()
+        assert w.actions_table.currentRow() == 1 and h.hooks.last('notificacion').title != 'Acción'
+
+        w.actions_table.item(1, 0).setText('Capacitar')
+        w.actions_table.item(1, 4).setText('z')
+        h.rapid(False)
+        assert w.rapid_mode and w.rapid_act.isChecked() and h.hooks.last().title == 'Acciones'
+        w.actions_table.item(1, 4).setText('e')
+        h.rapid(False)
+        assert not w.rapid_mode and w.actions_table.isHidden() and w.form_layout.labelForField(w.actions_table).isHidden()
+        assert [a['estado'] for a in w.actions_temp] == ['Abierta', 'En curso']
+        assert all(w.fields[n][0].isEnabled() for n in w.enable_chain_order) and w.save_btn.isEnabled()
+
+        w.reset_form()
+        w.fields['Nro NC'][0].setText('30')
+        h.rapid()
+        h.rapid(False)
+        enabled = [n for n in w.enable_chain_order if w.fields[n][0].isEnabled()]
+        assert enabled == ['Nro NC', 'Resultado Matriz'] and not w.save_btn.isEnabled()
+    print("✅ Cambio entre carga rápida y secuencial")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE LA CARGA RÁPIDA")
+    print("=" * 50)
+    if not QT_AVAILABLE:
+        print("⏭️  PyQt6 no instalado, pruebas omitidas")
+        sys.exit(0)
+    test_inline_action_values()
+    test_keyboard_entry()
+    test_required_fields()
+    test_switching_modes()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la capa de acceso a datos (db/repository.py)
+Se ejecutan sobre una base de datos en memoria, sin Qt
+"""
+
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import NCRepository, AccionRepository
+
+
+def _nc(nro, **overrides):
+    params = dict(nro_nc=nro, fecha='2025-01-01 08:00:00', resultado_matriz=1.0, op=100 + nro,
+                  cant_invol=10.0, cod_producto=f'P{nro}', desc_producto='Producto', cliente='Cliente',
+                  cant_scrap=1.0, costo=50.0, cant_recuperada=9.0, observaciones='', falla='Falla', ishikawa='')
+    params.update(overrides)
+    return params
+
+
+def _accion(tarea):
+    return dict(tarea=tarea, tiempo_estimado='1h', responsable='QA',
+                fecha_realizacion='2025-01-10', estado='Abierta', adjuntos='')
+
+
+def _open():
+    conn = repository.connect(':memory:')
+    repository.init_schema(conn)
+    return conn, NCRepository(conn), AccionRepository(conn)
+
+
+def test_save_and_update():
+    """save() inserta la primera vez y actualiza la segunda"""
+    conn, ncs, acciones = _open()
+    assert ncs.next_nro() == 1
+    nc_id, is_update = ncs.save(_nc(1))
+    assert not is_update and ncs.exists(1)
+    acciones.replace_for_nc(nc_id, [_accion('a'), _accion('b')])
+
+    same_id, is_update = ncs.save(_nc(1, costo=75.0))
+    assert is_update and same_id == nc_id
+    assert ncs.get_by_nro(1)['costo'] == 75.0
+    ncs.save(_nc(40))
+    assert ncs.next_nro() == 41
+
+    acciones.replace_for_nc(nc_id, [_accion('c')])
+    assert [r['tarea'] for r in acciones.list_for_nc(nc_id)] == ['c']
+    conn.close()
+    print("✅ Guardado y actualización correctos")
+
+
+def test_batched_methods():
+    """get_many/upsert_many trabajan en lotes mayores al límite de parámetros"""
+    conn, ncs, acciones = _open()
+    total = repository.MAX_PARAMS + 100
+    ncs.upsert_many(_nc(n) for n in range(total))
+    assert ncs.count() == total
+
+    ncs.upsert_many([_nc(5, costo=1.5)])
+    assert ncs.count() == total and ncs.get_by_nro(5)['costo'] == 1.5
+
+    rows = ncs.get_many(range(total))
+    assert len(rows) == total and rows[total - 1]['op'] == 100 + total - 1
+
+    ids = [ncs.get_id(1), ncs.get_id(2)]
+    acciones.upsert_many({ids[0]: [_accion('x')], ids[1]: [_accion('y'), _accion('z')]})
+    por_nc = acciones.get_many(ids)
+    assert len(por_nc[ids[0]]) == 1 and len(por_nc[ids[1]]) == 2
+    assert sum(1 for _ in ncs.iter_all(batch_size=100)) == total
+    conn.close()
+    print("✅ Métodos por lotes correctos")
+
+
+def test_init_schema_current():
+    """Con la base al día init_schema no escribe nada (arranque rápido)"""
+    conn = repository.connect(':memory:')
+    assert not repository.schema_is_current(conn)
+    repository.init_schema(conn)
+    assert repository.schema_is_current(conn)
+    changes = conn.total_changes
+    assert repository.init_schema(conn) == {'nc': [], 'acciones': []}
+    assert conn.total_changes == changes and not conn.in_transaction
+    conn.close()
+    print("✅ init_schema omitido con el esquema al día")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE LA CAPA DE ACCESO A DATOS")
+    print("=" * 50)
+    test_save_and_update()
+    test_batched_methods()
+    test_init_schema_current()
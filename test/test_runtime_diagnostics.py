@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Pruebas del perfil de la sesión y del vigilante de bloqueos (diagnostics/profiling.py, watchdog.py)
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from diagnostics.profiling import RuntimeProfiler, SamplingProfiler, collapse_stack
+from diagnostics.watchdog import GuiWatchdog
+
+
+def busy(seconds):
+    """Función identificable en las pilas: ocupa el hilo sin dormir"""
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def test_collapse_stack():
+    """La pila colapsada va del punto de entrada a la función en ejecución"""
+    def inner():
+        return collapse_stack(sys._getframe())
+    stack = inner().split(';')
+    assert stack[-1].startswith('inner (test_runtime_diagnostics.py:')
+    assert stack[-2].startswith('test_collapse_stack (')
+    print("✅ Pila colapsada en orden")
+
+
+def test_sampling_profiler():
+    """El muestreo del hilo principal encuentra la función que lo ocupa"""
+    sampler = SamplingProfiler(interval_ms=2)
+    sampler.start()
+    busy(0.15)
+    sampler.stop()
+    assert sampler.samples > 5
+    assert sum(count for stack, count in sampler.stacks.items() if 'busy (' in stack) > sampler.samples // 2
+    print("✅ Perfil por muestreo del hilo principal")
+
+
+def test_runtime_profiler_files():
+    """cProfile guarda .prof y resumen; el muestreo guarda .folded; un solo perfil a la vez"""
+    with tempfile.TemporaryDirectory() as tmp:
+        profiler = RuntimeProfiler(tmp)
+        assert profiler.stop() is None
+        profiler.start('cprofile')
+        try:
+            profiler.start('sampling')
+            assert False, "Debió rechazar un segundo perfil"
+        except RuntimeError:
+            pass
+        busy(0.02)
+        path = profiler.stop()
+        assert path.suffix == '.prof' and path.exists() and not profiler.running
+        assert 'busy' in path.with_suffix('.txt').read_text(encoding='utf-8')
+
+        profiler.start('sampling', interval_ms=2)
+        busy(0.1)
+        path = profiler.stop()
+        lines = path.read_text(encoding='utf-8').splitlines()
+        assert path.suffix == '.folded' and lines and lines[0].rsplit(' ', 1)[1].isdigit()
+        try:
+            profiler.start('otro')
+            assert False, "Debió rechazar el modo desconocido"
+        except ValueError:
+            pass
+    print("✅ Archivos de perfil guardados")
+
+
+def test_watchdog_detects_stall():
+    """Un bloqueo se registra una vez con la pila del hilo vigilado y se cierra con el latido"""
+    now = [100.0]
+    watchdog = GuiWatchdog(threshold_ms=200, clock=lambda: now[0])
+    assert watchdog.check() is None                # sin latidos todavía: no vigila
+    watchdog.beat()
+    now[0] += 0.1
+    assert watchdog.check() is None
+    now[0] += 0.2
+    stack = watchdog.check()
+    assert stack and 'test_watchdog_detects_stall' in stack and watchdog.stalls == 1
+    now[0] += 1
+    assert watchdog.check() is None and watchdog.stalls == 1
+    watchdog.beat()
+    now[0] += 0.25
+    assert watchdog.check() and watchdog.stalls == 2
+    print("✅ Vigilante detecta cada bloqueo una vez")
+
+
+def test_watchdog_thread():
+    """Con el hilo del vigilante, un bloqueo real del hilo principal deja su pila"""
+    watchdog = GuiWatchdog(threshold_ms=50)
+    watchdog.start()
+    watchdog.beat()
+    busy(0.2)
+    watchdog.beat()
+    watchdog.stop()
+    assert watchdog.stalls == 1 and 'busy' in watchdog.last_stack
+    assert not watchdog.running
+    print("✅ Hilo del vigilante registra bloqueos reales")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE DIAGNÓSTICO EN TIEMPO DE EJECUCIÓN")
+    print("=" * 50)
+    test_collapse_stack()
+    test_sampling_profiler()
+    test_runtime_profiler_files()
+    test_watchdog_detects_stall()
+    test_watchdog_thread()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Pruebas del esquema declarativo de NC (db/schema.py)
+Verifica que formulario, SQL generado y mapeo por nombre de columna sean coherentes
+"""
+
+import sqlite3
+import sys
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import schema
+
+
+def test_form_order():
+    """El orden del formulario coincide con la cadena de habilitación histórica"""
+    labels = [f.label for f in schema.NC_FORM_FIELDS]
+    assert labels == ['Nro NC','Resultado Matriz','OP','Cant. Invol.','Cod. Producto',
+                      'Desc. Producto','Cliente','Cant. Scrap','Costo','Cant. Recuperada','Falla']
+    print("✅ Orden de campos del formulario correcto")
+
+
+def test_roundtrip_sqlite_row():
+    """Insertar con el SQL generado y leer por nombre de columna con sqlite3.Row"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute(schema.NC_CREATE_SQL)
+    conn.execute(schema.ACCION_CREATE_SQL)
+
+    texts = {'Nro NC': '1000', 'Resultado Matriz': '7.5', 'OP': '54321', 'Cant. Invol.': '250',
+             'Cod. Producto': 'PROD-TEST', 'Desc. Producto': 'Producto Test', 'Cliente': 'Cliente S.A.',
+             'Cant. Scrap': '25', 'Costo': '1250', 'Cant. Recuperada': '225', 'Falla': 'Falla test'}
+    for f in schema.NC_FORM_FIELDS:
+        assert f.validator(texts[f.label]), f.label
+
+    params = schema.parse_form_values(texts)
+    params.update(fecha='2024-12-24 10:30:00', observaciones='', ishikawa='')
+    conn.execute(schema.NC_INSERT_SQL, params)
+
+    conn.row_factory = sqlite3.Row
+    row = conn.execute(schema.NC_SELECT_BY_NRO_SQL, (1000,)).fetchone()
+    values = schema.row_to_form_values(row)
+    assert values['OP'] == '54321'
+    assert values['Cant. Invol.'] == '250.0'
+    assert values['Falla'] == 'Falla test'
+
+    params['costo'] = 99.0
+    conn.execute(schema.NC_UPDATE_SQL, params)
+    assert conn.execute("SELECT costo FROM nc WHERE nro_nc=1000").fetchone()[0] == 99.0
+    conn.close()
+    print("✅ Guardado y carga por nombre de columna correctos")
+
+
+def test_ensure_columns():
+    """Una columna nueva del esquema se agrega a una tabla existente"""
+    conn = sqlite3.connect(':memory:')
+    conn.execute("CREATE TABLE nc (id INTEGER PRIMARY KEY AUTOINCREMENT, nro_nc INTEGER UNIQUE, fecha TEXT)")
+    added = schema.ensure_columns(conn.cursor(), 'nc', schema.NC_SCHEMA)
+    assert 'falla' in added and 'nro_nc' not in added
+    assert schema.ensure_columns(conn.cursor(), 'nc', schema.NC_SCHEMA) == []
+    conn.close()
+    print("✅ Columnas faltantes agregadas correctamente")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DEL ESQUEMA DECLARATIVO")
+    print("=" * 50)
+    test_form_order()
+    test_roundtrip_sqlite_row()
+    test_ensure_columns()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Pruebas de la detección de NC duplicadas (db/similarity.py)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from db import repository
+from db.repository import NCRepository
+from db.similarity import DuplicateFinder, FallaIndex, normalize
+from test_repository import _nc
+
+
+def test_normalize_and_search():
+    """Acentos, mayúsculas y puntuación no cambian la similitud"""
+    assert normalize('  Fisura en ZONA de soldadura!! ') == 'fisura en zona de soldadura'
+    assert normalize('Rebába') == 'rebaba'
+    index = FallaIndex().build(['Fisura en zona de soldadura', 'Rebaba en borde', 'Golpe en tapa',
+                                'fisura en zona de soldadura.'])
+    assert len(index) == 3
+    results = index.search('fisura zona soldadura')
+    assert results and results[0][1] == ['Fisura en zona de soldadura', 'fisura en zona de soldadura.']
+    assert all(score >= 0.45 for score, _ in results)
+    assert index.search('xyz') == [] and index.search('Pintura descascarada') == []
+    print("✅ Normalización y búsqueda por trigramas correctas")
+
+
+def test_duplicate_finder():
+    """Sugiere primero NC del mismo producto y excluye la NC en edición"""
+    tmp = tempfile.TemporaryDirectory()
+    db_file = Path(tmp.name) / 'nc.db'
+    conn = repository.connect(db_file)
+    repository.init_schema(conn)
+    ncs = NCRepository(conn)
+    ncs.insert_many([_nc(1, falla='Rebaba en borde superior', cod_producto='P1'),
+                     _nc(2, falla='Rebaba en el borde superior', cod_producto='P2'),
+                     _nc(3, falla='Golpe en tapa', cod_producto='P1')])
+    conn.commit()
+    finder = DuplicateFinder(conn)
+    assert finder.suggest('rebaba borde') == []      # todavía sin índice
+    finder.add('Golpe en tapa')                      # se guarda como pendiente
+    finder.build_async(lambda: repository.connect(db_file)).join()
+    assert finder.ready and len(finder.index) == 3
+    found = finder.suggest('Rebaba en borde superior', cod_producto='P2')
+    assert [s.nro_nc for s in found] == [2, 1] and found[0].same_product
+    assert [s.nro_nc for s in finder.suggest('Rebaba en borde superior', exclude_nro=1)] == [2]
+
+    ncs.insert(_nc(4, falla='Fisura longitudinal en eje', cod_producto='P3'))
+    conn.commit()
+    finder.add('Fisura longitudinal en eje')
+    assert [s.nro_nc for s in finder.suggest('fisura longitudinal eje')] == [4]
+
+    # Una escritura de otro proceso dispara la reconstrucción en segundo plano
+    other = repository.connect(db_file)
+    NCRepository(other).insert(_nc(5, falla='Porosidad en brida', cod_producto='P4'))
+    other.commit()
+    other.close()
+    finder.suggest('porosidad brida')
+    finder._thread.join()
+    assert [s.nro_nc for s in finder.suggest('porosidad brida')] == [5]
+    conn.close()
+    tmp.cleanup()
+    print("✅ Sugerencias de duplicados correctas")
+
+
+def test_lazy_capped_index():
+    """Con connect el índice se arma con la primera sugerencia; max_texts deja las fallas más recientes"""
+    tmp = tempfile.TemporaryDirectory()
+    db_file = Path(tmp.name) / 'nc.db'
+    conn = repository.connect(db_file)
+    repository.init_schema(conn)
+    NCRepository(conn).insert_many([_nc(i, falla=f'Falla número {i} en zona {i % 7}') for i in range(1, 11)])
+    conn.commit()
+
+    finder = DuplicateFinder(conn, lambda: repository.connect(db_file), max_texts=4)
+    assert finder.suggest('') == [] and not finder.building   # ni al crearlo ni sin texto de falla
+    assert finder.suggest('Falla número 9 en zona 2') == []
+    finder._thread.join()
+    assert len(finder.index) == 4
+    assert [s.nro_nc for s in finder.suggest('Falla número 9 en zona 2')][:1] == [9]
+    assert finder.suggest('Falla número 2 en zona 2', threshold=0.95) == []   # fuera del tope
+    conn.close()
+    tmp.cleanup()
+    print("✅ Índice de duplicados perezoso y acotado")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DE DETECCIÓN DE DUPLICADOS")
+    print("=" * 50)
+    test_normalize_and_search()
+    test_duplicate_finder()
+    test_lazy_capped_index()
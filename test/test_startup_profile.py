@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Pruebas del perfil de arranque (diagnostics/startup.py, --profile-startup)
+"""
+
+import csv
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+
+from diagnostics.startup import BEFORE_PYTHON, CSV_NAME, StartupProfiler, process_elapsed, run_mode
+
+
+def test_disabled_by_default():
+    """Sin --profile-startup no mide ni escribe nada"""
+    profiler = StartupProfiler.from_argv(['app.py'])
+    profiler.mark('imports')
+    assert not profiler.enabled and profiler.marks == [] and profiler.profile is None
+    assert profiler.finish('primer_pintado') is None
+    print("✅ Perfilador desactivado sin la opción")
+
+
+def test_phases_and_report():
+    """Cada fase dura desde la marca anterior; el informe y el CSV acumulan las corridas"""
+    tmp = tempfile.TemporaryDirectory()
+    for run in range(2):
+        profiler = StartupProfiler.from_argv(['app.py', '--profile-startup', '--cprofile'])
+        assert profiler.enabled and profiler.profile is not None
+        time.sleep(0.02)
+        profiler.mark('imports')
+        profiler.mark('init_db')
+        path = profiler.finish('primer_pintado', tmp.name)
+        phases = dict(profiler.phases())
+        assert list(phases)[-3:] == ['imports', 'init_db', 'primer_pintado']
+        assert phases['imports'] >= 0.02 and abs(profiler.total() - sum(phases.values())) < 1e-9
+        text = path.read_text(encoding='utf-8')
+        assert 'imports' in text and 'cProfile' in text and path.with_suffix('.prof').exists()
+        assert profiler.finish() is None          # un solo informe por arranque
+
+    with open(Path(tmp.name) / CSV_NAME, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 2 and rows[0]['modo'] == run_mode() == 'python'
+    assert float(rows[1]['total_ms']) >= float(rows[1]['imports']) >= 20
+    tmp.cleanup()
+    print("✅ Fases, informe y CSV de arranque correctos")
+
+
+def test_process_elapsed():
+    """El tiempo desde la creación del proceso se informa en Linux y Windows"""
+    elapsed = process_elapsed()
+    if sys.platform.startswith('linux') or sys.platform == 'win32':
+        assert elapsed is not None and 0 <= elapsed < 24 * 3600
+        profiler = StartupProfiler(enabled=True)
+        assert profiler.phases()[0][0] == BEFORE_PYTHON
+    print("✅ Tiempo desde la creación del proceso disponible")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DEL PERFIL DE ARRANQUE")
+    print("=" * 50)
+    test_disabled_by_default()
+    test_phases_and_report()
+    test_process_elapsed()
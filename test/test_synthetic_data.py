@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Pruebas del generador sintético de la suite de benchmarks (test/synthetic_data.py)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Añadir el directorio padre al path para importar módulos locales
+current_dir = Path(__file__).parent
+parent_dir = current_dir.parent
+sys.path.insert(0, str(parent_dir))
+sys.path.insert(0, str(current_dir))
+
+from db import repository
+from db.repository import NCRepository
+from db.schema import ISHIKAWA_CATEGORIAS, parse_ishikawa
+from synthetic_data import SyntheticGenerator, attachment_names, scale_count, write_attachments
+
+
+def test_reproducible():
+    """La misma semilla da los mismos datos, y cada NC no depende de la escala salvo en fechas"""
+    a, b = SyntheticGenerator(7), SyntheticGenerator(7)
+    assert a.record(1234, 10_000) == b.record(1234, 10_000)
+    small, large = a.record(1234, 10_000), a.record(1234, 1_000_000)
+    for key in ('cliente', 'cod_producto', 'falla', 'ishikawa', 'costo'):
+        assert small[0][key] == large[0][key]
+    assert len(small[1]) == len(large[1])
+    assert SyntheticGenerator(8).record(1234, 10_000) != small
+    assert scale_count('100k') == 100_000 and scale_count(nc=321) == 321
+    print("✅ Generación reproducible por semilla")
+
+
+def test_realistic_values():
+    """Valores coherentes: cantidades, producto con su descripción, Ishikawa parseable, adjuntos"""
+    gen = SyntheticGenerator()
+    products = dict(gen.productos)
+    with_ishikawa = with_attachments = 0
+    for nc, acciones in gen.records(1, 500, 500):
+        assert nc['cant_scrap'] + nc['cant_recuperada'] == nc['cant_invol']
+        assert products[nc['cod_producto']] == nc['desc_producto']
+        causes = parse_ishikawa(nc['ishikawa'])
+        assert all(cat in ISHIKAWA_CATEGORIAS and 1 <= len(whys) <= 5 for cat, whys in causes)
+        with_ishikawa += bool(causes)
+        for a in acciones:
+            assert a['fecha_realizacion'] > nc['fecha'][:10]
+            assert a['estado'] in ('Abierta', 'En curso', 'Cerrada')
+        with_attachments += bool(attachment_names(acciones))
+    assert 200 < with_ishikawa < 400 and with_attachments > 50
+    print("✅ Valores sintéticos coherentes")
+
+
+def test_populate_and_attachments():
+    """populate inserta NC y acciones por lotes; los adjuntos se escriben con contenido fijo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = repository.connect(Path(tmp) / 'nc.db')
+        repository.init_schema(conn)
+        gen = SyntheticGenerator()
+        totals = gen.populate(conn, 1200, batch_size=500)
+        assert totals['nc'] == NCRepository(conn).count() == 1200
+        assert totals['acciones'] == conn.execute("SELECT COUNT(*) FROM acciones").fetchone()[0] > 1200
+        row = NCRepository(conn).get_by_nro(77)
+        assert row['falla'] == gen.record(77, 1200)[0]['falla']
+        conn.close()
+
+        names = attachment_names(next(acc for _, acc in gen.records(1, 100) if attachment_names(acc)))
+        paths = write_attachments(Path(tmp) / 'attachments', names, size=100)
+        again = write_attachments(Path(tmp) / 'otra', names, size=100)
+        assert [p.read_bytes() for p in paths] == [p.read_bytes() for p in again]
+        assert all(p.stat().st_size == 100 for p in paths)
+    print("✅ Base y adjuntos sintéticos generados")
+
+
+if __name__ == '__main__':
+    print("PRUEBAS DEL GENERADOR SINTÉTICO")
+    print("=" * 50)
+    test_reproducible()
+    test_realistic_values()
+    test_populate_and_attachments()
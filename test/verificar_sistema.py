@@ -78,7 +78,7 @@ def verificar_base_datos():
         cur = conn.cursor()
         
         # Verificar tabla nc
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='nc'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table','view') AND name='nc'")
         if cur.fetchone():
             cur.execute("SELECT COUNT(*) FROM nc")
             count = cur.fetchone()[0]
@@ -88,7 +88,7 @@ def verificar_base_datos():
             return False
         
         # Verificar tabla acciones  
-        cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='acciones'")
+        cur.execute("SELECT name FROM sqlite_master WHERE type IN ('table','view') AND name='acciones'")
         if cur.fetchone():
             cur.execute("SELECT COUNT(*) FROM acciones")
             count = cur.fetchone()[0]
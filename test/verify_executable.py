@@ -156,7 +156,7 @@ class ExecutableVerifier:
 □ 24. Los logs se generan correctamente
 
 📊 EXPORTACIÓN:
-□ 25. Botón "Exportar a Excel" funciona
+□ 25. Botón "Exportar" funciona (Excel/CSV/Parquet)
 □ 26. Se genera el archivo Excel
 □ 27. El archivo contiene los datos correctos
 